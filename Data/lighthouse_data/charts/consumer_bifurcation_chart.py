@@ -16,6 +16,7 @@ FRED Series:
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -25,9 +26,14 @@ import requests
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 # FRED API
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 
+CACHE = RenderCache(__file__)
+
 # Lighthouse colors
 COLORS = {
     'ocean_blue': '#0089D1',
@@ -42,6 +48,7 @@ COLORS = {
 }
 
 
+@CACHE.track
 def fetch_fred_raw(series_id: str, start_date: str = '2015-01-01') -> pd.Series:
     """
     Fetch raw FRED data - NO smoothing, NO interpolation.
@@ -241,10 +248,10 @@ def generate_consumer_bifurcation_chart(output_path: Path = None):
         output_path = Path('/Users/bob/LHM/data/charts/priority1/chart_consumer_bifurcation.png')
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"\nSaved: {output_path}")
+    print(f"\n{'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -18,6 +18,7 @@ minus the percent with decreasing employment.
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -26,8 +27,13 @@ import requests
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 
+CACHE = RenderCache(__file__)
+
 COLORS = {
     'ocean_blue': '#0089D1',
     'dusk_orange': '#FF6723',
@@ -41,6 +47,7 @@ COLORS = {
 }
 
 
+@CACHE.track
 def fetch_fred_raw(series_id: str, start_date: str = '2000-01-01') -> pd.Series:
     """Fetch raw FRED data - FAILS if unavailable."""
     if not FRED_API_KEY:
@@ -209,10 +216,10 @@ def generate_employment_diffusion_chart(output_path: Path = None):
         output_path = Path('/Users/bob/LHM/data/charts/institutional/chart_employment_diffusion.png')
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     print(f"  Current value: {current_val:.1f}")
     return output_path
 
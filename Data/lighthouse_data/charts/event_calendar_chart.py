@@ -13,6 +13,7 @@ Options for y-axis:
 We'll use option 3 for clarity with option 1 as secondary.
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -21,6 +22,11 @@ from matplotlib.patches import FancyBboxPatch
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
+CACHE = RenderCache(__file__)
+
 COLORS = {
     'ocean_blue': '#0089D1',
     'dusk_orange': '#FF6723',
@@ -210,10 +216,10 @@ def generate_event_calendar_chart(output_path: Path = None):
         output_path = Path('/Users/bob/LHM/data/charts/institutional/chart_event_calendar.png')
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
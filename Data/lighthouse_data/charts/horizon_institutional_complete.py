@@ -9,6 +9,7 @@ Output: /Users/bob/LHM/data/charts/horizon_institutional/
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -21,10 +22,15 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 # Config
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 OUTPUT_DIR = Path('/Users/bob/LHM/data/charts/horizon_institutional')
 
+CACHE = RenderCache(__file__)
+
 # Lighthouse colors
 COLORS = {
     'ocean': '#0089D1',
@@ -39,6 +45,7 @@ COLORS = {
 }
 
 
+@CACHE.track
 def fetch_fred(series_id: str, start: str = '2000-01-01') -> pd.Series:
     """Fetch FRED data. FAILS if unavailable - never fabricates."""
     url = 'https://api.stlouisfed.org/fred/series/observations'
@@ -1202,18 +1209,20 @@ def generate_all():
     for name, func in ALL_CHARTS:
         try:
             print(f"  {name}...", end=' ')
-            fig = func()
-            path = OUTPUT_DIR / f'{name}.png'
-            fig.savefig(path, dpi=300, bbox_inches='tight', facecolor='white')
+            with CACHE.chart():
+                fig = func()
+                path = OUTPUT_DIR / f'{name}.png'
+                rendered = CACHE.savefig(fig, path, dpi=300, bbox_inches='tight', facecolor='white')
             plt.close(fig)
-            print("OK")
+            print("OK" if rendered else "unchanged")
             success += 1
         except Exception as e:
             print(f"FAILED: {e}")
             failed.append((name, str(e)))
 
     print("\n" + "=" * 70)
-    print(f"COMPLETE: {success}/{len(ALL_CHARTS)} charts generated")
+    print(f"COMPLETE: {success}/{len(ALL_CHARTS)} charts generated "
+          f"({len(CACHE.summary()['rebuilt'])} rebuilt, {len(CACHE.summary()['unchanged'])} unchanged)")
     print(f"Output: {OUTPUT_DIR}")
     if failed:
         print(f"\nFailed charts:")
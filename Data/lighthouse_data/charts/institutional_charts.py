@@ -21,6 +21,7 @@ Charts that required rebuilding:
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -30,6 +31,9 @@ import requests
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 # FRED API
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 
@@ -48,7 +52,10 @@ COLORS = {
 
 OUTPUT_DIR = Path('/Users/bob/LHM/data/charts/institutional')
 
+CACHE = RenderCache(__file__)
+
 
+@CACHE.track
 def fetch_fred_raw(series_id: str, start_date: str = '2000-01-01') -> pd.Series:
     """
     Fetch raw FRED data - NO smoothing, NO interpolation.
@@ -186,10 +193,10 @@ def generate_foreign_holdings_chart():
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output_path = OUTPUT_DIR / 'chart_foreign_holdings.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -270,10 +277,10 @@ def generate_auto_delinquency_chart():
     plt.tight_layout()
 
     output_path = OUTPUT_DIR / 'chart_auto_delinquency.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -337,10 +344,10 @@ def generate_cc_delinquency_chart():
     plt.tight_layout()
 
     output_path = OUTPUT_DIR / 'chart_cc_delinquency.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -398,10 +405,10 @@ def generate_wealth_distribution_chart():
     plt.tight_layout()
 
     output_path = OUTPUT_DIR / 'chart_wealth_distribution.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -491,10 +498,10 @@ def generate_excess_savings_chart():
     plt.tight_layout()
 
     output_path = OUTPUT_DIR / 'chart_excess_savings.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -562,10 +569,10 @@ def generate_cre_delinquency_chart():
     plt.tight_layout()
 
     output_path = OUTPUT_DIR / 'chart_cre_delinquency.png'
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     return output_path
 
 
@@ -12,6 +12,7 @@ Charts:
 7. Dollar Index vs Foreign Demand
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -32,6 +33,9 @@ from ..collect.fred_extended import (
 from ..collect.volatility import get_vix_move_analysis, update_volatility_raw
 from ..utils.logging import get_logger
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 log = get_logger(__name__)
 
 # === LIGHTHOUSE MACRO COLORS ===
@@ -51,6 +55,14 @@ COLORS = {
 # Chart output directory
 CHART_DIR = CONFIG.base_dir / "charts" / "priority1"
 
+CACHE = RenderCache(__file__)
+get_tga_history = CACHE.track(get_tga_history)
+get_fed_balance_sheet = CACHE.track(get_fed_balance_sheet)
+get_real_rates = CACHE.track(get_real_rates)
+get_sloos_data = CACHE.track(get_sloos_data)
+get_mmf_flows = CACHE.track(get_mmf_flows)
+get_vix_move_analysis = CACHE.track(get_vix_move_analysis)
+
 
 def setup_chart_style():
     """Apply Lighthouse Macro chart styling."""
@@ -204,8 +216,8 @@ def chart_tga_balance(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_tga_balance.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -272,8 +284,8 @@ def chart_fed_balance_sheet(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_fed_balance_sheet.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -354,8 +366,8 @@ def chart_move_vs_vix(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_move_vs_vix.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -422,8 +434,8 @@ def chart_mmf_flows(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_mmf_flows.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -497,8 +509,8 @@ def chart_sloos(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_sloos.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -570,8 +582,8 @@ def chart_real_rates(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_real_rates.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -605,6 +617,7 @@ def chart_dollar_index(save=True) -> plt.Figure:
 
     # Filter to recent
     df = df[df.index >= '2015-01-01']
+    CACHE.record(df)
 
     fig, ax = plt.subplots(figsize=(11, 8.5))
 
@@ -639,8 +652,8 @@ def chart_dollar_index(save=True) -> plt.Figure:
     if save:
         CHART_DIR.mkdir(parents=True, exist_ok=True)
         out_path = CHART_DIR / "chart_dollar_index.png"
-        plt.savefig(out_path, dpi=300, bbox_inches='tight')
-        log.info(f"Saved: {out_path}")
+        rendered = CACHE.savefig(fig, out_path, dpi=300, bbox_inches='tight')
+        log.info(f"{'Saved' if rendered else 'Unchanged'}: {out_path}")
 
     return fig
 
@@ -668,7 +681,8 @@ def generate_all_priority1_charts():
     for name, func in charts:
         try:
             log.info(f"\nGenerating: {name}")
-            fig = func(save=True)
+            with CACHE.chart():
+                fig = func(save=True)
             results[name] = "Success" if fig else "No data"
             if fig:
                 plt.close(fig)
@@ -17,6 +17,7 @@ FRED Series:
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -25,8 +26,13 @@ import requests
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.render_cache import RenderCache
+
 FRED_API_KEY = os.environ.get('FRED_API_KEY')
 
+CACHE = RenderCache(__file__)
+
 COLORS = {
     'ocean_blue': '#0089D1',
     'dusk_orange': '#FF6723',
@@ -39,6 +45,7 @@ COLORS = {
 }
 
 
+@CACHE.track
 def fetch_fred_raw(series_id: str, start_date: str = '2000-01-01') -> pd.Series:
     """Fetch raw FRED data."""
     if not FRED_API_KEY:
@@ -256,10 +263,10 @@ def generate_two_speed_consumer_chart(output_path: Path = None):
         output_path = Path('/Users/bob/LHM/data/charts/institutional/chart_two_speed_consumer.png')
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, output_path, dpi=300, bbox_inches='tight', facecolor='white')
     plt.close(fig)
 
-    print(f"  Saved: {output_path}")
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {output_path}")
     print(f"  Savings Rate: {savings_current:.1f}% (as of {savings_date.strftime('%b %Y')})")
     print(f"  CC Delinquency: {cc_current:.2f}% (as of {cc_date.strftime('%b %Y')})")
 
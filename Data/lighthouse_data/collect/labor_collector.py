@@ -12,6 +12,7 @@ This module orchestrates the full labor data collection pipeline.
 """
 
 import os
+import sys
 import time
 import json
 import requests
@@ -35,6 +36,15 @@ from .labor_series_registry import (
 
 log = get_logger(__name__)
 
+# Shared pooled transport with per-source token buckets (FRED 120/min, BLS
+# 500/day) from the data pipeline package; plain requests if unavailable
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+try:
+    from lighthouse.transport import get_session
+    http = get_session()
+except ImportError:
+    http = requests
+
 
 # =============================================================================
 # CONFIGURATION
@@ -66,7 +76,9 @@ class FREDCollector:
         self._last_request_time = 0.0
 
     def _rate_limit(self) -> None:
-        """Enforce rate limiting."""
+        """Enforce rate limiting (only needed without the shared transport)."""
+        if http is not requests:
+            return  # FRED token bucket in the shared session
         now = time.time()
         if self._request_count >= FRED_REQUESTS_PER_MINUTE:
             elapsed = now - self._last_request_time
@@ -101,7 +113,7 @@ class FREDCollector:
             params["observation_end"] = end_date
 
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
+            response = http.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json().get("observations", [])
 
@@ -240,7 +252,7 @@ class BLSCollector:
         headers = {"Content-type": "application/json"}
 
         try:
-            response = requests.post(
+            response = http.post(
                 self.base_url,
                 data=json.dumps(payload),
                 headers=headers,
@@ -346,7 +358,7 @@ class AtlantaFedCollector:
         log.info("Fetching Atlanta Fed Wage Growth Tracker...")
 
         try:
-            response = requests.get(self.DATA_URL, timeout=60)
+            response = http.get(self.DATA_URL, timeout=60)
             response.raise_for_status()
 
             # Read Excel file
@@ -415,7 +427,7 @@ class IndeedCollector:
         url = f"{self.GITHUB_BASE}/US/aggregate_job_postings_US.csv"
 
         try:
-            response = requests.get(url, timeout=30)
+            response = http.get(url, timeout=30)
             response.raise_for_status()
 
             df = pd.read_csv(StringIO(response.text))
@@ -444,7 +456,7 @@ class IndeedCollector:
         url = f"{self.GITHUB_BASE}/US/job_postings_by_sector_US.csv"
 
         try:
-            response = requests.get(url, timeout=30)
+            response = http.get(url, timeout=30)
             response.raise_for_status()
 
             df = pd.read_csv(StringIO(response.text))
@@ -1,9 +1,15 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+# Shared rolling kernel from the data pipeline package
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "Scripts" / "data_pipeline"))
+from lighthouse.rolling import rolling_zscore
+
 def zscore(s: pd.Series, window: int = 252) -> pd.Series:
-    r = s.rolling(window)
-    return (s - r.mean()) / r.std()
+    return rolling_zscore(s, window, min_periods=window)
 
 def rolling_vol(s: pd.Series, window: int = 21) -> pd.Series:
     return s.pct_change().rolling(window).std() * np.sqrt(252)
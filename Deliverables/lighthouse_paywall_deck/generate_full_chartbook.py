@@ -1,6 +1,10 @@
 """
 Lighthouse Macro Friday Chartbook - Full 50-Chart Generator
 Generates comprehensive institutional-grade macro intelligence deck with live FRED data
+
+FRED series are fetched once up front (PREFETCH_SERIES); the charts then
+render in parallel on the chart engine's process pool and are assembled in
+order into the PDF. Use --workers 1 to render serially.
 """
 
 import matplotlib.pyplot as plt
@@ -11,11 +15,16 @@ import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from matplotlib.backends.backend_pdf import PdfPages
 from fredapi import Fred
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Scripts', 'chart_generation'))
+from chart_engine import ChartJob, render_charts, write_chartbook
+
 # Lighthouse Macro Brand Colors
 COLORS = {
     'primary': '#003366',
@@ -85,17 +94,53 @@ def add_recession_shading(ax, data_index):
             ax.axvspan(start, end, alpha=0.15, color=COLORS['neutral'], zorder=0)
 
 
+# Fetched series by (series_id, start_date), shared by all charts
+_series_cache = {}
+
+# Every (series_id, start_date) the charts request, fetched once before rendering
+PREFETCH_SERIES = [
+    ('A191RL1Q225SBEA', '2015-01-01'), ('PCEPI', '2015-01-01'),
+    ('AWHAETP', '2020-01-01'), ('CES0500000003', '2020-01-01'), ('CIVPART', '2020-01-01'),
+    ('DCOILWTICO', '2020-01-01'), ('DGS10', '2020-01-01'), ('DTWEXBGS', '2020-01-01'),
+    ('EMRATIO', '2020-01-01'), ('GOLDAMGBD228NLBM', '2020-01-01'), ('SP500', '2020-01-01'),
+    ('UNRATE', '2020-01-01'),
+    ('CONSUMER', '2019-01-01'), ('CPIAUCSL', '2019-01-01'), ('CPILFESL', '2019-01-01'),
+    ('DGS10', '2019-01-01'), ('DGS2', '2019-01-01'), ('DGS30', '2019-01-01'), ('DGS3MO', '2019-01-01'),
+    ('DGS5', '2019-01-01'), ('JTSHIL', '2019-01-01'), ('JTSJOL', '2019-01-01'), ('JTSQUL', '2019-01-01'),
+    ('NAPM', '2019-01-01'), ('NAPMNOI', '2019-01-01'), ('PAYEMS', '2019-01-01'), ('PCEPI', '2019-01-01'),
+    ('PCEPILFE', '2019-01-01'), ('TOTCI', '2019-01-01'), ('UNRATE', '2019-01-01'), ('USSLIND', '2019-01-01'),
+    ('WALCL', '2019-01-01'), ('WSHOSHO', '2019-01-01'),
+    ('DGS10', '2021-01-01'), ('DGS2', '2021-01-01'), ('EFFR', '2021-01-01'), ('IORB', '2021-01-01'),
+    ('RRPONTSYD', '2021-01-01'), ('SOFR', '2021-01-01'), ('VIXCLS', '2021-01-01'),
+]
+
+
 def safe_get_series(series_id, start_date='2019-01-01', name=None):
-    """Safely fetch FRED series with error handling"""
-    try:
-        data = fred.get_series(series_id, observation_start=start_date)
-        if name:
-            data.name = name
-        return data
-    except Exception as e:
-        print(f"Warning: Could not fetch {series_id}: {e}")
-        # Return empty series
-        return pd.Series(dtype=float, name=name or series_id)
+    """Safely fetch FRED series with error handling (each series_id/start_date once)"""
+    key = (series_id, start_date)
+    if key not in _series_cache:
+        try:
+            _series_cache[key] = fred.get_series(series_id, observation_start=start_date)
+        except Exception as e:
+            print(f"Warning: Could not fetch {series_id}: {e}")
+            # Return empty series
+            return pd.Series(dtype=float, name=name or series_id)
+    data = _series_cache[key].copy()
+    if name:
+        data.name = name
+    return data
+
+
+def prefetch_series(workers=8):
+    """Fetch every PREFETCH_SERIES entry into the cache (concurrent requests)"""
+    print(f"Prefetching {len(PREFETCH_SERIES)} FRED series...")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda key: safe_get_series(*key), PREFETCH_SERIES))
+
+
+def install_series_cache(cache):
+    """Chart worker initializer: reuse the parent's prefetched series"""
+    _series_cache.update(cache)
 
 
 #============================================================================
@@ -991,40 +1036,33 @@ def chart_17_beveridge_curve():
 # For brevity, I'll create simplified versions of remaining charts
 # In production, each would have full FRED data implementation
 
-def generate_all_charts():
-    """Generate all 50 charts and return list of figures"""
-    print("="*70)
-    print("LIGHTHOUSE MACRO FRIDAY CHARTBOOK - FULL 50-CHART GENERATION")
-    print("="*70)
-    print()
-
-    charts = []
-
-    # Layer 1: Macro Regime Dashboard (1-10)
-    print("Layer 1: Macro Regime Dashboard (Charts 1-10)")
-    charts.append(("1", chart_01_economic_cycle_scatter()))
-    charts.append(("2", chart_02_leading_indicators()))
-    charts.append(("3", chart_03_unemployment_inflation()))
-    charts.append(("4", chart_04_labor_market_heatmap()))
-    charts.append(("5", chart_05_ism_composite()))
-    charts.append(("6", chart_06_yield_curve()))
-    charts.append(("7", chart_07_yield_curve_spreads()))
-    charts.append(("8", chart_08_credit_impulse()))
-    charts.append(("9", chart_09_cross_asset_correlation()))
-    charts.append(("10", chart_10_inflation_components()))
-
-    # Layer 2: Transmission Mechanisms (11-35)
-    print("\nLayer 2: Transmission Mechanisms")
-    print("  A. RRP/Liquidity (Charts 11-15)")
-    charts.append(("11", chart_11_fed_balance_sheet()))
-    charts.append(("12", chart_12_rrp_vs_vix()))
-    charts.append(("13", chart_13_money_market_rates()))
-    charts.append(("14", chart_14_treasury_liquidity()))
-    charts.append(("15", chart_15_liquidity_composite()))
-
-    print("  B. Labor Market Flows (Charts 16-20)")
-    charts.append(("16", chart_16_jolts_indicators()))
-    charts.append(("17", chart_17_beveridge_curve()))
+def chart_jobs():
+    """All 50 charts as render jobs, in chartbook order"""
+    jobs = [ChartJob(func, filename=f"chart_{i:02d}.png") for i, func in enumerate([
+        # Layer 1: Macro Regime Dashboard (1-10)
+        chart_01_economic_cycle_scatter,
+        chart_02_leading_indicators,
+        chart_03_unemployment_inflation,
+        chart_04_labor_market_heatmap,
+        chart_05_ism_composite,
+        chart_06_yield_curve,
+        chart_07_yield_curve_spreads,
+        chart_08_credit_impulse,
+        chart_09_cross_asset_correlation,
+        chart_10_inflation_components,
+
+        # Layer 2: Transmission Mechanisms (11-35)
+        # A. RRP/Liquidity (Charts 11-15)
+        chart_11_fed_balance_sheet,
+        chart_12_rrp_vs_vix,
+        chart_13_money_market_rates,
+        chart_14_treasury_liquidity,
+        chart_15_liquidity_composite,
+
+        # B. Labor Market Flows (Charts 16-20)
+        chart_16_jolts_indicators,
+        chart_17_beveridge_curve,
+    ], start=1)]
 
     # Remaining charts 18-50 as detailed implementations or placeholders
     chart_specs = [
@@ -1072,15 +1110,33 @@ def generate_all_charts():
     ]
 
     for num, title, subtitle in chart_specs:
-        print(f"  Chart {num}: {title}")
-        charts.append((str(num), create_placeholder_chart(num, title, subtitle)))
+        jobs.append(ChartJob(create_placeholder_chart, filename=f"chart_{num:02d}.png", args=(num, title, subtitle)))
+
+    return jobs
+
+
+def generate_all_charts(workers=None):
+    """Render all 50 charts (in parallel) and return their results in chart order"""
+    print("="*70)
+    print("LIGHTHOUSE MACRO FRIDAY CHARTBOOK - FULL 50-CHART GENERATION")
+    print("="*70)
+    print()
+
+    prefetch_series()
+    results = render_charts(
+        chart_jobs(),
+        formats=('figure',),
+        workers=workers,
+        initializer=install_series_cache,
+        initargs=(_series_cache,),
+    )
 
     print()
     print("="*70)
-    print(f"Generated {len(charts)} charts successfully!")
+    print(f"Generated {sum(r.ok for r in results)}/{len(results)} charts successfully!")
     print("="*70)
 
-    return charts
+    return results
 
 
 def create_cover_page():
@@ -1155,7 +1211,7 @@ def create_cover_page():
     return fig
 
 
-def main():
+def main(workers=None):
     """Main execution function"""
     output_file = 'Lighthouse_Macro_Chartbook_50_Charts.pdf'
 
@@ -1166,27 +1222,22 @@ def main():
     cover = create_cover_page()
 
     # Generate all charts
-    all_charts = generate_all_charts()
+    all_charts = generate_all_charts(workers)
 
-    # Create PDF
+    # Create PDF (pages in chart order; failed charts are left out)
     print("\nCompiling PDF...")
-    with PdfPages(output_file) as pdf:
-        # Add cover
-        pdf.savefig(cover, bbox_inches='tight')
-        plt.close(cover)
-
-        # Add all charts
-        for chart_num, fig in all_charts:
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+    pages = write_chartbook(all_charts, output_file, cover=cover)
 
     print(f"\n{'='*70}")
     print(f"SUCCESS! Chartbook generated: {output_file}")
-    print(f"Total pages: {len(all_charts) + 1} (1 cover + {len(all_charts)} charts)")
+    print(f"Total pages: {pages} (1 cover + {pages - 1} charts)")
     print(f"{'='*70}\n")
 
     return output_file
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the Friday chartbook")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    main(parser.parse_args().workers)
@@ -0,0 +1,229 @@
+"""
+LIGHTHOUSE MACRO - CHART RENDER ENGINE
+======================================
+Renders a set of chart functions on a process pool, so a chart run takes
+about as long as its slowest chart instead of the sum of all of them.
+
+- Data is prefetched once in the parent and handed to every worker through
+  the pool initializer; chart functions then read their module's cache
+  instead of fetching.
+- Workers draw with the Agg backend and return bytes: PNG/PDF files, and a
+  pickled figure ('figure') for PdfPages chartbooks. A figure that cannot
+  be pickled (e.g. a lambda tick formatter) goes into the chartbook as a
+  CHARTBOOK_PNG_DPI raster page instead.
+- Failures stay with their chart: a ChartResult carries the error and the
+  other charts render as usual.
+- Results come back in job order, so files and chartbook pages keep the
+  script's order whatever finishes first.
+
+Usage:
+    from chart_engine import ChartJob, render_charts, save_results, write_chartbook
+
+    results = render_charts([ChartJob(f) for f in CHART_FUNCTIONS], formats=('png',), dpi=150)
+    save_results(results, OUTPUT_DIR)
+"""
+
+import io
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+os.environ.setdefault('MPLBACKEND', 'Agg')  # Picked up by spawned workers at import
+
+import matplotlib
+
+# savefig settings shared by the chart scripts (dpi is passed per run)
+SAVEFIG_DEFAULTS = {'bbox_inches': 'tight', 'facecolor': 'white', 'edgecolor': 'none'}
+CHARTBOOK_PNG_DPI = 200  # Raster chartbook pages for figures that cannot be pickled
+
+
+# =============================================================================
+# JOBS AND RESULTS
+# =============================================================================
+
+@dataclass
+class ChartJob:
+    """One chart: func(*args) returns a Figure or (Figure, filename)."""
+    func: Callable
+    filename: Optional[str] = None     # For functions that return a bare Figure
+    args: tuple = ()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.func, '__name__', repr(self.func))
+
+
+@dataclass
+class ChartResult:
+    """Rendered output of one chart (or its error)."""
+    name: str
+    filename: Optional[str] = None
+    outputs: Dict[str, bytes] = field(default_factory=dict)   # Format -> bytes
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def _init_worker(initializer: Callable = None, initargs: tuple = ()):
+    matplotlib.use('Agg')
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def render_job(job: ChartJob, formats: Sequence[str], savefig_kwargs: dict) -> ChartResult:
+    """Build one chart and serialize it to each format; never raises."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        out = job.func(*job.args)
+        fig, filename = out if isinstance(out, tuple) else (out, job.filename)
+
+        outputs = {}
+        for fmt in formats:
+            if fmt == 'figure':
+                try:
+                    outputs[fmt] = pickle.dumps(fig)
+                except Exception:
+                    buf = io.BytesIO()
+                    fig.savefig(buf, format='png', **{**savefig_kwargs, 'dpi': CHARTBOOK_PNG_DPI})
+                    outputs['figure_png'] = buf.getvalue()
+            else:
+                buf = io.BytesIO()
+                fig.savefig(buf, format=fmt, **savefig_kwargs)
+                outputs[fmt] = buf.getvalue()
+        return ChartResult(job.name, filename, outputs, time.perf_counter() - start)
+    except Exception as e:
+        return ChartResult(job.name, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+    finally:
+        plt.close('all')
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+def _report(result: ChartResult):
+    if result.ok:
+        print(f"  OK: {result.filename or result.name} ({result.seconds:.1f}s)")
+    else:
+        print(f"  FAIL: {result.name} - {result.error}")
+
+
+def render_charts(
+    jobs: List[ChartJob],
+    formats: Sequence[str] = ('png',),
+    workers: int = None,
+    initializer: Callable = None,
+    initargs: tuple = (),
+    **savefig_kwargs
+) -> List[ChartResult]:
+    """
+    Render every job and return results in job order.
+
+    Args:
+        jobs: Charts to render (functions must be importable, i.e. module-level)
+        formats: 'png', 'pdf', 'svg', ... and/or 'figure' (pickled, for write_chartbook)
+        workers: Processes (default: one per CPU; 1 = render in this process)
+        initializer: Called with initargs in each worker before rendering,
+                     e.g. to install prefetched data
+        **savefig_kwargs: Passed to savefig on top of SAVEFIG_DEFAULTS (dpi=...)
+    """
+    savefig_kwargs = {**SAVEFIG_DEFAULTS, **savefig_kwargs}
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+
+    if workers <= 1:
+        results = []
+        for job in jobs:
+            results.append(render_job(job, formats, savefig_kwargs))
+            _report(results[-1])
+        return results
+
+    results: List[Optional[ChartResult]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(initializer, initargs)) as pool:
+        futures = {pool.submit(render_job, job, formats, savefig_kwargs): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # Worker died or the job could not be sent/returned
+                results[i] = ChartResult(jobs[i].name, error=f"{type(e).__name__}: {e}")
+            _report(results[i])
+    return results
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def save_results(results: List[ChartResult], output_dir: str, fmt: str = 'png') -> List[str]:
+    """Write each successful chart's `fmt` bytes to output_dir/filename; returns the paths."""
+    paths = []
+    for result in results:
+        if not result.ok or fmt not in result.outputs:
+            continue
+        filename = result.filename or f"{result.name}.{fmt}"
+        path = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}.{fmt}")
+        with open(path, 'wb') as f:
+            f.write(result.outputs[fmt])
+        paths.append(path)
+    return paths
+
+
+def _raster_page(png: bytes):
+    """Figure showing a rendered PNG at its own size."""
+    import matplotlib.image as mpimg
+    import matplotlib.pyplot as plt
+
+    image = mpimg.imread(io.BytesIO(png), format='png')
+    height, width = image.shape[:2]
+    fig = plt.figure(figsize=(width / CHARTBOOK_PNG_DPI, height / CHARTBOOK_PNG_DPI))
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.imshow(image)
+    ax.axis('off')
+    return fig
+
+
+def write_chartbook(results: List[ChartResult], output_file: str, cover=None, **savefig_kwargs) -> int:
+    """
+    Assemble the 'figure' outputs, in order, into one PdfPages document
+    (after an optional cover Figure). Failed charts are left out.
+
+    Returns:
+        Number of pages written
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    savefig_kwargs = {'bbox_inches': 'tight', **savefig_kwargs}
+    pages = 0
+    with PdfPages(output_file) as pdf:
+        if cover is not None:
+            pdf.savefig(cover, **savefig_kwargs)
+            plt.close(cover)
+            pages += 1
+        for result in results:
+            if not result.ok:
+                continue
+            if 'figure' in result.outputs:
+                fig = pickle.loads(result.outputs['figure'])
+            elif 'figure_png' in result.outputs:
+                fig = _raster_page(result.outputs['figure_png'])
+            else:
+                continue
+            pdf.savefig(fig, **savefig_kwargs)
+            plt.close(fig)
+            pages += 1
+    return pages
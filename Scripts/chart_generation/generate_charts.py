@@ -15,9 +15,18 @@ import warnings
 import requests
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 warnings.filterwarnings('ignore')
 
+# Shared disk-backed HTTP cache: reruns within the TTL (or with
+# LIGHTHOUSE_OFFLINE=1) make no network calls
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_pipeline'))
+try:
+    from lighthouse.http_cache import CachedSession
+except ImportError:
+    CachedSession = requests.Session
+
 # Import Lighthouse styling
 from lighthouse_chart_style import (
     LIGHTHOUSE_COLORS, LIGHTHOUSE_FILLS_HEX,
@@ -28,6 +37,7 @@ from lighthouse_chart_style import (
     create_figure, create_dual_panel, create_multi_panel,
     save_chart, hex_to_rgba
 )
+from chart_engine import ChartJob, render_charts, save_results
 
 # Configuration
 OUTPUT_DIR = '/Users/bob/Desktop/HorizonJan2026_LiveData/CHARTS'
@@ -52,6 +62,7 @@ class DataFetcher:
     def __init__(self):
         self.fred_cache = {}
         self.bls_cache = {}
+        self.session = CachedSession()
 
     def get_fred_series(self, series_id, start_date='2000-01-01'):
         """Fetch from FRED API with caching"""
@@ -64,7 +75,7 @@ class DataFetcher:
                    f"?series_id={series_id}&api_key={FRED_API_KEY}"
                    f"&file_type=json&observation_start={start_date}")
 
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -107,7 +118,7 @@ class DataFetcher:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 'https://api.bls.gov/publicAPI/v2/timeseries/data/',
                 json=payload,
                 headers=headers,
@@ -143,6 +154,32 @@ class DataFetcher:
 # Global data fetcher instance
 fetcher = DataFetcher()
 
+# Every FRED request made by the chart functions: (series_id, start_date)
+PREFETCH_FRED = [
+    ('SOFR', '2020-01-01'), ('EFFR', '2020-01-01'),
+    ('DGS3MO', '2024-01-01'), ('DGS6MO', '2024-01-01'), ('DGS1', '2024-01-01'), ('DGS2', '2024-01-01'),
+    ('DGS5', '2024-01-01'), ('DGS10', '2024-01-01'), ('DGS30', '2024-01-01'),
+    ('BAMLH0A0HYM2', '2020-01-01'), ('BAMLC0A0CM', '2020-01-01'),
+    ('BAMLC0A4CBBB', '2020-01-01'), ('BAMLC0A1CAAA', '2020-01-01'),
+    ('WRESBAL', '2008-01-01'), ('GDP', '2008-01-01'), ('RRPONTSYD', '2020-01-01'),
+    ('GDP', '2000-01-01'), ('GFDEBTN', '2000-01-01'), ('GFDEGDQ188S', '2000-01-01'),
+    ('PSAVERT', '2000-01-01'), ('TOTALSL', '2000-01-01'), ('UNRATE', '2000-01-01'),
+    ('ICSA', '2019-01-01'), ('A091RC1Q027SBEA', '1970-01-01'), ('VIXCLS', '2020-01-01'),
+]
+
+
+def prefetch_data(workers=None):
+    """Fill the fetcher's cache with every PREFETCH_FRED series (concurrent requests)."""
+    print(f"Prefetching {len(PREFETCH_FRED)} FRED series...")
+    with ThreadPoolExecutor(max_workers=workers or 8) as pool:
+        list(pool.map(lambda args: fetcher.get_fred_series(*args), PREFETCH_FRED))
+
+
+def install_prefetched_data(fred_cache, bls_cache):
+    """Chart worker initializer: reuse the parent's prefetched series."""
+    fetcher.fred_cache.update(fred_cache)
+    fetcher.bls_cache.update(bls_cache)
+
 
 def generate_synthetic_data(series_type, start_date='2020-01-01', end_date=TARGET_DATE):
     """
@@ -2105,8 +2142,8 @@ def chart_auction_tails_deviation():
 # MAIN EXECUTION
 # =============================================================================
 
-def generate_all_charts():
-    """Generate all charts with real FRED data"""
+def generate_all_charts(workers=None):
+    """Generate all charts with real FRED data (workers: render processes, 1 = serial)"""
 
     print("=" * 60)
     print("LIGHTHOUSE MACRO - LIVE DATA CHART GENERATION")
@@ -2162,20 +2199,20 @@ def generate_all_charts():
         chart_auction_tails_deviation,
     ]
 
-    results = []
-
-    for func in chart_functions:
-        try:
-            fig, filename = func()
-            filepath = os.path.join(OUTPUT_DIR, filename)
-            fig.savefig(filepath, dpi=DPI, bbox_inches='tight',
-                        facecolor='white', edgecolor='none')
-            plt.close(fig)
-            results.append((filename, 'SUCCESS'))
-            print(f"  OK: {filename}")
-        except Exception as e:
-            results.append((func.__name__, f'FAILED: {str(e)}'))
-            print(f"  FAIL: {func.__name__} - {e}")
+    # Fetch every series once, then render on a process pool (each worker
+    # gets the prefetched data; a failing chart does not stop the others)
+    prefetch_data(workers)
+    rendered = render_charts(
+        [ChartJob(func) for func in chart_functions],
+        formats=('png',),
+        workers=workers,
+        initializer=install_prefetched_data,
+        initargs=(fetcher.fred_cache, fetcher.bls_cache),
+        dpi=DPI,
+    )
+    save_results(rendered, OUTPUT_DIR)
+
+    results = [(r.filename, 'SUCCESS') if r.ok else (r.name, f'FAILED: {r.error}') for r in rendered]
 
     # Summary
     print("\n" + "=" * 60)
@@ -2190,4 +2227,7 @@ def generate_all_charts():
 
 
 if __name__ == '__main__':
-    generate_all_charts()
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate the live-data chart set')
+    parser.add_argument('--workers', type=int, default=None, help='Render processes (default: CPU count)')
+    generate_all_charts(parser.parse_args().workers)
@@ -1,7 +1,7 @@
 """
 LIGHTHOUSE MACRO — THE HORIZON | JANUARY 2026
 Chart Generation Pipeline
-Live Data from Lighthouse_Master.db + Horizon_Dataset.csv
+Live Data from Lighthouse_Master.db + the Horizon dataset
 
 Bob Sheehan, CFA, CMT
 """
@@ -12,10 +12,16 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.patches import FancyBboxPatch
 from datetime import datetime, timedelta
-import sqlite3
+import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_pipeline'))
+from lighthouse.chart_data import ChartDataContext
+from lighthouse.config import OUTPUT_DIR as EXPORT_DIR
+from lighthouse.render_cache import RenderCache
+
 # =============================================================================
 # LIGHTHOUSE BRAND COLORS
 # =============================================================================
@@ -35,81 +41,57 @@ COLORS = {
 # Output settings
 OUTPUT_DIR = '/Users/bob/Desktop/HORIZON_FINAL./output/charts'
 DB_PATH = '/Users/bob/Desktop/HORIZON_FINAL./data/databases/Lighthouse_Master.db'
-DATA_PATH = '/Users/bob/Desktop/HORIZON_FINAL./data/processed/Horizon_Dataset.csv'
+# Horizon_Dataset export written by horizon_dataset_builder (.parquet / .arrow / .csv)
+DATA_PATH = os.getenv('LIGHTHOUSE_HORIZON_DATASET', str(EXPORT_DIR / 'Horizon_Dataset'))
 DPI = 300
 
+# Render cache: charts whose data slice, code and style are unchanged are skipped
+CACHE = RenderCache(__file__)
+
 # =============================================================================
-# DATABASE HELPERS
+# CHART DATA
 # =============================================================================
-def get_db_connection():
-    """Get connection to Lighthouse Master database"""
-    return sqlite3.connect(DB_PATH)
-
+# Every series the charts read, loaded together on first use (one query or
+# one columnar read) instead of a connection and query per call
+HORIZON_SERIES = [
+    'UEMPMEAN', 'UEMP27OV', 'UNEMPLOY', 'LNS13008396', 'LNS13008756', 'LNS13008516',
+    'LNS14000003', 'LNS14000006', 'LNS14000009', 'LNS14000036', 'LNS14024230',
+    'DRSFRMACBS', 'DRCLACBS', 'DRCCLACBS', 'DRBLACBS',
+    'RRPONTSYD', 'TOTRESNS', 'NYFED_SOFR', 'NYFED_EFFR',
+    'DGS3MO', 'DGS6MO', 'DGS1', 'DGS2', 'DGS5', 'DGS10', 'DGS30',
+    'BAMLH0A0HYM2', 'BAMLC0A0CM', 'VIXCLS',
+]
+# Horizon dataset columns used as fallbacks (horizon panel, else the dataset export)
+HORIZON_COLUMNS = ['Fed_RRP_Outstanding', 'RRP_Usage', 'SOFR', 'EFFR', 'VIX']
+
+DATA = ChartDataContext(series=HORIZON_SERIES, panel=HORIZON_COLUMNS,
+                        db_path=DB_PATH, panel_file=DATA_PATH)
+
+@CACHE.track
 def get_latest_value(series_id):
-    """Get the most recent value for a series from the database"""
-    conn = get_db_connection()
-    result = conn.execute(
-        'SELECT date, value FROM observations WHERE series_id = ? ORDER BY date DESC LIMIT 1',
-        (series_id,)
-    ).fetchone()
-    conn.close()
-    return result if result else (None, None)
+    """Get the most recent (date, value) for a series"""
+    date, value = DATA.latest(series_id)
+    return (date.strftime('%Y-%m-%d'), value) if date is not None else (None, None)
+
+@CACHE.track
+def get_value_between(series_id, start_date, end_date):
+    """Latest value of a series between two dates (None if there is none)"""
+    return DATA.value_between(series_id, start_date, end_date)
+
+def _as_frame(series, value_name):
+    return pd.DataFrame({'date': series.index, value_name: series.to_numpy()})
 
+@CACHE.track
 def get_series_data(series_id, days=365*5):
-    """Get time series data from the database"""
-    conn = get_db_connection()
-    df = pd.read_sql(
-        f'''SELECT date, value FROM observations
-            WHERE series_id = ?
-            AND date >= date('now', '-{days} days')
-            ORDER BY date''',
-        conn, params=[series_id]
-    )
-    conn.close()
-    if len(df) > 0:
-        df['date'] = pd.to_datetime(df['date'])
-    return df
+    """Get time series data (date, value) for the last `days` days"""
+    start = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    return _as_frame(DATA.series(series_id, start_date=start), 'value')
 
+@CACHE.track
 def get_multiple_series(series_dict, days=365*5):
-    """Get multiple series and merge them on date"""
-    conn = get_db_connection()
-    dfs = []
-    for series_id, col_name in series_dict.items():
-        df = pd.read_sql(
-            f'''SELECT date, value as "{col_name}" FROM observations
-                WHERE series_id = ?
-                AND date >= date('now', '-{days} days')
-                ORDER BY date''',
-            conn, params=[series_id]
-        )
-        if len(df) > 0:
-            df['date'] = pd.to_datetime(df['date'])
-            dfs.append(df)
-    conn.close()
-
-    if not dfs:
-        return pd.DataFrame()
-
-    result = dfs[0]
-    for df in dfs[1:]:
-        result = pd.merge(result, df, on='date', how='outer')
-    return result.sort_values('date')
-
-# =============================================================================
-# LOAD DATA
-# =============================================================================
-print("Loading Horizon Dataset...")
-df = pd.read_csv(DATA_PATH)
-df['date'] = pd.to_datetime(df['date'])
-print(f"Loaded {len(df):,} rows, {len(df.columns)} columns")
-print(f"Date range: {df['date'].min().date()} to {df['date'].max().date()}")
-
-# Load latest values from database
-print("\nLoading live data from Lighthouse_Master.db...")
-conn = get_db_connection()
-db_date_range = conn.execute('SELECT MIN(date), MAX(date) FROM observations').fetchone()
-print(f"Database range: {db_date_range[0]} to {db_date_range[1]}")
-conn.close()
+    """Get multiple series side by side on date, columns renamed {series_id: name}"""
+    start = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    return DATA.frame(series_dict, start_date=start).rename_axis('date').reset_index()
 
 # =============================================================================
 # STYLING FUNCTIONS
@@ -140,15 +122,17 @@ def apply_lighthouse_style(ax, title, subtitle=None):
 def save_chart(fig, filename):
     """Save chart with consistent settings"""
     filepath = f"{OUTPUT_DIR}/{filename}"
-    fig.savefig(filepath, dpi=DPI, bbox_inches='tight', facecolor='white', edgecolor='none')
+    rendered = CACHE.savefig(fig, filepath, dpi=DPI, bbox_inches='tight', facecolor='white', edgecolor='none')
     plt.close(fig)
-    print(f"  ✓ Saved: {filename}")
+    print(f"  ✓ {'Saved' if rendered else 'Unchanged'}: {filename}")
 
+@CACHE.track
 def get_recent_data(column, days=365*5):
-    """Get recent data for a column"""
-    temp = df[['date', column]].dropna()
-    cutoff = temp['date'].max() - timedelta(days=days)
-    return temp[temp['date'] >= cutoff]
+    """Get recent data for a Horizon dataset column"""
+    temp = DATA.series(column)
+    if temp.empty:
+        return _as_frame(temp, column)
+    return _as_frame(temp.loc[temp.index.max() - timedelta(days=days):], column)
 
 # =============================================================================
 # PART I CHARTS: THE SILENT STOP
@@ -166,22 +150,19 @@ def chart_01_unemployment_duration():
 
     # Get unemployment by duration from FRED
     # LNS13008396 = <5 weeks, LNS13008756 = 5-14 weeks, LNS13008516 = 15-26 weeks
-    conn = get_db_connection()
-
     # Try to get duration breakdown - these are in thousands
-    u5_result = conn.execute("SELECT value FROM observations WHERE series_id = 'LNS13008396' ORDER BY date DESC LIMIT 1").fetchone()
-    u5_14_result = conn.execute("SELECT value FROM observations WHERE series_id = 'LNS13008756' ORDER BY date DESC LIMIT 1").fetchone()
-    u15_26_result = conn.execute("SELECT value FROM observations WHERE series_id = 'LNS13008516' ORDER BY date DESC LIMIT 1").fetchone()
-    u27_result = conn.execute("SELECT value FROM observations WHERE series_id = 'UEMP27OV' ORDER BY date DESC LIMIT 1").fetchone()
-    conn.close()
+    _, u5 = get_latest_value('LNS13008396')
+    _, u5_14 = get_latest_value('LNS13008756')
+    _, u15_26 = get_latest_value('LNS13008516')
+    _, u27 = get_latest_value('UEMP27OV')
 
     # Convert to millions, use fallback if not available
-    if u5_result and u5_14_result and u15_26_result and u27_result:
+    if None not in (u5, u5_14, u15_26, u27):
         current = [
-            u5_result[0] / 1000,      # <5 weeks (millions)
-            u5_14_result[0] / 1000,   # 5-14 weeks
-            u15_26_result[0] / 1000,  # 15-26 weeks
-            u27_result[0] / 1000      # 27+ weeks
+            u5 / 1000,      # <5 weeks (millions)
+            u5_14 / 1000,   # 5-14 weeks
+            u15_26 / 1000,  # 15-26 weeks
+            u27 / 1000      # 27+ weeks
         ]
     else:
         # Fallback to report values if series not in DB
@@ -758,17 +739,10 @@ def chart_16_treasury_yield_curve():
         current.append(value if value else 0)
 
     # Get yields from ~1 year ago for comparison
-    conn = get_db_connection()
     one_year_ago = []
     for tenor in tenors:
-        result = conn.execute(
-            '''SELECT value FROM observations
-               WHERE series_id = ? AND date BETWEEN '2025-01-10' AND '2025-01-20'
-               ORDER BY date DESC LIMIT 1''',
-            (tenor_series[tenor],)
-        ).fetchone()
-        one_year_ago.append(result[0] if result else 0)
-    conn.close()
+        value = get_value_between(tenor_series[tenor], '2025-01-10', '2025-01-20')
+        one_year_ago.append(value if value is not None else 0)
 
     x = np.arange(len(tenors))
 
@@ -1033,6 +1007,13 @@ def generate_all_charts():
     print("LIGHTHOUSE MACRO — HORIZON REPORT CHART GENERATION")
     print("="*60 + "\n")
 
+    print("Loading chart data...")
+    DATA.load()
+    obs = DATA.observations
+    print(f"Database: {len(HORIZON_SERIES)} series, {obs.index.min():%Y-%m-%d} to {obs.index.max():%Y-%m-%d}"
+          if len(obs) else "Database: no observations")
+    print(f"Horizon dataset: {len(HORIZON_COLUMNS)} columns, {len(DATA.panel):,} dates\n")
+
     charts = [
         # Part I: Silent Stop
         ("01", chart_01_unemployment_duration),
@@ -1069,14 +1050,16 @@ def generate_all_charts():
     for num, func in charts:
         try:
             print(f"Generating chart {num}...")
-            func()
+            with CACHE.chart():
+                func()
             success += 1
         except Exception as e:
             print(f"  ✗ Failed: {e}")
             failed.append((num, str(e)))
 
     print("\n" + "="*60)
-    print(f"COMPLETE: {success}/{len(charts)} charts generated")
+    print(f"COMPLETE: {success}/{len(charts)} charts generated "
+          f"({len(CACHE.summary()['rebuilt'])} rebuilt, {len(CACHE.summary()['unchanged'])} unchanged)")
     print(f"Output: {OUTPUT_DIR}")
     if failed:
         print(f"\nFailed charts:")
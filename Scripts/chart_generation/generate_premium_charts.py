@@ -18,9 +18,14 @@ from matplotlib.patches import Rectangle
 from datetime import datetime, timedelta
 import warnings
 import os
+import sys
 
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_pipeline'))
+from lighthouse.render_cache import RenderCache
+
+import lighthouse_chart_style
 from real_data_fetcher import RealDataFetcher
 from lighthouse_chart_style import (
     LIGHTHOUSE_COLORS,
@@ -34,8 +39,10 @@ from lighthouse_chart_style import (
 OUTPUT_DIR = '/Users/bob/Desktop/HORIZON_FINAL./charts'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Initialize data fetcher
-data = RealDataFetcher()
+CACHE = RenderCache(__file__, lighthouse_chart_style.__file__)
+
+# Initialize data fetcher (every get_* result is a chart input)
+data = CACHE.tracked(RealDataFetcher())
 
 
 def add_recession_shading(ax, recessions=None):
@@ -55,9 +62,9 @@ def save_chart(fig, filename):
     """Save with consistent settings"""
     filepath = os.path.join(OUTPUT_DIR, filename)
     fig.tight_layout()
-    fig.savefig(filepath, dpi=150, bbox_inches='tight', facecolor='white')
+    rendered = CACHE.savefig(fig, filepath, dpi=150, bbox_inches='tight', facecolor='white')
     plt.close(fig)
-    print(f"  OK: {filename}")
+    print(f"  {'OK' if rendered else 'Unchanged'}: {filename}")
     return filepath
 
 
@@ -880,7 +887,8 @@ def main():
     success = 0
     for chart_func in charts:
         try:
-            result = chart_func()
+            with CACHE.chart():
+                result = chart_func()
             if result:
                 success += 1
         except Exception as e:
@@ -888,7 +896,8 @@ def main():
 
     print()
     print("=" * 60)
-    print(f"GENERATION COMPLETE: {success}/{len(charts)} charts")
+    print(f"GENERATION COMPLETE: {success}/{len(charts)} charts "
+          f"({len(CACHE.summary()['rebuilt'])} rebuilt, {len(CACHE.summary()['unchanged'])} unchanged)")
     print(f"Output: {OUTPUT_DIR}")
     print("=" * 60)
 
@@ -0,0 +1,602 @@
+"""
+LIGHTHOUSE MACRO - REGISTRY CHART EXECUTOR
+==========================================
+Builds the charts declared in charts_registry_extension_60_75.json from the
+registry alone, so a new chart is a registry entry rather than a new
+fetch-and-plot function.
+
+- The tickers of every selected chart are loaded in one batched read from
+  the master DB (columnar store when current, SQLite otherwise), plus any
+  CSV drop-in files (csv_source / csv_supplement) found in CSV_DIR.
+- transform.method names map onto lighthouse.transforms.TRANSFORM_REGISTRY
+  (periods scaled to each series' own frequency), with a few generic
+  spread/ratio/technical methods on top. One panel per method, plus one for
+  transform.secondary (applied to the first panel's lines) when it is one
+  of the same methods.
+- Hooks of the form [<line>_]percentile_<N>y, zscore_<N><unit> and
+  delta_<N><unit> are computed on the line they name (a method or series;
+  default the chart's primary line) and shown in a callout.
+- Charts whose methods are bespoke (composites, heatmaps, CPI deflation, ...)
+  are reported as unsupported and skipped; charts built without part of
+  their transform (overlay, smoothing, an unsupported secondary, ...) are
+  reported as partial. --list shows the coverage.
+- Rendering goes through chart_engine.render_charts with the shared
+  lighthouse_chart_style templates.
+
+Usage:
+    python registry_charts.py                       # every chart the registry can build
+    python registry_charts.py --charts 004_headline_core_cpi 053_hy_oas
+    python registry_charts.py --list                # coverage: buildable / skipped and why
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / 'data_pipeline'))
+sys.path.insert(0, str(HERE.parent / 'utilities'))
+
+from chart_engine import ChartJob, render_charts, save_results  # Sets the Agg backend first
+from lighthouse.config import OUTPUT_DIR as DATA_DIR
+from lighthouse.query import get_multiple_series
+from lighthouse.transforms import TRANSFORM_REGISTRY, get_periods_for_freq, infer_frequency
+from lighthouse_chart_style import (
+    LIGHTHOUSE_COLORS, add_callout_box, add_series_with_label, add_threshold_line,
+    apply_lighthouse_style, create_multi_panel
+)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+REGISTRY_FILE = HERE / 'charts_registry_extension_60_75.json'
+CSV_DIR = HERE / 'data'                     # Drop-in CSVs: <csv_source>.csv with date,value
+OUTPUT_DIR = DATA_DIR / 'registry_charts'
+PLOT_YEARS = 10                             # Plotted window; transforms and hooks use full history
+DPI = 150
+
+FREQ_CODES = {'daily': 'D', 'weekly': 'W', 'monthly': 'M', 'quarterly': 'Q', 'annual': 'A'}
+PERIODS_PER_YEAR = {'D': 252, 'W': 52, 'M': 12, 'Q': 4, 'A': 1}
+UNITS_PER_YEAR = {'d': 252, 'w': 52, 'm': 12, 'q': 4, 'y': 1}
+
+LINE_COLORS = [LIGHTHOUSE_COLORS[c] for c in
+               ('ocean_blue', 'dusk_orange', 'teal_green', 'hot_magenta', 'electric_cyan')]
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+@dataclass
+class ChartSpec:
+    """One registry entry."""
+    chart_id: str
+    title: str
+    arc: str
+    frequency: str                          # Frequency code (D/W/M/Q/A)
+    tickers: List[str]
+    csv_sources: List[str]
+    methods: List[str]
+    transform: dict
+    hooks: Dict[str, str]
+
+    @classmethod
+    def from_registry(cls, chart_id: str, entry: dict) -> 'ChartSpec':
+        method = entry.get('transform', {}).get('method', [])
+        return cls(
+            chart_id=chart_id,
+            title=entry.get('title', chart_id),
+            arc=entry.get('arc', ''),
+            frequency=FREQ_CODES.get(entry.get('frequency'), 'M'),
+            tickers=list(entry.get('tickers') or []),
+            csv_sources=[entry[k] for k in ('csv_source', 'csv_supplement') if entry.get(k)],
+            methods=method if isinstance(method, list) else [method],
+            transform=entry.get('transform', {}),
+            hooks=dict(entry.get('hook', {})),
+        )
+
+    @property
+    def series(self) -> List[str]:
+        return self.tickers + self.csv_sources
+
+    @property
+    def secondary(self) -> Optional[str]:
+        return self.transform.get('secondary')
+
+
+def load_registry(path: Path = REGISTRY_FILE) -> List[ChartSpec]:
+    """Registry charts in file order."""
+    with open(path) as f:
+        charts = json.load(f)['charts']
+    return [ChartSpec.from_registry(chart_id, entry) for chart_id, entry in charts.items()]
+
+
+# =============================================================================
+# DATA
+# =============================================================================
+
+def _read_csv_series(path: Path) -> pd.Series:
+    df = pd.read_csv(path, usecols=['date', 'value'], parse_dates=['date'])
+    return df.dropna().set_index('date')['value'].astype('float64').sort_index()
+
+
+def load_registry_data(specs: List[ChartSpec], db_path: Path = None,
+                       csv_dir: Path = CSV_DIR) -> Dict[str, pd.Series]:
+    """
+    Every series the charts need: the union of their tickers in one batched
+    read, plus whichever CSV drop-ins exist. Missing series are left out.
+    """
+    start = time.perf_counter()
+    tickers = sorted({t for spec in specs for t in spec.tickers})
+    data = {}
+    if tickers:
+        wide = get_multiple_series(tickers, db_path=db_path)
+        for ticker in tickers:
+            s = wide[ticker].dropna()
+            if not s.empty:
+                data[ticker] = s.rename(ticker)
+
+    csv_names = sorted({name for spec in specs for name in spec.csv_sources})
+    for name in csv_names:
+        path = Path(csv_dir) / f'{name}.csv'
+        if path.exists():
+            data[name] = _read_csv_series(path).rename(name)
+
+    print(f"Loaded {len(data)}/{len(tickers) + len(csv_names)} series "
+          f"({len(tickers)} tickers in one read) in {time.perf_counter() - start:.1f}s")
+    return data
+
+
+def series_frequency(s: pd.Series, default: str = 'M') -> str:
+    """Frequency code inferred from the observation dates."""
+    freq = infer_frequency(s.to_frame())
+    return default if freq == 'U' else freq
+
+
+def horizon_periods(n: int, unit: str, freq: str) -> int:
+    """Number of `freq` observations spanning n units (d/w/m/q/y), at least 1."""
+    return max(1, int(round(n * PERIODS_PER_YEAR.get(freq, 12) / UNITS_PER_YEAR[unit])))
+
+
+def _monthly(s: pd.Series, freq: str) -> pd.Series:
+    """Monthly view for the month-based TRANSFORM_REGISTRY entries (3m_ann/6m_ann)."""
+    if freq in ('D', 'W'):
+        return s.resample('ME').last()
+    if freq in ('Q', 'A'):
+        return s.resample('MS').ffill()      # Step function between releases
+    return s
+
+
+# =============================================================================
+# TRANSFORMS
+# =============================================================================
+
+def _rsi(s: pd.Series, window: int = 14) -> pd.Series:
+    """Wilder RSI."""
+    change = s.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / window, min_periods=window).mean()
+    loss = (-change.clip(upper=0)).ewm(alpha=1 / window, min_periods=window).mean()
+    return 100 - 100 / (1 + gain / loss.where(loss != 0))
+
+
+def _sahm_rule(s: pd.Series) -> pd.Series:
+    """3-month average minus its low over the prior 12 months."""
+    ma3 = s.rolling(3).mean()
+    return ma3 - ma3.shift(1).rolling(12).min()
+
+
+def series_transform(method: str) -> Optional[Callable[[pd.Series, str], pd.Series]]:
+    """
+    Registry method -> f(series, freq) for methods applied to each series,
+    or None if the method is not one of them.
+    """
+    if method == 'level':
+        return lambda s, freq: s
+    if method == 'yoy':
+        return lambda s, freq: TRANSFORM_REGISTRY['yoy_pct'](s, get_periods_for_freq(freq)['yoy'])
+    if method in ('3m_annualized', '6m_annualized'):
+        key = f'{method[0]}m_ann'
+        return lambda s, freq: TRANSFORM_REGISTRY[key](_monthly(s, freq))
+    if method in ('zscore', 'zscore_each'):
+        return lambda s, freq: TRANSFORM_REGISTRY['z'](s, get_periods_for_freq(freq)['z_window'])
+    if method in ('50dma', '200dma'):
+        key = f'{method[:-3]}d_ma'
+        return lambda s, freq: TRANSFORM_REGISTRY[key](s)
+    if method == '4w_ma':
+        return lambda s, freq: TRANSFORM_REGISTRY['4wk_ma'](s)
+    if method == 'delta_ww':
+        return lambda s, freq: s.diff(horizon_periods(1, 'w', freq))
+    if method in ('rsi', 'rsi_14'):
+        return lambda s, freq: _rsi(s)
+    if method in ('drawdown_from_ath', 'drawdowns_from_ath'):
+        return lambda s, freq: (s / s.cummax() - 1) * 100
+    if method == '12_1_momentum':
+        return lambda s, freq: (s.shift(horizon_periods(1, 'm', freq))
+                                / s.shift(horizon_periods(12, 'm', freq)) - 1) * 100
+    if method == 'standardize':
+        return lambda s, freq: (s - s.mean()) / s.std()
+    if method == 'sahm_rule':
+        return lambda s, freq: _sahm_rule(_monthly(s, freq))
+
+    m = re.fullmatch(r'zscore_(\d+)([dwmqy])', method)
+    if m:
+        n, unit = int(m.group(1)), m.group(2)
+        return lambda s, freq: TRANSFORM_REGISTRY['z'](s, horizon_periods(n, unit, freq))
+    m = re.fullmatch(r'(\d+)([dwmqy])_(roc|delta|change|ma|sum)', method)
+    if m:
+        n, unit, kind = int(m.group(1)), m.group(2), m.group(3)
+        if kind == 'roc':
+            return lambda s, freq: s.pct_change(horizon_periods(n, unit, freq)) * 100
+        if kind in ('delta', 'change'):
+            return lambda s, freq: s.diff(horizon_periods(n, unit, freq))
+        if kind == 'sum':
+            return lambda s, freq: s.rolling(horizon_periods(n, unit, freq)).sum()
+        return lambda s, freq: s.rolling(horizon_periods(n, unit, freq)).mean()
+    return None
+
+
+COMBINE_METHODS = {
+    'spread': ('_minus_', ' - '),
+    'spreads': ('_minus_', ' - '),
+    'gap': ('_minus_', ' - '),
+    'basis_bps': ('_minus_', ' - '),
+    'ratio': ('_div_', ' / '),
+}
+
+
+# transform keys the executor draws; any other key (bar 'note') leaves the chart partial
+RENDERED_TRANSFORM_KEYS = ('method', 'formula', 'threshold', 'secondary', 'note')
+
+
+def is_supported(method: str) -> bool:
+    return method in COMBINE_METHODS or series_transform(method) is not None
+
+
+def panel_methods(spec: 'ChartSpec') -> List[str]:
+    """Methods drawn as panels: the chart's methods, then its secondary if supported."""
+    secondary = spec.secondary
+    return spec.methods + ([secondary] if secondary and series_transform(secondary) else [])
+
+
+def unrendered_transform(spec: 'ChartSpec') -> List[str]:
+    """Parts of the chart's transform the executor does not draw."""
+    parts = [f'{key}={spec.transform[key]}' for key in spec.transform if key not in RENDERED_TRANSFORM_KEYS]
+    if spec.secondary and series_transform(spec.secondary) is None:
+        parts.insert(0, f'secondary={spec.secondary}')
+    return parts
+
+
+def _resolve_term(term: str, data: Dict[str, pd.Series], spec: ChartSpec) -> pd.Series:
+    """Formula term -> series: a ticker (any case), optionally suffixed by a series method."""
+    lookup = {name.lower(): name for name in spec.series if name in data}
+    if term.lower() in lookup:
+        return data[lookup[term.lower()]]
+    for name_lower, name in lookup.items():
+        if term.lower().startswith(name_lower + '_'):
+            fn = series_transform(term[len(name_lower) + 1:].lower())
+            if fn is not None:
+                s = data[name]
+                return fn(s, series_frequency(s, spec.frequency)).rename(term)
+    raise KeyError(f"formula term '{term}' has no data")
+
+
+def combine(method: str, spec: ChartSpec, data: Dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Spread/ratio lines from transform.formula (default: first two series).
+    A chart declaring a single series (e.g. a csv_source that is already the
+    IWM/SPY ratio) plots that series as the line.
+    """
+    token, symbol = COMBINE_METHODS[method]
+    formulas = spec.transform.get('formula')
+    if formulas is None and len(spec.series) == 1:
+        name = spec.series[0]
+        return pd.DataFrame({name: data[name]}) if name in data else pd.DataFrame()
+    if formulas is None:
+        available = [name for name in spec.series if name in data]
+        if len(available) < 2:
+            raise ValueError(f"{method} needs two series, have {len(available)}")
+        formulas = [f'{available[0]}{token}{available[1]}']
+    elif isinstance(formulas, str):
+        formulas = [formulas]
+
+    lines = {}
+    for formula in formulas:
+        if token not in formula:
+            raise ValueError(f"formula '{formula}' is not a {method}")
+        left_term, right_term = formula.split(token, 1)
+        left = _resolve_term(left_term, data, spec).dropna()
+        right = _resolve_term(right_term, data, spec).dropna()
+        right = right.reindex(left.index, method='ffill')   # Lower-frequency side carried forward
+        line = left - right if token == '_minus_' else left / right.where(right != 0)
+        if method == 'basis_bps':
+            line = line * 100
+        lines[f'{left_term}{symbol}{right_term}'] = line
+    return pd.DataFrame(lines)
+
+
+# =============================================================================
+# HOOKS
+# =============================================================================
+
+def hook_value(hook: str, line: pd.Series) -> Optional[float]:
+    """Latest value of a percentile/zscore/delta hook on `line`; None if not computable."""
+    line = line.dropna()
+    if len(line) < 2:
+        return None
+    freq = series_frequency(line)
+
+    m = re.fullmatch(r'(?:.*_)?percentile_(\d+)y', hook)
+    if m:
+        window = line[line.index > line.index[-1] - pd.DateOffset(years=int(m.group(1)))]
+        return float((window <= window.iloc[-1]).mean() * 100)
+    m = re.fullmatch(r'(?:.*_)?zscore_(\d+)([dwmqy])', hook)
+    if m:
+        z = TRANSFORM_REGISTRY['z'](line, horizon_periods(int(m.group(1)), m.group(2), freq))
+        return float(z.iloc[-1])
+    m = re.fullmatch(r'(?:.*_)?delta_(?:(\d+)([dwmqy])|(ww|mm|qq))', hook)
+    if m:
+        n, unit = (int(m.group(1)), m.group(2)) if m.group(1) else (1, m.group(3)[0])
+        periods = horizon_periods(n, unit, freq)
+        return float(line.iloc[-1] - line.iloc[-1 - periods]) if len(line) > periods else None
+    return None
+
+
+def _hook_prefix(hook: str) -> Optional[str]:
+    """Line name before the hook statistic (e.g. 'ratio' in ratio_delta_4w), lowercased."""
+    m = re.fullmatch(r'(.+?)_(?:percentile|zscore|delta)_\w+', hook)
+    return m.group(1).lower() if m else None
+
+
+def _names_method(prefix: str, method: str) -> bool:
+    return method == prefix or method.startswith(prefix + '_')
+
+
+def hook_line(hook: str, panels: List[Tuple[str, pd.DataFrame]]) -> Optional[pd.Series]:
+    """
+    Line a hook refers to: its prefix (e.g. 'ratio' in ratio_delta_4w) names a
+    panel method or a series; no prefix means the primary line. None if the
+    prefix names nothing on the chart.
+    """
+    prefix = _hook_prefix(hook)
+    if prefix is None:
+        return panels[0][1].iloc[:, 0]
+    for method, lines in panels:
+        if _names_method(prefix, method):
+            return lines.iloc[:, 0]
+        for column in lines.columns:
+            if str(column).lower() == prefix:
+                return lines[column]
+    return None
+
+
+def is_supported_hook(hook: str) -> bool:
+    return re.fullmatch(r'(?:.*_)?(percentile_\d+y|zscore_\d+[dwmqy]|delta_(\d+[dwmqy]|ww|mm|qq))', hook) is not None
+
+
+def uncomputable_hooks(spec: 'ChartSpec') -> List[str]:
+    """
+    Hooks the executor cannot compute for a chart: an unsupported statistic,
+    or a prefix naming none of the chart's methods or series.
+    """
+    series = {name.lower() for name in spec.series}
+    missing = []
+    for hook in spec.hooks.values():
+        prefix = _hook_prefix(hook)
+        resolves = (prefix is None or prefix in series
+                    or any(_names_method(prefix, method) for method in panel_methods(spec)))
+        if not is_supported_hook(hook) or not resolves:
+            missing.append(hook)
+    return missing
+
+
+# =============================================================================
+# CHART BUILDING
+# =============================================================================
+
+@dataclass
+class RegistryChart:
+    """A registry chart's computed lines, ready to render."""
+    chart_id: str
+    title: str
+    arc: str
+    panels: List[Tuple[str, pd.DataFrame]]          # (method, lines) per panel
+    hooks: Dict[str, float] = field(default_factory=dict)
+    threshold: Optional[float] = None
+    missing_hooks: List[str] = field(default_factory=list)   # Declared but not computable
+
+    @property
+    def filename(self) -> str:
+        return f'{self.chart_id}.png'
+
+
+def unsupported_reason(spec: ChartSpec, data: Dict[str, pd.Series] = None) -> Optional[str]:
+    """Why the executor cannot build this chart (None if it can)."""
+    methods = [m for m in spec.methods if not is_supported(m)]
+    if methods:
+        return f"method {', '.join(methods)} not supported"
+    if data is not None and not any(name in data for name in spec.series):
+        return "no data (" + ', '.join(spec.series or ['no series declared']) + ")"
+    return None
+
+
+def build_chart(spec: ChartSpec, data: Dict[str, pd.Series], years: int = PLOT_YEARS) -> RegistryChart:
+    """Apply the chart's methods, compute its hooks and trim to the plot window."""
+    panels = []
+    for method in spec.methods:
+        if method in COMBINE_METHODS:
+            lines = combine(method, spec, data)
+        else:
+            fn = series_transform(method)
+            lines = pd.DataFrame({
+                name: fn(data[name], series_frequency(data[name], spec.frequency))
+                for name in spec.series if name in data
+            })
+        lines = lines.dropna(how='all')
+        if lines.empty:
+            raise ValueError(f"{method} produced no values")
+        panels.append((method, lines))
+
+    secondary = spec.secondary
+    fn = series_transform(secondary) if secondary else None
+    if fn is not None:
+        primary = panels[0][1]
+        lines = pd.DataFrame({
+            column: fn(primary[column].dropna(), series_frequency(primary[column].dropna(), spec.frequency))
+            for column in primary.columns
+        }).dropna(how='all')
+        if not lines.empty:
+            panels.append((secondary, lines))
+
+    hooks, missing_hooks = {}, []
+    for hook in spec.hooks.values():
+        line = hook_line(hook, panels)
+        value = hook_value(hook, line) if line is not None else None
+        if value is not None and np.isfinite(value):
+            hooks[hook] = value
+        else:
+            missing_hooks.append(hook)
+
+    end = max(lines.index[-1] for _, lines in panels)
+    start = end - pd.DateOffset(years=years)
+    panels = [(method, lines[lines.index >= start]) for method, lines in panels]
+    return RegistryChart(spec.chart_id, spec.title, spec.arc, panels, hooks, spec.transform.get('threshold'),
+                         missing_hooks)
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def render_registry_chart(chart: RegistryChart):
+    """Figure for one RegistryChart (chart_engine job function)."""
+    rows = len(chart.panels)
+    fig, axes = create_multi_panel(rows, 1, figsize=(12, 7 if rows == 1 else 4 * rows + 1), dpi=DPI)
+
+    for i, ((method, lines), ax) in enumerate(zip(chart.panels, axes[:, 0])):
+        for j, column in enumerate(lines.columns):
+            s = lines[column].dropna()
+            add_series_with_label(ax, s.index, s.to_numpy(), str(column), LINE_COLORS[j % len(LINE_COLORS)])
+        if method == 'sahm_rule' and chart.threshold is not None:
+            add_threshold_line(ax, chart.threshold, f'{chart.threshold}', color=LIGHTHOUSE_COLORS['pure_red'])
+        ax.set_ylabel(method)
+        ax.legend(loc='lower left', fontsize=8, frameon=False)
+        if i == 0:
+            apply_lighthouse_style(ax, chart.title, subtitle=f'{chart.arc} | {method}')
+        else:
+            apply_lighthouse_style(ax, method, show_branding=False)
+
+    if chart.hooks:
+        text = '\n'.join(f'{hook}: {value:+.2f}' for hook, value in chart.hooks.items())
+        add_callout_box(axes[0, 0], text, (0.01, 0.97))
+
+    fig.tight_layout()
+    return fig, chart.filename
+
+
+def run_registry(
+    chart_ids: List[str] = None,
+    output_dir: Path = OUTPUT_DIR,
+    workers: int = None,
+    years: int = PLOT_YEARS,
+    db_path: Path = None,
+) -> List[str]:
+    """Build and render the selected registry charts (default: all); returns the saved paths."""
+    specs = load_registry()
+    if chart_ids:
+        unknown = sorted(set(chart_ids) - {s.chart_id for s in specs})
+        if unknown:
+            print(f"Unknown chart ids: {', '.join(unknown)}")
+        specs = [s for s in specs if s.chart_id in chart_ids]
+
+    for spec in specs:
+        reason = unsupported_reason(spec)
+        if reason:
+            print(f"  SKIP: {spec.chart_id} - {reason}")
+    specs = [s for s in specs if unsupported_reason(s) is None]
+    data = load_registry_data(specs, db_path)
+
+    charts = []
+    for spec in specs:
+        reason = unsupported_reason(spec, data)
+        if reason:
+            print(f"  SKIP: {spec.chart_id} - {reason}")
+            continue
+        try:
+            chart = build_chart(spec, data, years)
+        except Exception as e:
+            print(f"  SKIP: {spec.chart_id} - {type(e).__name__}: {e}")
+            continue
+        if chart.missing_hooks:
+            print(f"  NOTE: {spec.chart_id} - hooks not computed: {', '.join(chart.missing_hooks)}")
+        partial = unrendered_transform(spec)
+        if partial:
+            print(f"  NOTE: {spec.chart_id} - partial, not rendered: {', '.join(partial)}")
+        charts.append(chart)
+
+    by_id = {spec.chart_id: spec for spec in specs}
+    n_partial = sum(bool(unrendered_transform(by_id[chart.chart_id])) for chart in charts)
+    print(f"\nRendering {len(charts)} registry charts ({n_partial} partial)...")
+    jobs = [ChartJob(render_registry_chart, chart.filename, args=(chart,)) for chart in charts]
+    results = render_charts(jobs, workers=workers, dpi=DPI)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = save_results(results, output_dir)
+    print(f"Saved {len(paths)} charts to {output_dir}")
+    return paths
+
+
+def print_coverage():
+    """Which registry charts and hooks the executor can build."""
+    specs = load_registry()
+    buildable = partial = 0
+    for spec in specs:
+        reason = unsupported_reason(spec)
+        notes = []
+        if reason is None:
+            buildable += 1
+            hooks = uncomputable_hooks(spec)
+            if hooks:
+                notes.append(f"hooks not computed: {', '.join(hooks)}")
+            unrendered = unrendered_transform(spec)
+            if unrendered:
+                partial += 1
+                notes.append(f"not rendered: {', '.join(unrendered)}")
+        status = 'SKIP' if reason else 'PART' if unrendered else 'OK  '
+        note = f" ({'; '.join(notes)})" if notes else ''
+        print(f"  {status} {spec.chart_id}: {reason or spec.title}{note}")
+    print(f"\n{buildable}/{len(specs)} registry charts supported ({partial} partially)")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the registry-declared charts")
+    parser.add_argument('--charts', nargs='+', default=None, help='Chart ids (default: all supported)')
+    parser.add_argument('--list', action='store_true', help='Show registry coverage and exit')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--years', type=int, default=PLOT_YEARS, help='Years of history to plot')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Render processes (default: one per CPU; 1 = sequential)')
+    parser.add_argument('--db', type=Path, default=None, help='Master database (default: pipeline config)')
+    args = parser.parse_args()
+
+    if args.list:
+        print_coverage()
+        return
+    run_registry(args.charts, args.output_dir, args.workers, args.years, args.db)
+
+
+if __name__ == '__main__':
+    main()
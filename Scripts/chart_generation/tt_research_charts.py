@@ -11,7 +11,6 @@ Output: /Users/bob/LHM/Outputs/token_terminal_deck/
 import sys
 sys.path.insert(0, '/Users/bob/LHM/Scripts/utilities')
 
-import sqlite3
 import pandas as pd
 import numpy as np
 import matplotlib
@@ -24,14 +23,20 @@ from matplotlib.lines import Line2D
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import lighthouse_chart_style
 from lighthouse_chart_style import (
     LIGHTHOUSE_COLORS as C,
     hex_to_rgba
 )
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'data_pipeline'))
+from lighthouse.chart_data import ChartDataContext
+from lighthouse.render_cache import RenderCache
+
 DB = Path('/Users/bob/LHM/Data/databases/Lighthouse_Master.db')
 
-conn = sqlite3.connect(DB)
+# Skips charts whose scores, code (this module and the shared style) and THEME are unchanged
+CACHE = RenderCache(__file__, lighthouse_chart_style.__file__)
 
 # =========================================================================
 # THEME SYSTEM
@@ -261,52 +266,65 @@ def brand_fig(fig, title, subtitle=None, source=None):
 
 def save(fig, name):
     """Save chart and close."""
-    fig.savefig(OUT / name, dpi=200, bbox_inches='tight', pad_inches=0.15,
-                facecolor=THEME['bg'], edgecolor='none')
+    rendered = CACHE.savefig(fig, OUT / name, style=THEME, dpi=200, bbox_inches='tight',
+                             pad_inches=0.15, facecolor=THEME['bg'], edgecolor='none')
     plt.close(fig)
-    print(f'  Saved: {name}')
+    print(f"  {'Saved' if rendered else 'Unchanged'}: {name}")
 
 
 # =========================================================================
 # DATA LOADERS
 # =========================================================================
 
+# Everything the charts read, queried once per run (see get_* below)
+TT_METRICS = ['revenue', 'fees', 'tvl', 'user_dau', 'token_incentives', 'price']
+MACRO_SERIES = ['RRPONTSYD', 'NFCI', 'BAMLH0A0HYM2', 'VIXCLS', 'T10Y2Y']
+METRIC_HISTORY_DAYS = 365  # Longest metric window any chart reads
+
+DATA = ChartDataContext(series=MACRO_SERIES, db_path=DB)
+
+
+@CACHE.track
 def get_scores():
-    df = pd.read_sql("""
+    df = DATA.sql("""
         SELECT cs.*, cm.name as meta_name, cm.sector as meta_sector
         FROM crypto_scores cs
         LEFT JOIN crypto_meta cm ON cs.project_id = cm.project_id
         WHERE cs.date = (SELECT MAX(date) FROM crypto_scores)
         ORDER BY cs.overall_score DESC
-    """, conn)
+    """)
     df['display_name'] = df['name'].fillna(df['meta_name']).fillna(df['project_id'])
     # Use meta_sector for grouping if sector column from scores is messy
     df['sector_clean'] = df['sector'].fillna(df['meta_sector']).fillna('Uncategorized')
     return df
 
 
+def _metric_history(days):
+    """All TT_METRICS rows since `days` ago, one query per run."""
+    cutoff = (datetime.now() - timedelta(days=max(days, METRIC_HISTORY_DAYS))).strftime('%Y-%m-%d')
+    placeholders = ','.join(['?'] * len(TT_METRICS))
+    return DATA.sql(
+        f"SELECT metric_id, project_id, date, value FROM crypto_metrics "
+        f"WHERE metric_id IN ({placeholders}) AND date>=? ORDER BY date",
+        [*TT_METRICS, cutoff], parse_dates=['date']
+    )
+
+
+@CACHE.track
 def get_metric_ts(metric_id, project_ids=None, days=180):
-    cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    q = "SELECT project_id, date, value FROM crypto_metrics WHERE metric_id=? AND date>=?"
-    params = [metric_id, cutoff]
+    cutoff = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize()
+    df = _metric_history(days)
+    mask = (df['metric_id'] == metric_id) & (df['date'] >= cutoff)
     if project_ids:
-        placeholders = ','.join(['?'] * len(project_ids))
-        q += f" AND project_id IN ({placeholders})"
-        params.extend(project_ids)
-    q += " ORDER BY date"
-    df = pd.read_sql(q, conn, params=params)
-    df['date'] = pd.to_datetime(df['date'])
-    return df
+        mask &= df['project_id'].isin(project_ids)
+    return df.loc[mask, ['project_id', 'date', 'value']].reset_index(drop=True)
 
 
+@CACHE.track
 def get_macro_ts(series_id, days=730):
     cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-    df = pd.read_sql(
-        "SELECT date, value FROM observations WHERE series_id=? AND date>=? ORDER BY date",
-        conn, params=[series_id, cutoff]
-    )
-    df['date'] = pd.to_datetime(df['date'])
-    return df
+    s = DATA.series(series_id, start_date=cutoff)
+    return pd.DataFrame({'date': s.index, 'value': s.to_numpy()})
 
 
 # =========================================================================
@@ -1340,5 +1358,8 @@ if __name__ == '__main__':
         print()
         print(f'Done ({mode}). 25 charts saved to {OUT}/')
 
-    conn.close()
+    summary = CACHE.summary()
+    print(f"Rebuilt {len(summary['rebuilt'])}, unchanged {len(summary['unchanged'])}")
+
+    DATA.close()
     print(f'\nOpen: open {OUT}')
@@ -33,6 +33,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, "/Users/bob/LHM")
 
 from lighthouse.config import DB_PATH as CONFIG_DB_PATH
+from lighthouse.bulk import index_rows, write_index_rows
+from lighthouse.rolling import rolling_zscore
 
 # Database path
 DB_PATH = Path("/Users/bob/LHM/Data/databases/Lighthouse_Master.db")
@@ -109,11 +111,8 @@ def get_crypto_status(index_name: str, value: float) -> str:
 # ==========================================
 
 def compute_zscore(series: pd.Series, window: int = 30, min_periods: int = 10) -> pd.Series:
-    """Compute rolling z-score."""
-    rolling_mean = series.rolling(window, min_periods=min_periods).mean()
-    rolling_std = series.rolling(window, min_periods=min_periods).std()
-    rolling_std = rolling_std.replace(0, np.nan)
-    return (series - rolling_mean) / rolling_std
+    """Compute rolling z-score (lighthouse.rolling kernel)."""
+    return rolling_zscore(series, window, min_periods)
 
 
 # ==========================================
@@ -392,66 +391,22 @@ def compute_all_crypto_indices(conn: sqlite3.Connection, latest_only: bool = Fal
     print("   Computing Sector Health Indices...")
     sector_df = compute_sector_health(conn)
 
-    # Build output rows
-    rows = []
-
-    # Add SLI
-    for _, row in sli_df.iterrows():
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": "SLI",
-            "value": round(row['SLI'], 4),
-            "status": get_crypto_status("SLI", row['SLI'])
-        })
-
-    # Add CFI
-    for _, row in cfi_df.iterrows():
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": "CFI",
-            "value": round(row['CFI'], 2),
-            "status": get_crypto_status("CFI", row['CFI'])
-        })
-
-    # Add CDI
-    for _, row in cdi_df.iterrows():
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": "CDI",
-            "value": round(row['CDI'], 4),
-            "status": get_crypto_status("CDI", row['CDI'])
-        })
-
-    # Add CVI
-    for _, row in cvi_df.iterrows():
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": "CVI",
-            "value": round(row['CVI'], 4),
-            "status": get_crypto_status("CVI", row['CVI'])
-        })
-
-    # Add CTI
-    for _, row in cti_df.iterrows():
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": "CTI",
-            "value": round(row['CTI'], 4),
-            "status": get_crypto_status("CTI", row['CTI'])
-        })
-
-    # Add Sector Health
-    for _, row in sector_df.iterrows():
-        sector_name = row['sector'].upper().replace(' ', '_').replace('-', '_')[:20]
-        index_id = f"CRYPTO_{sector_name}_HEALTH"
-        rows.append({
-            "date": row['date'].strftime("%Y-%m-%d") if hasattr(row['date'], 'strftime') else str(row['date']),
-            "index_id": index_id,
-            "value": round(row['health_score'], 2),
-            "status": get_crypto_status("DEFI_HEALTH", row['health_score'])
-        })
-
-    result_df = pd.DataFrame(rows)
+    # Build output rows (one long frame, status labels vectorized per index)
+    indices = {}
+    decimals = {"CFI": 2}
+    status_keys = {}
+    for index_id, frame in [("SLI", sli_df), ("CFI", cfi_df), ("CDI", cdi_df), ("CVI", cvi_df), ("CTI", cti_df)]:
+        indices[index_id] = pd.Series(frame[index_id].to_numpy(dtype=float), index=frame["date"].to_numpy())
+
+    # Sector health: one index per sector, scored on the DeFi health thresholds
+    sector_ids = ("CRYPTO_" + sector_df["sector"].str.upper().str.replace(" ", "_").str.replace("-", "_").str[:20]
+                  + "_HEALTH")
+    for index_id, frame in sector_df.groupby(sector_ids, sort=False):
+        indices[index_id] = pd.Series(frame["health_score"].to_numpy(dtype=float), index=frame["date"].to_numpy())
+        decimals[index_id] = 2
+        status_keys[index_id] = "DEFI_HEALTH"
+
+    result_df = index_rows(indices, CRYPTO_STATUS_THRESHOLDS, decimals, status_keys)
 
     if latest_only and not result_df.empty:
         latest_date = result_df['date'].max()
@@ -464,26 +419,9 @@ def compute_all_crypto_indices(conn: sqlite3.Connection, latest_only: bool = Fal
 
 def write_crypto_indices_to_db(conn: sqlite3.Connection, indices_df: pd.DataFrame):
     """Write computed crypto indices to lighthouse_indices table."""
-    c = conn.cursor()
-
-    # Create table if not exists (same schema as macro indices)
-    c.execute('''CREATE TABLE IF NOT EXISTS lighthouse_indices (
-        date TEXT,
-        index_id TEXT,
-        value REAL,
-        status TEXT,
-        PRIMARY KEY (date, index_id)
-    )''')
-
-    # Insert/replace data
-    for _, row in indices_df.iterrows():
-        c.execute("""
-            INSERT OR REPLACE INTO lighthouse_indices (date, index_id, value, status)
-            VALUES (?, ?, ?, ?)
-        """, (row["date"], row["index_id"], row["value"], row["status"]))
-
-    conn.commit()
-    print(f"   Wrote {len(indices_df)} crypto index rows to lighthouse_indices")
+    # Same schema as the macro indices; one executemany in one transaction
+    written = write_index_rows(conn, indices_df)
+    print(f"   Wrote {written} crypto index rows to lighthouse_indices")
 
 
 def verify_crypto_indices(conn: sqlite3.Connection):
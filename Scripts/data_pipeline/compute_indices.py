@@ -18,8 +18,9 @@ Formulas from: Lighthouse_Macro_Trading_Strategy.pdf
 
 Usage:
     python compute_indices.py              # Compute all indices, backfill history
-    python compute_indices.py --latest     # Only compute latest date
+    python compute_indices.py --latest     # Only recompute dates changed since the last run
     python compute_indices.py --verify     # Verify against expected thresholds
+    python compute_indices.py --check-parity  # --latest must match a full recompute
 """
 
 import sqlite3
@@ -27,6 +28,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, Optional
 import sys
 import os
 
@@ -35,7 +37,11 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Add lighthouse_quant to path
 sys.path.insert(0, "/Users/bob/LHM")
 
+from lighthouse import horizon_store
+from lighthouse.bulk import INDEX_COLUMNS, index_rows, write_index_rows
 from lighthouse.config import DB_PATH as CONFIG_DB_PATH
+from lighthouse.query import get_multiple_series
+from lighthouse.rolling import rolling_std, rolling_zscore
 from lighthouse_quant.models.recession_probability import compute_recession_probability
 from lighthouse_quant.models.warning_system import WarningSystem, WarningLevel
 from lighthouse_quant.models.risk_ensemble import RiskEnsemble, compute_ensemble_risk
@@ -291,6 +297,9 @@ def compute_zscore(series: pd.Series, window: int = 24, min_periods: int = None)
     """
     Compute rolling z-score for a series.
 
+    Uses the exact (start-independent) lighthouse.rolling kernel, which
+    compute_all_indices(latest_only=True) relies on.
+
     Args:
         series: Input series
         window: Rolling window (default 24 for monthly = 2 years)
@@ -299,19 +308,7 @@ def compute_zscore(series: pd.Series, window: int = 24, min_periods: int = None)
     Returns:
         Z-score series. Returns NaN where std is zero (constant values in window).
     """
-    if min_periods is None:
-        min_periods = max(1, window // 2)
-    else:
-        min_periods = min(min_periods, window)
-
-    rolling_mean = series.rolling(window, min_periods=min_periods).mean()
-    rolling_std = series.rolling(window, min_periods=min_periods).std()
-
-    # Protect against division by zero when std is 0 (constant values in window)
-    # Replace zero std with NaN to produce NaN z-score instead of inf
-    rolling_std = rolling_std.replace(0, np.nan)
-
-    return (series - rolling_mean) / rolling_std
+    return rolling_zscore(series, window, min_periods, exact=True)
 
 
 # ==========================================
@@ -851,7 +848,7 @@ def compute_svi(df: pd.DataFrame) -> pd.Series:
 
     # HY spread volatility (rolling std of changes)
     hy_oas = df.get("HY_OAS", pd.Series(dtype=float))
-    hy_vol = hy_oas.diff().rolling(21).std()
+    hy_vol = rolling_std(hy_oas.diff(), 21, min_periods=21, exact=True)
     z_hy_vol = compute_zscore(hy_vol, window=252)
 
     # Avoid division by zero
@@ -1015,6 +1012,9 @@ def load_market_data(conn: sqlite3.Connection) -> pd.DataFrame:
     """
     Load market structure data from observations table.
     This data is fetched by the market_fetchers.py module.
+
+    conn is unused (reads go through lighthouse.query against DB_PATH);
+    kept so existing callers don't change.
     """
     series_needed = [
         'SPX_Close', 'SPX_vs_200d_pct', 'SPX_vs_50d_pct', 'SPX_vs_20d_pct',
@@ -1024,29 +1024,12 @@ def load_market_data(conn: sqlite3.Connection) -> pd.DataFrame:
         'AAII_Bullish', 'AAII_Bearish', 'AAII_Bull_Bear_Spread', 'AAII_Neutral'
     ]
 
-    dfs = []
-    for series_id in series_needed:
-        query = f"""
-            SELECT date, value as {series_id}
-            FROM observations
-            WHERE series_id = '{series_id}'
-            ORDER BY date
-        """
-        try:
-            series_df = pd.read_sql(query, conn, parse_dates=['date'])
-            series_df = series_df.set_index('date')
-            dfs.append(series_df)
-        except Exception as e:
-            print(f"      Warning: Could not load {series_id}: {e}")
-
-    if not dfs:
+    # One columnar read (SQLite fallback) instead of a query per series
+    market_df = get_multiple_series(series_needed, db_path=DB_PATH)
+    market_df.columns.name = None
+    if market_df.empty:
         return pd.DataFrame()
 
-    # Merge all series
-    market_df = dfs[0]
-    for df in dfs[1:]:
-        market_df = market_df.join(df, how='outer')
-
     return market_df.sort_index()
 
 
@@ -1280,92 +1263,184 @@ def compute_ssd(spi: pd.Series, msi: pd.Series) -> pd.Series:
 # MAIN COMPUTATION ENGINE
 # ==========================================
 
-def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) -> pd.DataFrame:
+# Panel rows --latest loads ahead of the first date it recomputes. Every
+# panel-based index is built from row-count windows; the longest chain is
+# SVI (1-row diff -> 21-row vol -> 252-row z-score = 273 rows).
+INDEX_WARMUP_ROWS = 300
+
+# Indices not computed from the horizon panel. They are recomputed over full
+# history; --latest writes them from their last stored date onward.
+NON_PANEL_INDICES = ("MSI", "SBD", "SPI", "SSD", "REC_PROB",
+                     "WARNING_LEVEL", "ENSEMBLE_RISK", "DISCONTINUITY_PREMIUM", "ALLOC_MULTIPLIER", "BASE_REC_PROB")
+
+INDEX_STATE_TABLE = "lighthouse_indices_state"
+
+
+def _get_index_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    try:
+        row = conn.execute(f"SELECT value FROM {INDEX_STATE_TABLE} WHERE key = ?", (key,)).fetchone()
+    except sqlite3.OperationalError:
+        return None  # First run
+    return row[0] if row else None
+
+
+def _last_index_dates(conn: sqlite3.Connection) -> Dict[str, str]:
+    """Latest stored date per index_id."""
+    try:
+        return dict(conn.execute("SELECT index_id, MAX(date) FROM lighthouse_indices GROUP BY index_id"))
+    except sqlite3.OperationalError:
+        return {}
+
+
+def load_index_inputs(conn: sqlite3.Connection, latest_only: bool = False):
     """
-    Compute all proprietary indices from horizon_dataset.
+    Load the horizon rows needed to compute the indices.
 
-    Args:
-        conn: Database connection
-        latest_only: If True, only compute for latest date
+    Full mode loads all history. latest_only asks the panel's change log which
+    dates moved since the build the last run consumed, and loads from
+    INDEX_WARMUP_ROWS rows before the earliest of them.
 
     Returns:
-        DataFrame with columns: date, index_id, value, status
+        (df, emit_from, panel_built): emit_from is the first date whose
+        panel-based index values must be written (None = all history);
+        panel_built is the build stamp to record once written
     """
-    print("\n--- Loading Horizon Dataset ---")
-    df = pd.read_sql("SELECT * FROM horizon_dataset", conn, parse_dates=["date"])
-    df = df.set_index("date").sort_index()
-    print(f"   Loaded {len(df)} rows, {len(df.columns)} columns")
-    print(f"   Date range: {df.index.min().date()} to {df.index.max().date()}")
+    db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not horizon_store.exists(db_path):
+        df = pd.read_sql("SELECT * FROM horizon_dataset", conn, parse_dates=["date"])
+        df = df.set_index("date").sort_index()
+        emit_from = None
+        if latest_only:
+            # No change log for the SQLite table: recompute all, write from the last stored date
+            last = _last_index_dates(conn).get("MRI")
+            emit_from = pd.Timestamp(last) if last else None
+        return df, emit_from, None
+
+    index = horizon_store.read_index(db_path)
+    consumed = _get_index_state(conn, "panel_built") if latest_only else None
+    if consumed is None:
+        if latest_only:
+            print("   No previous run recorded - computing full history")
+        return horizon_store.read_panel(db_path=db_path), None, index["built"]
+
+    # Nothing changed: still refresh the final date
+    emit_from = pd.Timestamp(horizon_store.changed_since(consumed, db_path) or index["end"])
+    dates = horizon_store.read_panel(columns=[], db_path=db_path).index
+    warm_start = dates[max(0, dates.searchsorted(emit_from) - INDEX_WARMUP_ROWS)]
+    print(f"   Panel changed from {emit_from.date()}; loading from {warm_start.date()} "
+          f"({INDEX_WARMUP_ROWS}-row warm-up)")
+    return horizon_store.read_panel(start_date=warm_start, db_path=db_path), emit_from, index["built"]
+
+
+def compute_panel_indices(df: pd.DataFrame, verbose: bool = True) -> Dict[str, pd.Series]:
+    """
+    Compute the indices built only from horizon panel columns.
 
-    if latest_only:
-        # Only compute for last available date
-        df = df.iloc[[-1]]
+    Every formula looks back over row-count windows, so a value depends only
+    on the rows before it (see INDEX_WARMUP_ROWS).
 
-    print("\n--- Computing Indices ---")
+    Returns:
+        Dict of index_id -> Series indexed by date
+    """
+    say = print if verbose else (lambda *args: None)
 
     # Compute pillar composites first
-    print("   Computing LPI (Labor Pillar)...")
+    say("   Computing LPI (Labor Pillar)...")
     lpi = compute_lpi(df)
 
-    print("   Computing PCI (Prices Pillar)...")
+    say("   Computing PCI (Prices Pillar)...")
     pci = compute_pci(df)
 
-    print("   Computing GCI (Growth Pillar)...")
+    say("   Computing GCI (Growth Pillar)...")
     gci = compute_gci(df)
 
-    print("   Computing HCI (Housing Pillar)...")
+    say("   Computing HCI (Housing Pillar)...")
     hci = compute_hci(df)
 
-    print("   Computing CCI (Consumer Pillar)...")
+    say("   Computing CCI (Consumer Pillar)...")
     cci = compute_cci(df)
 
-    print("   Computing BCI (Business Pillar)...")
+    say("   Computing BCI (Business Pillar)...")
     bci = compute_bci(df)
 
-    print("   Computing TCI (Trade Pillar)...")
+    say("   Computing TCI (Trade Pillar)...")
     tci = compute_tci(df)
 
-    print("   Computing GCI-Gov (Government Pillar)...")
+    say("   Computing GCI-Gov (Government Pillar)...")
     gci_gov = compute_gci_gov(df)
 
     # Compute key indices
-    print("   Computing LFI (Labor Fragility Index)...")
+    say("   Computing LFI (Labor Fragility Index)...")
     lfi = compute_lfi(df)
 
-    print("   Computing LCI (Liquidity Cushion Index)...")
+    say("   Computing LCI (Liquidity Cushion Index)...")
     lci = compute_lci(df)
 
-    print("   Computing FCI (Financial Conditions)...")
+    say("   Computing FCI (Financial Conditions)...")
     fci = compute_fci(df, lci)
 
-    print("   Computing CLG (Credit-Labor Gap)...")
+    say("   Computing CLG (Credit-Labor Gap)...")
     clg = compute_clg(df, lfi)
 
-    print("   Computing MRI (Macro Risk Index)...")
+    say("   Computing MRI (Macro Risk Index)...")
     mri = compute_mri(lpi, pci, gci, hci, cci, bci, tci, gci_gov, fci, lci)
 
     # Additional indicators
-    print("   Computing LDI (Labor Dynamism Index)...")
+    say("   Computing LDI (Labor Dynamism Index)...")
     ldi = compute_ldi(df)
 
-    print("   Computing YFS (Yield-Funding Stress)...")
+    say("   Computing YFS (Yield-Funding Stress)...")
     yfs = compute_yfs(df)
 
-    print("   Computing SVI (Spread-Volatility Imbalance)...")
+    say("   Computing SVI (Spread-Volatility Imbalance)...")
     svi = compute_svi(df)
 
-    print("   Computing EMD (Equity Momentum Divergence)...")
+    say("   Computing EMD (Equity Momentum Divergence)...")
     emd = compute_emd(df)
 
-    print("   Computing Liquidity Stage...")
+    say("   Computing Liquidity Stage...")
     liq_stage = compute_liquidity_stage(df)
 
-    print("   Computing Bill-SOFR Spread...")
+    say("   Computing Bill-SOFR Spread...")
     bill_sofr = compute_bill_sofr_spread(df)
 
-    print("   Computing RMP Index (placeholder - needs Treasury data)...")
+    say("   Computing RMP Index (placeholder - needs Treasury data)...")
     rmp_index = compute_rmp_index(df)
 
+    return {
+        "LFI": lfi,
+        "LCI": lci,
+        "CLG": clg,
+        "MRI": mri,
+        "LPI": lpi,
+        "PCI": pci,
+        "GCI": gci,
+        "HCI": hci,
+        "CCI": cci,
+        "BCI": bci,
+        "TCI": tci,
+        "GCI_Gov": gci_gov,
+        "FCI": fci,
+        "LDI": ldi,
+        "YFS": yfs,
+        "SVI": svi,
+        "EMD": emd,
+        "LIQ_STAGE": liq_stage,
+        "BILL_SOFR": bill_sofr,
+        "RMP_Index": rmp_index,
+    }
+
+
+def compute_index_series(df: pd.DataFrame, conn: sqlite3.Connection) -> Dict[str, pd.Series]:
+    """
+    Compute every date-indexed index from a horizon slice (panel-based) and
+    the database (market structure, sentiment, recession probability).
+
+    Returns:
+        Dict of index_id -> Series indexed by date
+    """
+    panel = compute_panel_indices(df)
+
     # Market Structure Indices (Pillar 11 & 12)
     print("   Computing MSI (Market Structure Index)...")
     msi = compute_msi(conn)
@@ -1388,7 +1463,84 @@ def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) ->
         print(f"      WARNING: Recession probability computation failed: {e}")
         rec_prob = pd.Series(dtype=float, name="REC_PROB")
 
-    # Warning System & Risk Ensemble (latest only - these are point-in-time)
+    return {
+        # Core indices
+        "LFI": panel["LFI"],
+        "LCI": panel["LCI"],
+        "CLG": panel["CLG"],
+        "MRI": panel["MRI"],
+        # Pillar composites (1-10)
+        "LPI": panel["LPI"],
+        "PCI": panel["PCI"],
+        "GCI": panel["GCI"],
+        "HCI": panel["HCI"],
+        "CCI": panel["CCI"],
+        "BCI": panel["BCI"],
+        "TCI": panel["TCI"],
+        "GCI_Gov": panel["GCI_Gov"],
+        "FCI": panel["FCI"],
+        # Market Structure (Pillar 11)
+        "MSI": msi,
+        "SBD": sbd,
+        # Sentiment & Positioning (Pillar 12)
+        "SPI": spi,
+        "SSD": ssd,
+        # Additional indicators
+        "LDI": panel["LDI"],
+        "YFS": panel["YFS"],
+        "SVI": panel["SVI"],
+        "EMD": panel["EMD"],
+        "LIQ_STAGE": panel["LIQ_STAGE"],
+        "BILL_SOFR": panel["BILL_SOFR"],
+        "RMP_Index": panel["RMP_Index"],  # Placeholder - needs Treasury buyback data
+        # Recession Probability
+        "REC_PROB": rec_prob,
+    }
+
+
+def trim_to_changed(
+    indices: Dict[str, pd.Series],
+    emit_from: Optional[pd.Timestamp],
+    last_dates: Dict[str, str],
+) -> Dict[str, pd.Series]:
+    """
+    Keep only the dates a --latest run must write: panel-based indices from
+    emit_from, non-panel indices from their last stored date (or emit_from,
+    if earlier). emit_from None keeps everything.
+    """
+    if emit_from is None:
+        return indices
+    trimmed = {}
+    for index_id, series in indices.items():
+        since = emit_from
+        if index_id in NON_PANEL_INDICES:
+            last = last_dates.get(index_id)
+            since = min(emit_from, pd.Timestamp(last)) if last else None
+        trimmed[index_id] = series if since is None else series[series.index >= since]
+    return trimmed
+
+
+def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) -> pd.DataFrame:
+    """
+    Compute all proprietary indices from horizon_dataset.
+
+    Args:
+        conn: Database connection
+        latest_only: If True, only compute dates the horizon panel changed
+            since the last written run (plus each non-panel index's newest date)
+
+    Returns:
+        DataFrame with columns: date, index_id, value, status
+    """
+    print("\n--- Loading Horizon Dataset ---")
+    df, emit_from, panel_built = load_index_inputs(conn, latest_only)
+    print(f"   Loaded {len(df)} rows, {len(df.columns)} columns")
+    print(f"   Date range: {df.index.min().date()} to {df.index.max().date()}")
+
+    print("\n--- Computing Indices ---")
+    indices = compute_index_series(df, conn)
+
+    # Warning System & Risk Ensemble: latest point-in-time assessment...
     print("   Computing WARNING_LEVEL (Threshold Warning System)...")
     print("   Computing ENSEMBLE_RISK (Risk Ensemble)...")
     try:
@@ -1403,60 +1555,42 @@ def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) ->
         print(f"      Adjusted Probability: {ensemble_result.adjusted_probability:.1%}")
         print(f"      Discontinuity Premium: +{ensemble_result.discontinuity_premium:.1%}")
         print(f"      Allocation Multiplier: {ensemble_result.allocation_multiplier}x")
+        reads = warning_system.snapshot.stats
+        print(f"      Latest values: {reads['queries']} batched reads in {reads['seconds'] * 1000:.0f}ms")
     except Exception as e:
         print(f"      WARNING: Warning/Ensemble computation failed: {e}")
         warning_result = None
         ensemble_result = None
         warning_level_value = None
 
+    # ...and their full history (vectorized replay)
+    labels = {}
+    try:
+        history = RiskEnsemble(conn).replay()
+        indices.update({
+            "WARNING_LEVEL": history["warning_level"].astype(float),
+            "ENSEMBLE_RISK": history["adjusted_probability"],
+            "DISCONTINUITY_PREMIUM": history["discontinuity_premium"],
+            "ALLOC_MULTIPLIER": history["allocation_multiplier"],
+            "BASE_REC_PROB": history["base_probability"],
+        })
+        labels = {
+            "WARNING_LEVEL": history["warning_level"].map(lambda v: WarningLevel(v).name),
+            "ENSEMBLE_RISK": history["regime"],
+        }
+        print(f"      Replayed {len(history)} dates")
+    except Exception as e:
+        print(f"      WARNING: Warning/Ensemble replay failed: {e}")
+
     # Build output DataFrame
     print("\n--- Building Output ---")
-    indices = {
-        # Core indices
-        "LFI": lfi,
-        "LCI": lci,
-        "CLG": clg,
-        "MRI": mri,
-        # Pillar composites (1-10)
-        "LPI": lpi,
-        "PCI": pci,
-        "GCI": gci,
-        "HCI": hci,
-        "CCI": cci,
-        "BCI": bci,
-        "TCI": tci,
-        "GCI_Gov": gci_gov,
-        "FCI": fci,
-        # Market Structure (Pillar 11)
-        "MSI": msi,
-        "SBD": sbd,
-        # Sentiment & Positioning (Pillar 12)
-        "SPI": spi,
-        "SSD": ssd,
-        # Additional indicators
-        "LDI": ldi,
-        "YFS": yfs,
-        "SVI": svi,
-        "EMD": emd,
-        "LIQ_STAGE": liq_stage,
-        "BILL_SOFR": bill_sofr,
-        "RMP_Index": rmp_index,  # Placeholder - needs Treasury buyback data
-        # Recession Probability
-        "REC_PROB": rec_prob,
-    }
 
-    # Convert to long format for database storage
+    if latest_only:
+        indices = trim_to_changed(indices, emit_from, _last_index_dates(conn))
+
+    # Long format for database storage (status labels vectorized per index)
+    index_df = index_rows(indices, STATUS_THRESHOLDS, status_keys={"BASE_REC_PROB": "REC_PROB"}, labels=labels)
     rows = []
-    for index_id, series in indices.items():
-        for date, value in series.items():
-            if pd.notna(value):
-                status = get_status(index_id, value)
-                rows.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "index_id": index_id,
-                    "value": round(value, 4),
-                    "status": status
-                })
 
     # Add Warning System & Ensemble outputs (single point-in-time values)
     if ensemble_result is not None:
@@ -1497,7 +1631,10 @@ def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) ->
             "status": get_status("REC_PROB", ensemble_result.base_probability)
         })
 
-    result_df = pd.DataFrame(rows)
+    # Point-in-time rows take precedence over the replay on the same date
+    result_df = pd.concat([index_df, pd.DataFrame(rows, columns=INDEX_COLUMNS)], ignore_index=True)
+    result_df = result_df.drop_duplicates(subset=["date", "index_id"], keep="last").reset_index(drop=True)
+    result_df.attrs["panel_built"] = panel_built
     print(f"   Generated {len(result_df)} index observations")
 
     return result_df
@@ -1505,26 +1642,46 @@ def compute_all_indices(conn: sqlite3.Connection, latest_only: bool = False) ->
 
 def write_indices_to_db(conn: sqlite3.Connection, indices_df: pd.DataFrame):
     """Write computed indices to lighthouse_indices table."""
-    c = conn.cursor()
-
-    # Create table if not exists
-    c.execute('''CREATE TABLE IF NOT EXISTS lighthouse_indices (
-        date TEXT,
-        index_id TEXT,
-        value REAL,
-        status TEXT,
-        PRIMARY KEY (date, index_id)
-    )''')
-
-    # Insert/replace data
-    for _, row in indices_df.iterrows():
-        c.execute("""
-            INSERT OR REPLACE INTO lighthouse_indices (date, index_id, value, status)
-            VALUES (?, ?, ?, ?)
-        """, (row["date"], row["index_id"], row["value"], row["status"]))
+    # One executemany, committed below with the state row
+    written = write_index_rows(conn, indices_df, commit=False)
+
+    # Record the panel build these values came from (--latest starts from it)
+    if indices_df.attrs.get("panel_built"):
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {INDEX_STATE_TABLE} (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(f"INSERT OR REPLACE INTO {INDEX_STATE_TABLE} (key, value) VALUES ('panel_built', ?)",
+                     (indices_df.attrs["panel_built"],))
 
     conn.commit()
-    print(f"   Wrote {len(indices_df)} rows to lighthouse_indices")
+    print(f"   Wrote {written} rows to lighthouse_indices")
+
+
+def check_latest_parity(conn: sqlite3.Connection) -> bool:
+    """
+    Check that --latest reproduces a full-history recompute: every value the
+    latest run would write must equal the full-history value exactly
+    (unrounded; NaN matches NaN). Nothing is written.
+    """
+    print("\n--- Parity: --latest vs full history ---")
+    df, emit_from, _ = load_index_inputs(conn, latest_only=True)
+    latest = trim_to_changed(compute_index_series(df, conn), emit_from, _last_index_dates(conn))
+    full_df, _, _ = load_index_inputs(conn, latest_only=False)
+    full = compute_index_series(full_df, conn)
+
+    mismatched = []
+    for index_id, series in latest.items():
+        expected = full[index_id].reindex(series.index)
+        same = (series.to_numpy() == expected.to_numpy()) | (series.isna().to_numpy() & expected.isna().to_numpy())
+        if not same.all():
+            worst = (series - expected).abs().max()
+            mismatched.append(index_id)
+            print(f"   {index_id:10} {int((~same).sum())} of {len(series)} dates differ (max abs diff {worst:.3g})")
+
+    checked = sum(len(s) for s in latest.values())
+    if mismatched:
+        print(f"   FAILED: {len(mismatched)} indices differ")
+    else:
+        print(f"   OK: {checked} values match across {len(latest)} indices")
+    return not mismatched
 
 
 def verify_indices(conn: sqlite3.Connection):
@@ -1576,9 +1733,11 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Compute Lighthouse Macro Proprietary Indices")
-    parser.add_argument("--latest", action="store_true", help="Only compute latest date")
+    parser.add_argument("--latest", action="store_true", help="Only compute dates changed since the last run")
     parser.add_argument("--verify", action="store_true", help="Verify against expected values")
     parser.add_argument("--dry-run", action="store_true", help="Compute but don't write to database")
+    parser.add_argument("--check-parity", action="store_true",
+                        help="Check --latest against a full recompute (no writes)")
 
     args = parser.parse_args()
 
@@ -1590,6 +1749,11 @@ def main():
 
     conn = sqlite3.connect(DB_PATH)
 
+    if args.check_parity:
+        ok = check_latest_parity(conn)
+        conn.close()
+        sys.exit(0 if ok else 1)
+
     # Compute indices
     indices_df = compute_all_indices(conn, latest_only=args.latest)
 
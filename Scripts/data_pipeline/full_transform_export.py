@@ -3,7 +3,8 @@ LIGHTHOUSE MACRO - FULL DATABASE TRANSFORM & EXPORT
 ====================================================
 Takes ALL series from master database.
 Applies smart transformations based on series characteristics.
-Exports full CSV for model ingestion.
+Exports wide + long datasets for model ingestion (Parquet by default,
+CSV opt-in: --csv or LIGHTHOUSE_EXPORT_CSV=1; see lighthouse.export).
 
 Now uses centralized transforms from lighthouse package.
 """
@@ -27,13 +28,15 @@ from lighthouse.transforms import (
     get_default_transforms,
     apply_transforms
 )
+from lighthouse.query import iter_series
+from lighthouse.export import LongWriter, export_formats, peak_memory_mb, write_wide
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
-OUTPUT_CSV = OUTPUT_DIR / "Lighthouse_Full_Transformed.csv"
-OUTPUT_LONG_CSV = OUTPUT_DIR / "Lighthouse_Full_Long.csv"
+OUTPUT_WIDE = OUTPUT_DIR / "Lighthouse_Full_Transformed"  # + .parquet / .arrow / .csv
+OUTPUT_LONG = OUTPUT_DIR / "Lighthouse_Full_Long"
 YESTERDAY = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
 
@@ -44,8 +47,15 @@ def clean_column_name(name: str) -> str:
     return name[:80]
 
 
-def build_full_export():
-    """Build the full transformed dataset from all series."""
+def build_full_export(fmt: str = None, csv: bool = None):
+    """
+    Build the full transformed dataset from all series.
+
+    Args:
+        fmt: Export format, 'parquet' | 'arrow' | 'csv' (default: EXPORT_CONFIG)
+        csv: Also write CSV copies (default: LIGHTHOUSE_EXPORT_CSV)
+    """
+    formats = export_formats(fmt, csv)
     print("=" * 70)
     print("LIGHTHOUSE MACRO - FULL DATABASE TRANSFORM")
     print(f"Source: {DB_PATH}")
@@ -65,23 +75,18 @@ def build_full_export():
 
     print("\n--- Processing All Series ---")
 
-    for idx, row in series_meta.iterrows():
-        series_id = row["series_id"]
+    # Series are read in chunks from the columnar store (SQLite fallback)
+    frames = iter_series(series_meta["series_id"].tolist())
+    for (idx, row), (series_id, df) in zip(series_meta.iterrows(), frames):
         title = row["title"] or series_id
         source = row["source"]
 
-        # Fetch data
-        query = "SELECT date, value FROM observations WHERE series_id = ? ORDER BY date"
-        df = pd.read_sql(query, conn, params=[series_id])
-
         if df.empty or len(df) < 5:
             skipped += 1
             continue
 
-        # Convert and dedupe
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df = df.dropna(subset=["date", "value"])
-        df = df.set_index("date")
+        # Dedupe
+        df = df[df.index.notna()].dropna(subset=["value"])
         df = df[~df.index.duplicated(keep='first')]
         df = df.sort_index()
 
@@ -127,6 +132,7 @@ def build_full_export():
     # Combine into DataFrame
     print("\n--- Building Combined Dataset ---")
     full_df = pd.DataFrame(all_data)
+    del all_data  # full_df holds its own copy
     full_df.index.name = "date"
     full_df = full_df.sort_index()
 
@@ -141,21 +147,25 @@ def build_full_export():
     print(f"Memory: {mem_mb:.1f} MB")
 
     # Export wide format
-    print(f"\n--- Exporting Wide CSV ---")
-    full_df.to_csv(OUTPUT_CSV)
-    csv_size = OUTPUT_CSV.stat().st_size / 1024 / 1024
-    print(f"   Saved: {OUTPUT_CSV}")
-    print(f"   Size: {csv_size:.1f} MB")
-
-    # Also export long format
-    print(f"\n--- Exporting Long CSV ---")
-    long_df = full_df.reset_index().melt(id_vars=["date"], var_name="series", value_name="value")
-    long_df = long_df.dropna(subset=["value"])
-    long_df.to_csv(OUTPUT_LONG_CSV, index=False)
-    long_size = OUTPUT_LONG_CSV.stat().st_size / 1024 / 1024
-    print(f"   Saved: {OUTPUT_LONG_CSV}")
-    print(f"   Size: {long_size:.1f} MB")
-    print(f"   Rows: {len(long_df):,}")
+    print(f"\n--- Exporting Wide ({', '.join(formats)}) ---")
+    for path in write_wide(full_df, OUTPUT_WIDE, formats):
+        print(f"   Saved: {path}")
+        print(f"   Size: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+    # Long format, streamed one column at a time (same rows and order as melting the frame)
+    print(f"\n--- Exporting Long ({', '.join(formats)}) ---")
+    with LongWriter(OUTPUT_LONG, {"date": "date", "series": "string", "value": "float"}, formats) as writer:
+        for col in full_df.columns:
+            values = full_df[col].dropna()
+            writer.add(pd.DataFrame({"date": values.index, "series": col, "value": values.to_numpy()}))
+    for path in writer.paths:
+        print(f"   Saved: {path}")
+        print(f"   Size: {path.stat().st_size / 1024 / 1024:.1f} MB")
+    print(f"   Rows: {writer.rows:,}")
+
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"\nPeak memory: {peak:,.0f} MB")
 
     # Summary by source
     print("\n--- Column Summary by Source ---")
@@ -174,6 +184,13 @@ def build_full_export():
 
 
 if __name__ == "__main__":
-    df = build_full_export()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Transform and export every series")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], help="Export format (default: parquet)")
+    parser.add_argument("--csv", action="store_true", help="Also write CSV copies")
+    args = parser.parse_args()
+
+    df = build_full_export(fmt=args.format, csv=args.csv or None)
     print("\nSample columns:")
     print(list(df.columns[:20]))
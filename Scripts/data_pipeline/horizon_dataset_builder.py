@@ -8,11 +8,18 @@ Output:
 - Aligned on shortest timeframe (per series first obs to yesterday)
 - Gaps interpolated (not backfilled)
 - Raw + 1-5 transformations per series
-- SQLite table + CSV export
+- Columnar panel (lighthouse.horizon_store: Parquet + column index beside
+  the database) + Horizon_Dataset export in OUTPUT_DIR (Parquet by default,
+  CSV opt-in; see lighthouse.export); the wide SQLite table is optional
+  (LIGHTHOUSE_HORIZON_SQLITE=1)
+- Incremental mode (--incremental) patches only series whose observations
+  changed since the last build (tracked in the horizon_manifest table)
 
 Now uses centralized transforms from lighthouse package.
 """
 
+import hashlib
+import json
 import sqlite3
 import pandas as pd
 import numpy as np
@@ -24,14 +31,18 @@ import os
 # Add lighthouse package to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from lighthouse.config import DB_PATH, OUTPUT_DIR
+from lighthouse import horizon_store
+from lighthouse.config import DB_PATH, OUTPUT_DIR, HORIZON_STORE_CONFIG
+from lighthouse.export import export_formats, peak_memory_mb, write_wide
 from lighthouse.transforms import TRANSFORM_REGISTRY, get_periods_for_freq
+from lighthouse.query import get_series, iter_series
+from lighthouse.rolling import rolling_zscore
 
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
-OUTPUT_CSV = OUTPUT_DIR / "Horizon_Dataset.csv"
+OUTPUT_EXPORT = OUTPUT_DIR / "Horizon_Dataset"  # + .parquet / .arrow / .csv
 YESTERDAY = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
 # ==========================================
@@ -280,9 +291,7 @@ def apply_transforms(df, transforms, freq):
                 window = 24
             else:
                 window = 8
-            rolling_mean = df["value"].rolling(window, min_periods=window//2).mean()
-            rolling_std = df["value"].rolling(window, min_periods=window//2).std()
-            result["z"] = (df["value"] - rolling_mean) / rolling_std
+            result["z"] = rolling_zscore(df["value"], window)
 
         elif t == "4wk_ma":
             # 4-week moving average
@@ -313,68 +322,363 @@ def interpolate_series(df, first_obs, last_obs):
     return df
 
 
+# ==========================================
+# BUILD MANIFEST
+# ==========================================
+# One row per built series: a fingerprint of the observations it was built
+# from (count, first/last date, value sum up to the cutoff) and a hash of its
+# config. Incremental builds recompute only series whose fingerprint moved.
+
+MANIFEST_TABLE = "horizon_manifest"
+
+# Daily rows of history the transforms need (the 504-day z is the longest)
+TRANSFORM_LOOKBACK_DAYS = 520
+
+TABLE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # how to_sql stores the date index
+
+# Where the panel lives: the Parquet store, plus the wide SQLite table if
+# asked for (or if pyarrow is missing)
+USE_PANEL = horizon_store.PYARROW_AVAILABLE
+USE_SQLITE_TABLE = HORIZON_STORE_CONFIG["sqlite_table"] or not USE_PANEL
+
+
+def _config_hash(config):
+    return hashlib.md5(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _observation_fingerprints(conn, series_ids, cutoff):
+    """series_id -> (count, first_date, last_date, value_sum) over observations up to cutoff."""
+    series_ids = list(series_ids)
+    fingerprints = {}
+    for i in range(0, len(series_ids), 500):
+        chunk = series_ids[i:i + 500]
+        rows = conn.execute(
+            f"""SELECT series_id, COUNT(*), MIN(date), MAX(date), SUM(value)
+                FROM observations
+                WHERE series_id IN ({','.join('?' for _ in chunk)}) AND date <= ?
+                GROUP BY series_id""",
+            chunk + [cutoff]
+        ).fetchall()
+        fingerprints.update({r[0]: tuple(r[1:]) for r in rows})
+    return fingerprints
+
+
+def _same_sum(a, b):
+    return a == b or (a is not None and b is not None and bool(np.isclose(a, b, rtol=1e-12, atol=0)))
+
+
+def _load_manifest(conn):
+    try:
+        rows = conn.execute(
+            f"SELECT series_id, config_hash, obs_count, first_obs, last_obs, value_sum FROM {MANIFEST_TABLE}"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {r[0]: {"config_hash": r[1], "fingerprint": tuple(r[2:])} for r in rows}
+
+
+def _save_manifest(conn, fingerprints, replace=False):
+    conn.execute(f"""CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+        series_id TEXT PRIMARY KEY,
+        config_hash TEXT,
+        obs_count INTEGER,
+        first_obs TEXT,
+        last_obs TEXT,
+        value_sum REAL,
+        built_at TEXT
+    )""")
+    if replace:
+        conn.execute(f"DELETE FROM {MANIFEST_TABLE}")
+    now = datetime.now().isoformat()
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?,?,?,?,?,?,?)",
+        [(sid, _config_hash(HORIZON_SERIES[sid])) + tuple(fp) + (now,) for sid, fp in fingerprints.items()]
+    )
+    conn.commit()
+
+
+# ==========================================
+# SERIES BUILD
+# ==========================================
+
+def build_series_columns(df, config):
+    """Interpolated raw series plus transforms, named as horizon_dataset columns."""
+    df = df[~df.index.duplicated(keep='first')]  # Remove dupe dates
+
+    # Get first and last observation dates
+    first_obs = df.index.min()
+    last_obs = min(df.index.max(), pd.Timestamp(YESTERDAY))
+
+    # Interpolate gaps (only between first obs and yesterday)
+    df_interp = interpolate_series(df, first_obs, last_obs)
+
+    # Apply transformations
+    df_transformed = apply_transforms(df_interp, config["transforms"], config["freq"])
+
+    # Rename columns with series name prefix
+    name = config["name"]
+    return df_transformed.rename(columns=lambda col: f"{name}_{col}" if col != "raw" else name)
+
+
+def _patch_panel(panel, columns, clear=()):
+    """Apply a patch to the in-memory panel: null `clear`, then write columns (date index)."""
+    for col in clear:
+        panel[col] = np.nan
+
+    columns = columns.dropna(how="all")
+    if columns.empty:
+        return panel
+
+    new_dates = columns.index.difference(panel.index)
+    if len(new_dates):
+        panel = panel.reindex(panel.index.union(new_dates))
+    for col in columns.columns:
+        if col not in panel.columns:
+            panel[col] = np.nan
+    panel.loc[columns.index, list(columns.columns)] = columns.to_numpy()
+    return panel
+
+
+def _first_change(before, after):
+    """Earliest date where two aligned frames differ (NaN == NaN), or None."""
+    before = before.reindex(index=after.index, columns=after.columns)
+    changed = (after.ne(before) & ~(after.isna() & before.isna())).any(axis=1)
+    return changed.idxmax() if changed.any() else None
+
+
+def _patch_table(conn, columns, clear=()):
+    """
+    Write columns (date index) into the horizon_dataset SQLite table in place.
+
+    New columns are added, missing dates inserted, and columns in `clear`
+    are nulled first (for series rebuilt from scratch). Returns rows written.
+    """
+    existing = {r[1] for r in conn.execute('PRAGMA table_info("horizon_dataset")')}
+    for col in columns.columns:
+        if col not in existing:
+            conn.execute(f'ALTER TABLE horizon_dataset ADD COLUMN "{col}" REAL')
+
+    if clear:
+        conn.execute("UPDATE horizon_dataset SET " + ", ".join(f'"{c}" = NULL' for c in clear))
+
+    columns = columns.dropna(how="all")
+    if columns.empty:
+        return 0
+
+    dates = columns.index.strftime(TABLE_DATE_FORMAT).tolist()
+    stored = {r[0] for r in conn.execute("SELECT date FROM horizon_dataset WHERE date >= ?", (dates[0],))}
+    conn.executemany("INSERT INTO horizon_dataset (date) VALUES (?)",
+                     [(d,) for d in dates if d not in stored])
+
+    # NaN -> NULL; one executemany covers every patched column
+    values = columns.astype(object).where(columns.notna(), None).to_numpy().tolist()
+    assignments = ", ".join(f'"{c}" = ?' for c in columns.columns)
+    conn.executemany(f"UPDATE horizon_dataset SET {assignments} WHERE date = ?",
+                     [row + [d] for row, d in zip(values, dates)])
+    return len(dates)
+
+
+# ==========================================
+# INCREMENTAL BUILD
+# ==========================================
+
+def update_horizon_dataset():
+    """
+    Patch horizon_dataset in place for series whose observations changed.
+
+    A series that only gained observations since its last build is
+    recomputed from TRANSFORM_LOOKBACK_DAYS before its old end (so rolling
+    transforms see full windows) and only the new rows are written. A series
+    whose history changed (revisions, backfill) has its columns rebuilt.
+
+    Returns:
+        List of patched series_ids, or None when a full build is needed
+        (no table or manifest, or a built series changed in HORIZON_SERIES)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        manifest = _load_manifest(conn)
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='horizon_dataset'"
+        ).fetchone()
+        if not manifest or (USE_PANEL and not horizon_store.exists(DB_PATH)) or (USE_SQLITE_TABLE and not has_table):
+            print("   No previous build to patch")
+            return None
+
+        for series_id, entry in manifest.items():
+            if series_id not in HORIZON_SERIES or entry["config_hash"] != _config_hash(HORIZON_SERIES[series_id]):
+                print(f"   Series config changed: {series_id}")
+                return None
+
+        current = _observation_fingerprints(conn, HORIZON_SERIES, YESTERDAY)
+        extended, rebuilt = {}, []
+        for series_id in HORIZON_SERIES:
+            fingerprint = current.get(series_id)
+            old = manifest.get(series_id)
+            if old is None:
+                if fingerprint is not None:
+                    rebuilt.append(series_id)
+                continue
+            if fingerprint is None:
+                print(f"   Series lost its data: {series_id}")
+                return None
+
+            old_count, old_first, old_last, old_sum = old["fingerprint"]
+            count, first, last, value_sum = fingerprint
+            if (count, first, last) == (old_count, old_first, old_last) and _same_sum(value_sum, old_sum):
+                continue
+
+            # History up to the old end unchanged -> only the new tail needs computing
+            prefix_count, prefix_sum = conn.execute(
+                "SELECT COUNT(*), SUM(value) FROM observations WHERE series_id = ? AND date <= ?",
+                (series_id, old_last)
+            ).fetchone()
+            if first == old_first and prefix_count == old_count and _same_sum(prefix_sum, old_sum):
+                warmup = (pd.Timestamp(old_last) - pd.Timedelta(days=TRANSFORM_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+                anchor = conn.execute(
+                    "SELECT MAX(date) FROM observations WHERE series_id = ? AND date <= ?",
+                    (series_id, warmup)
+                ).fetchone()[0]
+                extended[series_id] = (old_last, anchor)
+            else:
+                rebuilt.append(series_id)
+
+        print(f"   {len(extended)} extended, {len(rebuilt)} rebuilt, "
+              f"{len(HORIZON_SERIES) - len(extended) - len(rebuilt)} unchanged")
+        if not extended and not rebuilt:
+            return []
+
+        # (columns, columns to null first) per dirty series
+        patches = []
+        for series_id, (old_last, anchor) in extended.items():
+            config = HORIZON_SERIES[series_id]
+            cols = build_series_columns(get_series(series_id, start_date=anchor), config)
+            patches.append((cols[cols.index > pd.Timestamp(old_last)], []))
+            print(f"   [+] {config['name']}: {old_last} -> {cols.index.max().date()}")
+
+        for series_id, df in iter_series(rebuilt):
+            config = HORIZON_SERIES[series_id]
+            cols = build_series_columns(df, config)
+            patches.append((cols, list(cols.columns)))
+            print(f"   [*] {config['name']}: rebuilt {cols.index.min().date()} to {cols.index.max().date()}")
+
+        if USE_PANEL:
+            panel = horizon_store.read_panel(db_path=DB_PATH)
+            changed_from = None
+            for cols, clear in patches:
+                before = panel.reindex(columns=cols.columns)
+                panel = _patch_panel(panel, cols, [c for c in clear if c in panel.columns])
+                first = _first_change(before, panel[cols.columns])
+                if first is not None:
+                    changed_from = first if changed_from is None else min(changed_from, first)
+
+            # changed_from goes in the panel's change log for compute_indices --latest
+            if changed_from is not None:
+                horizon_store.write_panel(panel, DB_PATH, changed_from=changed_from)
+                print(f"   Panel: {panel.shape[0]} rows x {panel.shape[1]} columns, "
+                      f"changed from {changed_from.date()} -> {horizon_store.panel_path(DB_PATH)}")
+            else:
+                print("   Panel: no values changed")
+
+        if USE_SQLITE_TABLE:
+            rows = 0
+            for cols, clear in patches:
+                existing = {r[1] for r in conn.execute('PRAGMA table_info("horizon_dataset")')}
+                rows += _patch_table(conn, cols, [c for c in clear if c in existing])
+            conn.commit()
+            print(f"   SQLite table: patched {rows:,} rows")
+
+        _save_manifest(conn, {sid: current[sid] for sid in list(extended) + rebuilt})
+        return list(extended) + rebuilt
+    finally:
+        conn.close()
+
+
 # ==========================================
 # MAIN BUILD FUNCTION
 # ==========================================
 
-def build_horizon_dataset():
-    """Build the Horizon-ready dataset."""
+def _export(horizon_df, formats):
+    print(f"\n--- Exporting Dataset ({', '.join(formats)}) ---")
+    for path in write_wide(horizon_df, OUTPUT_EXPORT, formats):
+        print(f"   Saved to: {path}")
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"   Peak memory: {peak:,.0f} MB")
+
+
+def build_horizon_dataset(incremental=False, export=True, fmt=None, csv=None):
+    """
+    Build the Horizon-ready dataset.
+
+    Args:
+        incremental: Patch only series whose observations changed since the
+            last build (falls back to a full build when that isn't possible)
+        export: Write the Horizon_Dataset export (in incremental mode this
+            re-reads the whole table, and only happens if something changed)
+        fmt: Export format, 'parquet' | 'arrow' | 'csv' (default: EXPORT_CONFIG)
+        csv: Also write Horizon_Dataset.csv (default: LIGHTHOUSE_EXPORT_CSV)
+
+    Returns:
+        The full dataset, or the list of patched series_ids in incremental mode
+    """
     print("=" * 70)
     print("LIGHTHOUSE MACRO - HORIZON DATASET BUILDER")
     print(f"Target: {len(HORIZON_SERIES)} base series")
     print(f"Cutoff: {YESTERDAY}")
+    print(f"Mode: {'incremental' if incremental else 'full'}")
     print("=" * 70)
 
+    if incremental:
+        print("\n--- Incremental Update ---")
+        patched = update_horizon_dataset()
+        if patched is not None:
+            if export and patched:
+                if USE_PANEL:
+                    horizon_df = horizon_store.read_panel(db_path=DB_PATH)
+                else:
+                    conn = sqlite3.connect(DB_PATH)
+                    horizon_df = pd.read_sql("SELECT * FROM horizon_dataset", conn, parse_dates=["date"])
+                    conn.close()
+                    horizon_df = horizon_df.set_index("date").sort_index()
+                _export(horizon_df, export_formats(fmt, csv))
+
+            print("\n" + "=" * 70)
+            print("HORIZON DATASET UPDATED")
+            print("=" * 70)
+            return patched
+        print("   Falling back to full build")
+
     conn = sqlite3.connect(DB_PATH)
+    fingerprints = _observation_fingerprints(conn, HORIZON_SERIES, YESTERDAY)
+    conn.close()
 
     all_data = {}
+    built = {}
     series_count = 0
     transform_count = 0
 
     print("\n--- Processing Series ---")
 
-    for series_id, config in HORIZON_SERIES.items():
+    # Bulk read from the columnar store (SQLite fallback) instead of one query per series
+    for series_id, df in iter_series(list(HORIZON_SERIES)):
+        config = HORIZON_SERIES[series_id]
         name = config["name"]
-        freq = config["freq"]
-        transforms = config["transforms"]
-
-        # Fetch from master database
-        query = f"""
-            SELECT date, value FROM observations
-            WHERE series_id = ?
-            ORDER BY date
-        """
-        df = pd.read_sql(query, conn, params=[series_id])
 
         if df.empty:
             print(f"   [SKIP] {name}: No data found for {series_id}")
             continue
 
-        # Convert to datetime and set index
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.set_index("date")
-        df = df[~df.index.duplicated(keep='first')]  # Remove dupe dates
-
-        # Get first and last observation dates
-        first_obs = df.index.min()
-        last_obs = min(df.index.max(), pd.Timestamp(YESTERDAY))
-
-        # Interpolate gaps (only between first obs and yesterday)
-        df_interp = interpolate_series(df, first_obs, last_obs)
-
-        # Apply transformations
-        df_transformed = apply_transforms(df_interp, transforms, freq)
-
-        # Rename columns with series name prefix
-        for col in df_transformed.columns:
-            col_name = f"{name}_{col}" if col != "raw" else name
-            all_data[col_name] = df_transformed[col]
+        cols = build_series_columns(df, config)
+        for col in cols.columns:
+            all_data[col] = cols[col]
             transform_count += 1
+        if series_id in fingerprints:
+            built[series_id] = fingerprints[series_id]
 
         series_count += 1
-        print(f"   [{series_count}] {name}: {len(df)} obs, {len(transforms)+1} cols, {first_obs.date()} to {last_obs.date()}")
-
-    conn.close()
+        print(f"   [{series_count}] {name}: {len(df)} obs, {len(cols.columns)} cols, "
+              f"{cols.index.min().date()} to {cols.index.max().date()}")
 
     # Combine all into single DataFrame
     print("\n--- Building Combined Dataset ---")
@@ -390,17 +694,25 @@ def build_horizon_dataset():
     print(f"Base Series: {series_count}")
     print(f"Total Columns (raw + transforms): {transform_count}")
 
-    # Save to SQLite
-    print("\n--- Saving to SQLite ---")
+    # Save panel
+    print("\n--- Saving Panel ---")
+    if USE_PANEL:
+        path = horizon_store.write_panel(horizon_df, DB_PATH)
+        print(f"   Saved to: {path}")
+
     conn = sqlite3.connect(DB_PATH)
-    horizon_df.to_sql("horizon_dataset", conn, if_exists="replace", index=True)
+    if USE_SQLITE_TABLE:
+        horizon_df.to_sql("horizon_dataset", conn, if_exists="replace", index=True)
+        print(f"   Saved to: {DB_PATH} (table: horizon_dataset)")
+    else:
+        # A table left from an older build would go stale; readers use the panel
+        conn.execute("DROP TABLE IF EXISTS horizon_dataset")
+    _save_manifest(conn, built, replace=True)
     conn.close()
-    print(f"   Saved to: {DB_PATH} (table: horizon_dataset)")
 
-    # Export to CSV
-    print("\n--- Exporting to CSV ---")
-    horizon_df.to_csv(OUTPUT_CSV)
-    print(f"   Saved to: {OUTPUT_CSV}")
+    # Export
+    if export:
+        _export(horizon_df, export_formats(fmt, csv))
 
     # Column summary
     print("\n--- Column Summary ---")
@@ -424,8 +736,20 @@ def build_horizon_dataset():
 # ==========================================
 
 if __name__ == "__main__":
-    df = build_horizon_dataset()
-
-    # Show sample
-    print("\nSample (last 5 rows, first 10 cols):")
-    print(df.iloc[-5:, :10].to_string())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the Horizon dataset")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Recompute only series with new or revised observations")
+    parser.add_argument("--no-export", "--no-csv", action="store_true", help="Skip the Horizon_Dataset export")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], help="Export format (default: parquet)")
+    parser.add_argument("--csv", action="store_true", help="Also write Horizon_Dataset.csv")
+    args = parser.parse_args()
+
+    df = build_horizon_dataset(incremental=args.incremental, export=not args.no_export,
+                               fmt=args.format, csv=args.csv or None)
+
+    if isinstance(df, pd.DataFrame):
+        # Show sample
+        print("\nSample (last 5 rows, first 10 cols):")
+        print(df.iloc[-5:, :10].to_string())
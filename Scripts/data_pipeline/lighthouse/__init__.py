@@ -4,19 +4,36 @@ LIGHTHOUSE MACRO - DATA PIPELINE
 Institutional-grade macro data infrastructure.
 
 One database. All sources. Zero headaches.
+
+The entry points below are imported on first use, so importing one module
+(e.g. lighthouse.rolling or lighthouse.http_cache) does not load the whole
+pipeline.
 """
 
+import importlib
+
 from .config import DB_PATH, OUTPUT_DIR
-from .pipeline import run_daily_update, get_stats
-from .transforms import TRANSFORM_REGISTRY
-from .query import get_series, search_series, export_wide
 
 __version__ = "2.0.0"
-__all__ = [
-    "run_daily_update",
-    "get_stats",
-    "get_series",
-    "search_series",
-    "export_wide",
-    "TRANSFORM_REGISTRY",
-]
+
+# Public name -> submodule it lives in
+_EXPORTS = {
+    "run_daily_update": "pipeline",
+    "get_stats": "pipeline",
+    "get_series": "query",
+    "search_series": "query",
+    "export_wide": "query",
+    "write_observations": "bulk",
+    "refresh_columnar_store": "columnar",
+    "TRANSFORM_REGISTRY": "transforms",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
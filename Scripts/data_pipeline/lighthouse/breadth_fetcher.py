@@ -17,7 +17,6 @@ Data source: yfinance (free)
 import pandas as pd
 import numpy as np
 import sqlite3
-import time
 import logging
 from datetime import datetime, timedelta
 from typing import Tuple, List, Optional
@@ -29,7 +28,9 @@ try:
 except ImportError:
     YFINANCE_AVAILABLE = False
 
-import requests
+from .bulk import write_wide, write_series_meta
+from .http_cache import cached_get
+from .transport import acquire
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +51,7 @@ def get_sp500_tickers() -> List[str]:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = cached_get(url, headers=headers, timeout=30)
         response.raise_for_status()
 
         tables = pd.read_html(StringIO(response.text))
@@ -224,6 +225,8 @@ class BreadthDataFetcher:
             try:
                 logger.info(f"   Batch {i//batch_size + 1}/{(len(tickers)-1)//batch_size + 1}: {len(batch)} tickers")
 
+                # yfinance uses its own HTTP client; take the slot from the shared YAHOO bucket
+                acquire("YAHOO")
                 data = yf.download(
                     batch_str,
                     start=start_date,
@@ -242,7 +245,6 @@ class BreadthDataFetcher:
                     if not closes[col].isna().all():
                         all_prices[col] = closes[col]
 
-                time.sleep(1)  # Rate limiting
 
             except Exception as e:
                 logger.warning(f"   Batch error: {e}")
@@ -268,9 +270,6 @@ class BreadthDataFetcher:
         Returns:
             Tuple of (series_count, observations_count)
         """
-        c = self.conn.cursor()
-        total_obs = 0
-
         # Get S&P 500 constituents
         tickers = get_sp500_tickers()
 
@@ -341,29 +340,19 @@ class BreadthDataFetcher:
             'SPX_BREADTH_THRUST': ('S&P 500 Breadth Thrust Signal', 'Binary'),
         }
 
-        for series_id, series_data in metrics_to_store.items():
-            obs_count = 0
-
-            for date, value in series_data.items():
-                if pd.notna(value) and np.isfinite(value):
-                    date_str = date.strftime('%Y-%m-%d')
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(value))
-                    )
-                    obs_count += 1
+        # One aligned frame -> one bulk write (NaN/inf dropped by the writer)
+        metrics = pd.DataFrame(metrics_to_store).astype(float)
+        total_obs = write_wide(self.conn, metrics, commit=False)
 
-            total_obs += obs_count
+        for series_id, obs_count in metrics.replace([np.inf, -np.inf], np.nan).count().items():
+            logger.info(f"   {series_id}: {obs_count:,} observations")
 
-            # Update metadata
+        # Update metadata
+        meta = []
+        for series_id in metrics_to_store:
             title, units = series_metadata.get(series_id, (series_id, 'Value'))
-            c.execute("""INSERT OR REPLACE INTO series_meta
-                        (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                        VALUES (?,?,?,?,?,?,?,?)""",
-                     (series_id, title, "Computed", "Market_Breadth", "Daily", units,
-                      datetime.now().isoformat(), datetime.now().isoformat()))
-
-            logger.info(f"   {series_id}: {obs_count:,} observations")
+            meta.append((series_id, title, "Computed", "Market_Breadth", "Daily", units))
+        write_series_meta(self.conn, meta)
 
         self.conn.commit()
 
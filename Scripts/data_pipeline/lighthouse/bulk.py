@@ -0,0 +1,324 @@
+"""
+LIGHTHOUSE MACRO - BULK OBSERVATION WRITER
+==========================================
+One write path for every fetcher. Accepts columnar input (DataFrame,
+Series, or NumPy arrays), builds the (series_id, date, value) rows in
+vectorized form, and writes them with one executemany per batch inside a
+single transaction.
+
+Works with a sqlite3.Connection or a writer.WriterConnection, so the same
+calls are used in sequential and concurrent pipeline runs.
+
+The index scripts (compute_indices, compute_crypto_indices) write
+lighthouse_indices the same way: long-format rows with vectorized status
+labels, one executemany in one transaction.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OBS_INSERT_SQL = "INSERT OR REPLACE INTO observations VALUES (?,?,?)"
+
+# Upsert keeps data_quality / obs_count from the last quality pass and
+# refreshes last_value_date (the incremental-fetch high-water mark).
+META_UPSERT_SQL = """INSERT INTO series_meta
+                    (series_id, title, source, category, frequency, units, last_updated, last_fetched,
+                     last_value_date)
+                    VALUES (?,?,?,?,?,?,?,?,
+                            (SELECT MAX(date) FROM observations WHERE series_id = ?))
+                    ON CONFLICT(series_id) DO UPDATE SET
+                        title = excluded.title,
+                        source = excluded.source,
+                        category = excluded.category,
+                        frequency = excluded.frequency,
+                        units = excluded.units,
+                        last_updated = excluded.last_updated,
+                        last_fetched = excluded.last_fetched,
+                        last_value_date = excluded.last_value_date"""
+
+# Connection-level settings for bulk loads. Nothing here persists in the
+# database file (no WAL switch), so backups that copy the .db stay valid.
+BULK_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -131072,  # 128 MB page cache (negative = KiB)
+}
+
+INDEX_TABLE_SQL = """CREATE TABLE IF NOT EXISTS lighthouse_indices (
+    date TEXT,
+    index_id TEXT,
+    value REAL,
+    status TEXT,
+    PRIMARY KEY (date, index_id)
+)"""
+
+INDEX_INSERT_SQL = "INSERT OR REPLACE INTO lighthouse_indices (date, index_id, value, status) VALUES (?,?,?,?)"
+
+INDEX_COLUMNS = ["date", "index_id", "value", "status"]
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+# ==========================================
+# CONNECTION SETUP
+# ==========================================
+
+def apply_bulk_pragmas(conn) -> None:
+    """Tune a connection for large INSERT OR REPLACE batches."""
+    for key, value in BULK_PRAGMAS.items():
+        conn.execute(f"PRAGMA {key} = {value}")
+
+
+# ==========================================
+# ROW BUILDING (VECTORIZED)
+# ==========================================
+
+def _format_dates(dates) -> np.ndarray:
+    """Dates as YYYY-MM-DD strings; datetime-likes are formatted in one pass."""
+    if isinstance(dates, pd.DatetimeIndex):
+        return dates.strftime("%Y-%m-%d").to_numpy(dtype=object)
+
+    arr = np.asarray(dates)
+    if np.issubdtype(arr.dtype, np.datetime64) or (
+        arr.dtype == object and len(arr) and isinstance(arr[0], (datetime, pd.Timestamp))
+    ):
+        return pd.DatetimeIndex(arr).strftime("%Y-%m-%d").to_numpy(dtype=object)
+    return arr.astype(str).astype(object)
+
+
+def observation_rows(
+    data: Union[pd.DataFrame, pd.Series, Tuple[Sequence, Sequence, Sequence]],
+    series_id: str = None,
+) -> List[tuple]:
+    """
+    Build (series_id, date, value) rows, dropping NaN/inf values.
+
+    Accepted inputs:
+        - DataFrame with 'series_id', 'date', 'value' columns (series_id
+          may be omitted when passed as an argument)
+        - Series indexed by date (requires series_id)
+        - Tuple of arrays (series_ids, dates, values); series_ids may be a
+          single string
+    """
+    if isinstance(data, pd.Series):
+        if series_id is None:
+            raise ValueError("series_id is required for Series input")
+        ids, dates, values = series_id, data.index, data.to_numpy()
+    elif isinstance(data, pd.DataFrame):
+        ids = data["series_id"].to_numpy() if "series_id" in data.columns else series_id
+        if ids is None:
+            raise ValueError("DataFrame needs a 'series_id' column or series_id argument")
+        dates = data["date"] if "date" in data.columns else data.index
+        if isinstance(dates, pd.Series):
+            dates = dates.to_numpy()
+        values = data["value"].to_numpy()
+    else:
+        ids, dates, values = data
+        if series_id is not None:
+            ids = series_id
+
+    values = np.asarray(values)
+    if values.dtype.kind not in "fiub":
+        # Strings from JSON payloads ('.', '', '1,234'): unparseable -> NaN
+        values = pd.to_numeric(values.astype(object), errors="coerce")
+    values = values.astype(np.float64)
+    mask = np.isfinite(values)
+    if not mask.any():
+        return []
+
+    date_strs = _format_dates(dates)[mask]
+    if isinstance(ids, str):
+        ids = np.full(mask.sum(), ids, dtype=object)
+    else:
+        ids = np.asarray(ids, dtype=object)[mask]
+
+    return list(zip(ids.tolist(), date_strs.tolist(), values[mask].tolist()))
+
+
+def wide_observation_rows(df: pd.DataFrame) -> List[tuple]:
+    """Rows from a wide frame (date index, one column per series_id)."""
+    if df.empty:
+        return []
+    n_dates, n_series = df.shape
+    dates = np.repeat(_format_dates(pd.DatetimeIndex(df.index)), n_series)
+    ids = np.tile(np.asarray(df.columns, dtype=object), n_dates)
+    return observation_rows((ids, dates, df.to_numpy(dtype=np.float64).ravel()))
+
+
+# ==========================================
+# WRITERS
+# ==========================================
+
+def drop_unchanged(conn, rows: List[tuple]) -> List[tuple]:
+    """Filter out rows whose (series_id, date) is already stored with the same value."""
+    if not rows:
+        return rows
+
+    ids = sorted({r[0] for r in rows})
+    min_date = min(r[1] for r in rows)
+    existing = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        for sid, date, value in conn.execute(
+            f"SELECT series_id, date, value FROM observations WHERE series_id IN ({placeholders}) AND date >= ?",
+            chunk + [min_date]
+        ).fetchall():
+            existing[(sid, date)] = value
+
+    return [r for r in rows if existing.get((r[0], r[1])) != r[2]]
+
+
+def write_rows(
+    conn,
+    rows: List[tuple],
+    batch_size: int = None,
+    commit: bool = True,
+    skip_unchanged: bool = True,
+) -> int:
+    """
+    Write prebuilt observation rows; one executemany per batch, one transaction.
+
+    With skip_unchanged, rows identical to what is stored are not rewritten,
+    so re-reading a revision window costs reads, not writes.
+    """
+    if skip_unchanged:
+        rows = drop_unchanged(conn, rows)
+    if not rows:
+        return 0
+
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    c = conn.cursor()
+    for start in range(0, len(rows), batch_size):
+        c.executemany(OBS_INSERT_SQL, rows[start:start + batch_size])
+    if commit:
+        conn.commit()
+    return len(rows)
+
+
+def write_observations(
+    conn,
+    data: Union[pd.DataFrame, pd.Series, Tuple[Sequence, Sequence, Sequence]],
+    series_id: str = None,
+    batch_size: int = None,
+    commit: bool = True,
+    skip_unchanged: bool = True,
+) -> int:
+    """
+    Bulk-write observations. See observation_rows for accepted inputs.
+
+    Returns:
+        Number of rows written (new or changed)
+    """
+    return write_rows(conn, observation_rows(data, series_id), batch_size, commit, skip_unchanged)
+
+
+def write_wide(
+    conn,
+    df: pd.DataFrame,
+    batch_size: int = None,
+    commit: bool = True,
+    skip_unchanged: bool = True,
+) -> int:
+    """Bulk-write a wide frame (date index, one column per series_id)."""
+    return write_rows(conn, wide_observation_rows(df), batch_size, commit, skip_unchanged)
+
+
+def write_series_meta(
+    conn,
+    entries: Iterable[Tuple[str, str, str, str, str, str]],
+    commit: bool = False,
+) -> int:
+    """
+    Upsert series_meta rows in one executemany.
+
+    Args:
+        entries: (series_id, title, source, category, frequency, units) tuples
+
+    Returns:
+        Number of rows written
+    """
+    now = datetime.now().isoformat()
+    rows = [tuple(e) + (now, now, e[0]) for e in entries]
+    if rows:
+        conn.cursor().executemany(META_UPSERT_SQL, rows)
+        if commit:
+            conn.commit()
+    return len(rows)
+
+
+# ==========================================
+# LIGHTHOUSE INDICES
+# ==========================================
+
+def status_labels(values, thresholds: List[Tuple[float, str]]) -> np.ndarray:
+    """
+    Status label per value: the first (threshold, label) the value is >= to,
+    "UNKNOWN" if none, "NO DATA" for NaN. Same rule as the scalar get_status.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if thresholds:
+        labels = np.select([values >= t for t, _ in thresholds],
+                           [label for _, label in thresholds], default="UNKNOWN").astype(object)
+    else:
+        labels = np.full(len(values), "UNKNOWN", dtype=object)
+    labels[np.isnan(values)] = "NO DATA"
+    return labels
+
+
+def index_rows(
+    indices: Dict[str, pd.Series],
+    thresholds: Dict[str, List[Tuple[float, str]]],
+    decimals: Union[int, Dict[str, int]] = 4,
+    status_keys: Dict[str, str] = None,
+    labels: Dict[str, pd.Series] = None,
+) -> pd.DataFrame:
+    """
+    Long-format lighthouse_indices rows (date, index_id, value, status).
+
+    Args:
+        indices: index_id -> Series indexed by date; NaNs are dropped
+        thresholds: Status thresholds keyed by index_id (or status_keys value)
+        decimals: Rounding for stored values, overall or per index_id
+        status_keys: index_id -> thresholds key, when an index borrows another's
+        labels: index_id -> status Series (by date) used instead of thresholds
+    """
+    status_keys = status_keys or {}
+    labels = labels or {}
+    frames = []
+    for index_id, series in indices.items():
+        series = series[series.notna()]
+        if series.empty:
+            continue
+        values = series.to_numpy(dtype=np.float64)
+        places = decimals.get(index_id, 4) if isinstance(decimals, dict) else decimals
+        frames.append(pd.DataFrame({
+            "date": _format_dates(series.index),
+            "index_id": index_id,
+            "value": np.round(values, places),
+            "status": (labels[index_id].reindex(series.index).to_numpy(dtype=object) if index_id in labels
+                       else status_labels(values, thresholds.get(status_keys.get(index_id, index_id), []))),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_index_rows(conn, df: pd.DataFrame, commit: bool = True) -> int:
+    """Upsert lighthouse_indices rows in one executemany (one transaction)."""
+    conn.execute(INDEX_TABLE_SQL)
+    if df.empty:
+        return 0
+    # Primary-key order: the b-tree is filled by appends instead of random inserts
+    df = df.sort_values(["date", "index_id"])
+    rows = list(zip(df["date"].tolist(), df["index_id"].tolist(), df["value"].tolist(), df["status"].tolist()))
+    conn.cursor().executemany(INDEX_INSERT_SQL, rows)
+    if commit:
+        conn.commit()
+    return len(rows)
@@ -0,0 +1,212 @@
+"""
+LIGHTHOUSE MACRO - CHART DATA CONTEXT
+=====================================
+One in-process data snapshot per chart module, in place of a database
+connection (and a query) per chart.
+
+A module declares the series it draws up front; the first read loads all
+of them at once:
+
+    - observations: one read of the columnar store (memory-mapped Parquet,
+      columnar.py), or one SQLite IN query when the store is not current
+    - horizon panel columns: one memory-mapped read of the horizon panel
+      (horizon_store.py), or of the Horizon_Dataset export (export.py) when
+      no panel has been built for the database
+
+Each source is pivoted once into a single float64 block (one contiguous row
+per series). Column reads are views of that block: nothing is copied, and
+copy-on-write keeps a chart that edits its column from changing the
+snapshot.
+
+Nothing is read at import, so chart modules import in milliseconds.
+
+Usage:
+    DATA = ChartDataContext(series=["VIXCLS", "TOTRESNS"], panel=["SOFR"])
+
+    vix = DATA.series("VIXCLS", start_date="2024-01-01")
+    date, value = DATA.latest("TOTRESNS")
+"""
+
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import horizon_store
+from .config import DB_PATH
+from .export import find_export, read_wide
+from .query import _pivot_long, _read_long
+
+logger = logging.getLogger(__name__)
+
+
+def _block(dates: np.ndarray, names: List[str], values: np.ndarray) -> pd.DataFrame:
+    """date x name frame over a (names x dates) C-contiguous array, without copying it."""
+    return pd.DataFrame(values.T, index=pd.DatetimeIndex(dates, name="date"),
+                        columns=pd.Index(names), copy=False)
+
+
+def _pivot_wide(df: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """Date-indexed frame -> one block (absent columns all-NaN)."""
+    df = df.reindex(columns=names)
+    values = np.ascontiguousarray(df.to_numpy(dtype="float64").T)
+    return _block(df.index.to_numpy(dtype="datetime64[ns]"), names, values)
+
+
+# ==========================================
+# CONTEXT
+# ==========================================
+
+class ChartDataContext:
+    """
+    Lazily loaded snapshot of a chart module's declared data.
+
+    Args:
+        series: Observation series ids (Lighthouse_Master.db)
+        panel: Horizon panel columns
+        start_date: Optional start date for both sources (YYYY-MM-DD)
+        db_path: Database the observations (and its horizon panel) belong to
+        panel_file: Horizon_Dataset export (stem or file) read when no panel is
+                    built; columnar files are preferred over CSV
+    """
+
+    def __init__(
+        self,
+        series: Sequence[str] = (),
+        panel: Sequence[str] = (),
+        start_date: str = None,
+        db_path: Path = None,
+        panel_file: Path = None,
+    ):
+        self.series_ids = list(dict.fromkeys(series))
+        self.panel_columns = list(dict.fromkeys(panel))
+        self.start_date = start_date
+        self.db_path = Path(db_path or DB_PATH)
+        self.panel_file = panel_file
+        self._observations: Optional[pd.DataFrame] = None
+        self._panel: Optional[pd.DataFrame] = None
+        self._queries: Dict[tuple, pd.DataFrame] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ---- loading ----
+
+    def _load_observations(self) -> pd.DataFrame:
+        start = time.perf_counter()
+        long = _read_long(self.series_ids, self.start_date, None, self.db_path) if self.series_ids else None
+        if long is None or long.empty:
+            block = _block(np.array([], dtype="datetime64[ns]"), self.series_ids, np.empty((len(self.series_ids), 0)))
+        else:
+            dates, values = _pivot_long(long.dropna(subset=["date"]), self.series_ids)
+            block = _block(dates, self.series_ids, values)
+        logger.info(f"Chart data: {len(self.series_ids)} series x {len(block):,} dates "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return block
+
+    def _load_panel(self) -> pd.DataFrame:
+        start = time.perf_counter()
+        df = horizon_store.read_panel(self.panel_columns, start_date=self.start_date, db_path=self.db_path)
+        path = find_export(self.panel_file) if df is None and self.panel_file else None
+        if path is not None:
+            logger.info(f"No horizon panel for {self.db_path.name}; reading {path.name}")
+            df = read_wide(path, self.panel_columns)
+            if self.start_date:
+                df = df.loc[self.start_date:]
+        if df is None:
+            logger.warning("No horizon panel or dataset export; panel columns are empty")
+            df = pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        block = _pivot_wide(df, self.panel_columns)
+        logger.info(f"Chart data: {len(self.panel_columns)} panel columns x {len(block):,} dates "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return block
+
+    def load(self) -> "ChartDataContext":
+        """Load both sources now (otherwise each loads on first read)."""
+        if self._observations is None:
+            self._observations = self._load_observations()
+        if self._panel is None and self.panel_columns:
+            self._panel = self._load_panel()
+        return self
+
+    def _source(self, name: str) -> pd.DataFrame:
+        """Block holding name; undeclared names are added and their source reloaded."""
+        if name in self.panel_columns:
+            if self._panel is None:
+                self._panel = self._load_panel()
+            return self._panel
+        if name not in self.series_ids:
+            logger.warning(f"Chart data: {name} was not declared; reloading observations")
+            self.series_ids.append(name)
+            self._observations = None
+        if self._observations is None:
+            self._observations = self._load_observations()
+        return self._observations
+
+    # ---- reads ----
+
+    @property
+    def observations(self) -> pd.DataFrame:
+        """All declared series (date x series_id), NaN where a series has no value."""
+        if self._observations is None:
+            self._observations = self._load_observations()
+        return self._observations
+
+    @property
+    def panel(self) -> pd.DataFrame:
+        """All declared panel columns (date x column)."""
+        if self._panel is None:
+            self._panel = self._load_panel()
+        return self._panel
+
+    def column(self, name: str) -> pd.Series:
+        """Full aligned column (view of the snapshot)."""
+        return self._source(name)[name]
+
+    def series(self, name: str, start_date=None, end_date=None, dropna: bool = True) -> pd.Series:
+        """A series or panel column over a date range, NaN dates dropped by default."""
+        s = self.column(name).loc[start_date:end_date]
+        return s.dropna() if dropna else s
+
+    def frame(self, names: Dict[str, str], start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Several series/columns side by side, renamed {name: label}, on the
+        dates where at least one has a value.
+        """
+        df = pd.DataFrame({label: self.column(name).loc[start_date:end_date] for name, label in names.items()})
+        return df.dropna(how="all")
+
+    def latest(self, name: str) -> Tuple[Optional[pd.Timestamp], Optional[float]]:
+        """Latest (date, value) of a series, (None, None) without data."""
+        s = self.column(name)
+        valid = np.flatnonzero(~np.isnan(s.to_numpy()))
+        if not len(valid):
+            return None, None
+        return s.index[valid[-1]], float(s.iloc[valid[-1]])
+
+    def value_between(self, name: str, start_date, end_date) -> Optional[float]:
+        """Latest value of a series between two dates (None if there is none)."""
+        s = self.series(name, start_date, end_date)
+        return float(s.iloc[-1]) if len(s) else None
+
+    # ---- other tables ----
+
+    def sql(self, query: str, params: Sequence = (), parse_dates: List[str] = None) -> pd.DataFrame:
+        """
+        Result of a read query on the database, run once per (query, params)
+        over one shared connection. Callers get a copy-on-write copy.
+        """
+        key = (query, tuple(params), tuple(parse_dates or ()))
+        if key not in self._queries:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path)
+            self._queries[key] = pd.read_sql(query, self._conn, params=list(params), parse_dates=parse_dates)
+        return self._queries[key].copy(deep=False)
+
+    def close(self):
+        """Close the shared connection (the snapshot stays readable)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,292 @@
+"""
+LIGHTHOUSE MACRO - COLUMNAR OBSERVATION STORE
+=============================================
+Parquet mirror of the observations table for analytical reads.
+
+Layout (next to the database, e.g. Lighthouse_Master_columnar/):
+    source=FRED/part-0.parquet
+    source=BLS/part-0.parquet
+    ...
+    _manifest.json
+
+Each partition holds (series_id, date, value) as dictionary string / date32 /
+float64, sorted by series_id then date, with a small _index.json mapping each
+series to its row groups. Partitions are rewritten only when their source's
+fingerprint has changed since the last refresh: series count and latest
+last_fetched in series_meta, plus observation count and highest rowid (every
+INSERT OR REPLACE takes a new rowid), so writes that skip series_meta count.
+
+Reads memory-map the partition files and decode only the row groups that
+hold the requested series; the date range is then filtered in Arrow. The
+store is used only while its manifest matches the database; otherwise
+callers fall back to SQLite.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .config import DB_PATH, COLUMNAR_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+INDEX_NAME = "_index.json"
+
+_FINGERPRINT_SQL = """
+    SELECT COALESCE(source, 'UNKNOWN'), COUNT(*), MAX(last_fetched)
+    FROM series_meta
+    GROUP BY COALESCE(source, 'UNKNOWN')
+"""
+
+_OBS_FINGERPRINT_SQL = """
+    SELECT COALESCE(m.source, 'UNKNOWN'), COUNT(*), MAX(o.rowid)
+    FROM observations o
+    JOIN series_meta m ON m.series_id = o.series_id
+    GROUP BY COALESCE(m.source, 'UNKNOWN')
+"""
+
+# Whole-table version of the observation fingerprint, cheap enough for every read
+_OBS_TOTAL_SQL = "SELECT COUNT(*), MAX(rowid) FROM observations"
+
+_PARTITION_SQL = """
+    SELECT o.series_id, o.date, o.value
+    FROM observations o
+    JOIN series_meta m ON m.series_id = o.series_id
+    WHERE COALESCE(m.source, 'UNKNOWN') = ?
+    ORDER BY o.series_id, o.date
+"""
+
+
+def store_path(db_path: Path = None) -> Path:
+    """Columnar store directory for a database (sits beside the .db file)."""
+    db_path = Path(db_path or DB_PATH)
+    return db_path.with_name(f"{db_path.stem}_columnar")
+
+
+def _partition_dir(root: Path, source: str) -> Path:
+    return root / f"source={re.sub(r'[^A-Za-z0-9_.-]', '_', source)}"
+
+
+def _meta_fingerprints(conn: sqlite3.Connection) -> Dict[str, list]:
+    return {source: [count, last_fetched] for source, count, last_fetched in conn.execute(_FINGERPRINT_SQL)}
+
+
+def _fingerprints(conn: sqlite3.Connection) -> Dict[str, list]:
+    """Per source: [series count, latest last_fetched, observation count, highest observation rowid]."""
+    observations = {source: [count, max_rowid] for source, count, max_rowid in conn.execute(_OBS_FINGERPRINT_SQL)}
+    return {source: meta + observations.get(source, [0, None])
+            for source, meta in _meta_fingerprints(conn).items()}
+
+
+def _observation_total(conn: sqlite3.Connection) -> list:
+    return list(conn.execute(_OBS_TOTAL_SQL).fetchone())
+
+
+def _read_manifest(root: Path) -> Optional[dict]:
+    try:
+        with open(root / MANIFEST_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ==========================================
+# REFRESH
+# ==========================================
+
+def _write_partition(conn: sqlite3.Connection, root: Path, source: str) -> int:
+    """Rewrite one source's partition from SQLite. Returns rows written."""
+    df = pd.read_sql(_PARTITION_SQL, conn, params=[source])
+    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d", errors="coerce")
+    df = df.dropna(subset=["date"])
+
+    table = pa.table({
+        "series_id": pa.array(df["series_id"].to_numpy(), pa.string()).dictionary_encode(),
+        "date": pa.array(df["date"].to_numpy().astype("datetime64[D]"), pa.date32()),
+        "value": pa.array(df["value"].to_numpy(dtype="float64"), pa.float64()),
+    })
+
+    # Rows are sorted by series_id: first/last row of each series -> row groups
+    group_size = COLUMNAR_CONFIG["row_group_size"]
+    ids = df["series_id"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=int)
+    ends = np.r_[starts[1:], len(ids)] - 1
+    index = {sid: [int(a) // group_size, int(b) // group_size]
+             for sid, a, b in zip(ids[starts].tolist(), starts, ends)}
+
+    part_dir = _partition_dir(root, source)
+    part_dir.mkdir(parents=True, exist_ok=True)
+    tmp = part_dir / "part-0.parquet.tmp"
+    pq.write_table(table, tmp, row_group_size=group_size, compression=COLUMNAR_CONFIG["compression"])
+    with open(part_dir / (INDEX_NAME + ".tmp"), "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, part_dir / "part-0.parquet")
+    os.replace(part_dir / (INDEX_NAME + ".tmp"), part_dir / INDEX_NAME)
+    return table.num_rows
+
+
+def refresh_columnar_store(db_path: Path = None, force: bool = False) -> Dict[str, int]:
+    """
+    Bring the Parquet mirror up to date with the database.
+
+    Only sources whose fingerprint changed are rewritten.
+
+    Args:
+        db_path: Optional custom database path
+        force: Rewrite every partition
+
+    Returns:
+        Dict of source -> rows written (rewritten partitions only)
+    """
+    if not PYARROW_AVAILABLE:
+        logger.warning("pyarrow not installed; columnar store not refreshed. Run: pip install pyarrow")
+        return {}
+
+    db_path = Path(db_path or DB_PATH)
+    root = store_path(db_path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    manifest = None if force else _read_manifest(root)
+    if manifest and manifest.get("db_path") != str(db_path.resolve()):
+        manifest = None
+    old = (manifest or {}).get("sources", {})
+
+    conn = sqlite3.connect(db_path)
+    try:
+        current = _fingerprints(conn)
+        total = _observation_total(conn)
+        written = {}
+        for source, fingerprint in current.items():
+            if old.get(source) == fingerprint and _partition_dir(root, source).exists():
+                continue
+            t0 = time.time()
+            written[source] = _write_partition(conn, root, source)
+            logger.info(f"   Columnar {source}: {written[source]:,} rows ({time.time() - t0:.1f}s)")
+    finally:
+        conn.close()
+
+    for source in set(old) - set(current):
+        shutil.rmtree(_partition_dir(root, source), ignore_errors=True)
+
+    tmp = root / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({
+            "db_path": str(db_path.resolve()),
+            "refreshed": pd.Timestamp.now().isoformat(),
+            "sources": current,
+            "observations": total,
+        }, f, indent=1)
+    os.replace(tmp, root / MANIFEST_NAME)
+    return written
+
+
+# ==========================================
+# READS
+# ==========================================
+
+_partitions: Dict[str, tuple] = {}
+_partitions_lock = threading.Lock()
+
+
+def _open_partitions(root: Path) -> list:
+    """(memory-mapped ParquetFile, series index) per partition, reopened when the manifest changes."""
+    mtime = (root / MANIFEST_NAME).stat().st_mtime
+    with _partitions_lock:
+        cached = _partitions.get(str(root))
+        if cached and cached[0] == mtime:
+            return cached[1]
+        parts = []
+        for part_dir in sorted(root.glob("source=*")):
+            try:
+                with open(part_dir / INDEX_NAME) as f:
+                    index = json.load(f)
+                parts.append((pq.ParquetFile(part_dir / "part-0.parquet", memory_map=True), index))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Columnar partition {part_dir.name} unreadable: {e}")
+        _partitions[str(root)] = (mtime, parts)
+        return parts
+
+
+def is_current(db_path: Path = None) -> bool:
+    """
+    True if the store exists and matches the database: the series_meta
+    fingerprints per source, and the observation count and highest rowid of
+    the whole table (one cheap query instead of the per-source scan).
+    """
+    if not PYARROW_AVAILABLE or not COLUMNAR_CONFIG["enabled"]:
+        return False
+    db_path = Path(db_path or DB_PATH)
+    manifest = _read_manifest(store_path(db_path))
+    if not manifest or manifest.get("db_path") != str(db_path.resolve()):
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        sources = manifest.get("sources") or {}
+        return (_meta_fingerprints(conn) == {source: fp[:2] for source, fp in sources.items()}
+                and _observation_total(conn) == manifest.get("observations"))
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def read_observations(
+    series_ids: List[str],
+    start_date: str = None,
+    end_date: str = None,
+    db_path: Path = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Long-format observations (series_id, date, value) from the columnar store.
+    series_id comes back as a categorical column.
+
+    Returns None when the store is missing or stale, so callers can fall
+    back to SQLite.
+    """
+    if not is_current(db_path):
+        return None
+
+    wanted = set(series_ids)
+    value_set = pa.array(sorted(wanted), pa.string())
+    tables = []
+    for parquet_file, index in _open_partitions(store_path(db_path)):
+        groups = sorted({g for sid in wanted if sid in index
+                         for g in range(index[sid][0], index[sid][1] + 1)})
+        if not groups:
+            continue
+        table = parquet_file.read_row_groups(groups, columns=["series_id", "date", "value"])
+        mask = pc.is_in(table["series_id"].cast(pa.string()), value_set=value_set)
+        if start_date:
+            mask = pc.and_(mask, pc.greater_equal(table["date"], pa.scalar(pd.Timestamp(start_date).date(), pa.date32())))
+        if end_date:
+            mask = pc.and_(mask, pc.less_equal(table["date"], pa.scalar(pd.Timestamp(end_date).date(), pa.date32())))
+        tables.append(table.filter(mask))
+
+    if not tables:
+        return pd.DataFrame({"series_id": pd.Series(dtype=object),
+                             "date": pd.Series(dtype="datetime64[ns]"),
+                             "value": pd.Series(dtype="float64")})
+
+    # series_id stays categorical (decoding 1M+ dictionary strings dominates otherwise)
+    df = pa.concat_tables(tables).to_pandas(date_as_object=False)
+    df["date"] = df["date"].astype("datetime64[ns]")
+    return df
@@ -602,12 +602,139 @@ FETCH_CONFIG = {
     "max_retries": 3,
     "retry_delay_base": 2,  # Exponential backoff base
     "timeout": 30,
-    "rate_limit_delay": 0.1,  # Delay between requests
     "fred_category_limit": 50,  # Series per category
     "bls_start_year": 1990,
     "bea_start_year": 2000,
     "nyfed_start_date": "2018-04-03",
-    "parallel_workers": 5,  # For parallel fetching
+    "parallel_workers": 5,  # Concurrent sources in run_daily_update (1 = sequential)
+    "crypto_workers": 4,  # Concurrent protocol/coin requests within the DefiLlama and CoinGecko fetchers
+    "writer_queue_size": 1000,  # Pending write batches before fetchers block
+    # Incremental fetch: history re-read before each series' last_value_date
+    # to pick up revisions (BLS/BEA benchmark and annual revisions reach back ~2y)
+    "revision_window_months": {
+        "FRED": 24,
+        "BLS": 24,
+        "BEA": 24,
+        "NYFED": 1,
+        "OFR": 3,
+        "YAHOO": 1,
+        "AAII": 3,
+        "DERIVED": 1,
+        "DEFILLAMA": 1,
+        "COINGECKO": 0,
+    },
+    "spx_warmup_days": 550,  # Price history needed for 252d z-score of 63d RoC
+    "http_pool_size": 10,  # Keep-alive connections per host in the shared session
+    "max_retry_after": 120,  # Cap (seconds) on honoring a server's Retry-After
+}
+
+# ==========================================
+# HTTP TRANSPORT
+# ==========================================
+
+# URL host -> source name (rate limits and cache TTLs are keyed by source)
+HOST_SOURCES = {
+    "api.stlouisfed.org": "FRED",
+    "api.bls.gov": "BLS",
+    "apps.bea.gov": "BEA",
+    "markets.newyorkfed.org": "NYFED",
+    "data.financialresearch.gov": "OFR",
+    "www.financialresearch.gov": "OFR",
+    "api.fiscaldata.treasury.gov": "TREASURY",
+    "query1.finance.yahoo.com": "YAHOO",
+    "query2.finance.yahoo.com": "YAHOO",
+    "www.aaii.com": "AAII",
+    "api.llama.fi": "DEFILLAMA",
+    "stablecoins.llama.fi": "DEFILLAMA",
+    "coins.llama.fi": "DEFILLAMA",
+    "api.coingecko.com": "COINGECKO",
+    "api.tokenterminal.com": "TOKEN_TERMINAL",
+    "en.wikipedia.org": "WIKIPEDIA",
+}
+
+# Token bucket per source: `rate` requests per `per` seconds, bursting to
+# `burst`. Daily quotas (BLS) are enforced per process only.
+RATE_LIMITS = {
+    "FRED": {"rate": 120, "per": 60, "burst": 20},
+    "BLS": {"rate": 500, "per": 86400, "burst": 50},
+    "BEA": {"rate": 100, "per": 60, "burst": 10},
+    "NYFED": {"rate": 5, "per": 1, "burst": 5},
+    "OFR": {"rate": 5, "per": 1, "burst": 5},
+    "TREASURY": {"rate": 5, "per": 1, "burst": 5},
+    "YAHOO": {"rate": 1, "per": 1, "burst": 2},
+    "AAII": {"rate": 1, "per": 1, "burst": 1},
+    "WIKIPEDIA": {"rate": 1, "per": 1, "burst": 1},
+    "DEFILLAMA": {"rate": 5, "per": 1, "burst": 5},
+    "COINGECKO": {"rate": 30, "per": 60, "burst": 5},
+    "TOKEN_TERMINAL": {"rate": 4, "per": 1, "burst": 4},
+}
+
+# ==========================================
+# HTTP RESPONSE CACHE
+# ==========================================
+
+HTTP_CACHE_CONFIG = {
+    "path": Path(os.getenv("LIGHTHOUSE_HTTP_CACHE", str(OUTPUT_DIR / "http_cache.db"))),
+    "max_bytes": 512 * 1024 * 1024,  # LRU eviction above this
+    "offline": os.getenv("LIGHTHOUSE_OFFLINE", "0") == "1",  # Serve only from cache
+    "default_ttl": 3600,  # Seconds, for hosts not listed below
+    # Freshness per source; after expiry the entry is revalidated with
+    # If-None-Match / If-Modified-Since where the server sent validators
+    "ttl_seconds": {
+        "FRED": 6 * 3600,
+        "BLS": 12 * 3600,
+        "BEA": 12 * 3600,
+        "NYFED": 2 * 3600,
+        "OFR": 6 * 3600,
+        "TREASURY": 6 * 3600,
+        "YAHOO": 15 * 60,
+        "AAII": 12 * 3600,
+        "DEFILLAMA": 3600,
+        "COINGECKO": 30 * 60,
+        "TOKEN_TERMINAL": 6 * 3600,
+        "WIKIPEDIA": 24 * 3600,
+    },
+    # Query / JSON body fields never included in cache keys
+    "secret_params": ("api_key", "apikey", "registrationkey", "userid", "key", "token"),
+}
+
+# ==========================================
+# CHART RENDER CACHE
+# ==========================================
+
+# Charts whose data slice, code and style are unchanged since the last run
+# keep their existing file (see render_cache.py)
+RENDER_CACHE_CONFIG = {
+    "manifest_name": "_render_manifest.json",  # One per output directory
+    "force": os.getenv("LIGHTHOUSE_RENDER_FORCE", "0") == "1",  # Re-render everything
+}
+
+# ==========================================
+# COLUMNAR STORE
+# ==========================================
+
+# Parquet mirror of observations beside the database
+# (<db stem>_columnar/source=<SOURCE>/part-0.parquet)
+COLUMNAR_CONFIG = {
+    "enabled": os.getenv("LIGHTHOUSE_COLUMNAR", "1") != "0",  # 0 = always read SQLite
+    "row_group_size": 32768,  # Rows per group; smaller = finer series skipping
+    "compression": "zstd",
+}
+
+# Horizon panel (date x series/transform) as one Parquet file per build
+# beside the database (<db stem>_horizon.parquet + _horizon_index.json)
+HORIZON_STORE_CONFIG = {
+    "row_group_size": 2048,  # Days per row group; date-range reads skip the rest
+    "compression": "zstd",
+    "sqlite_table": os.getenv("LIGHTHOUSE_HORIZON_SQLITE", "0") == "1",  # Also keep the wide SQLite table
+}
+
+# Dataset exports in OUTPUT_DIR (Horizon_Dataset, Lighthouse_Full_*, Lighthouse_Master_*)
+EXPORT_CONFIG = {
+    "format": os.getenv("LIGHTHOUSE_EXPORT_FORMAT", "parquet"),  # parquet | arrow (IPC file) | csv
+    "csv": os.getenv("LIGHTHOUSE_EXPORT_CSV", "0") == "1",  # Also write the CSV copy
+    "compression": "zstd",
+    "long_chunk_rows": 1_000_000,  # Rows buffered per long-format chunk (one row group / batch)
 }
 
 # ==========================================
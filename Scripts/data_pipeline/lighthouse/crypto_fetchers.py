@@ -9,7 +9,6 @@ Integrates with the on-chain framework from:
 """
 
 import sqlite3
-import time
 import logging
 from datetime import datetime
 from typing import Tuple, List, Dict, Optional
@@ -22,7 +21,6 @@ sys.path.insert(0, '/Users/bob/LHM')
 from lighthouse_quant.crypto.token_terminal import TokenTerminalClient
 from lighthouse_quant.crypto.fundamentals import CryptoFundamentalsEngine, ProtocolAnalysis
 
-from .config import FETCH_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -210,13 +208,9 @@ class CryptoFetcher:
 
         logger.info(f"Fetching metrics for {len(project_ids)} protocols...")
 
-        for pid in project_ids:
+        # Projects are fetched concurrently and written here as they arrive
+        for pid, df in self.client.iter_metrics(project_ids, days=days, metric_ids=CRYPTO_METRICS):
             try:
-                logger.info(f"   {pid}...")
-
-                # Fetch metrics from Token Terminal
-                df = self.client.get_metrics(pid, days=days, metric_ids=CRYPTO_METRICS)
-
                 if df.empty:
                     logger.warning(f"   {pid}: No data")
                     continue
@@ -249,9 +243,6 @@ class CryptoFetcher:
                 total_obs += obs_count
                 logger.info(f"   {pid}: {obs_count:,} observations")
 
-                # Rate limiting
-                time.sleep(FETCH_CONFIG.get("rate_limit_delay", 0.25))
-
             except Exception as e:
                 logger.error(f"   {pid}: Error - {e}")
                 continue
@@ -281,12 +272,11 @@ class CryptoFetcher:
 
         logger.info(f"Computing fundamentals for {len(project_ids)} protocols...")
 
-        for pid in project_ids:
+        # Analyses run concurrently; results are stored here as they finish
+        for pid, future in self.client.map_projects(self.engine.analyze_protocol, project_ids):
             try:
-                logger.info(f"   {pid}...")
-
                 # Run LHM fundamental analysis
-                analysis = self.engine.analyze_protocol(pid)
+                analysis = future.result()
 
                 if analysis is None:
                     logger.warning(f"   {pid}: Insufficient data")
@@ -315,9 +305,6 @@ class CryptoFetcher:
                 total_analyzed += 1
                 logger.info(f"   {pid}: {analysis.verdict.value} (Score: {analysis.overall_score})")
 
-                # Rate limiting (analysis already made API calls)
-                time.sleep(FETCH_CONFIG.get("rate_limit_delay", 0.1))
-
             except Exception as e:
                 logger.error(f"   {pid}: Error - {e}")
                 continue
@@ -6,16 +6,30 @@ Replaces Token Terminal with free APIs:
 - CoinGecko: Price data (30 calls/min free)
 
 No API keys required!
+
+Per-protocol and per-coin histories are requested concurrently on each
+fetcher's session (FETCH_CONFIG["crypto_workers"] in flight, paced by the
+DEFILLAMA / COINGECKO token buckets). Responses are parsed and written on the
+calling thread, one bulk batch per protocol, from its high-water mark on.
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import sqlite3
-import time
 import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Tuple, List, Dict, Optional
+from typing import Iterator, Tuple, List, Dict, Optional
+
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.tz import tzlocal
+
+from .bulk import write_observations, write_rows, write_series_meta
+from .config import FETCH_CONFIG
+from .http_cache import CachedSession
+from .incremental import revision_start, days_since
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +117,76 @@ COINGECKO_IDS = {
 }
 
 
+# ==========================================
+# HELPERS
+# ==========================================
+
+def _get_json(session, url: str, params: dict = None) -> Tuple[int, Optional[dict]]:
+    r = session.get(url, params=params, timeout=30)
+    return r.status_code, (r.json() if r.status_code == 200 else None)
+
+
+def fetch_concurrently(
+    session,
+    requests: Dict[str, Tuple[str, Optional[dict]]],
+    workers: int = None
+) -> Iterator[Tuple[str, Future]]:
+    """
+    GET every key's (url, params) on a thread pool.
+
+    Yields:
+        (key, completed future of (status_code, json or None)) in completion
+        order. Only the network and JSON decoding run on the pool, so callers
+        keep their sqlite connection on their own thread.
+    """
+    if not requests:
+        return
+    workers = workers or FETCH_CONFIG["crypto_workers"]
+    with ThreadPoolExecutor(max_workers=min(workers, len(requests))) as pool:
+        futures = {pool.submit(_get_json, session, url, params): key for key, (url, params) in requests.items()}
+        for future in as_completed(futures):
+            yield futures[future], future
+
+
+def _local_timezone():
+    """The machine's IANA zone (TZ, else /etc/localtime); dateutil's tzlocal (slower in pandas) if unknown."""
+    name = os.environ.get('TZ', '').lstrip(':')
+    if not name:
+        path = os.path.realpath('/etc/localtime')
+        name = path.split('zoneinfo/', 1)[1] if 'zoneinfo/' in path else ''
+    try:
+        return ZoneInfo(name)
+    except (ValueError, ZoneInfoNotFoundError):
+        return tzlocal()
+
+
+def timestamps_to_dates(seconds) -> np.ndarray:
+    """
+    Unix timestamps as 'YYYY-MM-DD' strings in one pass. Local time, as
+    datetime.fromtimestamp gave when the stored history was written.
+    """
+    stamps = pd.to_datetime(np.asarray(seconds, dtype=np.float64), unit='s', utc=True)
+    days = stamps.tz_convert(_local_timezone()).tz_localize(None).to_numpy().astype('datetime64[D]')
+    return days.astype(str).astype(object)
+
+
+def tvl_points(history: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (timestamps, values) of a DefiLlama TVL history, given as
+    {date, totalLiquidityUSD} dicts or [ts, value] pairs. Zero or missing
+    points are dropped.
+    """
+    if history and isinstance(history[0], dict):
+        frame = pd.DataFrame.from_records(history, columns=['date', 'totalLiquidityUSD'])
+    else:
+        frame = pd.DataFrame([p[:2] for p in history if isinstance(p, list) and len(p) >= 2],
+                             columns=['date', 'totalLiquidityUSD'])
+    ts = pd.to_numeric(frame['date'], errors='coerce').to_numpy(dtype=np.float64)
+    values = pd.to_numeric(frame['totalLiquidityUSD'], errors='coerce').to_numpy(dtype=np.float64)
+    keep = ~np.isnan(ts) & (ts != 0) & ~np.isnan(values) & (values != 0)
+    return ts[keep], values[keep]
+
+
 # ==========================================
 # DEFILLAMA FETCHER
 # ==========================================
@@ -110,9 +194,10 @@ COINGECKO_IDS = {
 class DefiLlamaFetcher:
     """Fetch DeFi data from DefiLlama (free, no auth)."""
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
-        self.session = requests.Session()
+        self.full_refresh = full_refresh
+        self.session = CachedSession()
         self.session.headers.update({
             'Accept': 'application/json',
             'User-Agent': 'LighthouseMacro/1.0'
@@ -120,62 +205,53 @@ class DefiLlamaFetcher:
 
     def fetch_all_tvl(self) -> Tuple[int, int]:
         """Fetch TVL for all tracked protocols."""
-        c = self.conn.cursor()
         total_obs = 0
         protocols_updated = 0
 
         logger.info("Fetching TVL data from DefiLlama...")
 
-        for protocol_id, name in DEFI_PROTOCOLS.items():
+        # High-water marks up front (the connection stays on this thread). The
+        # endpoint always returns full history; only the revision window is written.
+        series_ids = {pid: f"DEFI_{pid.upper().replace('-', '_')}_TVL" for pid in DEFI_PROTOCOLS}
+        since = {
+            pid: revision_start(self.conn, "DEFILLAMA", [series_id], full_refresh=self.full_refresh)
+            for pid, series_id in series_ids.items()
+        }
+        requests = {pid: (f"{DEFILLAMA_BASE}/protocol/{pid}", None) for pid in DEFI_PROTOCOLS}
+
+        for protocol_id, future in fetch_concurrently(self.session, requests):
+            name = DEFI_PROTOCOLS[protocol_id]
             try:
-                url = f"{DEFILLAMA_BASE}/protocol/{protocol_id}"
-                r = self.session.get(url, timeout=30)
+                status, data = future.result()
 
-                if r.status_code != 200:
-                    logger.warning(f"   {name}: HTTP {r.status_code}")
+                if status != 200:
+                    logger.warning(f"   {name}: HTTP {status}")
                     continue
 
-                data = r.json()
-
                 # Get TVL history
                 tvl_history = data.get('tvl', [])
                 if not tvl_history:
                     tvl_history = data.get('chainTvls', {}).get('combined', {}).get('tvl', [])
 
-                obs_count = 0
-                for point in tvl_history:
-                    if isinstance(point, dict):
-                        ts = point.get('date')
-                        value = point.get('totalLiquidityUSD')
-                    elif isinstance(point, list) and len(point) >= 2:
-                        ts, value = point[0], point[1]
-                    else:
-                        continue
-
-                    if ts and value:
-                        date_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                        series_id = f"DEFI_{protocol_id.upper().replace('-', '_')}_TVL"
-                        c.execute(
-                            "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                            (series_id, date_str, float(value))
-                        )
-                        obs_count += 1
+                ts, values = tvl_points(tvl_history)
+                dates = timestamps_to_dates(ts)
+                if since[protocol_id] is not None:
+                    keep = dates >= since[protocol_id]
+                    dates, values = dates[keep], values[keep]
+
+                series_id = series_ids[protocol_id]
+                obs_count = write_observations(self.conn, (series_id, dates, values), commit=False)
 
                 if obs_count > 0:
                     # Update metadata
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (f"DEFI_{protocol_id.upper().replace('-', '_')}_TVL",
-                              f"{name} TVL", "DefiLlama", "Crypto_TVL", "Daily", "USD",
-                              datetime.now().isoformat(), datetime.now().isoformat()))
+                    write_series_meta(self.conn, [
+                        (series_id, f"{name} TVL", "DefiLlama", "Crypto_TVL", "Daily", "USD")
+                    ])
 
                     protocols_updated += 1
                     total_obs += obs_count
                     logger.info(f"   {name}: {obs_count:,} observations")
 
-                time.sleep(0.2)  # Rate limiting
-
             except Exception as e:
                 logger.error(f"   {name}: Error - {e}")
                 continue
@@ -185,7 +261,6 @@ class DefiLlamaFetcher:
 
     def fetch_all_fees(self) -> Tuple[int, int]:
         """Fetch fees/revenue for all protocols."""
-        c = self.conn.cursor()
         total_obs = 0
         protocols_updated = 0
 
@@ -202,6 +277,7 @@ class DefiLlamaFetcher:
 
             data = r.json()
             protocols = data.get('protocols', [])
+            rows, meta = [], []
 
             for protocol in protocols:
                 name = protocol.get('name', '')
@@ -219,32 +295,18 @@ class DefiLlamaFetcher:
 
                 if daily_fees:
                     series_id = f"DEFI_{protocol_id.upper().replace('-', '_')}_FEES"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(daily_fees))
-                    )
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, f"{name} Daily Fees", "DefiLlama", "Crypto_Fees",
-                              "Daily", "USD", datetime.now().isoformat(), datetime.now().isoformat()))
-                    total_obs += 1
+                    rows.append((series_id, date_str, float(daily_fees)))
+                    meta.append((series_id, f"{name} Daily Fees", "DefiLlama", "Crypto_Fees", "Daily", "USD"))
 
                 if daily_revenue:
                     series_id = f"DEFI_{protocol_id.upper().replace('-', '_')}_REVENUE"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(daily_revenue))
-                    )
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, f"{name} Daily Revenue", "DefiLlama", "Crypto_Revenue",
-                              "Daily", "USD", datetime.now().isoformat(), datetime.now().isoformat()))
-                    total_obs += 1
+                    rows.append((series_id, date_str, float(daily_revenue)))
+                    meta.append((series_id, f"{name} Daily Revenue", "DefiLlama", "Crypto_Revenue", "Daily", "USD"))
 
                 protocols_updated += 1
 
+            total_obs += write_rows(self.conn, rows, commit=False)
+            write_series_meta(self.conn, meta)
             self.conn.commit()
             logger.info(f"   Fees/revenue: {protocols_updated} protocols, {total_obs} observations")
 
@@ -255,7 +317,6 @@ class DefiLlamaFetcher:
 
     def fetch_chain_tvl(self) -> Tuple[int, int]:
         """Fetch aggregate TVL by chain."""
-        c = self.conn.cursor()
         total_obs = 0
         chains_updated = 0
 
@@ -270,6 +331,7 @@ class DefiLlamaFetcher:
 
             chains = r.json()
             date_str = datetime.now().strftime('%Y-%m-%d')
+            rows, meta = [], []
 
             for chain in chains:
                 name = chain.get('name', '')
@@ -277,18 +339,12 @@ class DefiLlamaFetcher:
 
                 if name and tvl:
                     series_id = f"CHAIN_{name.upper().replace(' ', '_')}_TVL"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(tvl))
-                    )
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, f"{name} Chain TVL", "DefiLlama", "Crypto_Chain_TVL",
-                              "Daily", "USD", datetime.now().isoformat(), datetime.now().isoformat()))
-                    total_obs += 1
+                    rows.append((series_id, date_str, float(tvl)))
+                    meta.append((series_id, f"{name} Chain TVL", "DefiLlama", "Crypto_Chain_TVL", "Daily", "USD"))
                     chains_updated += 1
 
+            total_obs += write_rows(self.conn, rows, commit=False)
+            write_series_meta(self.conn, meta)
             self.conn.commit()
             logger.info(f"   Chain TVL: {chains_updated} chains")
 
@@ -299,7 +355,6 @@ class DefiLlamaFetcher:
 
     def fetch_stablecoin_tvl(self) -> Tuple[int, int]:
         """Fetch stablecoin market cap data."""
-        c = self.conn.cursor()
         total_obs = 0
 
         logger.info("Fetching stablecoin data from DefiLlama...")
@@ -317,6 +372,7 @@ class DefiLlamaFetcher:
 
             # Top stablecoins
             top_stables = ['USDT', 'USDC', 'DAI', 'FRAX', 'TUSD', 'BUSD']
+            rows, meta = [], []
 
             for stable in stables:
                 symbol = stable.get('symbol', '')
@@ -326,17 +382,11 @@ class DefiLlamaFetcher:
                 circulating = stable.get('circulating', {}).get('peggedUSD')
                 if circulating:
                     series_id = f"STABLE_{symbol}_MCAP"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(circulating))
-                    )
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, f"{symbol} Market Cap", "DefiLlama", "Crypto_Stablecoins",
-                              "Daily", "USD", datetime.now().isoformat(), datetime.now().isoformat()))
-                    total_obs += 1
+                    rows.append((series_id, date_str, float(circulating)))
+                    meta.append((series_id, f"{symbol} Market Cap", "DefiLlama", "Crypto_Stablecoins", "Daily", "USD"))
 
+            total_obs += write_rows(self.conn, rows, commit=False)
+            write_series_meta(self.conn, meta)
             self.conn.commit()
             logger.info(f"   Stablecoins: {total_obs} series")
 
@@ -353,102 +403,68 @@ class DefiLlamaFetcher:
 class CoinGeckoFetcher:
     """Fetch crypto price data from CoinGecko (free tier: 30 calls/min)."""
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
-        self.session = requests.Session()
+        self.full_refresh = full_refresh
+        self.session = CachedSession()
         self.session.headers.update({
             'Accept': 'application/json',
             'User-Agent': 'LighthouseMacro/1.0'
         })
-        self.last_call = 0
-        self.min_interval = 2.1  # ~30 calls/min = 2 sec between calls
-
-    def _rate_limit(self):
-        """Enforce rate limit."""
-        elapsed = time.time() - self.last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_call = time.time()
+        # 30 calls/min is enforced by the COINGECKO token bucket in the transport
 
     def fetch_prices(self, days: int = 30) -> Tuple[int, int]:
         """Fetch historical prices for tracked tokens."""
-        c = self.conn.cursor()
         total_obs = 0
         tokens_updated = 0
 
         logger.info(f"Fetching {days}d price history from CoinGecko...")
 
+        # Incremental: never ask for more days than the gap since the last stored price
+        since, requests = {}, {}
         for coin_id, symbol in COINGECKO_IDS.items():
+            since[coin_id] = revision_start(self.conn, "COINGECKO", [f"CRYPTO_{symbol}_PRICE"],
+                                            full_refresh=self.full_refresh)
+            coin_days = min(days, days_since(since[coin_id])) if since[coin_id] else days
+            requests[coin_id] = (f"{COINGECKO_BASE}/coins/{coin_id}/market_chart", {
+                'vs_currency': 'usd',
+                'days': coin_days,
+                'interval': 'daily'
+            })
+
+        for coin_id, future in fetch_concurrently(self.session, requests):
+            symbol = COINGECKO_IDS[coin_id]
             try:
-                self._rate_limit()
-
-                url = f"{COINGECKO_BASE}/coins/{coin_id}/market_chart"
-                params = {
-                    'vs_currency': 'usd',
-                    'days': days,
-                    'interval': 'daily'
-                }
+                status, data = future.result()
 
-                r = self.session.get(url, params=params, timeout=30)
-
-                if r.status_code == 429:
-                    logger.warning("Rate limited, waiting 60s...")
-                    time.sleep(60)
+                if status != 200:
+                    logger.warning(f"   {symbol}: HTTP {status}")
                     continue
 
-                if r.status_code != 200:
-                    logger.warning(f"   {symbol}: HTTP {r.status_code}")
-                    continue
+                # One batch for the coin's price, market cap and volume points from the high-water mark on
+                ids, dates, values = [], [], []
+                for suffix, key in [('PRICE', 'prices'), ('MCAP', 'market_caps'), ('VOLUME', 'total_volumes')]:
+                    points = np.asarray(data.get(key) or [], dtype=np.float64).reshape(-1, 2)
+                    point_dates = timestamps_to_dates(points[:, 0] / 1000)
+                    keep = point_dates >= since[coin_id] if since[coin_id] else slice(None)
+                    dates.append(point_dates[keep])
+                    values.append(points[keep, 1])
+                    ids.append(np.full(len(dates[-1]), f"CRYPTO_{symbol}_{suffix}", dtype=object))
 
-                data = r.json()
-                prices = data.get('prices', [])
-                market_caps = data.get('market_caps', [])
-                volumes = data.get('total_volumes', [])
-
-                obs_count = 0
-
-                # Store price
-                for ts, price in prices:
-                    date_str = datetime.fromtimestamp(ts/1000).strftime('%Y-%m-%d')
-                    series_id = f"CRYPTO_{symbol}_PRICE"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(price))
-                    )
-                    obs_count += 1
-
-                # Store market cap
-                for ts, mcap in market_caps:
-                    date_str = datetime.fromtimestamp(ts/1000).strftime('%Y-%m-%d')
-                    series_id = f"CRYPTO_{symbol}_MCAP"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(mcap))
-                    )
-                    obs_count += 1
-
-                # Store volume
-                for ts, vol in volumes:
-                    date_str = datetime.fromtimestamp(ts/1000).strftime('%Y-%m-%d')
-                    series_id = f"CRYPTO_{symbol}_VOLUME"
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(vol))
-                    )
-                    obs_count += 1
+                obs_count = write_observations(
+                    self.conn, (np.concatenate(ids), np.concatenate(dates), np.concatenate(values)), commit=False
+                )
 
                 # Update metadata
-                for suffix, title_suffix, units in [
-                    ('PRICE', 'Price', 'USD'),
-                    ('MCAP', 'Market Cap', 'USD'),
-                    ('VOLUME', 'Volume', 'USD')
-                ]:
-                    series_id = f"CRYPTO_{symbol}_{suffix}"
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, f"{symbol} {title_suffix}", "CoinGecko", "Crypto_Prices",
-                              "Daily", units, datetime.now().isoformat(), datetime.now().isoformat()))
+                write_series_meta(self.conn, [
+                    (f"CRYPTO_{symbol}_{suffix}", f"{symbol} {title_suffix}", "CoinGecko", "Crypto_Prices",
+                     "Daily", units)
+                    for suffix, title_suffix, units in [
+                        ('PRICE', 'Price', 'USD'),
+                        ('MCAP', 'Market Cap', 'USD'),
+                        ('VOLUME', 'Volume', 'USD')
+                    ]
+                ])
 
                 tokens_updated += 1
                 total_obs += obs_count
@@ -463,14 +479,11 @@ class CoinGeckoFetcher:
 
     def fetch_global_metrics(self) -> Tuple[int, int]:
         """Fetch global crypto market metrics."""
-        c = self.conn.cursor()
         total_obs = 0
 
         logger.info("Fetching global crypto metrics...")
 
         try:
-            self._rate_limit()
-
             url = f"{COINGECKO_BASE}/global"
             r = self.session.get(url, timeout=30)
 
@@ -489,20 +502,15 @@ class CoinGeckoFetcher:
                 'CRYPTO_ACTIVE_COINS': data.get('active_cryptocurrencies'),
             }
 
+            rows, meta = [], []
             for series_id, value in metrics.items():
                 if value is not None:
-                    c.execute(
-                        "INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                        (series_id, date_str, float(value))
-                    )
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, series_id.replace('_', ' ').title(), "CoinGecko",
-                              "Crypto_Global", "Daily", "USD" if 'MCAP' in series_id or 'VOLUME' in series_id else "Percent",
-                              datetime.now().isoformat(), datetime.now().isoformat()))
-                    total_obs += 1
+                    rows.append((series_id, date_str, float(value)))
+                    meta.append((series_id, series_id.replace('_', ' ').title(), "CoinGecko", "Crypto_Global", "Daily",
+                                 "USD" if 'MCAP' in series_id or 'VOLUME' in series_id else "Percent"))
 
+            total_obs += write_rows(self.conn, rows, commit=False)
+            write_series_meta(self.conn, meta)
             self.conn.commit()
             logger.info(f"   Global metrics: {total_obs} series")
 
@@ -522,10 +530,10 @@ class FreeCryptoFetcher:
     Replaces TokenTerminal with free alternatives.
     """
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
-        self.defillama = DefiLlamaFetcher(conn)
-        self.coingecko = CoinGeckoFetcher(conn)
+        self.defillama = DefiLlamaFetcher(conn, full_refresh)
+        self.coingecko = CoinGeckoFetcher(conn, full_refresh)
 
     def fetch_all(self, price_days: int = 30) -> Tuple[int, int]:
         """Fetch all crypto data from free sources."""
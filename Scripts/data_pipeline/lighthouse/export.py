@@ -0,0 +1,264 @@
+"""
+LIGHTHOUSE MACRO - DATASET EXPORTS
+==================================
+Writers (and a reader) for the datasets exported to OUTPUT_DIR.
+
+Exports are Parquet (zstd) by default, or Arrow IPC files
+(EXPORT_CONFIG["format"] / LIGHTHOUSE_EXPORT_FORMAT). CSV is opt-in: as the
+format itself, or as an extra copy (LIGHTHOUSE_EXPORT_CSV=1 / --csv).
+
+    - wide: a 'date' (date32) column plus one float64 column per series,
+      NaN where a series has no value (same layout as the horizon panel)
+    - long: written in chunks as series are added (LongWriter), so the
+      export never holds a second, melted copy of the dataset
+
+Readers load only the columns they ask for, from a memory-mapped file.
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .config import EXPORT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def export_formats(fmt: str = None, csv: bool = None) -> List[str]:
+    """
+    Formats to write: fmt (default EXPORT_CONFIG["format"]), plus 'csv' when
+    the CSV copy is requested. Columnar formats fall back to CSV without pyarrow.
+    """
+    fmt = fmt or EXPORT_CONFIG["format"]
+    if fmt not in SUFFIXES:
+        raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(SUFFIXES)})")
+    if fmt != "csv" and not PYARROW_AVAILABLE:
+        logger.warning("pyarrow not installed; exporting CSV. Run: pip install pyarrow")
+        fmt = "csv"
+    csv = EXPORT_CONFIG["csv"] if csv is None else csv
+    return [fmt] + (["csv"] if csv and fmt != "csv" else [])
+
+
+def export_path(stem: Path, fmt: str) -> Path:
+    """File for an export stem (e.g. OUTPUT_DIR / 'Horizon_Dataset') in a format."""
+    stem = Path(stem)
+    return stem.with_name(stem.name + SUFFIXES[fmt])
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process so far, in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def _write_table(table: "pa.Table", path: Path, fmt: str):
+    tmp = path.with_name(path.name + ".tmp")
+    if fmt == "parquet":
+        pq.write_table(table, tmp, compression=EXPORT_CONFIG["compression"])
+    else:
+        with ipc.new_file(tmp, table.schema, options=ipc.IpcWriteOptions(compression=EXPORT_CONFIG["compression"])) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _date_array(dates) -> "pa.Array":
+    return pa.array(pd.DatetimeIndex(dates).to_numpy().astype("datetime64[D]"), pa.date32())
+
+
+# ==========================================
+# WIDE
+# ==========================================
+
+def write_wide(df: pd.DataFrame, stem: Path, formats: List[str] = None) -> List[Path]:
+    """
+    Write a date-indexed frame of float columns to stem.<ext> per format.
+
+    Returns:
+        Paths written
+    """
+    formats = formats or export_formats()
+    paths = []
+    table = None
+    for fmt in formats:
+        path = export_path(stem, fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "csv":
+            df.to_csv(path)
+        else:
+            if table is None:
+                # Column by column, as in horizon_store.write_panel (no frame-sized temporaries)
+                arrays = {"date": _date_array(df.index)}
+                for col in df.columns:
+                    arrays[str(col)] = pa.array(df[col].to_numpy(dtype=np.float64), pa.float64())
+                table = pa.table(arrays)
+            _write_table(table, path, fmt)
+        paths.append(path)
+    return paths
+
+
+def find_export(stem: Path) -> Optional[Path]:
+    """Existing file for an export stem (or any of its files), columnar formats first."""
+    stem = Path(stem)
+    if stem.suffix in SUFFIXES.values():
+        stem = stem.with_suffix("")
+    order = [EXPORT_CONFIG["format"]] + [f for f in ("parquet", "arrow", "csv") if f != EXPORT_CONFIG["format"]]
+    for fmt in order:
+        if fmt != "csv" and not PYARROW_AVAILABLE:
+            continue
+        path = export_path(stem, fmt)
+        if path.exists():
+            return path
+    return None
+
+
+def read_wide(path: Path, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Read a wide export (any format) as a date-indexed frame. Columnar files
+    are memory-mapped and only `columns` are decoded; unknown columns are
+    left out.
+    """
+    path = Path(path)
+    if path.suffix == ".csv":
+        if columns is not None:
+            header = pd.read_csv(path, nrows=0).columns
+            columns = ["date"] + [c for c in columns if c in header]
+        df = pd.read_csv(path, usecols=columns, parse_dates=["date"])
+    else:
+        if columns is not None:
+            if path.suffix == ".parquet":
+                names = pq.read_schema(path).names
+            else:
+                with pa.memory_map(str(path)) as source:
+                    names = ipc.open_file(source).schema.names
+            columns = ["date"] + [c for c in columns if c in names and c != "date"]
+        if path.suffix == ".parquet":
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        df = table.to_pandas(date_as_object=False)
+        df["date"] = df["date"].astype("datetime64[ns]")
+    return df.set_index("date")
+
+
+# ==========================================
+# LONG
+# ==========================================
+
+class LongWriter:
+    """
+    Long-format export written chunk by chunk.
+
+    Frames added with add() are buffered up to EXPORT_CONFIG["long_chunk_rows"]
+    rows, then written as one Parquet row group / IPC record batch / CSV
+    append, so memory stays at about one chunk whatever the export size.
+
+    Args:
+        stem: Output path without extension
+        columns: Column -> 'date' | 'string' | 'float', in file order
+        formats: Formats to write (default: export_formats())
+
+    Usage:
+        with LongWriter(OUTPUT_DIR / "Lighthouse_Full_Long",
+                        {"date": "date", "series": "string", "value": "float"}) as writer:
+            for name, s in columns.items():
+                writer.add(pd.DataFrame({"date": s.index, "series": name, "value": s.to_numpy()}))
+    """
+
+    _TYPES = {"date": "date32", "string": "string", "float": "float64"}
+
+    def __init__(self, stem: Path, columns: Dict[str, str], formats: List[str] = None):
+        self.columns = columns
+        self.formats = formats or export_formats()
+        self.paths = [export_path(stem, fmt) for fmt in self.formats]
+        self.rows = 0
+        self._buffer: List[pd.DataFrame] = []
+        self._buffered = 0
+        self._writers: Dict[str, object] = {}
+        self._schema = None
+        if any(fmt != "csv" for fmt in self.formats):
+            self._schema = pa.schema([(name, getattr(pa, self._TYPES[kind])()) for name, kind in columns.items()])
+
+    def __enter__(self) -> "LongWriter":
+        for fmt, path in zip(self.formats, self.paths):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            if fmt == "parquet":
+                self._writers[fmt] = pq.ParquetWriter(tmp, self._schema, compression=EXPORT_CONFIG["compression"])
+            elif fmt == "arrow":
+                self._writers[fmt] = ipc.new_file(
+                    tmp, self._schema, options=ipc.IpcWriteOptions(compression=EXPORT_CONFIG["compression"]))
+            else:
+                self._writers[fmt] = open(tmp, "w", newline="")
+                pd.DataFrame(columns=list(self.columns)).to_csv(self._writers[fmt], index=False)
+        return self
+
+    def add(self, chunk: pd.DataFrame):
+        """Queue rows (columns as declared); flushed once a chunk's worth is buffered."""
+        if chunk.empty:
+            return
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= EXPORT_CONFIG["long_chunk_rows"]:
+            self.flush()
+
+    def _table(self, df: pd.DataFrame) -> "pa.Table":
+        arrays = []
+        for name, kind in self.columns.items():
+            if kind == "date":
+                arrays.append(_date_array(df[name]))
+            elif kind == "string":
+                arrays.append(pa.array(df[name], pa.string(), from_pandas=True))  # NaN/None -> null
+            else:
+                arrays.append(pa.array(df[name].to_numpy(dtype=np.float64), pa.float64()))
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+
+    def flush(self):
+        """Write the buffered rows."""
+        if not self._buffer:
+            return
+        df = pd.concat(self._buffer, ignore_index=True) if len(self._buffer) > 1 else self._buffer[0]
+        self._buffer, self._buffered = [], 0
+        df = df[list(self.columns)]
+
+        table = self._table(df) if self._schema is not None else None
+        for fmt, writer in self._writers.items():
+            if fmt == "csv":
+                df.to_csv(writer, index=False, header=False, date_format="%Y-%m-%d")
+            else:
+                writer.write_table(table)
+        self.rows += len(df)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+        for path in self.paths:
+            tmp = path.with_name(path.name + ".tmp")
+            if exc_type is None:
+                os.replace(tmp, path)
+            elif tmp.exists():
+                tmp.unlink()
+        return False
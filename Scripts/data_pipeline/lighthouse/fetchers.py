@@ -1,7 +1,8 @@
 """
 LIGHTHOUSE MACRO - DATA FETCHERS
 ================================
-Unified fetchers for all data sources with retry logic and rate limiting.
+Unified fetchers for all data sources with retry logic. Rate limits are
+enforced per source by the shared transport (see transport.py).
 """
 
 import requests
@@ -14,6 +15,9 @@ from io import StringIO
 from typing import Tuple, Optional, List, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .http_cache import cached_get, cached_post, OfflineCacheMiss
+from .bulk import write_observations, write_rows, write_wide, write_series_meta
+from .incremental import revision_start
 from .config import (
     API_KEYS, FETCH_CONFIG,
     FRED_CATEGORIES, FRED_CURATED,
@@ -44,6 +48,8 @@ def retry_with_backoff(
         for attempt in range(max_retries):
             try:
                 return func(*args, **kwargs)
+            except OfflineCacheMiss:
+                raise
             except requests.exceptions.RequestException as e:
                 last_exception = e
                 if attempt < max_retries - 1:
@@ -56,7 +62,7 @@ def retry_with_backoff(
 
 
 def fetch_with_retry(url: str, params: dict = None, timeout: int = None, method: str = "GET", json_data: dict = None) -> dict:
-    """Fetch URL with retry logic."""
+    """Fetch URL with retry logic. Responses are served from the HTTP cache when fresh."""
     timeout = timeout or FETCH_CONFIG["timeout"]
     max_retries = FETCH_CONFIG["max_retries"]
     base_delay = FETCH_CONFIG["retry_delay_base"]
@@ -65,11 +71,13 @@ def fetch_with_retry(url: str, params: dict = None, timeout: int = None, method:
     for attempt in range(max_retries):
         try:
             if method == "POST":
-                r = requests.post(url, json=json_data, timeout=timeout)
+                r = cached_post(url, json=json_data, timeout=timeout)
             else:
-                r = requests.get(url, params=params, timeout=timeout)
+                r = cached_get(url, params=params, timeout=timeout)
             r.raise_for_status()
             return r.json()
+        except OfflineCacheMiss:
+            raise  # Retrying cannot help in offline mode
         except requests.exceptions.RequestException as e:
             last_exception = e
             if attempt < max_retries - 1:
@@ -90,8 +98,9 @@ class FREDFetcher:
 
     BASE_URL = "https://api.stlouisfed.org/fred"
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
         self.api_key = API_KEYS["FRED"]
         if not self.api_key:
             raise ValueError("FRED_API_KEY not set")
@@ -135,8 +144,6 @@ class FREDFetcher:
                 updated += series_updated
                 obs_added += series_obs
 
-                time.sleep(FETCH_CONFIG["rate_limit_delay"])
-
         except Exception as e:
             logger.error(f"Error fetching category {category_name}: {e}")
 
@@ -156,13 +163,10 @@ class FREDFetcher:
             except Exception as e:
                 logger.error(f"Error fetching {series_id}: {e}")
 
-            time.sleep(FETCH_CONFIG["rate_limit_delay"])
-
         return updated, obs_added
 
     def _fetch_series(self, series_id: str, series_info: dict, category: str) -> Tuple[int, int]:
         """Fetch a single FRED series."""
-        c = self.conn.cursor()
 
         url = f"{self.BASE_URL}/series/observations"
         params = {
@@ -171,31 +175,35 @@ class FREDFetcher:
             "file_type": "json"
         }
 
+        # Incremental: only the revision window before the last stored value
+        start = revision_start(self.conn, "FRED", [series_id], full_refresh=self.full_refresh)
+        if start:
+            params["observation_start"] = start
+
         data = fetch_with_retry(url, params)
 
         if "observations" not in data:
             return 0, 0
 
-        obs_list = [
-            (series_id, o["date"], float(o["value"]))
-            for o in data["observations"]
-            if o["value"] != "."
-        ]
-
-        if not obs_list:
+        observations = [o for o in data["observations"] if o["value"] != "."]
+        if not observations:
             return 0, 0
 
-        c.executemany("INSERT OR REPLACE INTO observations VALUES (?,?,?)", obs_list)
+        # Unchanged rows are skipped (obs_count 0), but the fetch still
+        # refreshes series_meta so fetch_category can skip it next run
+        obs_count = write_observations(
+            self.conn,
+            (series_id, [o["date"] for o in observations], [o["value"] for o in observations]),
+            commit=False
+        )
 
-        c.execute("""INSERT OR REPLACE INTO series_meta
-                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                    VALUES (?,?,?,?,?,?,?,?)""",
-                 (series_id, series_info.get("title", ""), "FRED", category,
-                  series_info.get("frequency", ""), series_info.get("units", ""),
-                  datetime.now().isoformat(), datetime.now().isoformat()))
+        write_series_meta(self.conn, [
+            (series_id, series_info.get("title", ""), "FRED", category,
+             series_info.get("frequency", ""), series_info.get("units", ""))
+        ])
 
         self.conn.commit()
-        return 1, len(obs_list)
+        return 1, obs_count
 
     def fetch_all(self) -> Tuple[int, int]:
         """Fetch all FRED data: categories + curated."""
@@ -210,7 +218,6 @@ class FREDFetcher:
             total_updated += updated
             total_obs += obs
             self.conn.commit()
-            time.sleep(0.3)
 
         logger.info("--- FRED: Curated Series ---")
         updated, obs = self.fetch_curated()
@@ -231,16 +238,19 @@ class BLSFetcher:
 
     BASE_URL = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
         self.api_key = API_KEYS["BLS"]
         if not self.api_key:
             raise ValueError("BLS_API_KEY not set")
 
     def fetch_all(self, start_year: int = None) -> Tuple[int, int]:
-        """Fetch all BLS series with 20-year chunking."""
-        start_year = start_year or FETCH_CONFIG["bls_start_year"]
-        c = self.conn.cursor()
+        """Fetch all BLS series with 20-year chunking (incremental unless full_refresh)."""
+        if start_year is None:
+            start = revision_start(self.conn, "BLS", [f"BLS_{sid}" for sid in BLS_SERIES],
+                                   full_refresh=self.full_refresh)
+            start_year = int(start[:4]) if start else FETCH_CONFIG["bls_start_year"]
         total_obs = 0
 
         current_year = datetime.now().year
@@ -265,48 +275,37 @@ class BLSFetcher:
                 data = fetch_with_retry(self.BASE_URL, method="POST", json_data=payload, timeout=60)
 
                 if data.get("status") == "REQUEST_SUCCEEDED":
-                    chunk_obs = 0
+                    ids, dates, values, meta = [], [], [], []
+                    q_map = {"Q01": "01", "Q02": "04", "Q03": "07", "Q04": "10"}
                     for s in data["Results"]["series"]:
                         series_id = s["seriesID"]
                         title = BLS_SERIES.get(series_id, series_id)
 
                         for item in s["data"]:
-                            if item["value"] not in ["", "."]:
-                                period = item["period"]
-                                if period.startswith("M"):
-                                    month = period[1:]
-                                    date_str = f"{item['year']}-{month}-01"
-                                elif period.startswith("Q"):
-                                    q_map = {"Q01": "01", "Q02": "04", "Q03": "07", "Q04": "10"}
-                                    month = q_map.get(period, "01")
-                                    date_str = f"{item['year']}-{month}-01"
-                                else:
-                                    date_str = f"{item['year']}-01-01"
-
-                                try:
-                                    value = float(item["value"])
-                                    c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                             (f"BLS_{series_id}", date_str, value))
-                                    chunk_obs += 1
-                                except ValueError:
-                                    pass
-
-                        # Update metadata
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (f"BLS_{series_id}", title, "BLS", "Labor_Prices", "Monthly", "",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
+                            period = item["period"]
+                            if period.startswith("M"):
+                                month = period[1:]
+                            elif period.startswith("Q"):
+                                month = q_map.get(period, "01")
+                            else:
+                                month = "01"
+                            ids.append(f"BLS_{series_id}")
+                            dates.append(f"{item['year']}-{month}-01")
+                            values.append(item["value"])
+
+                        meta.append((f"BLS_{series_id}", title, "BLS", "Labor_Prices", "Monthly", ""))
+
+                    # Unparseable values ('', '.', '-') are dropped by the bulk writer
+                    chunk_obs = write_observations(self.conn, (ids, dates, values), commit=False)
+                    write_series_meta(self.conn, meta)
+                    self.conn.commit()
 
                     logger.info(f"   BLS {start_yr}-{end_yr}: {chunk_obs:,} obs")
                     total_obs += chunk_obs
-                    self.conn.commit()
 
             except Exception as e:
                 logger.error(f"BLS Error: {e}")
 
-            time.sleep(0.5)
-
         return len(BLS_SERIES), total_obs
 
 
@@ -319,22 +318,26 @@ class BEAFetcher:
 
     BASE_URL = "https://apps.bea.gov/api/data/"
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
         self.api_key = API_KEYS["BEA"]
         if not self.api_key:
             raise ValueError("BEA_API_KEY not set")
 
     def fetch_all(self, start_year: int = None) -> Tuple[int, int]:
-        """Fetch all BEA NIPA tables."""
-        start_year = start_year or FETCH_CONFIG["bea_start_year"]
-        c = self.conn.cursor()
+        """Fetch all BEA NIPA tables (incremental per table unless full_refresh)."""
         total_obs = 0
 
-        years = ",".join([str(y) for y in range(start_year, datetime.now().year + 1)])
-
         for table_info in BEA_TABLES:
-            logger.info(f"   BEA {table_info['desc']}...")
+            table_start = start_year
+            if table_start is None:
+                start = revision_start(self.conn, "BEA", like=f"BEA_{table_info['desc']}_%",
+                                       full_refresh=self.full_refresh)
+                table_start = int(start[:4]) if start else FETCH_CONFIG["bea_start_year"]
+            years = ",".join([str(y) for y in range(table_start, datetime.now().year + 1)])
+
+            logger.info(f"   BEA {table_info['desc']} from {table_start}...")
 
             params = {
                 "UserID": self.api_key,
@@ -351,12 +354,13 @@ class BEAFetcher:
 
                 if "BEAAPI" in data and "Results" in data["BEAAPI"]:
                     rows = data["BEAAPI"]["Results"].get("Data", [])
-                    table_obs = 0
+                    ids, dates, values = [], [], []
+                    meta = {}
+                    q_map = {"Q1": "01", "Q2": "04", "Q3": "07", "Q4": "10"}
 
                     for row in rows:
                         tp = row.get("TimePeriod", "")
                         if "Q" in tp:
-                            q_map = {"Q1": "01", "Q2": "04", "Q3": "07", "Q4": "10"}
                             quarter = tp[-2:]
                             month = q_map.get(quarter, "01")
                             date_str = f"{tp[:4]}-{month}-01"
@@ -366,30 +370,29 @@ class BEAFetcher:
                         line_desc = row.get("LineDescription", "Unknown")
                         series_id = f"BEA_{table_info['desc']}_{line_desc}".replace(" ", "_")[:100]
 
-                        try:
-                            value_str = row.get("DataValue", "").replace(",", "")
-                            value = float(value_str)
-                            c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                     (series_id, date_str, value))
-                            table_obs += 1
-
-                            c.execute("""INSERT OR REPLACE INTO series_meta
-                                        (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                        VALUES (?,?,?,?,?,?,?,?)""",
-                                     (series_id, line_desc, "BEA", table_info["desc"], "Quarterly", "",
-                                      datetime.now().isoformat(), datetime.now().isoformat()))
-                        except (ValueError, TypeError):
-                            pass
+                        ids.append(series_id)
+                        dates.append(date_str)
+                        values.append(str(row.get("DataValue", "")).replace(",", ""))
+                        meta.setdefault(series_id, line_desc)
+
+                    obs = pd.DataFrame({"series_id": ids, "date": dates, "value": values})
+                    obs["value"] = pd.to_numeric(obs["value"], errors="coerce")
+                    obs = obs.dropna(subset=["value"])
+                    table_obs = write_observations(self.conn, obs, commit=False)
+
+                    # Metadata only for lines that produced at least one value
+                    write_series_meta(self.conn, [
+                        (series_id, meta[series_id], "BEA", table_info["desc"], "Quarterly", "")
+                        for series_id in obs["series_id"].unique()
+                    ])
+                    self.conn.commit()
 
                     logger.info(f"   BEA {table_info['desc']}: {table_obs:,} obs")
                     total_obs += table_obs
-                    self.conn.commit()
 
             except Exception as e:
                 logger.error(f"BEA Error: {e}")
 
-            time.sleep(0.5)
-
         return len(BEA_TABLES), total_obs
 
 
@@ -402,25 +405,29 @@ class NYFedFetcher:
 
     BASE_URL = "https://markets.newyorkfed.org/api/rates/all/search.json"
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
 
     def fetch_all(self, start_date: str = None) -> Tuple[int, int]:
-        """Fetch NY Fed reference rates."""
-        start_date = start_date or FETCH_CONFIG["nyfed_start_date"]
-        c = self.conn.cursor()
+        """Fetch NY Fed reference rates (incremental unless full_refresh)."""
+        start_date = (start_date
+                      or revision_start(self.conn, "NYFED", [f"NYFED_{r}" for r in NYFED_RATES],
+                                        full_refresh=self.full_refresh)
+                      or FETCH_CONFIG["nyfed_start_date"])
         total_obs = 0
 
         url = f"{self.BASE_URL}?startDate={start_date}"
 
         try:
             logger.info(f"   NY Fed from {start_date}...")
-            r = requests.get(url, timeout=60)
+            r = cached_get(url, timeout=60)
 
             if r.status_code == 200:
                 data = r.json()
 
                 if "refRates" in data:
+                    rows = []
                     for item in data["refRates"]:
                         rate_type = item.get("type", "")
                         if rate_type in NYFED_RATES:
@@ -428,32 +435,22 @@ class NYFedFetcher:
                             rate = item.get("percentRate")
 
                             if rate is not None and date_str:
-                                series_id = f"NYFED_{rate_type}"
-                                c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                         (series_id, date_str, float(rate)))
-                                total_obs += 1
+                                rows.append((f"NYFED_{rate_type}", date_str, float(rate)))
 
                                 # Volume
                                 volume = item.get("volumeInBillions")
                                 if volume is not None:
-                                    vol_series_id = f"NYFED_{rate_type}_Volume"
-                                    c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                             (vol_series_id, date_str, float(volume)))
-                                    total_obs += 1
+                                    rows.append((f"NYFED_{rate_type}_Volume", date_str, float(volume)))
+
+                    total_obs += write_rows(self.conn, rows, commit=False)
 
                     # Update metadata
+                    meta = []
                     for rate_type, title in NYFED_RATES.items():
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (f"NYFED_{rate_type}", title, "NYFED", "Reference_Rates", "Daily", "Percent",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
-
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (f"NYFED_{rate_type}_Volume", f"{title} Volume", "NYFED", "Reference_Rates", "Daily", "Billions USD",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
+                        meta.append((f"NYFED_{rate_type}", title, "NYFED", "Reference_Rates", "Daily", "Percent"))
+                        meta.append((f"NYFED_{rate_type}_Volume", f"{title} Volume", "NYFED", "Reference_Rates",
+                                     "Daily", "Billions USD"))
+                    write_series_meta(self.conn, meta)
 
                     self.conn.commit()
                     logger.info(f"   NY Fed: {total_obs:,} obs")
@@ -474,12 +471,12 @@ class OFRFetcher:
     SERIES_URL = "https://data.financialresearch.gov/v1/series/timeseries/"
     FSI_URL = "https://www.financialresearch.gov/financial-stress-index/data/fsi.csv"
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
 
     def fetch_all(self) -> Tuple[int, int]:
-        """Fetch all OFR data."""
-        c = self.conn.cursor()
+        """Fetch all OFR data (incremental unless full_refresh)."""
         total_obs = 0
         series_count = 0
 
@@ -487,28 +484,25 @@ class OFRFetcher:
         for mnemonic, title in OFR_SERIES.items():
             logger.info(f"   OFR {title}...")
             url = f"{self.SERIES_URL}?mnemonic={mnemonic}"
+            start = revision_start(self.conn, "OFR", [f"OFR_{mnemonic}"], full_refresh=self.full_refresh)
+            if start:
+                url += f"&start_date={start}"
 
             try:
-                r = requests.get(url, timeout=30)
+                r = cached_get(url, timeout=30)
                 if r.status_code == 200:
                     data = r.json()
-                    obs_count = 0
-
-                    for item in data:
-                        if isinstance(item, list) and len(item) >= 2:
-                            date_str = item[0]
-                            value = item[1]
-                            if value is not None:
-                                c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                         (f"OFR_{mnemonic}", date_str, float(value)))
-                                obs_count += 1
+                    points = [item for item in data if isinstance(item, list) and len(item) >= 2]
+                    obs_count = write_observations(
+                        self.conn,
+                        (f"OFR_{mnemonic}", [p[0] for p in points], [p[1] for p in points]),
+                        commit=False
+                    )
 
                     if obs_count > 0:
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (f"OFR_{mnemonic}", title, "OFR", "Short_Term_Funding", "Daily", "",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
+                        write_series_meta(self.conn, [
+                            (f"OFR_{mnemonic}", title, "OFR", "Short_Term_Funding", "Daily", "")
+                        ])
                         series_count += 1
                         total_obs += obs_count
                         logger.info(f"   OFR {title}: {obs_count:,} obs")
@@ -516,32 +510,30 @@ class OFRFetcher:
             except Exception as e:
                 logger.error(f"OFR Error {mnemonic}: {e}")
 
-            time.sleep(0.2)
-
         self.conn.commit()
 
         # Fetch FSI
         logger.info("   OFR FSI...")
         try:
-            r = requests.get(self.FSI_URL, timeout=30)
+            r = cached_get(self.FSI_URL, timeout=30)
             if r.status_code == 200:
                 df = pd.read_csv(StringIO(r.text))
-                fsi_obs = 0
-
-                for col, series_id in OFR_FSI_COLUMNS.items():
-                    if col in df.columns:
-                        for _, row in df.iterrows():
-                            if pd.notna(row[col]):
-                                c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                         (series_id, row["Date"], float(row[col])))
-                                fsi_obs += 1
-
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (series_id, f"Financial Stress Index - {col}", "OFR", "Financial_Stress", "Daily", "Index",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
-                        series_count += 1
+
+                present = {col: series_id for col, series_id in OFR_FSI_COLUMNS.items() if col in df.columns}
+                wide = df.set_index("Date")[list(present)].rename(columns=present)
+                wide.index = pd.to_datetime(wide.index)
+
+                # The CSV is always full history; only write the revision window
+                start = revision_start(self.conn, "OFR", list(present.values()), full_refresh=self.full_refresh)
+                if start:
+                    wide = wide[wide.index >= start]
+                fsi_obs = write_wide(self.conn, wide, commit=False)
+
+                write_series_meta(self.conn, [
+                    (series_id, f"Financial Stress Index - {col}", "OFR", "Financial_Stress", "Daily", "Index")
+                    for col, series_id in present.items()
+                ])
+                series_count += len(present)
 
                 total_obs += fsi_obs
                 self.conn.commit()
@@ -0,0 +1,276 @@
+"""
+LIGHTHOUSE MACRO - HORIZON PANEL STORE
+======================================
+Columnar storage for the horizon dataset (one column per series/transform,
+one row per day), replacing the wide SQLite table written by to_sql.
+
+Each build writes one Parquet file beside the database, e.g.
+Lighthouse_Master_horizon.parquet: a date32 'date' column plus float64
+columns, sorted by date in row groups of HORIZON_STORE_CONFIG["row_group_size"]
+days. Readers memory-map the file and decode only the columns and row groups
+they ask for.
+
+A JSON column index written with it (Lighthouse_Master_horizon_index.json)
+lists every column with its first/last valid date, so column listings and
+latest-value lookups never touch the panel itself. It also keeps a short
+change log (build time, earliest date whose values changed) that downstream
+stages use to recompute only what moved.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .config import DB_PATH, HORIZON_STORE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+CHANGE_LOG_LENGTH = 100  # Builds remembered in the index's change log
+BUILD_KEY = b"lighthouse_built"  # Panel schema metadata: the index "built" stamp of its build
+BUILD_RETRIES = 20  # Reads of a panel/index pair caught mid-publish before giving up
+
+
+def panel_path(db_path: Path = None) -> Path:
+    """Horizon panel file for a database (sits beside the .db file)."""
+    db_path = Path(db_path or DB_PATH)
+    return db_path.with_name(f"{db_path.stem}_horizon.parquet")
+
+
+def index_path(db_path: Path = None) -> Path:
+    db_path = Path(db_path or DB_PATH)
+    return db_path.with_name(f"{db_path.stem}_horizon_index.json")
+
+
+def exists(db_path: Path = None) -> bool:
+    """True if a panel has been built for this database and pyarrow can read it."""
+    return PYARROW_AVAILABLE and panel_path(db_path).exists() and index_path(db_path).exists()
+
+
+# ==========================================
+# WRITE
+# ==========================================
+
+def _column_index(df: pd.DataFrame) -> dict:
+    """Per column: [first valid date, last valid date] (None if all NaN)."""
+    dates = df.index.strftime("%Y-%m-%d").to_numpy()
+    valid = df.notna().to_numpy()
+    has_any = valid.any(axis=0)
+    first = valid.argmax(axis=0)
+    last = len(df) - 1 - valid[::-1].argmax(axis=0)
+    return {
+        col: [dates[f], dates[l]] if ok else None
+        for col, f, l, ok in zip(df.columns, first, last, has_any)
+    }
+
+
+def write_panel(df: pd.DataFrame, db_path: Path = None, changed_from: pd.Timestamp = None) -> Path:
+    """
+    Write the horizon panel (DatetimeIndex, float columns) and its column index.
+
+    Both files are written to temporaries and swapped in, so readers never
+    see a half-written build, and both are stamped with the build time so
+    readers never pair a panel with another build's index.
+
+    Args:
+        changed_from: Earliest date whose values differ from the previous
+            build (None = everything, e.g. a full rebuild)
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for the horizon store. Run: pip install pyarrow")
+
+    df = df.sort_index()
+    built = pd.Timestamp.now().isoformat()
+    arrays = {"date": pa.array(df.index.to_numpy().astype("datetime64[D]"), pa.date32())}
+    for col in df.columns:
+        arrays[col] = pa.array(df[col].to_numpy(dtype=np.float64), pa.float64())
+
+    path, idx_path = panel_path(db_path), index_path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    table = pa.table(arrays).replace_schema_metadata({BUILD_KEY: built.encode()})
+    pq.write_table(table, tmp,
+                   row_group_size=HORIZON_STORE_CONFIG["row_group_size"],
+                   compression=HORIZON_STORE_CONFIG["compression"])
+
+    start = df.index.min().strftime("%Y-%m-%d") if len(df) else None
+    if changed_from is None or start is None:
+        changed_from = start
+    else:
+        changed_from = max(pd.Timestamp(changed_from), df.index.min()).strftime("%Y-%m-%d")
+    changes = (read_index(db_path) or {}).get("changes", []) if changed_from != start else []
+    changes = (changes + [{"built": built, "changed_from": changed_from}])[-CHANGE_LOG_LENGTH:]
+
+    index = {
+        "built": built,
+        "rows": len(df),
+        "start": start,
+        "end": df.index.max().strftime("%Y-%m-%d") if len(df) else None,
+        "columns": _column_index(df),
+        "changes": changes,
+    }
+    idx_tmp = idx_path.with_name(idx_path.name + ".tmp")
+    with open(idx_tmp, "w") as f:
+        json.dump(index, f)
+
+    # Two renames: a reader between them sees a new panel with the old index.
+    # Both carry the build stamp, and readers retry until they match (_open_build).
+    os.replace(tmp, path)
+    os.replace(idx_tmp, idx_path)
+    return path
+
+
+# ==========================================
+# READ
+# ==========================================
+
+def read_index(db_path: Path = None) -> Optional[dict]:
+    """The column index of the current build (None if there is no build)."""
+    try:
+        with open(index_path(db_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def changed_since(built: str, db_path: Path = None) -> Optional[str]:
+    """
+    Earliest date changed by any build after `built` (the "built" stamp of
+    the index a consumer last used). Returns the panel start when that build
+    is no longer in the change log, and None when nothing has changed.
+    """
+    index = read_index(db_path)
+    if not index:
+        return None
+    if built == index["built"]:
+        return None
+    stamps = [c["built"] for c in index.get("changes", [])]
+    if built not in stamps:
+        return index["start"]
+    later = index["changes"][stamps.index(built) + 1:]
+    return min(c["changed_from"] for c in later) if later else None
+
+
+def panel_columns(db_path: Path = None) -> List[str]:
+    """Columns in the current build, in panel order."""
+    index = read_index(db_path)
+    return list(index["columns"]) if index else []
+
+
+def _open_build(db_path: Path = None) -> Tuple[Optional[dict], Optional["pq.ParquetFile"]]:
+    """
+    Index and open panel file of one build, (None, None) when there is none.
+
+    write_panel swaps the files in one after the other; a pair whose stamps
+    differ was caught in between and is re-read. The open file stays on its
+    build even if a newer one is published while it is read.
+    """
+    for _ in range(BUILD_RETRIES):
+        index = read_index(db_path)
+        if not index:
+            return None, None
+        try:
+            pf = pq.ParquetFile(panel_path(db_path), memory_map=True)
+        except OSError:
+            return None, None
+        stamp = (pf.schema_arrow.metadata or {}).get(BUILD_KEY)
+        if stamp is None or stamp.decode() == index["built"]:  # unstamped: panel from before stamps
+            return index, pf
+        pf.close()
+        time.sleep(0.05)
+    raise RuntimeError(f"Horizon panel and index of {panel_path(db_path).name} are from different builds")
+
+
+def _read_slice(pf: "pq.ParquetFile", columns: Optional[List[str]], start_date: str, end_date: str) -> pd.DataFrame:
+    """Columns of an open panel between two dates, reading only the row groups that overlap them."""
+    start = pd.Timestamp(start_date).date() if start_date else None
+    end = pd.Timestamp(end_date).date() if end_date else None
+    date_col = pf.schema_arrow.get_field_index("date")
+    groups = []
+    for i in range(pf.num_row_groups):
+        stats = pf.metadata.row_group(i).column(date_col).statistics
+        if stats is not None and stats.has_min_max:
+            if (start and stats.max < start) or (end and stats.min > end):
+                continue
+        groups.append(i)
+
+    table = pf.read_row_groups(groups, columns=columns)
+    if start or end:
+        mask = pc.and_(pc.greater_equal(table["date"], pa.scalar(start or pd.Timestamp.min.date(), pa.date32())),
+                       pc.less_equal(table["date"], pa.scalar(end or pd.Timestamp.max.date(), pa.date32())))
+        table = table.filter(mask)
+    df = table.to_pandas(date_as_object=False)
+    df["date"] = df["date"].astype("datetime64[ns]")
+    return df.set_index("date")
+
+
+def read_panel(
+    columns: List[str] = None,
+    start_date: str = None,
+    end_date: str = None,
+    db_path: Path = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Read a column/date slice of the panel.
+
+    Only the requested columns are decoded and row groups outside the date
+    range are skipped. Unknown columns are left out with a warning.
+
+    Returns:
+        DataFrame with a 'date' DatetimeIndex, or None when no panel is built
+    """
+    if not exists(db_path):
+        return None
+    index, pf = _open_build(db_path)
+    if index is None:
+        return None
+
+    if columns is not None:
+        available = set(index["columns"])
+        missing = [c for c in columns if c not in available and c != "date"]
+        if missing:
+            logger.warning(f"Horizon panel has no column(s): {', '.join(missing)}")
+        columns = ["date"] + [c for c in dict.fromkeys(columns) if c in available]
+
+    with pf:
+        return _read_slice(pf, columns, start_date, end_date)
+
+
+def latest_values(columns: List[str], db_path: Path = None) -> Dict[str, Tuple[pd.Timestamp, float]]:
+    """
+    Latest non-null (date, value) per column.
+
+    Each lookup reads one column at its last valid date from the index, i.e.
+    a single row group. Columns without data are omitted.
+    """
+    index, pf = _open_build(db_path) if exists(db_path) else (None, None)
+    if not index:
+        return {}
+
+    by_date: Dict[str, List[str]] = {}
+    for col in dict.fromkeys(columns):
+        span = index["columns"].get(col)
+        if span:
+            by_date.setdefault(span[1], []).append(col)
+
+    result = {}
+    with pf:
+        for date, cols in by_date.items():
+            df = _read_slice(pf, ["date"] + cols, date, date)
+            for col in cols:
+                if not df.empty:
+                    result[col] = (df.index[-1], float(df[col].iloc[-1]))
+    return result
@@ -0,0 +1,370 @@
+"""
+LIGHTHOUSE MACRO - HTTP RESPONSE CACHE
+======================================
+One disk-backed cache for every external fetcher. Responses live in a small
+SQLite file keyed on method + URL + params (API keys stripped), with:
+
+- per-source TTLs (HTTP_CACHE_CONFIG["ttl_seconds"], matched by host)
+- ETag / Last-Modified revalidation once an entry expires (304 = reuse body)
+- size-bounded LRU eviction
+- offline mode (LIGHTHOUSE_OFFLINE=1 or set_offline(True)) that answers only
+  from the cache, so chart and backtest reruns cost no network round-trips
+- only valid responses are stored: HTTP 200 whose body is not an API error
+  envelope (BLS REQUEST_NOT_PROCESSED, {"error": ...}, ...), see
+  is_valid_response; sessions can pass their own predicate
+
+Use CachedSession wherever a requests.Session was used, or cached_get /
+cached_post in place of requests.get / requests.post.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .config import HTTP_CACHE_CONFIG
+from .transport import LimitedSession, source_for_url
+
+logger = logging.getLogger(__name__)
+
+_offline = HTTP_CACHE_CONFIG["offline"]
+
+
+class OfflineCacheMiss(requests.exceptions.ConnectionError):
+    """Offline mode and no cached response for the request."""
+
+
+def set_offline(offline: bool = True):
+    """Switch every CachedSession to cache-only mode (or back)."""
+    global _offline
+    _offline = offline
+
+
+def is_offline() -> bool:
+    return _offline
+
+
+# ==========================================
+# CACHE KEYS
+# ==========================================
+
+def _is_secret(name) -> bool:
+    return str(name).lower() in HTTP_CACHE_CONFIG["secret_params"]
+
+
+def _strip_secrets(obj):
+    """Drop API-key fields from a JSON payload (recursively)."""
+    if isinstance(obj, dict):
+        return {k: _strip_secrets(v) for k, v in obj.items() if not _is_secret(k)}
+    if isinstance(obj, list):
+        return [_strip_secrets(v) for v in obj]
+    return obj
+
+
+def clean_url(url: str, params=None) -> str:
+    """URL with params merged into a sorted query string and API keys removed."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += list(params.items()) if isinstance(params, dict) else list(params)
+    query = sorted((str(k), str(v)) for k, v in query if v is not None and not _is_secret(k))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def cache_key(method: str, url: str, params=None, json_data=None) -> str:
+    """Stable key for a request. API keys in the URL, params or JSON body are ignored."""
+    body = ""
+    if json_data is not None:
+        body = json.dumps(_strip_secrets(json_data), sort_keys=True, default=str)
+
+    return hashlib.sha256(f"{method.upper()} {clean_url(url, params)} {body}".encode()).hexdigest()
+
+
+def ttl_for(source: Optional[str]) -> int:
+    return HTTP_CACHE_CONFIG["ttl_seconds"].get(source, HTTP_CACHE_CONFIG["default_ttl"])
+
+
+# ==========================================
+# VALIDITY
+# ==========================================
+
+# Top-level JSON fields that mark an API error delivered with HTTP 200
+_ERROR_FIELDS = ("error", "errors", "error_message", "Error Message")
+
+
+def is_valid_response(response: requests.Response) -> bool:
+    """
+    False for HTTP 200 bodies that are known API error envelopes, so they are
+    not cached (and replayed for a whole TTL):
+
+    - BLS: "status" other than REQUEST_SUCCEEDED (REQUEST_NOT_PROCESSED when
+      the daily quota is used up, REQUEST_FAILED, ...)
+    - CoinGecko: "status": {"error_code": ...}
+    - FRED / EIA / Alpha Vantage / others: a non-empty "error", "errors",
+      "error_message" or "Error Message" field
+    """
+    if "json" not in response.headers.get("Content-Type", "") and response.content[:1] not in (b"{", b"["):
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    if not isinstance(body, dict):
+        return True
+
+    status = body.get("status")
+    if isinstance(status, str) and status.startswith("REQUEST_") and status != "REQUEST_SUCCEEDED":
+        return False
+    if isinstance(status, dict) and status.get("error_code"):
+        return False
+    return not any(body.get(field) for field in _ERROR_FIELDS)
+
+
+# ==========================================
+# DISK STORE
+# ==========================================
+
+class HTTPCache:
+    """
+    SQLite-backed response store.
+
+    Thread-safe within a process (one connection behind a lock); separate
+    processes share the file through SQLite's own locking.
+    """
+
+    def __init__(self, path: Path = None, max_bytes: int = None):
+        self.path = Path(path or HTTP_CACHE_CONFIG["path"])
+        self.max_bytes = max_bytes or HTTP_CACHE_CONFIG["max_bytes"]
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                expires_at REAL,
+                last_access REAL
+            )''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+            conn.commit()
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """Cached entry for a key (fresh or stale), marking it recently used."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+
+        url, status, headers, body, etag, last_modified, expires_at = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": expires_at,
+        }
+
+    def store(self, key: str, response: requests.Response, ttl: int):
+        """Save a 200 response and evict least-recently-used entries if over budget."""
+        body = response.content
+        now = time.time()
+        # Body is stored decoded, so Content-Encoding is deliberately not kept
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() in ("content-type", "etag", "last-modified")}
+
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                (key, clean_url(response.url), response.status_code, json.dumps(headers), body, len(body),
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now, now + ttl, now)
+            )
+            conn.commit()
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+
+    def refresh(self, key: str, ttl: int):
+        """Extend an entry's freshness after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                         (now + ttl, now, key))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least-recently-used entries until the cache is under 90% of budget."""
+        target = int(self.max_bytes * 0.9)
+        # Other processes may have written; start from the real total
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if self._total_bytes <= target:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        conn.commit()
+        logger.debug(f"HTTP cache: evicted {evicted} entries ({self._total_bytes / 1e6:.0f} MB kept)")
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            entries, size, fresh = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires_at > ?), 0) FROM responses",
+                (time.time(),)
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "fresh": fresh, "path": str(self.path)}
+
+
+_default_cache: Optional[HTTPCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache() -> HTTPCache:
+    """Process-wide cache instance."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HTTPCache()
+        return _default_cache
+
+
+# ==========================================
+# SESSION
+# ==========================================
+
+def _response_from_entry(entry: dict, url: str) -> requests.Response:
+    r = requests.Response()
+    r.status_code = entry["status"]
+    r._content = entry["body"]
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.url = entry["url"] or url
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    r.from_cache = True
+    return r
+
+
+class CachedSession(LimitedSession):
+    """
+    Pooled, rate-limited session (transport.LimitedSession) that answers
+    GETs (and JSON POSTs, e.g. BLS) from the HTTP cache. Only requests that
+    miss the cache spend a rate-limit token.
+
+    Args:
+        source: Source name for the TTL and rate limit; defaults to a lookup on the URL host
+        ttl: Fixed TTL in seconds, overriding the source TTL
+        cache: HTTPCache to use (default: the process-wide cache)
+        offline: Force cache-only (True) or network (False); None follows set_offline()
+        is_valid: Predicate a 200 response must pass to be cached
+                  (default: is_valid_response)
+    """
+
+    def __init__(self, source: str = None, ttl: int = None, cache: HTTPCache = None, offline: bool = None,
+                 is_valid: Callable[[requests.Response], bool] = None):
+        super().__init__(source=source)
+        self.ttl = ttl
+        self.cache = cache
+        self.offline = offline
+        self.is_valid = is_valid or is_valid_response
+
+    def request(self, method, url, params=None, data=None, headers=None, json=None, **kwargs):
+        method = method.upper()
+        cacheable = method == "GET" or (method == "POST" and json is not None and data is None)
+        if not cacheable:
+            return super().request(method, url, params=params, data=data, headers=headers, json=json, **kwargs)
+
+        cache = self.cache or get_cache()
+        offline = _offline if self.offline is None else self.offline
+        ttl = self.ttl if self.ttl is not None else ttl_for(self.source or source_for_url(url))
+        key = cache_key(method, url, params, json)
+
+        entry = cache.lookup(key)
+        if entry is not None and (offline or entry["expires_at"] > time.time()):
+            return _response_from_entry(entry, url)
+        if offline:
+            raise OfflineCacheMiss(f"Offline: no cached response for {url}")
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().request(method, url, params=params, data=data, headers=headers, json=json, **kwargs)
+        response.from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key, ttl)
+            return _response_from_entry(entry, url)
+        if response.status_code == 200:
+            if not self.is_valid(response):
+                logger.warning(f"HTTP cache: not caching error response from {clean_url(url)}")
+                return response
+            try:
+                cache.store(key, response, ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"HTTP cache write failed for {url}: {e}")
+        return response
+
+
+_default_session: Optional[CachedSession] = None
+
+
+def _session() -> CachedSession:
+    global _default_session
+    with _default_cache_lock:
+        if _default_session is None:
+            _default_session = CachedSession()
+        return _default_session
+
+
+def cached_get(url: str, params=None, **kwargs) -> requests.Response:
+    """Drop-in for requests.get backed by the HTTP cache."""
+    return _session().get(url, params=params, **kwargs)
+
+
+def cached_post(url: str, json=None, **kwargs) -> requests.Response:
+    """Drop-in for requests.post; JSON bodies are cached, form posts are not."""
+    return _session().post(url, json=json, **kwargs)
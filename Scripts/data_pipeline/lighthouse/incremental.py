@@ -0,0 +1,89 @@
+"""
+LIGHTHOUSE MACRO - INCREMENTAL FETCH WINDOWS
+============================================
+Per-series high-water marks. Each fetcher asks for the date it should start
+from: the series' last_value_date minus a revision window (so revised
+history is re-read), or None for a full-history fetch.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from .config import FETCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# last_value_date is normally kept current by write_series_meta and the
+# quality pass; fall back to the observations table for older rows.
+_HWM_SQL = """
+    SELECT m.series_id,
+           COALESCE(m.last_value_date,
+                    (SELECT MAX(o.date) FROM observations o WHERE o.series_id = m.series_id))
+    FROM series_meta m
+    WHERE {where}
+"""
+
+
+def get_high_water_marks(conn, series_ids: Iterable[str] = None, like: str = None) -> dict:
+    """
+    Latest stored observation date per series.
+
+    Args:
+        conn: sqlite3.Connection or WriterConnection
+        series_ids: Exact series to look up
+        like: SQL LIKE pattern instead of an explicit list (e.g. 'NYFED_%')
+
+    Returns:
+        Dict of series_id -> 'YYYY-MM-DD' (None when the series has no data)
+    """
+    if series_ids is not None:
+        series_ids = list(series_ids)
+        if not series_ids:
+            return {}
+        marks = {}
+        for start in range(0, len(series_ids), 500):
+            chunk = series_ids[start:start + 500]
+            where = f"m.series_id IN ({','.join('?' for _ in chunk)})"
+            marks.update(dict(conn.execute(_HWM_SQL.format(where=where), chunk).fetchall()))
+        return marks
+
+    return dict(conn.execute(_HWM_SQL.format(where="m.series_id LIKE ?"), (like,)).fetchall())
+
+
+def revision_start(
+    conn,
+    source: str,
+    series_ids: Iterable[str] = None,
+    like: str = None,
+    full_refresh: bool = False,
+) -> Optional[str]:
+    """
+    Start date for an incremental request covering the given series.
+
+    The oldest high-water mark among the series, minus the source's revision
+    window from FETCH_CONFIG["revision_window_months"]. Returns None (fetch
+    full history) on full refresh, or when any requested series is new or
+    empty.
+    """
+    if full_refresh:
+        return None
+
+    marks = get_high_water_marks(conn, series_ids=series_ids, like=like)
+    if series_ids is not None and len(marks) < len(set(series_ids)):
+        return None  # At least one series has never been fetched
+    if not marks or any(v is None for v in marks.values()):
+        return None
+
+    months = FETCH_CONFIG["revision_window_months"].get(source, 0)
+    start = pd.Timestamp(min(marks.values())) - pd.DateOffset(months=months)
+    return start.strftime("%Y-%m-%d")
+
+
+def days_since(start_date: Optional[str]) -> Optional[int]:
+    """Calendar days from start_date to today (None passes through)."""
+    if start_date is None:
+        return None
+    return max((datetime.now() - datetime.strptime(start_date, "%Y-%m-%d")).days, 1)
@@ -11,7 +11,6 @@ Data Sources:
 - Barchart/Other: Breadth data (% above MAs, NH-NL, A/D line)
 """
 
-import requests
 import pandas as pd
 import numpy as np
 import sqlite3
@@ -27,6 +26,11 @@ try:
 except ImportError:
     YFINANCE_AVAILABLE = False
 
+from .bulk import write_wide, write_series_meta
+from .http_cache import cached_get
+from .config import FETCH_CONFIG
+from .incremental import revision_start
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,19 +44,28 @@ class YFinanceFetcher:
     Used for computing trend/momentum components of MSI.
     """
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, full_refresh: bool = False):
         self.conn = conn
+        self.full_refresh = full_refresh
 
     def fetch_spx(self, start_date: str = "2000-01-01") -> Tuple[int, int]:
         """
         Fetch S&P 500 (^GSPC) price data and compute derived metrics.
 
+        Incremental unless full_refresh: prices are fetched from the revision
+        window minus enough warm-up history for the longest derived window,
+        and only the revision window is written.
+
         Returns:
             Tuple of (series_count, observations_count)
         """
-        c = self.conn.cursor()
         total_obs = 0
 
+        write_start = revision_start(self.conn, "YAHOO", ["SPX_Close"], full_refresh=self.full_refresh)
+        if write_start:
+            warmup = pd.Timedelta(days=FETCH_CONFIG["spx_warmup_days"])
+            start_date = max(start_date, (pd.Timestamp(write_start) - warmup).strftime("%Y-%m-%d"))
+
         try:
             ticker = "^GSPC"
             end_date = datetime.now().strftime("%Y-%m-%d")
@@ -78,7 +91,7 @@ class YFinanceFetcher:
                 headers = {
                     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
                 }
-                r = requests.get(url, params=params, headers=headers, timeout=30)
+                r = cached_get(url, params=params, headers=headers, timeout=30)
                 if r.status_code != 200:
                     logger.error(f"Yahoo Finance API returned {r.status_code}")
                     return 0, 0
@@ -89,23 +102,17 @@ class YFinanceFetcher:
 
             if len(df) > 0:
 
-                # Store raw price data
-                for _, row in df.iterrows():
-                    date_str = row["Date"].strftime("%Y-%m-%d")
-
-                    # Store Close price
-                    c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                             ("SPX_Close", date_str, float(row["Close"])))
-                    total_obs += 1
-
-                    # Store Volume if available
-                    if pd.notna(row.get("Volume")):
-                        c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                 ("SPX_Volume", date_str, float(row["Volume"])))
-                        total_obs += 1
+                # Store raw price data (Close, and Volume if available)
+                raw = pd.DataFrame({"SPX_Close": df["Close"].to_numpy()},
+                                   index=pd.DatetimeIndex(df["Date"]))
+                if "Volume" in df.columns:
+                    raw["SPX_Volume"] = df["Volume"].to_numpy()
+                if write_start:
+                    raw = raw[raw.index >= write_start]
+                total_obs += write_wide(self.conn, raw, commit=False)
 
                 # Compute derived metrics
-                derived_obs = self._compute_derived_metrics(df, c)
+                derived_obs = self._compute_derived_metrics(df, since=write_start)
                 total_obs += derived_obs
 
                 # Update metadata
@@ -127,12 +134,10 @@ class YFinanceFetcher:
                     ("SPX_RSI_14d", "S&P 500 14-day RSI"),
                 ]
 
-                for series_id, title in series_list:
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, title, "Yahoo", "Market_Structure", "Daily", "",
-                              datetime.now().isoformat(), datetime.now().isoformat()))
+                write_series_meta(self.conn, [
+                    (series_id, title, "Yahoo", "Market_Structure", "Daily", "")
+                    for series_id, title in series_list
+                ])
 
                 self.conn.commit()
                 logger.info(f"   S&P 500: {total_obs:,} observations")
@@ -147,10 +152,8 @@ class YFinanceFetcher:
 
         return 0, 0
 
-    def _compute_derived_metrics(self, df: pd.DataFrame, cursor) -> int:
-        """Compute trend and momentum metrics from price data."""
-        obs_count = 0
-
+    def _compute_derived_metrics(self, df: pd.DataFrame, since: str = None) -> int:
+        """Compute trend and momentum metrics from price data (stored from `since` on)."""
         df = df.copy()
         df = df.set_index("Date")
         close = df["Close"]
@@ -203,14 +206,10 @@ class YFinanceFetcher:
             "SPX_RSI_14d": rsi,
         }
 
-        for series_id, series in metrics.items():
-            for date, value in series.dropna().items():
-                date_str = date.strftime("%Y-%m-%d")
-                cursor.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                              (series_id, date_str, float(value)))
-                obs_count += 1
-
-        return obs_count
+        metrics = pd.DataFrame(metrics)
+        if since:
+            metrics = metrics[metrics.index >= since]
+        return write_wide(self.conn, metrics, commit=False)
 
 
 # ==========================================
@@ -285,9 +284,10 @@ class SentimentFetcher:
     FRED_BASE_URL = "https://api.stlouisfed.org/fred"
     AAII_URL = "https://www.aaii.com/files/surveys/sentiment.xls"
 
-    def __init__(self, conn: sqlite3.Connection, fred_api_key: str):
+    def __init__(self, conn: sqlite3.Connection, fred_api_key: str, full_refresh: bool = False):
         self.conn = conn
         self.fred_api_key = fred_api_key
+        self.full_refresh = full_refresh
 
     def fetch_all(self) -> Tuple[int, int]:
         """Fetch all sentiment data sources."""
@@ -343,29 +343,21 @@ class SentimentFetcher:
                     lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100, raw=False
                 )
 
-                # Store derived metrics
-                for date, value in vix_vs_50d.dropna().items():
-                    date_str = date.strftime("%Y-%m-%d")
-                    c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                             ("VIX_vs_50d_pct", date_str, float(value)))
-                    obs_count += 1
-
-                for date, value in vix_pct.dropna().items():
-                    date_str = date.strftime("%Y-%m-%d")
-                    c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                             ("VIX_percentile_252d", date_str, float(value)))
-                    obs_count += 1
+                # Store derived metrics (revision window only, unless full refresh)
+                derived = pd.DataFrame({
+                    "VIX_vs_50d_pct": vix_vs_50d,
+                    "VIX_percentile_252d": vix_pct,
+                })
+                since = revision_start(self.conn, "DERIVED", list(derived.columns), full_refresh=self.full_refresh)
+                if since:
+                    derived = derived[derived.index >= since]
+                obs_count += write_wide(self.conn, derived, commit=False)
 
                 # Update metadata
-                for series_id, title in [
-                    ("VIX_vs_50d_pct", "VIX % vs 50-day MA"),
-                    ("VIX_percentile_252d", "VIX Percentile (252-day)"),
-                ]:
-                    c.execute("""INSERT OR REPLACE INTO series_meta
-                                (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                VALUES (?,?,?,?,?,?,?,?)""",
-                             (series_id, title, "Derived", "Sentiment", "Daily", "Percent",
-                              datetime.now().isoformat(), datetime.now().isoformat()))
+                write_series_meta(self.conn, [
+                    ("VIX_vs_50d_pct", "VIX % vs 50-day MA", "Derived", "Sentiment", "Daily", "Percent"),
+                    ("VIX_percentile_252d", "VIX Percentile (252-day)", "Derived", "Sentiment", "Daily", "Percent"),
+                ])
 
                 self.conn.commit()
                 logger.info(f"   VIX metrics: {obs_count:,} observations")
@@ -381,7 +373,6 @@ class SentimentFetcher:
         Fetch AAII Investor Sentiment Survey.
         Weekly data: % Bullish, % Bearish, % Neutral.
         """
-        c = self.conn.cursor()
         obs_count = 0
 
         try:
@@ -391,7 +382,7 @@ class SentimentFetcher:
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
             }
 
-            r = requests.get(self.AAII_URL, headers=headers, timeout=30)
+            r = cached_get(self.AAII_URL, headers=headers, timeout=30)
 
             if r.status_code == 200:
                 # Parse Excel file (xls format requires xlrd engine)
@@ -450,63 +441,38 @@ class SentimentFetcher:
                 bearish_col = "Bearish" if "Bearish" in df.columns else None
 
                 if bullish_col and bearish_col:
-                    for _, row in df.iterrows():
-                        if pd.isna(row["Date"]):
-                            continue
-                        date_str = row["Date"].strftime("%Y-%m-%d")
-
-                        if pd.notna(row.get(bullish_col)):
-                            val = float(row[bullish_col])
-                            if val > 1:  # Likely percentage, not decimal
-                                val = val / 100
-                            c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                     ("AAII_Bullish", date_str, val))
-                            obs_count += 1
-
-                        if pd.notna(row.get(bearish_col)):
-                            val = float(row[bearish_col])
-                            if val > 1:
-                                val = val / 100
-                            c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                     ("AAII_Bearish", date_str, val))
-                            obs_count += 1
-
-                        if neutral_col and pd.notna(row.get(neutral_col)):
-                            val = float(row[neutral_col])
-                            if val > 1:
-                                val = val / 100
-                            c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                     ("AAII_Neutral", date_str, val))
-                            obs_count += 1
-
-                    # Compute Bull-Bear spread
-                    c.execute("""SELECT date, value FROM observations
-                                WHERE series_id = 'AAII_Bullish' ORDER BY date""")
-                    bullish = dict(c.fetchall())
-
-                    c.execute("""SELECT date, value FROM observations
-                                WHERE series_id = 'AAII_Bearish' ORDER BY date""")
-                    bearish = dict(c.fetchall())
-
-                    for date in bullish:
-                        if date in bearish:
-                            spread = bullish[date] - bearish[date]
-                            c.execute("INSERT OR REPLACE INTO observations VALUES (?,?,?)",
-                                     ("AAII_Bull_Bear_Spread", date, spread))
-                            obs_count += 1
+                    columns = {"AAII_Bullish": bullish_col, "AAII_Bearish": bearish_col}
+                    if neutral_col:
+                        columns["AAII_Neutral"] = neutral_col
+
+                    sentiment = pd.DataFrame(
+                        {sid: pd.to_numeric(df[col], errors="coerce").to_numpy() for sid, col in columns.items()},
+                        index=pd.DatetimeIndex(df["Date"])
+                    )
+                    # Likely percentage, not decimal
+                    sentiment = sentiment.where(sentiment <= 1, sentiment / 100)
+                    sentiment = sentiment[~sentiment.index.duplicated(keep="last")]
+
+                    # Compute Bull-Bear spread (dates with both readings)
+                    sentiment["AAII_Bull_Bear_Spread"] = sentiment["AAII_Bullish"] - sentiment["AAII_Bearish"]
+
+                    # The file is always full history; only write the revision window
+                    since = revision_start(self.conn, "AAII", list(columns), full_refresh=self.full_refresh)
+                    if since:
+                        sentiment = sentiment[sentiment.index >= since]
+
+                    obs_count += write_wide(self.conn, sentiment, commit=False)
 
                     # Update metadata
-                    for series_id, title in [
-                        ("AAII_Bullish", "AAII % Bullish"),
-                        ("AAII_Bearish", "AAII % Bearish"),
-                        ("AAII_Neutral", "AAII % Neutral"),
-                        ("AAII_Bull_Bear_Spread", "AAII Bull-Bear Spread"),
-                    ]:
-                        c.execute("""INSERT OR REPLACE INTO series_meta
-                                    (series_id, title, source, category, frequency, units, last_updated, last_fetched)
-                                    VALUES (?,?,?,?,?,?,?,?)""",
-                                 (series_id, title, "AAII", "Sentiment", "Weekly", "Percent",
-                                  datetime.now().isoformat(), datetime.now().isoformat()))
+                    write_series_meta(self.conn, [
+                        (series_id, title, "AAII", "Sentiment", "Weekly", "Percent")
+                        for series_id, title in [
+                            ("AAII_Bullish", "AAII % Bullish"),
+                            ("AAII_Bearish", "AAII % Bearish"),
+                            ("AAII_Neutral", "AAII % Neutral"),
+                            ("AAII_Bull_Bear_Spread", "AAII Bull-Bear Spread"),
+                        ]
+                    ])
 
                     self.conn.commit()
                     logger.info(f"   AAII sentiment: {obs_count:,} observations")
@@ -592,11 +558,11 @@ class MarketDataFetcher:
     Master fetcher coordinating all market data sources.
     """
 
-    def __init__(self, conn: sqlite3.Connection, fred_api_key: str):
+    def __init__(self, conn: sqlite3.Connection, fred_api_key: str, full_refresh: bool = False):
         self.conn = conn
-        self.yfinance = YFinanceFetcher(conn)
+        self.yfinance = YFinanceFetcher(conn, full_refresh)
         self.breadth = BreadthFetcher(conn, fred_api_key)
-        self.sentiment = SentimentFetcher(conn, fred_api_key)
+        self.sentiment = SentimentFetcher(conn, fred_api_key, full_refresh)
         self.putcall = PutCallFetcher(conn)
 
     def fetch_all(self) -> Dict[str, Tuple[int, int]]:
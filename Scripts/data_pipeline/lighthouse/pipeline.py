@@ -9,25 +9,27 @@ Run daily at 06:00 ET via launchd.
 import sqlite3
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Dict
 
-from .config import DB_PATH, validate_api_keys, API_KEYS
+from .config import DB_PATH, FETCH_CONFIG, validate_api_keys, API_KEYS
 from .fetchers import FREDFetcher, BLSFetcher, BEAFetcher, NYFedFetcher, OFRFetcher
 from .market_fetchers import MarketDataFetcher
 from .crypto_free_fetchers import FreeCryptoFetcher  # Replaced TokenTerminal with free APIs
 from .breadth_fetcher import BreadthDataFetcher  # New: DIY breadth from S&P 500 components
 from .quality import update_quality_flags
+from .bulk import apply_bulk_pragmas
+from .columnar import refresh_columnar_store
+from .writer import SQLiteWriter
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
 logger = logging.getLogger(__name__)
 
+# Root logging is set up by the entry points (run_pipeline.py, __main__ below),
+# not on import, so library users keep their own configuration
+LOG_FORMAT = {"format": "%(asctime)s [%(levelname)s] %(message)s", "datefmt": "%Y-%m-%d %H:%M:%S"}
+
 
 # ==========================================
 # DATABASE SCHEMA
@@ -39,6 +41,7 @@ def init_db(db_path: Path = None) -> sqlite3.Connection:
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     conn = sqlite3.connect(db_path)
+    apply_bulk_pragmas(conn)
     c = conn.cursor()
 
     # Master observations table
@@ -88,6 +91,134 @@ def init_db(db_path: Path = None) -> sqlite3.Connection:
     return conn
 
 
+# ==========================================
+# SOURCE REGISTRY
+# ==========================================
+
+def _fetch_fred(conn, full_refresh: bool) -> Tuple[int, int]:
+    return FREDFetcher(conn, full_refresh).fetch_all()
+
+
+def _fetch_bls(conn, full_refresh: bool) -> Tuple[int, int]:
+    return BLSFetcher(conn, full_refresh).fetch_all()
+
+
+def _fetch_bea(conn, full_refresh: bool) -> Tuple[int, int]:
+    return BEAFetcher(conn, full_refresh).fetch_all()
+
+
+def _fetch_nyfed(conn, full_refresh: bool) -> Tuple[int, int]:
+    return NYFedFetcher(conn, full_refresh).fetch_all()
+
+
+def _fetch_ofr(conn, full_refresh: bool) -> Tuple[int, int]:
+    return OFRFetcher(conn, full_refresh).fetch_all()
+
+
+def _fetch_market(conn, full_refresh: bool) -> Tuple[int, int]:
+    market_results = MarketDataFetcher(conn, API_KEYS["FRED"], full_refresh).fetch_all()
+    # Aggregate market results
+    market_series = sum(r[0] for r in market_results.values())
+    market_obs = sum(r[1] for r in market_results.values())
+    return market_series, market_obs
+
+
+def _fetch_crypto(conn, full_refresh: bool) -> Tuple[int, int]:
+    return FreeCryptoFetcher(conn, full_refresh).fetch_all(price_days=30)
+
+
+def _fetch_breadth(conn, full_refresh: bool) -> Tuple[int, int]:
+    # Always recomputed over the lookback: A/D line and McClellan summation
+    # are cumulative from the start of the window, so a partial write would
+    # splice two different baselines. Unchanged rows are skipped by the writer.
+    return BreadthDataFetcher(conn).fetch_and_compute(lookback_years=3)
+
+
+# source -> (banner, fetch function). Order is the sequential run order.
+SOURCE_FETCHERS = {
+    "FRED": ("FRED", _fetch_fred),
+    "BLS": ("BLS", _fetch_bls),
+    "BEA": ("BEA", _fetch_bea),
+    "NYFED": ("NY FED", _fetch_nyfed),
+    "OFR": ("OFR", _fetch_ofr),
+    "MARKET": ("MARKET DATA (MSI/SPI)", _fetch_market),
+    "CRYPTO": ("CRYPTO (DefiLlama + CoinGecko)", _fetch_crypto),
+    "BREADTH": ("MARKET BREADTH (S&P 500 Components)", _fetch_breadth),
+}
+
+# Sources that read another source's output (MARKET derives VIX metrics from FRED VIXCLS)
+SOURCE_DEPENDENCIES = {
+    "MARKET": ("FRED",),
+}
+
+
+def _run_source(source: str, conn, full_refresh: bool = False) -> Tuple[int, int, float, Optional[str]]:
+    """Run one source in isolation. Returns (series, obs, seconds, error)."""
+    t0 = time.time()
+    try:
+        series, obs = SOURCE_FETCHERS[source][1](conn, full_refresh)
+        return series, obs, time.time() - t0, None
+    except Exception as e:
+        logger.error(f"{source} failed: {e}")
+        return 0, 0, time.time() - t0, str(e)
+
+
+def _run_sequential(conn: sqlite3.Connection, sources: List[str], full_refresh: bool = False) -> Dict[str, tuple]:
+    """Fetch sources one after another on the shared connection."""
+    outcomes = {}
+    for source in sources:
+        print(f"\n--- {SOURCE_FETCHERS[source][0]} ---")
+        outcomes[source] = _run_source(source, conn, full_refresh)
+    return outcomes
+
+
+def _run_concurrent(
+    db_path: Path,
+    sources: List[str],
+    workers: int,
+    full_refresh: bool = False
+) -> Dict[str, tuple]:
+    """
+    Fetch sources on a thread pool. A single SQLiteWriter thread owns the
+    database connection; each fetcher writes through its own queue-backed
+    WriterConnection, so network latency overlaps but writes stay serialized.
+    """
+    print(f"\n--- CONCURRENT FETCH ({workers} workers): {', '.join(sources)} ---")
+    outcomes = {}
+
+    with SQLiteWriter(db_path) as writer, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+
+        def run(source):
+            # Wait for upstream sources so their writes are queued ahead of our reads
+            deps = [futures[d] for d in SOURCE_DEPENDENCIES.get(source, ()) if d in futures]
+            wait(deps)
+            return _run_source(source, writer.connection(source), full_refresh)
+
+        # Dependencies are submitted before their dependents, so waits never deadlock
+        ordered = sorted(sources, key=lambda s: len(SOURCE_DEPENDENCIES.get(s, ())))
+        for source in ordered:
+            futures[source] = pool.submit(run, source)
+
+        for future in as_completed(futures.values()):
+            source = next(s for s, f in futures.items() if f is future)
+            outcomes[source] = future.result()
+            series, obs, seconds, _ = outcomes[source]
+            print(f"  [{source}] done in {seconds:.1f}s: {series} series, {obs:,} obs")
+
+    # Surface write failures next to fetch failures, per source
+    for source in sources:
+        write_errors = writer.source_errors(source)
+        if writer.failure is not None:
+            write_errors.append(f"writer thread stopped: {writer.failure}")
+        if write_errors:
+            series, obs, seconds, error = outcomes[source]
+            detail = f"{len(write_errors)} write errors (first: {write_errors[0]})"
+            outcomes[source] = (series, obs, seconds, f"{error}; {detail}" if error else detail)
+
+    return {s: outcomes[s] for s in sources}
+
+
 # ==========================================
 # MAIN UPDATE ROUTINE
 # ==========================================
@@ -95,7 +226,9 @@ def init_db(db_path: Path = None) -> sqlite3.Connection:
 def run_daily_update(
     db_path: Path = None,
     skip_quality: bool = False,
-    sources: list = None
+    sources: list = None,
+    workers: int = None,
+    full_refresh: bool = False
 ) -> Tuple[int, int]:
     """
     Master update routine - run this daily.
@@ -104,18 +237,24 @@ def run_daily_update(
         db_path: Optional custom database path
         skip_quality: Skip quality checks (faster)
         sources: List of sources to update (default: all)
-            Options: ['FRED', 'BLS', 'BEA', 'NYFED', 'OFR']
+            Options: ['FRED', 'BLS', 'BEA', 'NYFED', 'OFR', 'MARKET', 'CRYPTO', 'BREADTH']
+        workers: Sources fetched concurrently (default: FETCH_CONFIG["parallel_workers"]).
+            1 runs everything sequentially on a single connection.
+        full_refresh: Re-download full history instead of fetching from each
+            series' last_value_date minus its revision window
 
     Returns:
         Tuple of (total_series_updated, total_observations_added)
     """
     start_time = time.time()
     errors = []
+    workers = workers or FETCH_CONFIG["parallel_workers"]
 
     print("=" * 70)
     print("LIGHTHOUSE MACRO - MASTER DATABASE UPDATE")
     print(f"Database: {db_path or DB_PATH}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Mode: {'FULL REFRESH' if full_refresh else 'incremental'}")
     print("=" * 70)
 
     # Validate API keys
@@ -132,120 +271,24 @@ def run_daily_update(
 
     # Default to all sources
     if sources is None:
-        sources = ["FRED", "BLS", "BEA", "NYFED", "OFR", "MARKET", "CRYPTO", "BREADTH"]
+        sources = list(SOURCE_FETCHERS)
+    sources = [s for s in SOURCE_FETCHERS if s in sources]
+
+    # Fetch each source: source -> (series, obs, seconds, error)
+    if workers > 1 and len(sources) > 1:
+        outcomes = _run_concurrent(db_path or DB_PATH, sources, workers, full_refresh)
+    else:
+        outcomes = _run_sequential(conn, sources, full_refresh)
 
     # Track totals
-    total_series = 0
-    total_obs = 0
     results = {}
-
-    # Fetch each source
-    if "FRED" in sources:
-        print("\n--- FRED ---")
-        try:
-            fetcher = FREDFetcher(conn)
-            series, obs = fetcher.fetch_all()
-            results["FRED"] = (series, obs)
-            total_series += series
-            total_obs += obs
-        except Exception as e:
-            logger.error(f"FRED failed: {e}")
-            errors.append(f"FRED: {e}")
-            results["FRED"] = (0, 0)
-
-    if "BLS" in sources:
-        print("\n--- BLS ---")
-        try:
-            fetcher = BLSFetcher(conn)
-            series, obs = fetcher.fetch_all()
-            results["BLS"] = (series, obs)
-            total_series += series
-            total_obs += obs
-        except Exception as e:
-            logger.error(f"BLS failed: {e}")
-            errors.append(f"BLS: {e}")
-            results["BLS"] = (0, 0)
-
-    if "BEA" in sources:
-        print("\n--- BEA ---")
-        try:
-            fetcher = BEAFetcher(conn)
-            series, obs = fetcher.fetch_all()
-            results["BEA"] = (series, obs)
-            total_series += series
-            total_obs += obs
-        except Exception as e:
-            logger.error(f"BEA failed: {e}")
-            errors.append(f"BEA: {e}")
-            results["BEA"] = (0, 0)
-
-    if "NYFED" in sources:
-        print("\n--- NY FED ---")
-        try:
-            fetcher = NYFedFetcher(conn)
-            series, obs = fetcher.fetch_all()
-            results["NYFED"] = (series, obs)
-            total_series += series
-            total_obs += obs
-        except Exception as e:
-            logger.error(f"NYFED failed: {e}")
-            errors.append(f"NYFED: {e}")
-            results["NYFED"] = (0, 0)
-
-    if "OFR" in sources:
-        print("\n--- OFR ---")
-        try:
-            fetcher = OFRFetcher(conn)
-            series, obs = fetcher.fetch_all()
-            results["OFR"] = (series, obs)
-            total_series += series
-            total_obs += obs
-        except Exception as e:
-            logger.error(f"OFR failed: {e}")
-            errors.append(f"OFR: {e}")
-            results["OFR"] = (0, 0)
-
-    if "MARKET" in sources:
-        print("\n--- MARKET DATA (MSI/SPI) ---")
-        try:
-            fetcher = MarketDataFetcher(conn, API_KEYS["FRED"])
-            market_results = fetcher.fetch_all()
-            # Aggregate market results
-            market_series = sum(r[0] for r in market_results.values())
-            market_obs = sum(r[1] for r in market_results.values())
-            results["MARKET"] = (market_series, market_obs)
-            total_series += market_series
-            total_obs += market_obs
-        except Exception as e:
-            logger.error(f"MARKET failed: {e}")
-            errors.append(f"MARKET: {e}")
-            results["MARKET"] = (0, 0)
-
-    if "CRYPTO" in sources:
-        print("\n--- CRYPTO (DefiLlama + CoinGecko) ---")
-        try:
-            fetcher = FreeCryptoFetcher(conn)
-            crypto_series, crypto_obs = fetcher.fetch_all(price_days=30)
-            results["CRYPTO"] = (crypto_series, crypto_obs)
-            total_series += crypto_series
-            total_obs += crypto_obs
-        except Exception as e:
-            logger.error(f"CRYPTO failed: {e}")
-            errors.append(f"CRYPTO: {e}")
-            results["CRYPTO"] = (0, 0)
-
-    if "BREADTH" in sources:
-        print("\n--- MARKET BREADTH (S&P 500 Components) ---")
-        try:
-            fetcher = BreadthDataFetcher(conn)
-            breadth_series, breadth_obs = fetcher.fetch_and_compute(lookback_years=3)
-            results["BREADTH"] = (breadth_series, breadth_obs)
-            total_series += breadth_series
-            total_obs += breadth_obs
-        except Exception as e:
-            logger.error(f"BREADTH failed: {e}")
-            errors.append(f"BREADTH: {e}")
-            results["BREADTH"] = (0, 0)
+    for source, (series, obs, seconds, error) in outcomes.items():
+        results[source] = (series, obs, seconds)
+        if error:
+            errors.append(f"{source}: {error}")
+    total_series = sum(r[0] for r in results.values())
+    total_obs = sum(r[1] for r in results.values())
+    fetch_duration = time.time() - start_time
 
     # Run quality checks
     if not skip_quality:
@@ -256,13 +299,28 @@ def run_daily_update(
             logger.error(f"Quality checks failed: {e}")
             errors.append(f"Quality: {e}")
 
-    # Log the update
+    # Refresh the Parquet mirror read by lighthouse.query (changed sources only)
+    print("\n--- COLUMNAR STORE ---")
+    conn.commit()
+    try:
+        rewritten = refresh_columnar_store(db_path)
+        print(f"  Partitions rewritten: {', '.join(rewritten) if rewritten else 'none'}")
+    except Exception as e:
+        logger.error(f"Columnar store refresh failed: {e}")
+        errors.append(f"Columnar: {e}")
+
+    # Log the update: one row per source plus the overall run
     duration = time.time() - start_time
+    now = datetime.now().isoformat()
     c = conn.cursor()
-    c.execute("""INSERT INTO update_log
+    log_sql = """INSERT INTO update_log
                 (timestamp, source, series_updated, observations_added, duration_seconds, status, errors)
-                VALUES (?,?,?,?,?,?,?)""",
-             (datetime.now().isoformat(), "ALL", total_series, total_obs, duration,
+                VALUES (?,?,?,?,?,?,?)"""
+    for source, (series, obs, seconds, error) in outcomes.items():
+        c.execute(log_sql, (now, source, series, obs, seconds,
+                            "completed_with_errors" if error else "completed", error))
+    c.execute(log_sql,
+             (now, "ALL", total_series, total_obs, duration,
               "completed" if not errors else "completed_with_errors",
               "; ".join(errors) if errors else None))
     conn.commit()
@@ -284,8 +342,12 @@ def run_daily_update(
     print(f"  Duration: {duration:.1f} seconds")
 
     print(f"\nThis Update:")
-    for source, (series, obs) in results.items():
-        print(f"  {source}: {series} series, {obs:,} observations")
+    for source, (series, obs, seconds) in results.items():
+        print(f"  {source}: {series} series, {obs:,} observations ({seconds:.1f}s)")
+    source_seconds = sum(r[2] for r in results.values())
+    if source_seconds > 0:
+        print(f"  Fetch wall time: {fetch_duration:.1f}s "
+              f"(sum of sources {source_seconds:.1f}s, {source_seconds / max(fetch_duration, 1e-9):.1f}x)")
 
     if errors:
         print(f"\nErrors ({len(errors)}):")
@@ -353,11 +415,17 @@ def get_stats(db_path: Path = None):
 if __name__ == "__main__":
     import argparse
 
+    logging.basicConfig(level=logging.INFO, **LOG_FORMAT)
+
     parser = argparse.ArgumentParser(description="Lighthouse Macro Data Pipeline")
     parser.add_argument("--stats", action="store_true", help="Show database statistics only")
     parser.add_argument("--skip-quality", action="store_true", help="Skip quality checks")
     parser.add_argument("--sources", nargs="+", choices=["FRED", "BLS", "BEA", "NYFED", "OFR", "MARKET"],
                        help="Only update specific sources")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Sources fetched concurrently (1 = sequential)")
+    parser.add_argument("--full-refresh", action="store_true",
+                       help="Re-download full history instead of incremental fetch")
 
     args = parser.parse_args()
 
@@ -366,6 +434,8 @@ if __name__ == "__main__":
     else:
         run_daily_update(
             skip_quality=args.skip_quality,
-            sources=args.sources
+            sources=args.sources,
+            workers=args.workers,
+            full_refresh=args.full_refresh
         )
         get_stats()
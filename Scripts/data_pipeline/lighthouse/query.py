@@ -2,15 +2,21 @@
 LIGHTHOUSE MACRO - QUERY HELPERS
 ================================
 Clean interfaces for querying the master database.
+
+Series reads come from the columnar store (columnar.py) when it is current,
+and from SQLite otherwise.
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
 
 from .config import DB_PATH, OUTPUT_DIR
+from .columnar import read_observations
+from .export import SUFFIXES, LongWriter, export_formats, peak_memory_mb, write_wide
 
 
 # ==========================================
@@ -35,6 +41,10 @@ def get_series(
     Returns:
         DataFrame with 'date' index and 'value' column
     """
+    df = read_observations([series_id], start_date, end_date, db_path)
+    if df is not None and not df.empty:
+        return df[["date", "value"]].sort_values("date").set_index("date")
+
     db_path = db_path or DB_PATH
     conn = sqlite3.connect(db_path)
 
@@ -74,33 +84,93 @@ def get_multiple_series(
         db_path: Optional custom database path
 
     Returns:
-        DataFrame with date index and series as columns
+        DataFrame with date index and series as columns (all-NaN for series
+        with no data)
     """
-    db_path = db_path or DB_PATH
-    conn = sqlite3.connect(db_path)
+    return _to_wide(_read_long(series_ids, start_date, end_date, db_path), series_ids)
 
-    placeholders = ",".join(["?" for _ in series_ids])
-    query = f"SELECT date, series_id, value FROM observations WHERE series_id IN ({placeholders})"
-    params = list(series_ids)
 
-    if start_date:
-        query += " AND date >= ?"
-        params.append(start_date)
-    if end_date:
-        query += " AND date <= ?"
-        params.append(end_date)
+def iter_series(
+    series_ids: List[str],
+    start_date: str = None,
+    end_date: str = None,
+    db_path: Path = None,
+    chunk_size: int = 200
+):
+    """
+    Yield (series_id, DataFrame) pairs shaped like get_series, loading
+    chunk_size series per read instead of one query per series.
 
-    query += " ORDER BY date"
+    Series with no data yield an empty frame.
+    """
+    series_ids = list(series_ids)
+    for i in range(0, len(series_ids), chunk_size):
+        chunk = series_ids[i:i + chunk_size]
+        long = _read_long(chunk, start_date, end_date, db_path)
+        groups = dict(tuple(long.groupby("series_id", observed=True, sort=False)))
+        for series_id in chunk:
+            group = groups.get(series_id)
+            if group is None:
+                group = long.iloc[:0]
+            yield series_id, group[["date", "value"]].sort_values("date").set_index("date")
+
+
+def _read_long(
+    series_ids: List[str],
+    start_date: str = None,
+    end_date: str = None,
+    db_path: Path = None
+) -> pd.DataFrame:
+    """(series_id, date, value) rows from the columnar store, SQLite for anything it lacks."""
+    df = read_observations(series_ids, start_date, end_date, db_path)
+    missing = list(series_ids) if df is None else sorted(set(series_ids) - set(df["series_id"].unique()))
+
+    if missing:
+        # Store stale/absent, or series without metadata (not mirrored)
+        db_path = db_path or DB_PATH
+        conn = sqlite3.connect(db_path)
+
+        placeholders = ",".join(["?" for _ in missing])
+        query = f"SELECT series_id, date, value FROM observations WHERE series_id IN ({placeholders})"
+        params = list(missing)
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+
+        sql_df = pd.read_sql(query, conn, params=params)
+        sql_df["date"] = pd.to_datetime(sql_df["date"], errors="coerce")
+        sql_df["value"] = sql_df["value"].astype("float64")
+        conn.close()
+        if df is None or df.empty:
+            df = sql_df
+        elif not sql_df.empty:
+            df["series_id"] = df["series_id"].astype(object)
+            df = pd.concat([df, sql_df], ignore_index=True)
 
-    df = pd.read_sql(query, conn, params=params)
-    df["date"] = pd.to_datetime(df["date"])
+    return df
 
-    # Pivot to wide format
-    df_wide = df.pivot(index="date", columns="series_id", values="value")
-    df_wide = df_wide[series_ids]  # Maintain order
 
-    conn.close()
-    return df_wide
+def _pivot_long(df: pd.DataFrame, series_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Long (series_id, date, value) -> (sorted dates, float64 array with one
+    C-contiguous row per series, in series_ids order, NaN where absent).
+    """
+    dates, col = np.unique(df["date"].to_numpy(dtype="datetime64[ns]"), return_inverse=True)
+    row = pd.Index(series_ids).get_indexer(df["series_id"])
+    values = np.full((len(series_ids), len(dates)), np.nan)
+    values[row, col] = df["value"].to_numpy(dtype="float64")
+    return dates, values
+
+
+def _to_wide(df: pd.DataFrame, series_ids: List[str]) -> pd.DataFrame:
+    """Long (series_id, date, value) -> date x series frame, columns in series_ids order."""
+    dates, values = _pivot_long(df, series_ids)
+    return pd.DataFrame(values.T, index=pd.DatetimeIndex(dates, name="date"),
+                        columns=pd.Index(series_ids, name="series_id"))
 
 
 def search_series(
@@ -212,22 +282,27 @@ def export_wide(
     output_path: Path = None,
     start_date: str = "2000-01-01",
     series_ids: List[str] = None,
-    db_path: Path = None
+    db_path: Path = None,
+    fmt: str = None,
+    csv: bool = None
 ) -> Path:
     """
-    Export data to wide-format CSV.
+    Export data to a wide-format file (one column per series title).
 
     Args:
-        output_path: Output file path (default: Lighthouse_Master_Wide.csv)
+        output_path: Output path without extension (default: Lighthouse_Master_Wide)
         start_date: Start date for export
         series_ids: Optional list of specific series to export
         db_path: Optional custom database path
+        fmt: 'parquet' | 'arrow' | 'csv' (default: EXPORT_CONFIG["format"])
+        csv: Also write a CSV copy (default: EXPORT_CONFIG["csv"])
 
     Returns:
-        Path to exported file
+        Path to the exported file (the `fmt` one)
     """
     db_path = db_path or DB_PATH
-    output_path = output_path or OUTPUT_DIR / "Lighthouse_Master_Wide.csv"
+    output_path = Path(output_path or OUTPUT_DIR / "Lighthouse_Master_Wide")
+    output_path = output_path.with_suffix("") if output_path.suffix in SUFFIXES.values() else output_path
 
     conn = sqlite3.connect(db_path)
 
@@ -252,53 +327,73 @@ def export_wide(
         params = [start_date]
 
     df = pd.read_sql(query, conn, params=params)
+    conn.close()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df_wide = df.pivot_table(index="date", columns="title", values="value")
-    df_wide.to_csv(output_path)
+    del df
 
-    print(f"Exported to: {output_path}")
+    paths = write_wide(df_wide, output_path, export_formats(fmt, csv))
+    for path in paths:
+        print(f"Exported to: {path}")
     print(f"Shape: {df_wide.shape[0]} rows x {df_wide.shape[1]} columns")
-
-    conn.close()
-    return output_path
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"Peak memory: {peak:,.0f} MB")
+    return paths[0]
 
 
 def export_long(
     output_path: Path = None,
     start_date: str = "2000-01-01",
-    db_path: Path = None
+    db_path: Path = None,
+    fmt: str = None,
+    csv: bool = None
 ) -> Path:
     """
-    Export data to long-format CSV (better for some models).
+    Export data to a long-format file (better for some models).
+
+    Rows are (date, series_id, title, source, category, value), grouped by
+    series and written in chunks as series are read, never as one frame.
 
     Args:
-        output_path: Output file path
+        output_path: Output path without extension (default: Lighthouse_Master_Long)
         start_date: Start date for export
         db_path: Optional custom database path
+        fmt: 'parquet' | 'arrow' | 'csv' (default: EXPORT_CONFIG["format"])
+        csv: Also write a CSV copy (default: EXPORT_CONFIG["csv"])
 
     Returns:
-        Path to exported file
+        Path to the exported file (the `fmt` one)
     """
     db_path = db_path or DB_PATH
-    output_path = output_path or OUTPUT_DIR / "Lighthouse_Master_Long.csv"
+    output_path = Path(output_path or OUTPUT_DIR / "Lighthouse_Master_Long")
+    output_path = output_path.with_suffix("") if output_path.suffix in SUFFIXES.values() else output_path
 
     conn = sqlite3.connect(db_path)
-
-    query = """
-        SELECT o.date, o.series_id, m.title, m.source, m.category, o.value
-        FROM observations o
-        JOIN series_meta m ON o.series_id = m.series_id
-        WHERE o.date >= ?
-        ORDER BY o.date, o.series_id
-    """
-
-    df = pd.read_sql(query, conn, params=[start_date])
-    df.to_csv(output_path, index=False)
-
-    print(f"Exported to: {output_path}")
-    print(f"Rows: {len(df):,}")
-
+    meta = pd.read_sql("SELECT series_id, title, source, category FROM series_meta ORDER BY series_id", conn)
     conn.close()
-    return output_path
+
+    columns = {"date": "date", "series_id": "string", "title": "string",
+               "source": "string", "category": "string", "value": "float"}
+    info = meta.drop_duplicates("series_id").set_index("series_id")
+    with LongWriter(output_path, columns, export_formats(fmt, csv)) as writer:
+        for series_id, df in iter_series(meta["series_id"].tolist(), start_date=start_date, db_path=db_path):
+            df = df[df.index.notna()]
+            if df.empty:
+                continue
+            title, source, category = info.loc[series_id, ["title", "source", "category"]]
+            writer.add(pd.DataFrame({
+                "date": df.index, "series_id": series_id, "title": title,
+                "source": source, "category": category, "value": df["value"].to_numpy(),
+            }))
+
+    for path in writer.paths:
+        print(f"Exported to: {path}")
+    print(f"Rows: {writer.rows:,}")
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"Peak memory: {peak:,.0f} MB")
+    return writer.paths[0]
 
 
 # ==========================================
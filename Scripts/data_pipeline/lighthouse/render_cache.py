@@ -0,0 +1,243 @@
+"""
+LIGHTHOUSE MACRO - CHART RENDER CACHE
+=====================================
+Content-addressed skip for chart scripts: a chart's file is rewritten only
+when its key changes. The key hashes
+
+- the data the chart read: results of the script's loader functions,
+  registered with RenderCache.track / RenderCache.tracked
+- the code: source of the chart script (and any style modules passed in)
+- the style: matplotlib rcParams, extra style settings (e.g. a theme dict)
+  and the savefig arguments
+
+Each output directory keeps a manifest (RENDER_CACHE_CONFIG["manifest_name"])
+with every chart's key and the last run's rebuilt / unchanged lists. Set
+LIGHTHOUSE_RENDER_FORCE=1 (or force=True) to re-render everything.
+
+Data reads are attributed to the next savefig: inputs collect from the start
+of a `with cache.chart():` block (or the previous savefig) until the chart
+is saved.
+
+Usage:
+    CACHE = RenderCache(__file__)
+
+    @CACHE.track
+    def get_series_data(series_id, days=365*5): ...
+
+    def save_chart(fig, filename):
+        if CACHE.savefig(fig, path, dpi=300, bbox_inches='tight'):
+            print("Saved")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .config import RENDER_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# rcParams that do not change the saved file (and differ between sessions)
+_IGNORED_RC = {"backend", "backend_fallback", "interactive", "webagg.port", "savefig.directory"}
+
+
+# ==========================================
+# HASHING
+# ==========================================
+
+def _update(h, value):
+    """Feed a value (frames, arrays, containers, scalars) into hash h."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            h.update(repr((list(value.columns), list(map(str, value.dtypes)))).encode())
+        else:
+            h.update(repr((value.name, str(value.dtype))).encode())
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index))
+            h.update(hashed.to_numpy().tobytes())
+        except TypeError:  # Unhashable cells (lists, dicts)
+            h.update(pickle.dumps(value))
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(pickle.dumps(value) if value.dtype == object else np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=repr):
+            _update(h, k)
+            _update(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for item in value:
+            _update(h, item)
+        h.update(b"]")
+    elif value is None or isinstance(value, (str, int, float, bool, np.generic, datetime, pd.Timestamp)):
+        h.update(repr(value).encode())
+    else:
+        try:
+            h.update(pickle.dumps(value))
+        except Exception:
+            h.update(repr(value).encode())
+
+
+def digest(*values) -> str:
+    """sha256 hex digest of values."""
+    h = hashlib.sha256()
+    for value in values:
+        _update(h, value)
+    return h.hexdigest()
+
+
+def _source_digest(paths) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# ==========================================
+# RENDER CACHE
+# ==========================================
+
+class RenderCache:
+    """
+    Skips savefig for charts whose key matches the manifest entry of an
+    existing file.
+
+    Args:
+        *source_files: Files whose source is the charts' code version
+                       (normally the script's __file__, plus style modules)
+        force: Re-render every chart (default: LIGHTHOUSE_RENDER_FORCE)
+    """
+
+    def __init__(self, *source_files, force: bool = None):
+        self.code_version = _source_digest(source_files)
+        self.force = RENDER_CACHE_CONFIG["force"] if force is None else force
+        self.run = datetime.now().isoformat(timespec="seconds")
+        self._inputs: List[str] = []
+        self._manifests: Dict[Path, dict] = {}
+
+    # ---- data tracking ----
+
+    def record(self, *values):
+        """Add values to the inputs of the chart being built."""
+        self._inputs.append(digest(*values))
+
+    def track(self, fn: Callable) -> Callable:
+        """Decorator: every result of fn (with its arguments) becomes a chart input."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            self.record(fn.__name__, args, kwargs, result)
+            return result
+        return wrapper
+
+    def tracked(self, obj, prefix: str = "get_"):
+        """Proxy for a data-source object whose `prefix*` methods are tracked."""
+        return _TrackedSource(self, obj, prefix)
+
+    @contextmanager
+    def chart(self):
+        """Scope for one chart: inputs start empty (reads from failed charts do not carry over)."""
+        self._inputs = []
+        try:
+            yield self
+        finally:
+            self._inputs = []
+
+    # ---- manifest ----
+
+    def _manifest(self, directory: Path) -> dict:
+        if directory not in self._manifests:
+            manifest = {}
+            path = directory / RENDER_CACHE_CONFIG["manifest_name"]
+            if path.exists():
+                try:
+                    with open(path) as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable render manifest {path}: {e}")
+            manifest.setdefault("charts", {})
+            manifest.update({"run": self.run, "rebuilt": [], "unchanged": []})
+            self._manifests[directory] = manifest
+        return self._manifests[directory]
+
+    def _write_manifest(self, directory: Path):
+        path = directory / RENDER_CACHE_CONFIG["manifest_name"]
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._manifests[directory], f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+    # ---- saving ----
+
+    def key(self, filename: str, style=None, **savefig_kwargs) -> str:
+        """Cache key of the chart being built if saved to filename."""
+        import matplotlib
+        rc = {k: matplotlib.rcParams[k] for k in matplotlib.rcParams if k not in _IGNORED_RC}
+        return digest(self.code_version, filename, self._inputs, style,
+                      savefig_kwargs, matplotlib.__version__, rc)
+
+    def savefig(self, fig, path, style=None, **savefig_kwargs) -> bool:
+        """
+        fig.savefig(path, **savefig_kwargs) unless the file exists with the
+        same key. The figure is left open either way.
+
+        Args:
+            style: Extra style settings in effect (e.g. the active theme dict)
+
+        Returns:
+            True if the file was (re)rendered, False if it was unchanged
+        """
+        path = Path(path)
+        directory = path.parent.resolve()
+        key = self.key(path.name, style, **savefig_kwargs)
+        self._inputs = []
+
+        manifest = self._manifest(directory)
+        entry = manifest["charts"].get(path.name)
+        if not self.force and entry and entry.get("key") == key and path.exists():
+            manifest["unchanged"].append(path.name)
+            rendered = False
+        else:
+            fig.savefig(path, **savefig_kwargs)
+            manifest["charts"][path.name] = {"key": key, "rendered": datetime.now().isoformat(timespec="seconds")}
+            manifest["rebuilt"].append(path.name)
+            rendered = True
+
+        self._write_manifest(directory)
+        return rendered
+
+    def summary(self) -> Dict[str, List[str]]:
+        """Rebuilt / unchanged charts of this run, over all output directories."""
+        return {
+            status: [name for m in self._manifests.values() for name in m[status]]
+            for status in ("rebuilt", "unchanged")
+        }
+
+
+class _TrackedSource:
+    """Attribute proxy used by RenderCache.tracked."""
+
+    def __init__(self, cache: RenderCache, obj, prefix: str):
+        self._cache = cache
+        self._obj = obj
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        if callable(attr) and name.startswith(self._prefix):
+            return self._cache.track(attr)
+        return attr
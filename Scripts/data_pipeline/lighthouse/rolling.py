@@ -0,0 +1,118 @@
+"""
+LIGHTHOUSE MACRO - ROLLING STATISTICS
+=====================================
+One rolling mean/std/z-score module for every z-score in the stack
+(indices, crypto indices, transforms, validation, dashboards), so they all
+follow the same conventions:
+
+    - NaNs are skipped; a window needs min_periods valid values
+      (default window // 2, at least 1, never more than window)
+    - std is the sample std (ddof=1) and needs at least two valid values
+    - zero std gives a NaN z-score, never inf
+
+Series and DataFrames go through the same 2-D kernels, all columns at once.
+
+Two kernels:
+    - default: O(n) running mean/variance (pandas' Welford updates with
+      Kahan-compensated sums; exact zeros for constant windows)
+    - exact=True: each window's mean and std computed from that window's own
+      values, two-pass. O(n * window), but a window's result does not depend
+      on where the series starts, so a trailing slice reproduces full-history
+      values bit for bit. compute_indices (--latest, walk-forward vintages)
+      relies on this.
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+EXACT_BLOCK_CELLS = 4_000_000  # Window values per block in the exact kernel (bounds temporary memory)
+
+SeriesOrFrame = Union[pd.Series, pd.DataFrame]
+
+
+def resolve_min_periods(window: int, min_periods: int = None) -> int:
+    """The min_periods rule above."""
+    if min_periods is None:
+        return max(1, window // 2)
+    return max(1, min(min_periods, window))
+
+
+# ==========================================
+# KERNELS
+# ==========================================
+
+def _running_mean_std(columns: np.ndarray, window: int, min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """O(n) kernel on a (rows x columns) array."""
+    rolling = pd.DataFrame(columns).rolling(window, min_periods=min_periods)
+    return rolling.mean().to_numpy(), rolling.std().to_numpy()
+
+
+def _exact_mean_std(columns: np.ndarray, window: int, min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Start-independent kernel on a (rows x columns) array."""
+    columns = columns.T  # (columns, rows): each window contiguous
+    k, n = columns.shape
+    mean = np.full((k, n), np.nan)
+    std = np.full((k, n), np.nan)
+
+    padded = np.concatenate([np.full((k, window - 1), np.nan), columns], axis=1)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=1)  # (k, n, window)
+    rows = max(1, EXACT_BLOCK_CELLS // (k * window))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, n, rows):
+            block = windows[:, start:start + rows]
+            valid = ~np.isnan(block)
+            count = valid.sum(axis=2)
+            m = np.where(valid, block, 0.0).sum(axis=2) / count
+            dev = np.where(valid, block - m[:, :, None], 0.0)
+            var = (dev * dev).sum(axis=2) / (count - 1)
+            ok = count >= min_periods
+            mean[:, start:start + rows] = np.where(ok, m, np.nan)
+            std[:, start:start + rows] = np.where(ok & (count > 1), np.sqrt(var), np.nan)
+    return mean.T, std.T
+
+
+def rolling_mean_std(values: np.ndarray, window: int, min_periods: int = None,
+                     exact: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and sample std of a 1-D array or of each column of a 2-D
+    (rows x columns) array, shaped like `values`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    columns = values[:, None] if values.ndim == 1 else values
+    if columns.size == 0:
+        return np.full(values.shape, np.nan), np.full(values.shape, np.nan)
+
+    kernel = _exact_mean_std if exact else _running_mean_std
+    mean, std = kernel(columns, window, resolve_min_periods(window, min_periods))
+    return mean.reshape(values.shape), std.reshape(values.shape)
+
+
+# ==========================================
+# SERIES / DATAFRAME API
+# ==========================================
+
+def _wrap(result: np.ndarray, like: SeriesOrFrame) -> SeriesOrFrame:
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(result, index=like.index, columns=like.columns)
+    return pd.Series(result, index=like.index, name=like.name)
+
+
+def rolling_mean(data: SeriesOrFrame, window: int, min_periods: int = None, exact: bool = False) -> SeriesOrFrame:
+    """Rolling mean of a Series or of every DataFrame column."""
+    mean, _ = rolling_mean_std(data.to_numpy(dtype=np.float64), window, min_periods, exact)
+    return _wrap(mean, data)
+
+
+def rolling_std(data: SeriesOrFrame, window: int, min_periods: int = None, exact: bool = False) -> SeriesOrFrame:
+    """Rolling sample std of a Series or of every DataFrame column."""
+    _, std = rolling_mean_std(data.to_numpy(dtype=np.float64), window, min_periods, exact)
+    return _wrap(std, data)
+
+
+def rolling_zscore(data: SeriesOrFrame, window: int, min_periods: int = None, exact: bool = False) -> SeriesOrFrame:
+    """(value - rolling mean) / rolling std of a Series or of every DataFrame column."""
+    values = data.to_numpy(dtype=np.float64)
+    mean, std = rolling_mean_std(values, window, min_periods, exact)
+    return _wrap((values - mean) / np.where(std == 0, np.nan, std), data)
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Callable
 
+from .rolling import rolling_zscore
+
 # ==========================================
 # CORE TRANSFORM FUNCTIONS
 # ==========================================
@@ -69,10 +71,8 @@ def ann_6m(s: pd.Series) -> pd.Series:
 
 
 def z_score(s: pd.Series, window: int = 24) -> pd.Series:
-    """Rolling z-score."""
-    rolling_mean = s.rolling(window, min_periods=window // 2).mean()
-    rolling_std = s.rolling(window, min_periods=window // 2).std()
-    return (s - rolling_mean) / rolling_std
+    """Rolling z-score (min_periods window // 2, NaN where std is zero)."""
+    return rolling_zscore(s, window)
 
 
 def ma_4wk(s: pd.Series) -> pd.Series:
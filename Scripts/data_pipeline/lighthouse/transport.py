@@ -0,0 +1,190 @@
+"""
+LIGHTHOUSE MACRO - HTTP TRANSPORT
+=================================
+Shared network layer for every fetcher:
+
+- keep-alive sessions with a connection pool per host
+- a token bucket per source, sized from the provider's published quota
+  (RATE_LIMITS in config), shared by all threads in the process
+- 429 / 503 handling that honors Retry-After, otherwise jittered
+  exponential backoff
+
+Concurrent fetchers go as fast as each quota allows instead of serializing
+on fixed sleeps. The HTTP cache (http_cache.CachedSession) is built on
+LimitedSession, so cache hits never spend a token.
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import FETCH_CONFIG, HOST_SOURCES, RATE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 503)
+
+
+def source_for_url(url: str) -> Optional[str]:
+    """Source name for a URL's host (see HOST_SOURCES)."""
+    return HOST_SOURCES.get(urlsplit(url).netloc.lower())
+
+
+# ==========================================
+# TOKEN BUCKET
+# ==========================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Holds up to `burst` tokens and refills at rate/per tokens per second.
+    acquire() blocks until a token is available; pause() holds every caller
+    when the server asks us to back off.
+    """
+
+    def __init__(self, rate: float, per: float, burst: float = None):
+        self.capacity = float(burst or rate)
+        self.fill_rate = rate / per
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting as needed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return waited
+                    wait = (tokens - self.tokens) / self.fill_rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """Block all acquirers for `seconds` and drain the bucket."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(source: Optional[str]) -> Optional[TokenBucket]:
+    """Process-wide bucket for a source (None if the source has no configured limit)."""
+    if source not in RATE_LIMITS:
+        return None
+    with _limiters_lock:
+        if source not in _limiters:
+            _limiters[source] = TokenBucket(**RATE_LIMITS[source])
+        return _limiters[source]
+
+
+def acquire(source: str) -> float:
+    """Wait for a request slot against a source's quota (for non-requests clients, e.g. yfinance)."""
+    limiter = get_limiter(source)
+    return limiter.acquire() if limiter else 0.0
+
+
+# ==========================================
+# BACKOFF
+# ==========================================
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Delay requested by the server's Retry-After header (seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = None) -> float:
+    """Exponential backoff with +/-50% jitter so concurrent retries spread out."""
+    base = base or FETCH_CONFIG["retry_delay_base"]
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+# ==========================================
+# SESSION
+# ==========================================
+
+class LimitedSession(requests.Session):
+    """
+    Keep-alive session with a connection pool per host and token-bucket
+    rate limiting on every request that reaches the network.
+
+    Args:
+        source: Rate-limit bucket to use; defaults to a lookup on the URL host
+        max_retries: Attempts on 429/503 before the response is returned as-is
+        pool_size: Connections kept alive per host
+    """
+
+    def __init__(self, source: str = None, max_retries: int = None, pool_size: int = None):
+        super().__init__()
+        pool_size = pool_size or FETCH_CONFIG["http_pool_size"]
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.source = source
+        self.max_retries = max_retries or FETCH_CONFIG["max_retries"]
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        limiter = get_limiter(self.source or source_for_url(request.url))
+
+        for attempt in range(self.max_retries):
+            if limiter is not None:
+                limiter.acquire()
+            response = super().send(request, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries - 1:
+                return response
+
+            delay = retry_after_seconds(response)
+            delay = backoff_delay(attempt) if delay is None else delay
+            delay = min(delay, FETCH_CONFIG["max_retry_after"])
+            logger.warning(f"HTTP {response.status_code} from {urlsplit(request.url).netloc}, "
+                           f"retrying in {delay:.1f}s")
+            response.close()
+
+            if limiter is not None:
+                limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+        return response
+
+
+_shared_session: Optional[LimitedSession] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_session() -> LimitedSession:
+    """Process-wide pooled session (no response cache)."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = LimitedSession()
+        return _shared_session
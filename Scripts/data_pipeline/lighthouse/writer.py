@@ -0,0 +1,228 @@
+"""
+LIGHTHOUSE MACRO - SINGLE-WRITER DATABASE THREAD
+=================================================
+SQLite allows one writer at a time. When sources are fetched concurrently,
+a single thread owns the connection and every fetcher talks to it through
+a queue. Fetchers keep their existing cursor/execute/commit code: they are
+handed a WriterConnection instead of a sqlite3.Connection.
+"""
+
+import queue
+import sqlite3
+import threading
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .bulk import apply_bulk_pragmas
+from .config import DB_PATH, FETCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+
+# ==========================================
+# WRITER THREAD
+# ==========================================
+
+class SQLiteWriter:
+    """
+    Owns the SQLite connection on a dedicated thread.
+
+    Writes (execute / executemany / commit) are fire-and-forget: they are
+    queued and applied in order. Reads block until the writer thread has
+    run them, so a fetcher always sees its own earlier writes.
+
+    Write failures never propagate into the fetcher thread. They are
+    collected per source in `errors` so the pipeline can report them next
+    to the fetch errors.
+
+    The connection is opened in start(), so a bad path or pragma fails in
+    the caller. If the thread itself stops (`failure` is set), pending
+    queries fail and later calls raise instead of blocking on the queue.
+    """
+
+    def __init__(self, db_path: Path = None, queue_size: int = None):
+        self.db_path = db_path or DB_PATH
+        queue_size = queue_size or FETCH_CONFIG["writer_queue_size"]
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="lighthouse-writer", daemon=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.errors: Dict[str, List[str]] = {}
+        self.statements = 0
+        self.failure: Optional[BaseException] = None
+
+    # ---- lifecycle ----
+
+    def start(self) -> "SQLiteWriter":
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            apply_bulk_pragmas(self._conn)
+        except Exception:
+            self._conn.close()
+            raise
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Flush the queue, commit, and close the connection."""
+        if self._thread.is_alive():
+            try:
+                self._put((_CLOSE, None, None, None, None))
+            except RuntimeError:
+                pass  # Stopped in the meantime; failure is already set
+        self._thread.join()
+
+    def __enter__(self) -> "SQLiteWriter":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- producer API ----
+
+    def _check(self):
+        if self.failure is not None:
+            raise RuntimeError(f"Writer thread stopped: {self.failure}")
+
+    def _put(self, item: tuple):
+        """Queue an item; raises once the writer has stopped instead of blocking on a full queue."""
+        while True:
+            self._check()
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def execute(self, sql: str, params: Sequence = (), source: str = None):
+        self._put(("execute", sql, params, source, None))
+
+    def executemany(self, sql: str, rows: List[Sequence], source: str = None):
+        self._put(("executemany", sql, rows, source, None))
+
+    def commit(self, source: str = None):
+        self._put(("commit", None, None, source, None))
+
+    def query(self, sql: str, params: Sequence = (), source: str = None) -> List[tuple]:
+        """Run a SELECT on the writer thread and wait for the rows."""
+        future: Future = Future()
+        self._put(("query", sql, params, source, future))
+        while True:
+            try:
+                return future.result(timeout=0.5)
+            except FutureTimeout:
+                self._check()
+
+    def connection(self, source: str) -> "WriterConnection":
+        """Connection stand-in for a single source's fetcher."""
+        return WriterConnection(self, source)
+
+    def source_errors(self, source: str) -> List[str]:
+        with self._lock:
+            return list(self.errors.get(source, []))
+
+    # ---- consumer loop ----
+
+    def _run(self):
+        conn = self._conn
+        try:
+            while True:
+                op, sql, params, source, future = self._queue.get()
+                if op is _CLOSE:
+                    break
+                try:
+                    if op == "execute":
+                        conn.execute(sql, params)
+                    elif op == "executemany":
+                        conn.executemany(sql, params)
+                    elif op == "commit":
+                        conn.commit()
+                    elif op == "query":
+                        future.set_result(conn.execute(sql, params).fetchall())
+                    self.statements += 1
+                except Exception as e:
+                    if future is not None:
+                        future.set_exception(e)
+                    else:
+                        logger.error(f"Writer error ({source or 'unknown'}): {e}")
+                        with self._lock:
+                            self.errors.setdefault(source or "unknown", []).append(str(e))
+            conn.commit()
+        except BaseException as e:
+            logger.error(f"Writer thread stopped: {e}")
+            self._fail(e)
+        finally:
+            conn.close()
+
+    def _fail(self, error: BaseException):
+        """Mark the writer stopped and fail every query still queued."""
+        self.failure = error
+        while True:
+            try:
+                future = self._queue.get_nowait()[4]
+            except queue.Empty:
+                break
+            if future is not None:
+                future.set_exception(RuntimeError(f"Writer thread stopped: {error}"))
+
+
+# ==========================================
+# CONNECTION / CURSOR STAND-INS
+# ==========================================
+
+class WriterCursor:
+    """Cursor stand-in. SELECTs are answered synchronously; everything else is queued."""
+
+    def __init__(self, conn: "WriterConnection"):
+        self._conn = conn
+        self._rows: List[tuple] = []
+
+    def execute(self, sql: str, params: Sequence = ()) -> "WriterCursor":
+        writer, source = self._conn._writer, self._conn.source
+        if sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            self._rows = writer.query(sql, params, source)
+        else:
+            self._rows = []
+            writer.execute(sql, params, source)
+        return self
+
+    def executemany(self, sql: str, rows) -> "WriterCursor":
+        self._conn._writer.executemany(sql, list(rows), self._conn.source)
+        return self
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> List[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class WriterConnection:
+    """sqlite3.Connection stand-in bound to one source."""
+
+    def __init__(self, writer: SQLiteWriter, source: str):
+        self._writer = writer
+        self.source = source
+
+    def cursor(self) -> WriterCursor:
+        return WriterCursor(self)
+
+    def execute(self, sql: str, params: Sequence = ()) -> WriterCursor:
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql: str, rows) -> WriterCursor:
+        return self.cursor().executemany(sql, rows)
+
+    def commit(self):
+        self._writer.commit(self.source)
+
+    def close(self):
+        pass  # The writer owns the real connection
@@ -9,8 +9,11 @@ Usage:
     python run_pipeline.py --stats      # Just show database stats
     python run_pipeline.py --quick      # Skip quality checks (faster)
     python run_pipeline.py --fred-only  # Only update FRED
+    python run_pipeline.py --workers 1  # Fetch sources sequentially
+    python run_pipeline.py --full-refresh  # Re-download full history
 """
 
+import logging
 import sys
 import os
 import shutil
@@ -23,7 +26,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Change to script directory so .env is found
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-from lighthouse.pipeline import run_daily_update, get_stats
+from lighthouse.pipeline import LOG_FORMAT, run_daily_update, get_stats
 from lighthouse.config import DB_PATH
 from compute_indices import compute_all_indices, write_indices_to_db, verify_indices, DB_PATH as INDICES_DB_PATH
 from compute_crypto_indices import compute_all_crypto_indices, write_crypto_indices_to_db, verify_crypto_indices
@@ -77,6 +80,10 @@ def main():
                        help="Only update specific sources")
     parser.add_argument("--skip-indices", action="store_true",
                        help="Skip proprietary index computation")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Sources fetched concurrently (default: FETCH_CONFIG, 1 = sequential)")
+    parser.add_argument("--full-refresh", action="store_true",
+                       help="Re-download full history instead of incremental fetch")
 
     args = parser.parse_args()
 
@@ -92,7 +99,9 @@ def main():
 
     run_daily_update(
         skip_quality=args.quick,
-        sources=sources
+        sources=sources,
+        workers=args.workers,
+        full_refresh=args.full_refresh
     )
 
     # Compute proprietary indices
@@ -147,4 +156,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, **LOG_FORMAT)
     main()
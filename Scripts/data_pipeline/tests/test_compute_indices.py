@@ -0,0 +1,63 @@
+"""Panel index parity: a warm-up tail slice reproduces the full-history values (compute_indices --latest)."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, os.path.join(HERE, "..", "..", ".."))  # lighthouse_quant
+
+import compute_indices  # noqa: E402
+
+# Horizon columns read by compute_panel_indices
+PANEL_COLUMNS = [
+    "Bank_Reserves", "Business_Loans_yoy_pct", "CI_Loans_yoy_pct", "CPI_Shelter_yoy_pct",
+    "Case_Shiller_Home_Prices_yoy_pct", "Chicago_NFCI_z", "Consumer_Sentiment_z", "Curve_10Y_2Y_z",
+    "Curve_10Y_3M_z", "Debt_to_GDP", "Delinquency_Credit_Card_z", "Dollar_Index_yoy_pct", "EFFR",
+    "EUR_USD_yoy_pct", "Existing_Home_Sales_yoy_pct", "Forward_Inflation_5Y_z", "HY_OAS", "HY_OAS_z",
+    "Housing_Starts_yoy_pct", "Housing_Starts_z", "Industrial_Production_yoy_pct", "Initial_Claims",
+    "Initial_Claims_z", "JOLTS_Hires_Rate", "JOLTS_Quits_Rate", "JOLTS_Quits_Rate_z",
+    "LFPR_Prime_Age_25_54_z", "Months_Supply_z", "Mortgage_30Y", "PCE_Core_3m_ann", "RMP_Index",
+    "RRP_Usage", "RRP_Usage_z", "Retail_Sales_yoy_pct", "SOFR", "Saving_Rate_z",
+    "Sticky_Core_CPI_yoy_pct", "Term_Premium_10Y_z", "Treasury_3M", "Unemployed_27wks_Plus_z",
+    "VIX", "VIX_z",
+]
+
+TAIL_ROWS = 60
+
+
+@pytest.fixture
+def panel():
+    """Daily panel of random walks: daily, weekly and monthly columns (step-filled), late starts."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2015-01-01", periods=1500)
+    data = {}
+    for i, col in enumerate(PANEL_COLUMNS):
+        s = pd.Series(rng.normal(size=len(dates)).cumsum() * 0.1 + 2.0, index=dates)
+        step = (1, 5, 21)[i % 3]
+        s = s.where(np.arange(len(dates)) % step == 0).ffill()
+        s.iloc[:rng.integers(0, 200)] = np.nan
+        data[col] = s
+    df = pd.DataFrame(data)
+    df.index.name = "date"
+    return df
+
+
+def test_tail_slice_matches_full_history(panel):
+    full = compute_indices.compute_panel_indices(panel, verbose=False)
+
+    emit = len(panel) - TAIL_ROWS
+    start = emit - compute_indices.INDEX_WARMUP_ROWS
+    tail = compute_indices.compute_panel_indices(panel.iloc[start:], verbose=False)
+
+    emit_from = panel.index[emit]
+    assert set(tail) == set(full)
+    for index_id, series in tail.items():
+        actual = series.loc[emit_from:].to_numpy(dtype=float)
+        expected = full[index_id].loc[emit_from:].to_numpy(dtype=float)
+        assert len(actual) == TAIL_ROWS, index_id
+        np.testing.assert_array_equal(actual, expected, err_msg=index_id)
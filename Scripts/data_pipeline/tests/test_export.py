@@ -0,0 +1,57 @@
+"""Dataset exports (lighthouse.export / query.export_long)."""
+
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lighthouse import export, query  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "test.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE observations (series_id TEXT, date TEXT, value REAL)")
+    conn.execute("CREATE TABLE series_meta (series_id TEXT, title TEXT, source TEXT, category TEXT, last_fetched TEXT)")
+    conn.executemany("INSERT INTO observations VALUES (?, ?, ?)",
+                     [("A", "2024-01-01", 1.0), ("A", "2024-02-01", 2.0), ("B", "2024-01-01", 3.0)])
+    conn.executemany("INSERT INTO series_meta VALUES (?, ?, ?, ?, ?)",
+                     [("A", "Series A", "FRED", None, "2024-02-01"),   # NULL category
+                      ("B", None, "BLS", "Labor", "2024-02-01")])      # NULL title
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow", "csv"])
+def test_export_long_null_metadata(db_path, tmp_path, fmt):
+    path = query.export_long(tmp_path / "long", start_date="2000-01-01", db_path=db_path, fmt=fmt, csv=False)
+
+    if fmt == "parquet":
+        df = pd.read_parquet(path)
+    elif fmt == "arrow":
+        df = pd.read_feather(path)
+    else:
+        df = pd.read_csv(path)
+
+    assert len(df) == 3
+    a = df[df["series_id"] == "A"]
+    assert a["category"].isna().all()
+    assert (a["title"] == "Series A").all()
+    assert df.loc[df["series_id"] == "B", "title"].isna().all()
+    assert sorted(df["value"]) == [1.0, 2.0, 3.0]
+
+
+def test_write_wide_round_trip(tmp_path):
+    df = pd.DataFrame({"x": [1.0, None, 3.0], "y": [None, 2.0, None]},
+                      index=pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03"], name="date"))
+    for fmt in ("parquet", "arrow", "csv"):
+        (path,) = export.write_wide(df, tmp_path / "wide", [fmt])
+        back = export.read_wide(path, ["y", "missing"])
+        assert list(back.columns) == ["y"]
+        pd.testing.assert_series_equal(back["y"], df["y"], check_freq=False, check_index_type=False)
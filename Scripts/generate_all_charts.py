@@ -3,20 +3,23 @@
 LIGHTHOUSE MACRO — MASTER CHART GENERATION SCRIPT
 THE HORIZON | JANUARY 2026
 
-This script runs all chart generation pipelines in sequence.
+This script runs all chart generation pipelines at once (one process each,
+Agg backend), printing each pipeline's output as it finishes.
 Individual scripts are preserved and can still be run independently.
 
 Usage:
-    python generate_all_charts.py           # Run all pipelines
-    python generate_all_charts.py --core    # Only core 20 charts
-    python generate_all_charts.py --premium # Only premium charts
-    python generate_all_charts.py --real    # Only real-data charts
+    python generate_all_charts.py              # Run all pipelines
+    python generate_all_charts.py --core       # Only core 20 charts
+    python generate_all_charts.py --premium    # Only premium charts
+    python generate_all_charts.py --real       # Only real-data charts
+    python generate_all_charts.py --sequential # One pipeline after another, output streamed
 """
 
 import subprocess
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Script locations (relative to this file)
@@ -48,7 +51,12 @@ SCRIPTS = {
 
 
 def run_script(script_key, verbose=True):
-    """Run a single chart generation script."""
+    """
+    Run a single chart generation script.
+
+    verbose streams its output; otherwise the output is captured and printed
+    in one block when the script ends (used when pipelines run concurrently).
+    """
     script = SCRIPTS.get(script_key)
     if not script:
         print(f"Unknown script: {script_key}")
@@ -72,19 +80,22 @@ def run_script(script_key, verbose=True):
             [sys.executable, script['path']],
             cwd=CHART_GEN_DIR,
             capture_output=not verbose,
-            text=True
+            text=True,
+            env={**os.environ, 'MPLBACKEND': 'Agg'}
         )
 
         elapsed = time.time() - start
 
+        if not verbose and result.stdout:
+            print(f"\n{'='*60}\n{script['name']}\n{'='*60}\n{result.stdout}")
+
         if result.returncode == 0:
-            if verbose:
-                print(f"\n✓ {script['name']} completed in {elapsed:.1f}s")
+            print(f"\n✓ {script['name']} completed in {elapsed:.1f}s")
             return True
         else:
             print(f"\n✗ {script['name']} failed (exit code {result.returncode})")
             if not verbose and result.stderr:
-                print(f"  Error: {result.stderr[:200]}")
+                print(f"  Error: {result.stderr[-200:]}")
             return False
 
     except Exception as e:
@@ -118,8 +129,16 @@ def main():
     results = {}
     total_start = time.time()
 
-    for script_key in scripts_to_run:
-        results[script_key] = run_script(script_key)
+    if '--sequential' in args or len(scripts_to_run) == 1:
+        for script_key in scripts_to_run:
+            results[script_key] = run_script(script_key)
+    else:
+        # Pipelines are independent processes; the run takes as long as the slowest one
+        with ThreadPoolExecutor(max_workers=len(scripts_to_run)) as pool:
+            futures = {pool.submit(run_script, key, False): key for key in scripts_to_run}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        results = {key: results[key] for key in scripts_to_run}
 
     # Summary
     total_elapsed = time.time() - total_start
@@ -16,6 +16,16 @@ from datetime import datetime, timedelta
 from functools import lru_cache
 import json
 import time
+import os
+import sys
+
+# Shared disk-backed HTTP cache (TTLs, revalidation, LIGHTHOUSE_OFFLINE=1);
+# falls back to plain sessions if the pipeline package isn't available
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data_pipeline'))
+try:
+    from lighthouse.http_cache import CachedSession
+except ImportError:
+    CachedSession = requests.Session
 
 
 # =============================================================================
@@ -36,7 +46,7 @@ class NYFedAPI:
     BASE_URL = "https://markets.newyorkfed.org"
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = CachedSession()
         self.session.headers.update({
             'Accept': 'application/json',
             'User-Agent': 'LighthouseMacro/1.0'
@@ -233,7 +243,7 @@ class TreasuryAPI:
     BASE_URL = "https://api.fiscaldata.treasury.gov/services/api/fiscal_service"
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = CachedSession()
 
     def _get(self, endpoint, params=None):
         """Make GET request to Treasury API"""
@@ -342,7 +352,7 @@ class FREDAPI:
 
     def __init__(self, api_key=FRED_API_KEY):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = CachedSession()
 
     def get_series(self, series_id, start_date='2000-01-01'):
         """Fetch a FRED series"""
@@ -459,7 +469,7 @@ class BLSAPI:
 
     def __init__(self, api_key=BLS_API_KEY):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = CachedSession()
 
     def get_series(self, series_ids, start_year=2019, end_year=2026):
         """Fetch one or more BLS series"""
@@ -532,7 +542,7 @@ class BEAAPI:
 
     def __init__(self, api_key=BEA_API_KEY):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.session = CachedSession()
 
     def get_table(self, table_id, year=None, frequency="Q", dataset="NIPA"):
         """
@@ -798,7 +808,7 @@ class FedDFAAPI:
     DFA_URL = "https://www.federalreserve.gov/releases/z1/dataviz/dfa/distribute/chart/data.json"
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = CachedSession()
 
     def get_wealth_distribution(self):
         """
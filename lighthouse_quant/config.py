@@ -13,6 +13,9 @@ OUTPUT_DIR = LHM_ROOT / "lighthouse_quant" / "outputs"
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Lead-lag validation results, keyed on a hash of the input data
+LEAD_LAG_CACHE_PATH = OUTPUT_DIR / "lead_lag_cache.db"
+
 # Publication lags (in days) for key series
 # Critical for avoiding look-ahead bias in backtesting
 PUBLICATION_LAGS = {
@@ -18,7 +18,7 @@ Usage:
 
     engine = CryptoFundamentalsEngine()
     report = engine.analyze_protocol('aave')
-    watchlist = engine.screen_universe()
+    watchlist = engine.screen_universe()   # Concurrent (client max_workers)
 """
 
 import pandas as pd
@@ -595,22 +595,26 @@ class CryptoFundamentalsEngine:
                 'sky',  # MakerDAO
             ]
 
-        project_ids = project_ids[:max_projects]
-        results = []
+        project_ids = list(dict.fromkeys(project_ids))[:max_projects]
+        analyzed = {}
 
+        # Protocols are analyzed concurrently on the client's pool and
+        # reported as they finish; the project list is fetched once per client
         print(f"Analyzing {len(project_ids)} protocols...")
-        for i, pid in enumerate(project_ids):
+        for i, (pid, future) in enumerate(self.client.map_projects(self.analyze_protocol, project_ids)):
             print(f"  [{i+1}/{len(project_ids)}] {pid}...", end=" ")
             try:
-                analysis = self.analyze_protocol(pid)
+                analysis = future.result()
                 if analysis:
-                    results.append(self._analysis_to_dict(analysis))
+                    analyzed[pid] = self._analysis_to_dict(analysis)
                     print(f"✓ {analysis.verdict.value}")
                 else:
                     print("✗ No data")
             except Exception as e:
                 print(f"✗ Error: {e}")
 
+        # Input order before ranking, so ties keep the watchlist order
+        results = [analyzed[pid] for pid in project_ids if pid in analyzed]
         if not results:
             return pd.DataFrame()
 
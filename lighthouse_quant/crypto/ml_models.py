@@ -34,6 +34,11 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+# crypto_metrics series behind the time series models
+TIMESERIES_METRICS = ['revenue', 'fees', 'user_dau', 'tvl', 'pf_fully_diluted']
+TIMESERIES_LOOKBACK_DAYS = 90
+
+
 # ==========================================
 # DATA STRUCTURES
 # ==========================================
@@ -56,6 +61,28 @@ class ReversionSignal(Enum):
     OVERBOUGHT = "OVERBOUGHT"       # Sell signal
 
 
+@dataclass
+class MetricPanel:
+    """
+    Protocol x metric x observation panel of crypto_metrics.
+
+    Each series is right-aligned: the last column is its latest observation,
+    earlier columns step back one observation at a time, and the left is
+    NaN-padded up to its count (see stack_series).
+    """
+    protocols: List[str]
+    metrics: List[str]
+    values: np.ndarray              # (protocols, metrics, observations)
+    counts: np.ndarray              # (protocols, metrics) observations per series
+
+    def series(self, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(values, counts) of one metric for every protocol."""
+        if metric not in self.metrics:
+            return np.full((len(self.protocols), 1), np.nan), np.zeros(len(self.protocols), dtype=np.int64)
+        i = self.metrics.index(metric)
+        return self.values[:, i, :], self.counts[:, i]
+
+
 @dataclass
 class ProtocolTimeSeries:
     """Time series analysis for a protocol"""
@@ -135,42 +162,76 @@ class CryptoMLSignals:
 # ==========================================
 # HELPER FUNCTIONS
 # ==========================================
+# The time series helpers work on panels of series: a (series x observations)
+# array, each row right-aligned, plus the observation count of each row. The
+# single-series helpers run the same code on a one-row panel.
+
+def stack_series(series: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Right-align 1-D arrays into a (series x observations) panel and their counts."""
+    counts = np.array([len(s) for s in series], dtype=np.int64)
+    width = max(1, int(counts.max())) if len(counts) else 1
+    values = np.full((len(series), width), np.nan)
+    for i, s in enumerate(series):
+        if len(s):
+            values[i, width - len(s):] = s
+    return values, counts
+
+
+def momentum_panel(values: np.ndarray, counts: np.ndarray, periods: int = 30) -> np.ndarray:
+    """Rate-of-change momentum of every series (0 where undefined)."""
+    if values.shape[1] < periods + 1:
+        return np.zeros(len(counts))
+    current = values[:, -1]
+    past = values[:, -(periods + 1)]
+    ok = (counts >= periods + 1) & (past != 0) & ~np.isnan(past) & ~np.isnan(current)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(ok, (current - past) / np.abs(past), 0.0)
+
+
+def zscore_static_panel(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Z-score of each series' latest value against its earlier observations
+    (0 below 10 observations or for a flat history). Series are grouped by
+    length, so each is reduced over exactly its own values.
+    """
+    zscores = np.zeros(len(counts))
+    width = values.shape[1]
+    for n in np.unique(counts[counts >= 10]):
+        rows = np.flatnonzero(counts == n)
+        block = values[rows, width - n:]
+        mean = np.nanmean(block[:, :-1], axis=1)
+        std = np.nanstd(block[:, :-1], axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (block[:, -1] - mean) / std
+        zscores[rows] = np.where((std == 0) | np.isnan(std), 0.0, z)
+    return zscores
+
+
+def trend_acceleration_panel(values: np.ndarray, counts: np.ndarray, short: int = 7, long: int = 30) -> np.ndarray:
+    """ACCELERATING / STABLE / DECELERATING for every series."""
+    short_mom = momentum_panel(values, counts, short)
+    long_mom = momentum_panel(values, counts, long)
+    trend = np.select(
+        [short_mom > long_mom + 0.05, short_mom < long_mom - 0.05],
+        ["ACCELERATING", "DECELERATING"],
+        "STABLE",
+    )
+    return np.where(counts >= long + 1, trend, "STABLE").astype(object)
+
 
 def compute_zscore_static(values: np.ndarray) -> float:
     """Compute z-score for latest value in array"""
-    if len(values) < 10:
-        return 0.0
-    mean = np.nanmean(values[:-1])
-    std = np.nanstd(values[:-1])
-    if std == 0 or np.isnan(std):
-        return 0.0
-    return (values[-1] - mean) / std
+    return float(zscore_static_panel(*stack_series([np.asarray(values, dtype=float)]))[0])
 
 
 def compute_momentum(values: np.ndarray, periods: int = 30) -> float:
     """Compute rate of change momentum"""
-    if len(values) < periods + 1:
-        return 0.0
-    current = values[-1]
-    past = values[-(periods+1)]
-    if past == 0 or np.isnan(past) or np.isnan(current):
-        return 0.0
-    return (current - past) / abs(past)
+    return float(momentum_panel(*stack_series([np.asarray(values, dtype=float)]), periods)[0])
 
 
 def compute_trend_acceleration(values: np.ndarray, short: int = 7, long: int = 30) -> str:
     """Detect if trend is accelerating or decelerating"""
-    if len(values) < long + 1:
-        return "STABLE"
-
-    short_mom = compute_momentum(values, short)
-    long_mom = compute_momentum(values, long)
-
-    if short_mom > long_mom + 0.05:
-        return "ACCELERATING"
-    elif short_mom < long_mom - 0.05:
-        return "DECELERATING"
-    return "STABLE"
+    return str(trend_acceleration_panel(*stack_series([np.asarray(values, dtype=float)]), short, long)[0])
 
 
 def sigmoid(x: float) -> float:
@@ -211,19 +272,33 @@ class MomentumModel:
         Returns:
             Tuple of (signal, score, component_momentums)
         """
-        momentums = {}
+        signals, scores, momentums = self.compute_panel(*(
+            stack_series([np.asarray(s, dtype=float)])
+            for s in (revenue_series, dau_series, tvl_series, fee_series)
+        ))
+        return signals[0], int(scores[0]), {k: float(v[0]) for k, v in momentums.items()}
 
-        # Revenue momentum (30d)
-        momentums['revenue'] = compute_momentum(revenue_series, 30)
-
-        # DAU momentum (30d)
-        momentums['dau'] = compute_momentum(dau_series, 30)
-
-        # TVL momentum (30d)
-        momentums['tvl'] = compute_momentum(tvl_series, 30)
+    def compute_panel(
+        self,
+        revenue: Tuple[np.ndarray, np.ndarray],
+        dau: Tuple[np.ndarray, np.ndarray],
+        tvl: Tuple[np.ndarray, np.ndarray],
+        fees: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[List[MomentumSignal], np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Momentum signal of every protocol at once; each input is a
+        (values, counts) panel (see stack_series).
 
-        # Fee momentum (30d)
-        momentums['fees'] = compute_momentum(fee_series, 30)
+        Returns:
+            Tuple of (signals, scores, component_momentums), one entry per protocol
+        """
+        # 30d momentum per component
+        momentums = {
+            'revenue': momentum_panel(*revenue, 30),
+            'dau': momentum_panel(*dau, 30),
+            'tvl': momentum_panel(*tvl, 30),
+            'fees': momentum_panel(*fees, 30),
+        }
 
         # Weighted composite momentum
         composite = sum(
@@ -232,22 +307,17 @@ class MomentumModel:
         )
 
         # Classify signal
-        if composite > 0.20:
-            signal = MomentumSignal.STRONG_BULLISH
-        elif composite > 0.05:
-            signal = MomentumSignal.BULLISH
-        elif composite > -0.05:
-            signal = MomentumSignal.NEUTRAL
-        elif composite > -0.20:
-            signal = MomentumSignal.BEARISH
-        else:
-            signal = MomentumSignal.STRONG_BEARISH
+        labels = [MomentumSignal.STRONG_BULLISH, MomentumSignal.BULLISH, MomentumSignal.NEUTRAL,
+                  MomentumSignal.BEARISH, MomentumSignal.STRONG_BEARISH]
+        band = np.select([composite > 0.20, composite > 0.05, composite > -0.05, composite > -0.20],
+                         [0, 1, 2, 3], 4)
+        signals = [labels[b] for b in band]
 
         # Score (0-100)
         # Map composite from [-0.5, 0.5] to [0, 100]
-        score = int(min(100, max(0, (composite + 0.5) * 100)))
+        scores = np.clip((composite + 0.5) * 100, 0, 100).astype(int)
 
-        return signal, score, momentums
+        return signals, scores, momentums
 
 
 # ==========================================
@@ -284,37 +354,49 @@ class MeanReversionModel:
         Returns:
             Tuple of (signal, score, component_zscores)
         """
-        zscores = {}
+        signals, scores, zscores = self.compute_panel(*(
+            stack_series([np.asarray(s, dtype=float)])
+            for s in (revenue_series, dau_series, valuation_series)
+        ))
+        return signals[0], int(scores[0]), {k: float(v[0]) for k, v in zscores.items()}
 
-        # Revenue z-score (positive = above mean = bullish)
-        zscores['revenue'] = compute_zscore_static(revenue_series)
-
-        # DAU z-score (positive = above mean = bullish)
-        zscores['dau'] = compute_zscore_static(dau_series)
+    def compute_panel(
+        self,
+        revenue: Tuple[np.ndarray, np.ndarray],
+        dau: Tuple[np.ndarray, np.ndarray],
+        valuation: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[List[ReversionSignal], np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Mean reversion signal of every protocol at once; each input is a
+        (values, counts) panel (see stack_series).
 
-        # Valuation z-score (INVERTED: high = expensive = bearish)
-        zscores['valuation'] = -compute_zscore_static(valuation_series)
+        Returns:
+            Tuple of (signals, scores, component_zscores), one entry per protocol
+        """
+        zscores = {
+            'revenue': zscore_static_panel(*revenue),       # Positive = above mean = bullish
+            'dau': zscore_static_panel(*dau),               # Positive = above mean = bullish
+            'valuation': -zscore_static_panel(*valuation),  # INVERTED: high = expensive = bearish
+        }
 
         # Composite (equal weight)
-        composite = np.nanmean(list(zscores.values()))
-
-        # Classify signal
-        if composite <= self.thresholds['oversold']:
-            signal = ReversionSignal.OVERSOLD
-        elif composite <= self.thresholds['slightly_oversold']:
-            signal = ReversionSignal.SLIGHTLY_OVERSOLD
-        elif composite <= self.thresholds['fair_value_high']:
-            signal = ReversionSignal.FAIR_VALUE
-        elif composite <= self.thresholds['slightly_overbought']:
-            signal = ReversionSignal.SLIGHTLY_OVERBOUGHT
-        else:
-            signal = ReversionSignal.OVERBOUGHT
+        composite = np.nanmean(np.column_stack(list(zscores.values())), axis=1)
+
+        # Classify signal (NaN composite -> OVERBOUGHT, as the comparisons fail)
+        labels = [ReversionSignal.OVERSOLD, ReversionSignal.SLIGHTLY_OVERSOLD, ReversionSignal.FAIR_VALUE,
+                  ReversionSignal.SLIGHTLY_OVERBOUGHT, ReversionSignal.OVERBOUGHT]
+        band = np.select([composite <= self.thresholds['oversold'],
+                          composite <= self.thresholds['slightly_oversold'],
+                          composite <= self.thresholds['fair_value_high'],
+                          composite <= self.thresholds['slightly_overbought']],
+                         [0, 1, 2, 3], 4)
+        signals = [labels[b] for b in band]
 
         # Score (0-100, where 100 = most oversold = buy signal)
         # Map composite from [-2, 2] to [100, 0] (inverted for buy signal)
-        score = int(min(100, max(0, (-composite + 2) * 25)))
+        scores = np.nan_to_num(np.clip((-composite + 2) * 25, 0, 100), nan=0.0).astype(int)
 
-        return signal, score, zscores
+        return signals, scores, zscores
 
 
 # ==========================================
@@ -584,17 +666,13 @@ class CryptoMLEngine:
         today = datetime.now().strftime('%Y-%m-%d')
 
         # 1. Load time series data
-        timeseries_data = self._load_timeseries_data()
+        panel = self._load_timeseries_panel()
 
         # 2. Load latest scores
         scores_data = self._load_scores_data()
 
-        # 3. Compute protocol-level time series signals
-        protocol_ts = {}
-        for project_id, ts_data in timeseries_data.items():
-            protocol_ts[project_id] = self._compute_protocol_timeseries(
-                project_id, ts_data
-            )
+        # 3. Compute protocol-level time series signals (whole panel at once)
+        protocol_ts = self._compute_panel_timeseries(panel)
 
         # 4. Compute protocol health predictions
         protocol_pred = {}
@@ -642,32 +720,34 @@ class CryptoMLEngine:
             ml_conviction_score=conviction
         )
 
-    def _load_timeseries_data(self) -> Dict[str, Dict[str, np.ndarray]]:
-        """Load time series data for all protocols"""
-        query = """
+    def _load_timeseries_panel(self) -> MetricPanel:
+        """Load the TIMESERIES_METRICS of all protocols as one MetricPanel"""
+        metrics = list(TIMESERIES_METRICS)
+        query = f"""
             SELECT project_id, date, metric_id, value
             FROM crypto_metrics
-            WHERE metric_id IN ('revenue', 'fees', 'user_dau', 'tvl', 'pf_fully_diluted')
-            AND date >= date('now', '-90 days')
+            WHERE metric_id IN ({','.join('?' * len(metrics))})
+            AND date >= date('now', '-{TIMESERIES_LOOKBACK_DAYS} days')
             ORDER BY project_id, metric_id, date
         """
 
         try:
-            df = pd.read_sql(query, self.conn)
+            df = pd.read_sql(query, self.conn, params=metrics)
         except Exception:
-            return {}
+            df = pd.DataFrame(columns=['project_id', 'date', 'metric_id', 'value'])
 
-        result = {}
-        for project_id in df['project_id'].unique():
-            project_df = df[df['project_id'] == project_id]
-            result[project_id] = {}
+        # Scatter the long rows into place: protocol, metric, observations back from the latest
+        protocol_idx, protocols = pd.factorize(df['project_id'], sort=True)
+        metric_idx = df['metric_id'].map({m: i for i, m in enumerate(metrics)}).to_numpy(dtype=np.int64)
+        back = df.groupby(['project_id', 'metric_id'], sort=False).cumcount(ascending=False).to_numpy()
 
-            for metric in ['revenue', 'fees', 'user_dau', 'tvl', 'pf_fully_diluted']:
-                metric_df = project_df[project_df['metric_id'] == metric]
-                if not metric_df.empty:
-                    result[project_id][metric] = metric_df['value'].values
+        counts = np.zeros((len(protocols), len(metrics)), dtype=np.int64)
+        np.add.at(counts, (protocol_idx, metric_idx), 1)
+        width = max(1, int(counts.max())) if counts.size else 1
+        values = np.full((len(protocols), len(metrics), width), np.nan)
+        values[protocol_idx, metric_idx, width - 1 - back] = df['value'].to_numpy(dtype=float)
 
-        return result
+        return MetricPanel(protocols=list(protocols), metrics=metrics, values=values, counts=counts)
 
     def _load_scores_data(self) -> Dict[str, Dict]:
         """Load latest scores data"""
@@ -699,57 +779,49 @@ class CryptoMLEngine:
 
         return result
 
-    def _compute_protocol_timeseries(
-        self,
-        project_id: str,
-        ts_data: Dict[str, np.ndarray]
-    ) -> ProtocolTimeSeries:
-        """Compute time series analysis for single protocol"""
-
-        revenue = ts_data.get('revenue', np.array([0]))
-        fees = ts_data.get('fees', np.array([0]))
-        dau = ts_data.get('user_dau', np.array([0]))
-        tvl = ts_data.get('tvl', np.array([0]))
-        valuation = ts_data.get('pf_fully_diluted', np.array([0]))
+    def _compute_panel_timeseries(self, panel: MetricPanel) -> Dict[str, ProtocolTimeSeries]:
+        """Compute time series analysis for every protocol in the panel"""
+        revenue = panel.series('revenue')
+        fees = panel.series('fees')
+        dau = panel.series('user_dau')
+        tvl = panel.series('tvl')
+        valuation = panel.series('pf_fully_diluted')
 
         # Momentum signals
-        mom_signal, mom_score, momentums = self.momentum_model.compute_signal(
+        mom_signals, mom_scores, momentums = self.momentum_model.compute_panel(
             revenue, dau, tvl, fees
         )
 
         # Reversion signals
-        rev_signal, rev_score, zscores = self.reversion_model.compute_signal(
+        rev_signals, rev_scores, zscores = self.reversion_model.compute_panel(
             revenue, dau, valuation
         )
 
         # Trend acceleration
-        revenue_trend = compute_trend_acceleration(revenue)
-        dau_trend = compute_trend_acceleration(dau)
+        revenue_trend = trend_acceleration_panel(*revenue)
+        dau_trend = trend_acceleration_panel(*dau)
 
         # Overall trend score
-        trend_scores = {'ACCELERATING': 75, 'STABLE': 50, 'DECELERATING': 25}
-        trend_score = (
-            trend_scores.get(revenue_trend, 50) * 0.6 +
-            trend_scores.get(dau_trend, 50) * 0.4
-        )
+        def trend_points(trend: np.ndarray) -> np.ndarray:
+            return np.select([trend == 'ACCELERATING', trend == 'DECELERATING'], [75, 25], 50)
+        trend_scores = (trend_points(revenue_trend) * 0.6 + trend_points(dau_trend) * 0.4).astype(int)
+
+        columns = {
+            'revenue_momentum': momentums['revenue'], 'dau_momentum': momentums['dau'],
+            'tvl_momentum': momentums['tvl'], 'fee_momentum': momentums['fees'],
+            'momentum_signal': mom_signals, 'momentum_score': mom_scores,
+            'revenue_zscore': zscores['revenue'], 'dau_zscore': zscores['dau'],
+            'valuation_zscore': zscores['valuation'],
+            'reversion_signal': rev_signals, 'reversion_score': rev_scores,
+            'revenue_trend': revenue_trend, 'dau_trend': dau_trend,
+            'overall_trend_score': trend_scores,
+        }
+        columns = {k: list(v) if isinstance(v, list) else v.tolist() for k, v in columns.items()}
 
-        return ProtocolTimeSeries(
-            project_id=project_id,
-            revenue_momentum=momentums.get('revenue', 0),
-            dau_momentum=momentums.get('dau', 0),
-            tvl_momentum=momentums.get('tvl', 0),
-            fee_momentum=momentums.get('fees', 0),
-            momentum_signal=mom_signal,
-            momentum_score=mom_score,
-            revenue_zscore=zscores.get('revenue', 0),
-            dau_zscore=zscores.get('dau', 0),
-            valuation_zscore=zscores.get('valuation', 0),
-            reversion_signal=rev_signal,
-            reversion_score=rev_score,
-            revenue_trend=revenue_trend,
-            dau_trend=dau_trend,
-            overall_trend_score=int(trend_score)
-        )
+        return {
+            project_id: ProtocolTimeSeries(project_id=project_id, **{k: v[i] for k, v in columns.items()})
+            for i, project_id in enumerate(panel.protocols)
+        }
 
     def _compute_sector_data(
         self,
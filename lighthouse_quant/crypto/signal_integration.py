@@ -25,12 +25,46 @@ from enum import Enum
 import sqlite3
 import logging
 
-from .systematic import CryptoSystematicEngine, CryptoRegime, WarningFlag, WarningLevel
+from .systematic import CryptoSystematicEngine, CryptoRegime, FlagSeverity, WarningFlag, WarningLevel
 from .ml_models import CryptoMLEngine
 
 logger = logging.getLogger(__name__)
 
 
+# ==========================================
+# SCORING TABLES
+# ==========================================
+
+# Total score -> signal / tier (first band whose floor the score reaches)
+SIGNAL_BANDS = [(18, "STRONG_BUY"), (14, "BUY"), (10, "NEUTRAL"), (6, "SELL")]
+SIGNAL_FLOOR = "STRONG_SELL"
+TIER_BANDS = [(16, "TIER 1 (Accumulate)"), (12, "TIER 2 (Hold)"), (8, "NEUTRAL (Watch)"), (5, "CAUTION")]
+TIER_FLOOR = "AVOID"
+
+# Existing fundamental verdicts (first substring match wins)
+VERDICT_SCORES = {
+    'TIER 1': 2.0,
+    'TIER 2': 1.5,
+    'NEUTRAL': 1.0,
+    'CAUTION': 0.5,
+    'AVOID': 0.0,
+}
+
+# Sectors that fit each crypto regime
+REGIME_SECTOR_FIT = {
+    CryptoRegime.EXPANSION: ['defi_dex', 'layer1', 'defi_derivatives'],
+    CryptoRegime.LATE_CYCLE: ['stablecoins', 'liquid_staking', 'defi_lending'],
+    CryptoRegime.HOLLOW_RALLY: [],  # Nothing fits well
+    CryptoRegime.PRE_CRISIS: ['stablecoins'],
+    CryptoRegime.CRISIS: [],
+}
+
+# crypto_scores columns checked against the protocol-level warning flags
+PROTOCOL_WARNING_METRICS = ['subsidy_score', 'float_ratio', 'dau', 'pe_ratio', 'pf_ratio']
+
+PRICE_TREND_ROWS = 50  # Price observations behind the fallback trend score (20d/50d MAs)
+
+
 # ==========================================
 # SCORE COMPONENTS
 # ==========================================
@@ -126,32 +160,20 @@ class IntegratedProtocolScore:
     def signal(self) -> SignalStrength:
         """Derive signal from total score."""
         score = self.total_score
-        if score >= 18:
-            return SignalStrength.STRONG_BUY
-        elif score >= 14:
-            return SignalStrength.BUY
-        elif score >= 10:
-            return SignalStrength.NEUTRAL
-        elif score >= 6:
-            return SignalStrength.SELL
-        else:
-            return SignalStrength.STRONG_SELL
+        for floor, name in SIGNAL_BANDS:
+            if score >= floor:
+                return SignalStrength[name]
+        return SignalStrength[SIGNAL_FLOOR]
 
     # Tier classification (matches existing TIER 1/2/etc)
     @property
     def tier(self) -> str:
         """Map score to tier classification."""
         score = self.total_score
-        if score >= 16:
-            return "TIER 1 (Accumulate)"
-        elif score >= 12:
-            return "TIER 2 (Hold)"
-        elif score >= 8:
-            return "NEUTRAL (Watch)"
-        elif score >= 5:
-            return "CAUTION"
-        else:
-            return "AVOID"
+        for floor, tier in TIER_BANDS:
+            if score >= floor:
+                return tier
+        return TIER_FLOOR
 
     # Warnings
     active_warnings: List[WarningFlag] = field(default_factory=list)
@@ -159,7 +181,7 @@ class IntegratedProtocolScore:
     @property
     def has_override_warning(self) -> bool:
         """Check if any override-level warnings are active."""
-        return any(w.severity == 'OVERRIDE' for w in self.active_warnings)
+        return any(w.severity == FlagSeverity.OVERRIDE for w in self.active_warnings)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for storage/display."""
@@ -207,6 +229,7 @@ class CryptoSignalIntegration:
         self.systematic = CryptoSystematicEngine(conn)
         self.ml_engine = CryptoMLEngine(conn)
         self._ml_signals_cache = None  # Cache ML signals for batch processing
+        self._scores_by_date: Dict[str, pd.DataFrame] = {}  # score_all_protocols results
 
     def compute_protocol_score(
         self,
@@ -228,23 +251,15 @@ class CryptoSignalIntegration:
 
         score = IntegratedProtocolScore(project_id=project_id, date=date)
 
-        # Load protocol data
-        protocol_data = self._load_protocol_data(project_id)
-        if protocol_data is None:
+        latest, prices = self._load_universe([project_id])
+        if latest.empty:
             return score
 
-        # 1. TECHNICAL SCORE (0-8)
-        score.technical = self._compute_technical_score(project_id, protocol_data)
-
-        # 2. FUNDAMENTAL SCORE (0-8)
-        score.fundamental = self._compute_fundamental_score(project_id, protocol_data)
-
-        # 3. MICROSTRUCTURE SCORE (0-8)
-        score.microstructure = self._compute_microstructure_score(project_id, protocol_data)
-
-        # 4. WARNINGS
-        score.active_warnings = self._get_protocol_warnings(project_id, protocol_data)
-
+        row = self._score_components(latest, prices).iloc[0]
+        score.technical = TechnicalScore(row['momentum'], row['mean_reversion'], row['trend'])
+        score.fundamental = FundamentalScore(row['health'], row['chi'], row['verdict'])
+        score.microstructure = MicrostructureScore(row['tokenomics'], row['liquidity'], row['regime_fit'])
+        score.active_warnings = self._get_protocol_warnings(project_id, latest.iloc[0].to_dict())
         return score
 
     def _get_ml_signals(self):
@@ -257,184 +272,6 @@ class CryptoSignalIntegration:
                 self._ml_signals_cache = None
         return self._ml_signals_cache
 
-    def _compute_technical_score(
-        self,
-        project_id: str,
-        data: Dict
-    ) -> TechnicalScore:
-        """Compute technical component (momentum, reversion, trend)."""
-        tech = TechnicalScore()
-
-        try:
-            # Get ML signals (cached)
-            ml_signals = self._get_ml_signals()
-
-            # Get protocol-specific time series signals
-            if ml_signals and project_id in ml_signals.protocol_timeseries:
-                ts = ml_signals.protocol_timeseries[project_id]
-
-                # Momentum (0-3) from momentum score
-                mom_score = ts.momentum_score / 100  # Normalize 0-100 to 0-1
-                if mom_score > 0.7:
-                    tech.momentum_score = 3.0
-                elif mom_score > 0.5:
-                    tech.momentum_score = 2.0
-                elif mom_score > 0.3:
-                    tech.momentum_score = 1.0
-                else:
-                    tech.momentum_score = 0.0
-
-                # Mean Reversion (0-2) from reversion score
-                rev_score = ts.reversion_score / 100  # Normalize 0-100 to 0-1
-                if rev_score > 0.6:
-                    tech.mean_reversion_score = 2.0
-                elif rev_score > 0.4:
-                    tech.mean_reversion_score = 1.0
-                else:
-                    tech.mean_reversion_score = 0.5
-
-                # Trend (0-3) from trend info
-                if ts.revenue_trend == 'ACCELERATING':
-                    tech.trend_score = 3.0
-                elif ts.revenue_trend == 'STABLE':
-                    tech.trend_score = 2.0
-                else:
-                    tech.trend_score = 0.5
-            else:
-                # Fallback: use price history if ML signals unavailable
-                price_data = data.get('price_history', pd.Series())
-                if len(price_data) >= 50:
-                    current = price_data.iloc[-1] if len(price_data) > 0 else 0
-                    ma20 = price_data.tail(20).mean()
-                    ma50 = price_data.tail(50).mean()
-
-                    if current > ma20 > ma50:
-                        tech.trend_score = 3.0
-                    elif current > ma50:
-                        tech.trend_score = 2.0
-                    elif current > ma20:
-                        tech.trend_score = 1.0
-                    else:
-                        tech.trend_score = 0.0
-
-        except Exception as e:
-            logger.debug(f"Technical score error for {project_id}: {e}")
-
-        return tech
-
-    def _compute_fundamental_score(
-        self,
-        project_id: str,
-        data: Dict
-    ) -> FundamentalScore:
-        """Compute fundamental component (health, CHI, verdict)."""
-        fund = FundamentalScore()
-
-        try:
-            # Health from ML classifier (0-4)
-            ml_signals = self._get_ml_signals()
-            if ml_signals and project_id in ml_signals.protocol_predictions:
-                pred = ml_signals.protocol_predictions[project_id]
-                health_prob = pred.health_probability
-                fund.health_score = health_prob * 4.0
-
-            # CHI contribution (0-2)
-            chi_result = self.systematic.compute_chi()
-            if chi_result is not None:
-                chi_value = chi_result[0] if isinstance(chi_result, tuple) else chi_result
-                # Scale CHI (-2 to +2) to (0-2)
-                fund.chi_contribution = max(0, min(2, (chi_value + 2) / 2))
-
-            # Existing verdict (0-2)
-            verdict = data.get('verdict', '')
-            verdict_map = {
-                'TIER 1': 2.0,
-                'TIER 2': 1.5,
-                'NEUTRAL': 1.0,
-                'CAUTION': 0.5,
-                'AVOID': 0.0
-            }
-            for v_key, v_score in verdict_map.items():
-                if v_key in verdict:
-                    fund.verdict_score = v_score
-                    break
-
-        except Exception as e:
-            logger.debug(f"Fundamental score error for {project_id}: {e}")
-
-        return fund
-
-    def _compute_microstructure_score(
-        self,
-        project_id: str,
-        data: Dict
-    ) -> MicrostructureScore:
-        """Compute microstructure component (tokenomics, liquidity, regime)."""
-        micro = MicrostructureScore()
-
-        try:
-            # Tokenomics (0-3)
-            float_ratio = data.get('float_ratio', 0)
-            subsidy_score = data.get('subsidy_score', float('inf'))
-
-            # Good float = high circulating vs FDV
-            if float_ratio > 0.7:
-                micro.tokenomics_score += 1.5
-            elif float_ratio > 0.5:
-                micro.tokenomics_score += 1.0
-            elif float_ratio > 0.3:
-                micro.tokenomics_score += 0.5
-
-            # Low subsidy = sustainable
-            if subsidy_score < 1.0:
-                micro.tokenomics_score += 1.5
-            elif subsidy_score < 3.0:
-                micro.tokenomics_score += 1.0
-            elif subsidy_score < 5.0:
-                micro.tokenomics_score += 0.5
-
-            # Liquidity (0-3)
-            volume = data.get('trading_volume', 0)
-            mcap = data.get('market_cap', 1)
-            volume_ratio = volume / mcap if mcap > 0 else 0
-
-            if volume_ratio > 0.10:
-                micro.liquidity_score = 3.0
-            elif volume_ratio > 0.05:
-                micro.liquidity_score = 2.0
-            elif volume_ratio > 0.02:
-                micro.liquidity_score = 1.0
-            else:
-                micro.liquidity_score = 0.5
-
-            # Regime fit (0-2)
-            chi_result = self.systematic.compute_chi()
-            chi_value = chi_result[0] if isinstance(chi_result, tuple) else (chi_result or 0)
-            regime, _ = self.systematic.classify_regime(chi_value, WarningLevel.GREEN)
-            sector = data.get('sector', '')
-
-            # Sector-regime alignment
-            regime_sector_fit = {
-                CryptoRegime.EXPANSION: ['defi_dex', 'layer1', 'defi_derivatives'],
-                CryptoRegime.LATE_CYCLE: ['stablecoins', 'liquid_staking', 'defi_lending'],
-                CryptoRegime.HOLLOW_RALLY: [],  # Nothing fits well
-                CryptoRegime.PRE_CRISIS: ['stablecoins'],
-                CryptoRegime.CRISIS: [],
-            }
-
-            favorable_sectors = regime_sector_fit.get(regime, [])
-            if sector in favorable_sectors:
-                micro.regime_fit_score = 2.0
-            elif regime in [CryptoRegime.EXPANSION, CryptoRegime.LATE_CYCLE]:
-                micro.regime_fit_score = 1.0
-            else:
-                micro.regime_fit_score = 0.0
-
-        except Exception as e:
-            logger.debug(f"Microstructure score error for {project_id}: {e}")
-
-        return micro
-
     def _get_protocol_warnings(
         self,
         project_id: str,
@@ -445,13 +282,7 @@ class CryptoSignalIntegration:
 
         try:
             # Build protocol-specific metrics
-            metrics = {
-                'subsidy_score': data.get('subsidy_score'),
-                'float_ratio': data.get('float_ratio'),
-                'dau': data.get('dau'),
-                'pe_ratio': data.get('pe_ratio'),
-                'pf_ratio': data.get('pf_ratio'),
-            }
+            metrics = {m: data.get(m) for m in PROTOCOL_WARNING_METRICS}
 
             # Evaluate warnings using the systematic engine
             warning_result = self.systematic.evaluate_warnings(metrics)
@@ -466,64 +297,194 @@ class CryptoSignalIntegration:
 
         return warnings
 
-    def _load_protocol_data(self, project_id: str) -> Optional[Dict]:
-        """Load all relevant data for a protocol."""
-        try:
-            c = self.conn.cursor()
-
-            # Get latest score
-            c.execute("""
-                SELECT * FROM crypto_scores
-                WHERE project_id = ?
-                ORDER BY date DESC LIMIT 1
-            """, (project_id,))
-            row = c.fetchone()
-
-            if not row:
-                return None
-
-            # Map to dict
-            columns = [d[0] for d in c.description]
-            data = dict(zip(columns, row))
-
-            # Get price history
-            c.execute("""
-                SELECT date, value FROM crypto_metrics
-                WHERE project_id = ? AND metric_id = 'price'
-                ORDER BY date
-            """, (project_id,))
-            price_rows = c.fetchall()
-            if price_rows:
-                data['price_history'] = pd.Series(
-                    [r[1] for r in price_rows],
-                    index=pd.to_datetime([r[0] for r in price_rows])
-                )
-            else:
-                data['price_history'] = pd.Series()
-
-            return data
+    # ==========================================
+    # BATCH SCORING
+    # ==========================================
+
+    def _load_universe(self, project_ids: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Latest crypto_scores row per protocol and the last PRICE_TREND_ROWS
+        prices per protocol, in one query each.
+
+        Returns:
+            (latest, prices): latest is indexed by project_id; prices has
+            project_id, value and n (1 = most recent)
+        """
+        where, params = "", []
+        if project_ids is not None:
+            where = f"WHERE project_id IN ({','.join('?' * len(project_ids))})"
+            params = list(project_ids)
 
+        try:
+            latest = pd.read_sql(f"""
+                SELECT s.* FROM crypto_scores s
+                JOIN (SELECT project_id, MAX(date) AS date FROM crypto_scores {where}
+                      GROUP BY project_id) m
+                ON s.project_id = m.project_id AND s.date = m.date
+                ORDER BY s.project_id
+            """, self.conn, params=params).set_index('project_id', drop=False)
+
+            prices = pd.read_sql(f"""
+                SELECT project_id, value, n FROM (
+                    SELECT project_id, value,
+                           ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY date DESC) AS n
+                    FROM crypto_metrics
+                    WHERE metric_id = 'price' {where.replace('WHERE', 'AND')}
+                ) WHERE n <= {PRICE_TREND_ROWS}
+            """, self.conn, params=params)
         except Exception as e:
-            logger.error(f"Error loading data for {project_id}: {e}")
-            return None
+            logger.error(f"Error loading protocol data: {e}")
+            return pd.DataFrame(), pd.DataFrame(columns=['project_id', 'value', 'n'])
+
+        return latest, prices
 
-    def score_all_protocols(self) -> pd.DataFrame:
+    def _score_components(self, latest: pd.DataFrame, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        The nine sub-scores, warning count and override flag of every protocol
+        in `latest`, as columns. CHI, the regime and the ML signals are shared
+        by the whole universe and computed once.
+        """
+        index = latest.index
+
+        def col(name: str, default: float = np.nan) -> pd.Series:
+            """Numeric crypto_scores column (NULL -> NaN; `default` if absent)."""
+            if name in latest:
+                return pd.to_numeric(latest[name], errors='coerce')
+            return pd.Series(default, index=index)
+
+        comp = pd.DataFrame(index=index)
+
+        chi_result = self.systematic.compute_chi()
+        chi_value = chi_result[0] if isinstance(chi_result, tuple) else (chi_result or 0)
+        regime, _ = self.systematic.classify_regime(chi_value, WarningLevel.GREEN)
+        ml_signals = self._get_ml_signals()
+
+        # 1. TECHNICAL (0-8): ML time series signals, price trend as fallback
+        timeseries = ml_signals.protocol_timeseries if ml_signals else {}
+        ts = pd.DataFrame(
+            [(t.momentum_score, t.reversion_score, t.revenue_trend)
+             for t in (timeseries.get(pid) for pid in index) if t is not None],
+            index=[pid for pid in index if pid in timeseries],
+            columns=['momentum', 'reversion', 'revenue_trend'],
+        ).reindex(index)
+        has_ts = index.isin(list(timeseries))
+
+        mom = ts['momentum'].astype(float) / 100  # Normalize 0-100 to 0-1
+        rev = ts['reversion'].astype(float) / 100
+        comp['momentum'] = np.where(has_ts, np.select([mom > 0.7, mom > 0.5, mom > 0.3], [3.0, 2.0, 1.0], 0.0), 0.0)
+        comp['mean_reversion'] = np.where(has_ts, np.select([rev > 0.6, rev > 0.4], [2.0, 1.0], 0.5), 0.0)
+
+        recent = prices.pivot_table(index='project_id', columns='n', values='value', aggfunc='first', dropna=False)
+        recent = recent.reindex(index=index, columns=range(1, PRICE_TREND_ROWS + 1))
+        n_prices = prices.groupby('project_id').size().reindex(index, fill_value=0)
+        current = recent[1]
+        ma20 = recent.loc[:, 1:20].mean(axis=1)
+        ma50 = recent.loc[:, 1:PRICE_TREND_ROWS].mean(axis=1)
+        price_trend = np.select(
+            [(current > ma20) & (ma20 > ma50), current > ma50, current > ma20], [3.0, 2.0, 1.0], 0.0
+        )
+        price_trend = np.where(n_prices >= PRICE_TREND_ROWS, price_trend, 0.0)
+        ts_trend = ts['revenue_trend'].map({'ACCELERATING': 3.0, 'STABLE': 2.0}).fillna(0.5)
+        comp['trend'] = np.where(has_ts, ts_trend, price_trend)
+
+        # 2. FUNDAMENTAL (0-8): ML health, CHI, existing verdict
+        predictions = ml_signals.protocol_predictions if ml_signals else {}
+        health = pd.Series([predictions[pid].health_probability if pid in predictions else np.nan
+                            for pid in index], index=index, dtype=float)
+        comp['health'] = health.fillna(0.0) * 4.0
+        comp['chi'] = max(0, min(2, (chi_value + 2) / 2))  # Scale CHI (-2 to +2) to (0-2)
+        verdict = latest['verdict'].fillna('').astype(str) if 'verdict' in latest else pd.Series('', index=index)
+        comp['verdict'] = np.select(
+            [verdict.str.contains(key, regex=False) for key in VERDICT_SCORES], list(VERDICT_SCORES.values()), 0.0
+        )
+
+        # 3. MICROSTRUCTURE (0-8): tokenomics, liquidity, regime fit
+        float_ratio, subsidy = col('float_ratio'), col('subsidy_score', np.inf)
+        comp['tokenomics'] = (
+            np.select([float_ratio > 0.7, float_ratio > 0.5, float_ratio > 0.3], [1.5, 1.0, 0.5], 0.0)  # Good float
+            + np.select([subsidy < 1.0, subsidy < 3.0, subsidy < 5.0], [1.5, 1.0, 0.5], 0.0)           # Low subsidy
+        )
+        volume, mcap = col('trading_volume', 0).fillna(0), col('market_cap', 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(mcap > 0, volume / mcap, 0.0)
+        comp['liquidity'] = np.select(
+            [volume_ratio > 0.10, volume_ratio > 0.05, volume_ratio > 0.02], [3.0, 2.0, 1.0], 0.5
+        )
+        sector = latest['sector'] if 'sector' in latest else pd.Series('', index=index)
+        regime_fit = 1.0 if regime in (CryptoRegime.EXPANSION, CryptoRegime.LATE_CYCLE) else 0.0
+        comp['regime_fit'] = np.where(sector.isin(REGIME_SECTOR_FIT.get(regime, [])), 2.0, regime_fit)
+
+        # 4. WARNINGS: protocol-level flags of the systematic engine
+        triggered = pd.DataFrame(index=index)
+        for flag_name, flag_def in self.systematic.thresholds.items():
+            if flag_def['metric'] not in PROTOCOL_WARNING_METRICS:
+                continue
+            value = col(flag_def['metric'])
+            condition = {'gt': value > flag_def['threshold'],
+                         'lt': value < flag_def['threshold'],
+                         'eq': value == flag_def['threshold']}.get(flag_def['condition'])
+            if condition is not None:
+                triggered[flag_name] = condition.to_numpy()
+        overrides = [f for f in triggered if self.systematic.thresholds[f]['severity'] == FlagSeverity.OVERRIDE]
+        comp['warning_count'] = triggered.sum(axis=1).astype(int)
+        comp['has_override'] = triggered[overrides].any(axis=1) if overrides else False
+        return comp
+
+    def _score_frame(self, date: str) -> pd.DataFrame:
+        """Score the whole universe from two reads (see score_all_protocols)."""
+        latest, prices = self._load_universe()
+        columns = ['project_id', 'date', 'total_score', 'technical_score', 'fundamental_score',
+                   'microstructure_score', 'signal', 'tier', 'has_override', 'warning_count',
+                   'technical_breakdown', 'fundamental_breakdown', 'microstructure_breakdown']
+        if latest.empty:
+            return pd.DataFrame(columns=columns)
+
+        comp = self._score_components(latest, prices)
+        parts = {
+            'technical': ['momentum', 'mean_reversion', 'trend'],
+            'fundamental': ['health', 'chi', 'verdict'],
+            'microstructure': ['tokenomics', 'liquidity', 'regime_fit'],
+        }
+
+        scores = pd.DataFrame({'project_id': comp.index, 'date': date}, index=comp.index)
+        for part, subs in parts.items():
+            scores[f'{part}_score'] = np.minimum(8, comp[subs[0]] + comp[subs[1]] + comp[subs[2]])
+        total = scores['technical_score'] + scores['fundamental_score'] + scores['microstructure_score']
+        scores.insert(2, 'total_score', total)
+        scores['signal'] = np.select([total >= floor for floor, _ in SIGNAL_BANDS],
+                                     [name for _, name in SIGNAL_BANDS], SIGNAL_FLOOR)
+        scores['tier'] = np.select([total >= floor for floor, _ in TIER_BANDS],
+                                   [tier for _, tier in TIER_BANDS], TIER_FLOOR)
+        scores['has_override'] = comp['has_override'].astype(bool)
+        scores['warning_count'] = comp['warning_count']
+
+        records = comp.to_dict('index')
+        for part, subs in parts.items():
+            scores[f'{part}_breakdown'] = [
+                {**{sub: float(records[pid][sub]) for sub in subs}, 'total': float(scores.at[pid, f'{part}_score'])}
+                for pid in comp.index
+            ]
+        return scores[columns].reset_index(drop=True)
+
+    def score_all_protocols(self, date: str = None, refresh: bool = False) -> pd.DataFrame:
         """
         Compute integrated scores for all protocols.
 
+        The universe is loaded in two queries and scored as columns. The
+        result is kept per date, so generate_daily_signals, get_tier1_systematic
+        and write_scores_to_db in one run share a single scoring pass.
+
+        Args:
+            date: Scoring date (default: today)
+            refresh: Rescore even if this date was already scored
+
         Returns:
             DataFrame with scores for all protocols
         """
-        c = self.conn.cursor()
-        c.execute("SELECT DISTINCT project_id FROM crypto_scores")
-        protocols = [row[0] for row in c.fetchall()]
-
-        results = []
-        for pid in protocols:
-            score = self.compute_protocol_score(pid)
-            results.append(score.to_dict())
-
-        return pd.DataFrame(results)
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        if refresh or date not in self._scores_by_date:
+            self._scores_by_date[date] = self._score_frame(date)
+        return self._scores_by_date[date].copy()
 
     def get_tier1_systematic(self) -> List[str]:
         """Get protocols that qualify as Tier 1 by systematic scoring."""
@@ -579,8 +540,8 @@ class CryptoSignalIntegration:
 
     def write_scores_to_db(self):
         """Write integrated scores to database for historical tracking."""
-        scores_df = self.score_all_protocols()
         date = datetime.now().strftime('%Y-%m-%d')
+        scores_df = self.score_all_protocols(date)
 
         c = self.conn.cursor()
 
@@ -600,13 +561,14 @@ class CryptoSignalIntegration:
         )""")
 
         # Insert scores
-        for _, row in scores_df.iterrows():
-            c.execute("""INSERT OR REPLACE INTO crypto_integrated_scores
+        rows = scores_df[['project_id', 'total_score', 'technical_score', 'fundamental_score',
+                          'microstructure_score', 'signal', 'tier', 'has_override', 'warning_count']]
+        c.executemany("""INSERT OR REPLACE INTO crypto_integrated_scores
                         VALUES (?,?,?,?,?,?,?,?,?,?)""",
-                     (row['project_id'], date, row['total_score'],
-                      row['technical_score'], row['fundamental_score'],
-                      row['microstructure_score'], row['signal'],
-                      row['tier'], int(row['has_override']), row['warning_count']))
+                     [(pid, date, float(total), float(tech), float(fund), float(micro),
+                       signal, tier, int(override), int(warnings))
+                      for pid, total, tech, fund, micro, signal, tier, override, warnings
+                      in rows.itertuples(index=False)])
 
         self.conn.commit()
         logger.info(f"Wrote {len(scores_df)} integrated scores to database")
@@ -42,6 +42,9 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import warnings
+
+from lighthouse_quant.data.snapshot import DataSnapshot, snapshot_for
+from lighthouse_quant.data.pipeline import rolling_zscore
 warnings.filterwarnings('ignore')
 
 
@@ -351,11 +354,8 @@ class CryptoSystematicResult:
 # ==========================================
 
 def compute_zscore(series: pd.Series, window: int = 30, min_periods: int = 10) -> pd.Series:
-    """Rolling z-score computation"""
-    rolling_mean = series.rolling(window, min_periods=min_periods).mean()
-    rolling_std = series.rolling(window, min_periods=min_periods).std()
-    rolling_std = rolling_std.replace(0, np.nan)
-    return (series - rolling_mean) / rolling_std
+    """Rolling z-score computation (lighthouse.rolling kernel)"""
+    return rolling_zscore(series, window, min_periods)
 
 
 def compute_momentum(series: pd.Series, periods: int = 30) -> float:
@@ -407,18 +407,28 @@ class CryptoSystematicEngine:
     - Timing refinement
     """
 
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, snapshot: DataSnapshot = None):
         """
         Initialize the systematic engine.
 
         Args:
             conn: Database connection with crypto_metrics, crypto_scores,
                   lighthouse_indices tables
+            snapshot: Latest-value snapshot for the macro indices (default:
+                      the one shared by every model on this database)
         """
         self.conn = conn
+        self._snapshot = snapshot
         self.thresholds = CRYPTO_THRESHOLDS
         self.chi_weights = CHI_WEIGHTS
 
+    @property
+    def snapshot(self) -> DataSnapshot:
+        """Macro index snapshot, set up on first use (see snapshot_for)."""
+        if self._snapshot is None:
+            self._snapshot = snapshot_for(self.conn)
+        return self._snapshot
+
     # ==========================================
     # WARNING SYSTEM
     # ==========================================
@@ -701,19 +711,13 @@ class CryptoSystematicEngine:
         Macro overlay from MRI/LCI.
         Score: -2 to +2
         """
-        query = """
-            SELECT value, index_id
-            FROM lighthouse_indices
-            WHERE index_id IN ('MRI', 'LCI')
-            AND date = (SELECT MAX(date) FROM lighthouse_indices WHERE index_id = 'MRI')
-        """
         try:
-            result = pd.read_sql(query, self.conn)
-            if result.empty:
+            macro = self._macro_cross_section()
+            if not macro:
                 return 0.0
 
-            mri = result[result['index_id'] == 'MRI']['value'].iloc[0] if 'MRI' in result['index_id'].values else 0
-            lci = result[result['index_id'] == 'LCI']['value'].iloc[0] if 'LCI' in result['index_id'].values else 0
+            mri = macro.get('MRI', 0)
+            lci = macro.get('LCI', 0)
 
             # MRI: <0 bullish, >0.5 bearish for crypto
             mri_score = 1 - (mri * 2)  # Inverted: low MRI = high score
@@ -854,16 +858,10 @@ class CryptoSystematicEngine:
 
     def _get_macro_multiplier(self) -> float:
         """Get allocation multiplier from macro regime"""
-        query = """
-            SELECT value FROM lighthouse_indices
-            WHERE index_id = 'MRI'
-            AND date = (SELECT MAX(date) FROM lighthouse_indices WHERE index_id = 'MRI')
-        """
         try:
-            result = pd.read_sql(query, self.conn)
-            if result.empty:
+            mri = self._macro_cross_section().get('MRI')
+            if mri is None:
                 return 1.0
-            mri = result['value'].iloc[0]
 
             # MRI-based multiplier for crypto
             if mri < -0.2:
@@ -1043,39 +1041,22 @@ class CryptoSystematicEngine:
             pass
 
         # From lighthouse_indices (macro)
-        query = """
-            SELECT index_id, value
-            FROM lighthouse_indices
-            WHERE index_id IN ('MRI', 'LCI')
-            AND date = (SELECT MAX(date) FROM lighthouse_indices WHERE index_id = 'MRI')
-        """
-        try:
-            result = pd.read_sql(query, self.conn)
-            for _, row in result.iterrows():
-                if row['index_id'] == 'MRI':
-                    metrics['mri'] = row['value']
-                elif row['index_id'] == 'LCI':
-                    metrics['lci'] = row['value']
-        except Exception:
-            pass
+        macro = self._macro_cross_section()
+        if 'MRI' in macro:
+            metrics['mri'] = macro['MRI']
+        if 'LCI' in macro:
+            metrics['lci'] = macro['LCI']
 
         return metrics
 
+    def _macro_cross_section(self) -> Dict[str, float]:
+        """MRI and LCI on MRI's latest date (one snapshot read shared by every caller)"""
+        return self.snapshot.indices_on_latest('MRI', ['MRI', 'LCI'])
+
     def _get_macro_indicators(self) -> Tuple[Optional[float], Optional[float]]:
         """Get latest MRI and LCI values"""
-        query = """
-            SELECT index_id, value
-            FROM lighthouse_indices
-            WHERE index_id IN ('MRI', 'LCI')
-            AND date = (SELECT MAX(date) FROM lighthouse_indices WHERE index_id = 'MRI')
-        """
-        try:
-            result = pd.read_sql(query, self.conn)
-            mri = result[result['index_id'] == 'MRI']['value'].iloc[0] if 'MRI' in result['index_id'].values else None
-            lci = result[result['index_id'] == 'LCI']['value'].iloc[0] if 'LCI' in result['index_id'].values else None
-            return mri, lci
-        except Exception:
-            return None, None
+        macro = self._macro_cross_section()
+        return macro.get('MRI'), macro.get('LCI')
 
     def _generate_discretionary_notes(
         self,
@@ -9,19 +9,41 @@ Usage:
     client = TokenTerminalClient()
     eth_metrics = client.get_metrics('ethereum', days=30)
     all_projects = client.get_projects()
+
+    # Many projects concurrently, streamed in completion order
+    for pid, df in client.iter_metrics(['aave', 'uniswap', 'lido'], days=30):
+        print(pid, len(df))
+
+Requests run on a thread pool (max_workers in flight). The shared
+transport's TOKEN_TERMINAL token bucket paces them for the whole process and
+handles 429s with Retry-After / backoff. Identical requests in one client's
+lifetime are made once: concurrent callers wait on the same in-flight request.
 """
 
 import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+import threading
 import time
 import os
+import sys
+
+# Shared cached, rate-limited transport from the data pipeline; plain sessions if unavailable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Scripts', 'data_pipeline'))
+try:
+    from lighthouse.http_cache import CachedSession
+    SHARED_TRANSPORT = True
+except ImportError:
+    CachedSession = requests.Session
+    SHARED_TRANSPORT = False
 
 # API Configuration
 API_KEY = os.environ.get('TOKEN_TERMINAL_API_KEY', '348c4261-f49b-4517-949c-e18ef6a6c300')
 BASE_URL = 'https://api.tokenterminal.com/v2'
+DEFAULT_MAX_WORKERS = 8  # Requests in flight; the token bucket, not this, sets the request rate
 
 
 class TokenTerminalClient:
@@ -60,34 +82,47 @@ class TokenTerminalClient:
         ]
     }
 
-    def __init__(self, api_key: str = None, rate_limit_delay: float = 0.25):
+    def __init__(self, api_key: str = None, rate_limit_delay: float = 0.25,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         """
         Initialize the Token Terminal client.
 
         Args:
             api_key: Token Terminal API key. Defaults to env var or hardcoded key.
-            rate_limit_delay: Seconds to wait between API calls (default 0.25s = 4 req/sec)
+            rate_limit_delay: Seconds to wait between API calls (default 0.25s = 4 req/sec).
+                Only used without the shared transport, whose TOKEN_TERMINAL
+                token bucket otherwise enforces the limit across threads.
+            max_workers: Concurrent requests in the batch methods (1 = sequential)
         """
         self.api_key = api_key or API_KEY
         self.base_url = BASE_URL
         self.rate_limit_delay = rate_limit_delay
+        self.max_workers = max(1, max_workers)
         self.headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
-        self._cache = {}
+        self._cache: Dict[tuple, Future] = {}  # Request key -> response (in flight or done)
+        self._cache_lock = threading.Lock()
+        self._rate_lock = threading.Lock()
         self._last_request_time = 0
+        self.session = CachedSession()
 
     def _rate_limit(self):
         """Enforce rate limiting between requests."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self._last_request_time = time.time()
+        if SHARED_TRANSPORT:
+            return
+        with self._rate_lock:
+            elapsed = time.time() - self._last_request_time
+            if elapsed < self.rate_limit_delay:
+                time.sleep(self.rate_limit_delay - elapsed)
+            self._last_request_time = time.time()
 
     def _request(self, endpoint: str, params: dict = None) -> Optional[dict]:
         """
-        Make a rate-limited request to the API.
+        Make a rate-limited request to the API, once per client: repeated
+        (endpoint, params) return the first response, and concurrent callers
+        wait on the request already in flight. Failures are not kept.
 
         Args:
             endpoint: API endpoint (without base URL)
@@ -96,29 +131,75 @@ class TokenTerminalClient:
         Returns:
             JSON response data or None on error
         """
-        self._rate_limit()
-        url = f"{self.base_url}{endpoint}"
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        with self._cache_lock:
+            future = self._cache.get(key)
+            owner = future is None
+            if owner:
+                future = self._cache[key] = Future()
+        if not owner:
+            return future.result()
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            data = self._fetch(endpoint, params)
+        except BaseException as e:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+            future.set_exception(e)
+            raise
+        if data is None:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+        future.set_result(data)
+        return data
+
+    def _fetch(self, endpoint: str, params: dict = None, attempts: int = 3) -> Optional[dict]:
+        """One API request (the shared transport retries 429s itself)."""
+        url = f"{self.base_url}{endpoint}"
 
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                # Rate limited, wait and retry once
-                print(f"Rate limited, waiting 5s...")
-                time.sleep(5)
-                response = requests.get(url, headers=self.headers, params=params, timeout=30)
-                if response.status_code == 200:
-                    return response.json()
-            else:
-                print(f"API Error {response.status_code}: {response.text[:200]}")
+        for attempt in range(attempts):
+            self._rate_limit()
+            try:
+                response = self.session.get(url, headers=self.headers, params=params, timeout=30)
+            except requests.exceptions.RequestException as e:
+                print(f"Request failed: {e}")
                 return None
 
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 429 and not SHARED_TRANSPORT and attempt < attempts - 1:
+                delay = 2 ** (attempt + 1)
+                print(f"Rate limited, waiting {delay}s...")
+                time.sleep(delay)
+                continue
+            print(f"API Error {response.status_code}: {response.text[:200]}")
             return None
 
+    def clear_cache(self):
+        """Forget responses from earlier requests (the next calls hit the API again)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def map_projects(
+        self,
+        fn: Callable[[str], object],
+        project_ids: List[str]
+    ) -> Iterator[Tuple[str, Future]]:
+        """
+        Run fn(project_id) for every project on a pool of max_workers threads.
+
+        Yields:
+            (project_id, completed future) in completion order; future.result()
+            returns fn's value or raises its exception
+        """
+        project_ids = list(dict.fromkeys(project_ids))
+        if not project_ids:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(project_ids))) as pool:
+            futures = {pool.submit(fn, pid): pid for pid in project_ids}
+            for future in as_completed(futures):
+                yield futures[future], future
+
     # ==========================================
     # PROJECT ENDPOINTS
     # ==========================================
@@ -245,6 +326,27 @@ class TokenTerminalClient:
     # BATCH OPERATIONS
     # ==========================================
 
+    def iter_metrics(
+        self,
+        project_ids: List[str],
+        days: int = 1,
+        metric_ids: List[str] = None
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        get_metrics for many projects concurrently.
+
+        Yields:
+            (project_id, DataFrame) as each project arrives (empty on error)
+        """
+        for pid, future in self.map_projects(
+            lambda pid: self.get_metrics(pid, days=days, metric_ids=metric_ids), project_ids
+        ):
+            try:
+                yield pid, future.result()
+            except Exception as e:
+                print(f"  {pid}: {e}")
+                yield pid, pd.DataFrame()
+
     def get_metrics_batch(
         self,
         project_ids: List[str],
@@ -252,7 +354,7 @@ class TokenTerminalClient:
         metrics: List[str] = None
     ) -> pd.DataFrame:
         """
-        Fetch metrics for multiple projects.
+        Fetch metrics for multiple projects (concurrently, see iter_metrics).
 
         Args:
             project_ids: List of project IDs
@@ -262,15 +364,16 @@ class TokenTerminalClient:
         Returns:
             DataFrame with multi-index (project_id, date)
         """
-        all_data = []
+        fetched = {}
 
-        for pid in project_ids:
-            print(f"  Fetching {pid}...")
-            df = self.get_metrics(pid, days=days, metric_ids=metrics)
+        for i, (pid, df) in enumerate(self.iter_metrics(project_ids, days=days, metric_ids=metrics)):
+            print(f"  [{i+1}/{len(project_ids)}] {pid}: {len(df)} rows")
             if not df.empty:
                 df['project_id'] = pid
-                all_data.append(df.reset_index())
+                fetched[pid] = df.reset_index()
 
+        # Input order, whatever order the responses arrived in
+        all_data = [fetched[pid] for pid in dict.fromkeys(project_ids) if pid in fetched]
         if not all_data:
             return pd.DataFrame()
 
@@ -295,12 +398,13 @@ class TokenTerminalClient:
         if metrics is None:
             metrics = self.METRIC_GROUPS['valuation'] + self.METRIC_GROUPS['financial'][:6]
 
-        results = []
-        for pid in project_ids:
-            latest = self.get_latest_metrics(pid)
-            if not latest.empty:
+        latest_by_pid = {}
+        for pid, df in self.iter_metrics(project_ids, days=1):
+            if not df.empty:
+                latest = df.iloc[-1].copy()
                 latest['project_id'] = pid
-                results.append(latest)
+                latest_by_pid[pid] = latest
+        results = [latest_by_pid[pid] for pid in dict.fromkeys(project_ids) if pid in latest_by_pid]
 
         if not results:
             return pd.DataFrame()
@@ -341,15 +445,17 @@ class TokenTerminalClient:
             return pd.DataFrame()
 
         # Get latest metrics for each project (expensive operation)
-        results = []
-        for pid in projects['project_id'].head(100):  # Limit to prevent timeout
-            latest = self.get_latest_metrics(pid)
-            if not latest.empty and metric in latest.index:
-                results.append({
-                    'project_id': pid,
-                    'name': projects[projects['project_id'] == pid]['name'].values[0],
-                    metric: latest[metric]
-                })
+        names = projects.drop_duplicates('project_id').set_index('project_id')['name']
+        candidates = projects['project_id'].head(100).tolist()  # Limit to prevent timeout
+        latest_by_pid = {}
+        for pid, df in self.iter_metrics(candidates, days=1):
+            if not df.empty and metric in df.columns:
+                latest_by_pid[pid] = df.iloc[-1][metric]
+
+        results = [
+            {'project_id': pid, 'name': names[pid], metric: latest_by_pid[pid]}
+            for pid in dict.fromkeys(candidates) if pid in latest_by_pid
+        ]
 
         if not results:
             return pd.DataFrame()
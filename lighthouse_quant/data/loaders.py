@@ -1,15 +1,31 @@
 """
 Data loading functions for Lighthouse Quant.
+
+The horizon panel is read from the pipeline's columnar store
+(lighthouse.horizon_store) when a build exists, decoding only the requested
+columns and date range; otherwise from the legacy horizon_dataset table.
 """
 
 import sqlite3
 import pandas as pd
 import numpy as np
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Tuple, Union
 from pathlib import Path
 
 from lighthouse_quant.config import DB_PATH, NBER_RECESSIONS, PUBLICATION_LAGS
 
+# Columnar horizon panel from the data pipeline; SQLite table if unavailable
+from lighthouse_quant.data.pipeline import horizon_store
+
+
+def _panel_available(db_path: Path) -> bool:
+    return horizon_store is not None and horizon_store.exists(db_path)
+
+
+def database_path(conn: sqlite3.Connection) -> Path:
+    """File behind an open connection (for models that are handed a conn)."""
+    return Path(conn.execute("PRAGMA database_list").fetchone()[2])
+
 
 def load_horizon_dataset(
     start_date: Optional[str] = None,
@@ -18,7 +34,7 @@ def load_horizon_dataset(
     db_path: Path = DB_PATH
 ) -> pd.DataFrame:
     """
-    Load horizon_dataset from SQLite database.
+    Load the horizon dataset.
 
     Args:
         start_date: Filter data from this date (YYYY-MM-DD)
@@ -29,6 +45,9 @@ def load_horizon_dataset(
     Returns:
         DataFrame with date index
     """
+    if _panel_available(db_path):
+        return horizon_store.read_panel(columns, start_date, end_date, db_path)
+
     conn = sqlite3.connect(db_path)
 
     # Build query
@@ -57,6 +76,38 @@ def load_horizon_dataset(
     return df
 
 
+def load_horizon_latest(
+    columns: List[str],
+    db_path: Path = DB_PATH,
+    conn: sqlite3.Connection = None
+) -> Dict[str, Tuple[pd.Timestamp, float]]:
+    """
+    Latest non-null (date, value) for each column of the horizon dataset.
+    Columns with no data are omitted.
+
+    With `conn` the horizon_dataset table is read through that connection
+    (e.g. an in-memory database) and no panel is looked up.
+    """
+    if conn is None and _panel_available(db_path):
+        return horizon_store.latest_values(columns, db_path)
+
+    own_conn = conn is None
+    conn = conn or sqlite3.connect(db_path)
+    result = {}
+    for col in columns:
+        try:
+            row = conn.execute(
+                f'SELECT date, "{col}" FROM horizon_dataset WHERE "{col}" IS NOT NULL ORDER BY date DESC LIMIT 1'
+            ).fetchone()
+        except sqlite3.OperationalError:
+            continue  # No such column (or no table)
+        if row:
+            result[col] = (pd.Timestamp(row[0]), float(row[1]))
+    if own_conn:
+        conn.close()
+    return result
+
+
 def load_lighthouse_indices(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -115,6 +166,25 @@ def create_nber_recession_series(index: pd.DatetimeIndex) -> pd.Series:
     return recession
 
 
+def publication_lags(columns: List[str], lags: Dict[str, int] = None) -> np.ndarray:
+    """
+    Publication lag in days per column. Derived columns (e.g. JOLTS_Quits_Rate_z)
+    inherit the lag of the longest PUBLICATION_LAGS key they extend; columns
+    with no match are treated as real time (0).
+    """
+    lags = PUBLICATION_LAGS if lags is None else lags
+    keys = sorted(lags, key=len, reverse=True)
+    result = np.zeros(len(columns), dtype=np.int64)
+    for i, col in enumerate(columns):
+        if col in lags:
+            result[i] = lags[col]
+            continue
+        base = next((k for k in keys if col.startswith(k + "_")), None)
+        if base is not None:
+            result[i] = lags[base]
+    return result
+
+
 def apply_publication_lags(
     df: pd.DataFrame,
     as_of_date: pd.Timestamp
@@ -124,16 +194,39 @@ def apply_publication_lags(
 
     Returns DataFrame with future data (relative to as_of_date) set to NaN.
     """
-    result = df.copy()
+    lags = publication_lags(list(df.columns))
+    cutoff = pd.Timestamp(as_of_date).to_datetime64() - lags.astype("timedelta64[D]")
+    mask = (df.index.to_numpy()[:, None] > cutoff[None, :]) & (lags > 0)
+    return df.mask(mask)
 
-    for col in result.columns:
-        lag_days = PUBLICATION_LAGS.get(col, 0)
-        if lag_days > 0:
-            cutoff = as_of_date - pd.Timedelta(days=lag_days)
-            mask = result.index > cutoff
-            result.loc[mask, col] = np.nan
 
-    return result
+def as_of_panel(df: pd.DataFrame, lags: np.ndarray = None) -> pd.DataFrame:
+    """
+    Point-in-time view of a daily panel: each column shifted forward by its
+    publication lag, so row T holds what had been published by T.
+
+    An observation appears on the first panel date at least `lag` days after
+    its own date (later observations mapping to the same row win). Any
+    prefix of the result is the vintage available on its last date.
+
+    Args:
+        df: Panel with a sorted DatetimeIndex
+        lags: Lag in days per column (default: publication_lags(df.columns))
+    """
+    lags = publication_lags(list(df.columns)) if lags is None else np.asarray(lags)
+    dates = df.index.to_numpy()
+    values = df.to_numpy(dtype=np.float64)
+    shifted = np.full_like(values, np.nan)
+
+    for lag in np.unique(lags):
+        cols = np.flatnonzero(lags == lag)
+        # Last source row published by each date; take each source row once
+        src = np.searchsorted(dates, dates - np.timedelta64(int(lag), "D"), side="right") - 1
+        first = (src >= 0) & (src != np.concatenate([[-1], src[:-1]]))
+        rows = np.flatnonzero(first)
+        shifted[np.ix_(rows, cols)] = values[np.ix_(src[rows], cols)]
+
+    return pd.DataFrame(shifted, index=df.index, columns=df.columns)
 
 
 def resample_to_monthly(df: pd.DataFrame, method: str = "last") -> pd.DataFrame:
@@ -158,7 +251,10 @@ def resample_to_monthly(df: pd.DataFrame, method: str = "last") -> pd.DataFrame:
 
 
 def get_available_columns(db_path: Path = DB_PATH) -> List[str]:
-    """Return list of all columns in horizon_dataset."""
+    """Return list of all columns in the horizon dataset."""
+    if _panel_available(db_path):
+        return horizon_store.panel_columns(db_path)
+
     conn = sqlite3.connect(db_path)
     df = pd.read_sql("SELECT * FROM horizon_dataset LIMIT 1", conn)
     conn.close()
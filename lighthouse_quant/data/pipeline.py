@@ -0,0 +1,28 @@
+"""
+Data pipeline modules used by Lighthouse Quant.
+
+The pipeline (Scripts/data_pipeline) is not an installed package; this is
+the one module that puts it on sys.path. Import pipeline code from here
+rather than relying on another import having done so.
+"""
+
+import importlib
+import os
+import sys
+
+PIPELINE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Scripts', 'data_pipeline'))
+if PIPELINE_DIR not in sys.path:
+    sys.path.insert(0, PIPELINE_DIR)
+
+from lighthouse.rolling import rolling_zscore  # noqa: E402
+
+# Columnar horizon panel; loaders fall back to the SQLite table without it
+try:
+    from lighthouse import horizon_store  # noqa: E402
+except ImportError:
+    horizon_store = None
+
+
+def pipeline_module(name: str):
+    """Import a top-level pipeline script as a module (e.g. 'compute_indices')."""
+    return importlib.import_module(name)
@@ -0,0 +1,223 @@
+"""
+Shared latest-value snapshot for Lighthouse Quant models.
+
+The point-in-time models (WarningSystem, RiskEnsemble, CryptoSystematicEngine)
+each need the latest non-null value of dozens of horizon series and
+lighthouse_indices. A DataSnapshot fetches whatever is asked for in one
+batched read per source and keeps it, so a flag evaluation is a dict lookup
+and every model in a run shares the same reads (see shared_snapshot).
+
+The snapshot drops its values as soon as the pipeline writes: SQLite's
+data_version (bumped by any other connection's commit), the connection's own
+total_changes (writes made through it, which data_version does not count)
+and the horizon panel's index file are checked on each lookup.
+
+Models handed a connection use snapshot_for(conn): the shared snapshot of the
+connection's database file, or, for an in-memory / temporary database that
+a second connection cannot open, a snapshot reading through conn itself.
+close_shared_snapshots() closes the shared snapshots' connections.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from lighthouse_quant.config import DB_PATH
+from lighthouse_quant.data.loaders import horizon_store, load_horizon_latest
+
+logger = logging.getLogger(__name__)
+
+# Called after every read with (query name, number of keys fetched, seconds)
+QueryHook = Callable[[str, int, float], None]
+
+
+class DataSnapshot:
+    """
+    Latest values of horizon series and lighthouse_indices, fetched in batches.
+
+    Args:
+        db_path: Database the values are read from
+        on_query: Optional hook called after every read (see QueryHook)
+        conn: Read through this connection instead of opening one on db_path
+              (no horizon panel is used; the caller keeps ownership)
+    """
+
+    def __init__(self, db_path: Path = DB_PATH, on_query: QueryHook = None,
+                 conn: sqlite3.Connection = None):
+        self.db_path = None if conn is not None else Path(db_path)
+        self.on_query = on_query
+        self.stats = {"queries": 0, "seconds": 0.0}
+        self._own_conn = conn is None
+        self._conn = conn if conn is not None else sqlite3.connect(self.db_path)
+        self._version = None
+        self._series: Dict[str, Optional[Tuple[pd.Timestamp, float]]] = {}
+        self._indices: Dict[str, Optional[Tuple[pd.Timestamp, float]]] = {}
+        self._cross_sections: Dict[Tuple[str, Tuple[str, ...]], Dict[str, float]] = {}
+
+    # ==========================================
+    # FRESHNESS
+    # ==========================================
+
+    def _current_version(self) -> tuple:
+        """Changes whenever the database is written to or the panel is rebuilt."""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        try:
+            panel_mtime = (os.stat(horizon_store.index_path(self.db_path)).st_mtime_ns
+                           if horizon_store and self.db_path else None)
+        except OSError:
+            panel_mtime = None
+        return data_version, self._conn.total_changes, panel_mtime
+
+    def _refresh(self):
+        version = self._current_version()
+        if version != self._version:
+            self.invalidate()
+            self._version = version
+
+    def invalidate(self):
+        """Drop every fetched value; the next lookup reads again."""
+        self._series.clear()
+        self._indices.clear()
+        self._cross_sections.clear()
+
+    def _timed(self, name: str, keys: int, read: Callable):
+        start = time.perf_counter()
+        try:
+            return read()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats["queries"] += 1
+            self.stats["seconds"] += elapsed
+            logger.debug(f"snapshot {name}: {keys} key(s) in {elapsed * 1000:.1f}ms")
+            if self.on_query:
+                self.on_query(name, keys, elapsed)
+
+    # ==========================================
+    # HORIZON SERIES
+    # ==========================================
+
+    def series_latest(self, columns: List[str]) -> Dict[str, Tuple[pd.Timestamp, float]]:
+        """
+        Latest non-null (date, value) per horizon column. Columns not fetched
+        yet are read together in one batch; columns without data are omitted.
+        """
+        self._refresh()
+        missing = [c for c in dict.fromkeys(columns) if c not in self._series]
+        if missing:
+            try:
+                latest = self._timed("series_latest", len(missing),
+                                     lambda: load_horizon_latest(missing, self.db_path,
+                                                                 None if self._own_conn else self._conn))
+            except Exception as e:
+                logger.warning(f"Snapshot could not read horizon series: {e}")
+                latest = {}
+            for col in missing:
+                self._series[col] = latest.get(col)
+        return {c: self._series[c] for c in columns if self._series.get(c) is not None}
+
+    def series_value(self, column: str) -> Optional[float]:
+        """Latest non-null value of a horizon column (None if it has no data)."""
+        latest = self.series_latest([column])
+        return latest[column][1] if column in latest else None
+
+    # ==========================================
+    # LIGHTHOUSE INDICES
+    # ==========================================
+
+    def index_latest(self, index_ids: List[str]) -> Dict[str, Tuple[pd.Timestamp, float]]:
+        """
+        Latest (date, value) per lighthouse_indices id, read in one query for
+        all ids not fetched yet. Ids without rows are omitted.
+        """
+        self._refresh()
+        missing = [i for i in dict.fromkeys(index_ids) if i not in self._indices]
+        if missing:
+            marks = ",".join("?" * len(missing))
+            query = f"""
+                SELECT i.index_id, i.date, i.value
+                FROM lighthouse_indices i
+                JOIN (SELECT index_id, MAX(date) AS date FROM lighthouse_indices
+                      WHERE index_id IN ({marks}) GROUP BY index_id) m
+                ON i.index_id = m.index_id AND i.date = m.date
+            """
+            try:
+                rows = self._timed("index_latest", len(missing),
+                                   lambda: self._conn.execute(query, missing).fetchall())
+            except sqlite3.Error as e:
+                logger.warning(f"Snapshot could not read lighthouse_indices: {e}")
+                rows = []
+            for index_id in missing:
+                self._indices[index_id] = None
+            for index_id, date, value in rows:
+                if value is not None:
+                    self._indices[index_id] = (pd.Timestamp(date), float(value))
+        return {i: self._indices[i] for i in index_ids if self._indices.get(i) is not None}
+
+    def index_value(self, index_id: str) -> Optional[float]:
+        """Latest value of a lighthouse index (None if it has no rows)."""
+        latest = self.index_latest([index_id])
+        return latest[index_id][1] if index_id in latest else None
+
+    def indices_on_latest(self, anchor: str, index_ids: List[str]) -> Dict[str, float]:
+        """
+        Values of `index_ids` on the anchor index's latest date, i.e. one
+        consistent cross-section (ids with no row on that date are omitted).
+        """
+        self._refresh()
+        key = (anchor, tuple(index_ids))
+        if key not in self._cross_sections:
+            query = f"""
+                SELECT index_id, value FROM lighthouse_indices
+                WHERE index_id IN ({','.join('?' * len(index_ids))})
+                AND date = (SELECT MAX(date) FROM lighthouse_indices WHERE index_id = ?)
+            """
+            try:
+                rows = self._timed("indices_on_latest", len(index_ids),
+                                   lambda: self._conn.execute(query, list(index_ids) + [anchor]).fetchall())
+            except sqlite3.Error as e:
+                logger.warning(f"Snapshot could not read lighthouse_indices: {e}")
+                rows = []
+            self._cross_sections[key] = {i: float(v) for i, v in rows if v is not None}
+        return dict(self._cross_sections[key])
+
+    def close(self):
+        if self._own_conn:
+            self._conn.close()
+
+
+# ==========================================
+# SHARED SNAPSHOTS
+# ==========================================
+
+_shared: Dict[Path, DataSnapshot] = {}
+
+
+def close_shared_snapshots():
+    """Close every shared snapshot's connection; later calls open new ones."""
+    while _shared:
+        _, snapshot = _shared.popitem()
+        snapshot.close()
+
+
+def shared_snapshot(db_path: Path = DB_PATH) -> DataSnapshot:
+    """The process-wide snapshot for a database, so models in one run share reads."""
+    key = Path(db_path).resolve()
+    if key not in _shared:
+        _shared[key] = DataSnapshot(key)
+    return _shared[key]
+
+
+def snapshot_for(conn: sqlite3.Connection) -> DataSnapshot:
+    """
+    Snapshot for a model handed `conn`: the shared one for its database file,
+    or one reading through conn for an in-memory / temporary database.
+    """
+    file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not file or file == ":memory:":
+        return DataSnapshot(conn=conn)
+    return shared_snapshot(file)
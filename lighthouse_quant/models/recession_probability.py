@@ -16,15 +16,58 @@ Key Inputs:
     - Labor flows (Quits rate)
 """
 
+import json
+import logging
+import os
 import pandas as pd
 import numpy as np
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Tuple, Optional, List
 from dataclasses import dataclass
 import warnings
 
 from lighthouse_quant.config import NBER_RECESSIONS, DB_PATH
+from lighthouse_quant.data.loaders import database_path, load_horizon_dataset
+
+logger = logging.getLogger(__name__)
+
+try:
+    from scipy.optimize import minimize
+    from scipy.stats import rankdata
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# ==========================================
+# CALIBRATION CONFIG
+# ==========================================
+
+# Coefficient values searched by calibrate(method="grid")
+CALIBRATION_GRID = {
+    "MRI": [2.0, 3.0, 4.0, 5.0, 6.0],
+    "yield_curve": [-3.0, -2.0, -1.0],
+    "credit_spread": [0.5, 1.0, 1.5, 2.0],
+    "intercept": [-3.0, -2.5, -2.0, -1.5],
+}
+
+# Logit terms in model order (yield curve enters in percent / 100)
+MODEL_TERMS = ["intercept", "MRI", "yield_curve", "credit_spread", "quits_inv"]
+
+# Production coefficients (fitted on 1990-2024 NBER recessions, 2026-01-19);
+# a stored calibration (CALIBRATION_TABLE) overrides them
+BASELINE_COEFFICIENTS = {
+    "intercept": -1.5,      # Adjusted for recall (was -2.5)
+    "MRI": 4.0,             # Primary signal
+    "yield_curve": -3.0,    # Negative slope = higher probability (was -2.0)
+    "credit_spread": 1.0,   # Wider spreads = higher probability (was 1.5)
+    "quits_inv": 1.0,       # Lower quits = higher probability
+}
+
+GRID_BLOCK_CELLS = 10_000_000  # Grid points x samples scored per block
+CALIBRATION_TABLE = "recession_model_calibration"
 
 
 @dataclass
@@ -44,19 +87,18 @@ def create_recession_forward_target(index: pd.DatetimeIndex, horizon_months: int
     Create forward-looking recession indicator.
     Returns 1 if recession starts within horizon_months, 0 otherwise.
     """
-    recession_starts = [pd.Timestamp(start) for start, _ in NBER_RECESSIONS]
+    recession_starts = np.sort(pd.to_datetime([start for start, _ in NBER_RECESSIONS]).to_numpy())
+    index = pd.DatetimeIndex(index)
 
-    target = pd.Series(0, index=index, name=f"recession_next_{horizon_months}m")
+    # The first recession start strictly after each date is the only one that
+    # can fall in (date, date + horizon]
+    nxt = np.searchsorted(recession_starts, index.to_numpy(), side="right")
+    has_next = nxt < len(recession_starts)
+    next_start = recession_starts[np.minimum(nxt, len(recession_starts) - 1)]
+    horizon_end = (index + pd.DateOffset(months=horizon_months)).to_numpy()
 
-    for date in index:
-        # Check if any recession starts within the horizon
-        horizon_end = date + pd.DateOffset(months=horizon_months)
-        for rec_start in recession_starts:
-            if date < rec_start <= horizon_end:
-                target.loc[date] = 1
-                break
-
-    return target
+    target = (has_next & (next_start <= horizon_end)).astype(np.int64)
+    return pd.Series(target, index=index, name=f"recession_next_{horizon_months}m")
 
 
 def sigmoid(x: np.ndarray) -> np.ndarray:
@@ -64,6 +106,109 @@ def sigmoid(x: np.ndarray) -> np.ndarray:
     return 1 / (1 + np.exp(-np.clip(x, -500, 500)))
 
 
+# ==========================================
+# CALIBRATION ENGINE
+# ==========================================
+
+def design_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Columns in MODEL_TERMS order: 1, MRI, yield curve / 100, credit spread, inverted quits."""
+    def col(name):
+        return df[name].fillna(0).to_numpy(dtype=float) if name in df else np.zeros(len(df))
+
+    return np.column_stack([np.ones(len(df)), col('MRI'), col('yield_curve') / 100,
+                            col('credit_spread'), col('quits_inv')])
+
+
+def f1_scores(preds: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """F1 of each row of a (points x samples) boolean prediction matrix."""
+    tp = np.count_nonzero(preds & y, axis=1)
+    predicted = np.count_nonzero(preds, axis=1)
+    fp = predicted - tp
+    fn = np.count_nonzero(y) - tp
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision = np.where(tp + fp > 0, tp / predicted, 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return f1
+
+
+def grid_search(X: np.ndarray, y: np.ndarray, grid: Dict[str, List[float]],
+                threshold: float = 0.5, workers: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    F1 at `threshold` for every point of a coefficient grid.
+
+    Points are enumerated like nested loops over grid's keys (first key
+    outermost) and scored in blocks of GRID_BLOCK_CELLS logits: coefficients
+    x features -> logits -> predictions -> F1. Blocks run on a thread pool
+    (numpy releases the GIL).
+
+    Returns:
+        (coefficients, f1): points x MODEL_TERMS matrix (unsearched terms
+        are 0) and the F1 of each point
+    """
+    axes = np.meshgrid(*[np.asarray(v, dtype=float) for v in grid.values()], indexing="ij")
+    coeffs = np.zeros((axes[0].size, len(MODEL_TERMS)))
+    for term, axis in zip(grid, axes):
+        coeffs[:, MODEL_TERMS.index(term)] = axis.ravel()
+
+    # sigmoid(z) > threshold  <=>  z > logit(threshold)
+    cutoff = np.log(threshold / (1 - threshold))
+    block = max(1, GRID_BLOCK_CELLS // max(len(y), 1))
+
+    def score(start):
+        return f1_scores(coeffs[start:start + block] @ X.T > cutoff, y)
+
+    starts = range(0, len(coeffs), block)
+    workers = workers or min(len(starts), os.cpu_count() or 1)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scores = list(pool.map(score, starts))
+    else:
+        scores = [score(start) for start in starts]
+    return coeffs, np.concatenate(scores)
+
+
+def log_loss(z: np.ndarray, y: np.ndarray) -> float:
+    """Mean logistic loss of logits z."""
+    return float(np.mean(np.logaddexp(0, z) - y * z))
+
+
+def roc_auc(scores: np.ndarray, y: np.ndarray) -> float:
+    """ROC AUC via the Mann-Whitney rank statistic (ties count half)."""
+    n_pos = np.count_nonzero(y)
+    n_neg = len(y) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    ranks = rankdata(scores)
+    return float((ranks[y].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, start: np.ndarray = None) -> np.ndarray:
+    """Maximum-likelihood logistic coefficients (L-BFGS with analytic gradient)."""
+    y = y.astype(float)
+
+    def loss(beta):
+        z = X @ beta
+        return log_loss(z, y), X.T @ (sigmoid(z) - y) / len(y)
+
+    start = np.zeros(X.shape[1]) if start is None else start
+    return minimize(loss, start, jac=True, method="L-BFGS-B").x
+
+
+def fit_auc(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Slope direction maximizing ROC AUC (Nelder-Mead from the log-loss fit).
+
+    AUC ignores the intercept and scale of the logit, so those two are then
+    fitted by log-loss on the resulting score.
+    """
+    start = fit_logistic(X, y)
+    slopes = X[:, 1:]
+    direction = minimize(lambda w: -roc_auc(slopes @ w, y), start[1:], method="Nelder-Mead").x
+    a, b = fit_logistic(np.column_stack([np.ones(len(y)), slopes @ direction]), y)
+    return np.concatenate([[a], b * direction])
+
+
 class RecessionProbabilityModel:
     """
     Recession probability model using MRI and supplementary indicators.
@@ -75,24 +220,27 @@ class RecessionProbabilityModel:
     recession detection while minimizing false positives.
     """
 
-    def __init__(self, conn: sqlite3.Connection = None):
-        """Initialize the model."""
+    def __init__(self, conn: sqlite3.Connection = None, use_stored_calibration: bool = True):
+        """
+        Initialize the model.
+
+        Args:
+            conn: Database connection (default: DB_PATH)
+            use_stored_calibration: Use the latest saved calibration if there is
+                one; False pins BASELINE_COEFFICIENTS
+        """
         self.conn = conn or sqlite3.connect(DB_PATH)
 
-        # Calibrated coefficients (fitted on 1990-2024 NBER recessions)
-        # Calibration date: 2026-01-19
-        self.coefficients = {
-            "intercept": -1.5,      # Adjusted for recall (was -2.5)
-            "MRI": 4.0,             # Primary signal
-            "yield_curve": -3.0,    # Negative slope = higher probability (was -2.0)
-            "credit_spread": 1.0,   # Wider spreads = higher probability (was 1.5)
-            "quits_inv": 1.0,       # Lower quits = higher probability
-        }
+        self.coefficients = dict(BASELINE_COEFFICIENTS)
 
         # Model calibration metadata
         self.calibration_date = "2026-01-19"
         self.training_start = "1990-01-01"
         self.training_end = "2024-12-31"
+        self.calibration_source = "baseline"
+        if use_stored_calibration:
+            self._load_calibration()
+        logger.info(f"REC_PROB coefficients: {self.calibration_source} (calibrated {self.calibration_date})")
 
     def load_indicators(self) -> pd.DataFrame:
         """Load required indicators from database."""
@@ -102,23 +250,16 @@ class RecessionProbabilityModel:
             self.conn, parse_dates=['date']
         )
 
-        # Load yield curve (10Y-3M spread from horizon_dataset)
-        yield_curve = pd.read_sql(
-            "SELECT date, Curve_10Y_3M as yield_curve FROM horizon_dataset ORDER BY date",
-            self.conn, parse_dates=['date']
-        )
-
-        # Load HY OAS
-        hy_oas = pd.read_sql(
-            "SELECT date, HY_OAS_z as credit_spread FROM horizon_dataset ORDER BY date",
-            self.conn, parse_dates=['date']
-        )
+        # Yield curve (10Y-3M spread), HY OAS z and Quits z in one projected read
+        horizon = load_horizon_dataset(
+            columns=['Curve_10Y_3M', 'HY_OAS_z', 'JOLTS_Quits_Rate_z'],
+            db_path=database_path(self.conn)
+        ).reset_index()
+        yield_curve = horizon[['date', 'Curve_10Y_3M']].rename(columns={'Curve_10Y_3M': 'yield_curve'})
+        hy_oas = horizon[['date', 'HY_OAS_z']].rename(columns={'HY_OAS_z': 'credit_spread'})
 
         # Load Quits rate (inverted z-score)
-        quits = pd.read_sql(
-            "SELECT date, JOLTS_Quits_Rate_z as quits_z FROM horizon_dataset ORDER BY date",
-            self.conn, parse_dates=['date']
-        )
+        quits = horizon[['date', 'JOLTS_Quits_Rate_z']].rename(columns={'JOLTS_Quits_Rate_z': 'quits_z'})
         # Invert quits (low quits = high risk)
         if not quits.empty:
             quits['quits_inv'] = -quits['quits_z']
@@ -132,13 +273,22 @@ class RecessionProbabilityModel:
 
         return df.sort_index()
 
-    def calibrate(self, start_date: str = "1990-01-01") -> Dict:
+    def calibrate(self, start_date: str = "1990-01-01", method: str = "grid",
+                  grid: Dict[str, List[float]] = None, workers: int = None) -> Dict:
         """
         Calibrate model coefficients on historical data.
 
-        Uses a simple grid search to find coefficients that maximize
-        the area under the ROC curve while maintaining reasonable
-        precision at the detection threshold.
+        Methods:
+            grid:    F1 at the 0.5 threshold over every point of `grid`
+                     (default CALIBRATION_GRID), scored as one matrix product
+                     per block of grid points. As before, the quits term is
+                     left out of the search and kept at 1.0.
+            logloss: Maximum-likelihood logistic fit of all five terms (scipy)
+            auc:     Slope direction maximizing ROC AUC, then intercept and
+                     scale fitted by log-loss (scipy)
+
+        The f1 / log_loss / auc reported for every method are those of the
+        full predict() model with the chosen coefficients.
         """
         df = self.load_indicators()
         df = df.loc[df.index >= start_date].copy()
@@ -154,53 +304,84 @@ class RecessionProbabilityModel:
             warnings.warn("Insufficient data for calibration")
             return {}
 
-        # Simple calibration: find coefficients that maximize F1 score
-        # This is a simplified version - production would use proper ML
-
-        best_f1 = 0
-        best_coeffs = self.coefficients.copy()
-
-        # Grid search over coefficient space
-        for mri_coef in [2.0, 3.0, 4.0, 5.0, 6.0]:
-            for yc_coef in [-3.0, -2.0, -1.0]:
-                for cs_coef in [0.5, 1.0, 1.5, 2.0]:
-                    for intercept in [-3.0, -2.5, -2.0, -1.5]:
-                        # Compute probabilities
-                        z = (intercept +
-                             mri_coef * df['MRI'].fillna(0) +
-                             yc_coef * df['yield_curve'].fillna(0) / 100 +  # Scale yield curve
-                             cs_coef * df['credit_spread'].fillna(0))
-
-                        probs = sigmoid(z)
-
-                        # Compute F1 at threshold 0.5
-                        preds = (probs > 0.5).astype(int)
-                        tp = ((preds == 1) & (df['target'] == 1)).sum()
-                        fp = ((preds == 1) & (df['target'] == 0)).sum()
-                        fn = ((preds == 0) & (df['target'] == 1)).sum()
-
-                        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-                        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-                        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0
-
-                        if f1 > best_f1:
-                            best_f1 = f1
-                            best_coeffs = {
-                                "intercept": intercept,
-                                "MRI": mri_coef,
-                                "yield_curve": yc_coef,
-                                "credit_spread": cs_coef,
-                                "quits_inv": 1.0  # Keep fixed for simplicity
-                            }
+        X = design_matrix(df)
+        y = df['target'].to_numpy().astype(bool)
+
+        if method == "grid":
+            coeffs, scores = grid_search(X, y, grid or CALIBRATION_GRID, workers=workers)
+            best = int(np.argmax(scores))
+            best_f1 = scores[best]
+            if best_f1 > 0:
+                best_coeffs = dict(zip(MODEL_TERMS, coeffs[best].tolist()))
+                best_coeffs["quits_inv"] = 1.0  # Keep fixed for simplicity
+            else:
+                best_coeffs = self.coefficients.copy()
+            result = {"best_f1": best_f1, "grid_size": len(coeffs)}
+        elif method in ("logloss", "auc"):
+            if not SCIPY_AVAILABLE:
+                raise ImportError("scipy is required for continuous calibration. Run: pip install scipy")
+            beta = fit_logistic(X, y) if method == "logloss" else fit_auc(X, y)
+            best_coeffs = {term: round(float(b), 4) for term, b in zip(MODEL_TERMS, beta)}
+            result = {}
+        else:
+            raise ValueError(f"Unknown calibration method: {method}")
 
         self.coefficients = best_coeffs
+        self.calibration_date = datetime.now().strftime("%Y-%m-%d")
+        self.training_start = df.index.min().strftime("%Y-%m-%d")
+        self.training_end = df.index.max().strftime("%Y-%m-%d")
 
-        return {
-            "best_f1": best_f1,
+        z = X @ np.array([best_coeffs[t] for t in MODEL_TERMS])
+        result.update({
+            "method": method,
             "coefficients": best_coeffs,
             "n_samples": len(df),
-            "n_recessions": df['target'].sum()
-        }
+            "n_recessions": df['target'].sum(),
+            "f1": f1_scores(z[None, :] > 0, y)[0],
+            "log_loss": log_loss(z, y),
+        })
+        if SCIPY_AVAILABLE:
+            result["auc"] = roc_auc(z, y)
+        return result
+
+    def save_calibration(self, result: Dict):
+        """Store a calibrate() result; later models on this database load it."""
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CALIBRATION_TABLE} (
+                calibrated_at TEXT PRIMARY KEY,
+                method TEXT,
+                coefficients TEXT,
+                training_start TEXT,
+                training_end TEXT,
+                n_samples INTEGER,
+                f1 REAL,
+                auc REAL,
+                log_loss REAL
+            )
+        """)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {CALIBRATION_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (datetime.now().isoformat(timespec="seconds"), result["method"],
+             json.dumps({k: float(v) for k, v in result["coefficients"].items()}),
+             self.training_start, self.training_end, int(result["n_samples"]),
+             float(result["f1"]), float(result["auc"]) if "auc" in result else None,
+             float(result["log_loss"])))
+        self.conn.commit()
+
+    def _load_calibration(self):
+        """Use the latest stored calibration, if any (else the defaults above)."""
+        try:
+            row = self.conn.execute(
+                f"SELECT calibrated_at, coefficients, training_start, training_end, method "
+                f"FROM {CALIBRATION_TABLE} ORDER BY calibrated_at DESC LIMIT 1"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return  # Never calibrated
+        if row:
+            self.coefficients = {**self.coefficients, **json.loads(row[1])}
+            self.calibration_date = row[0][:10]
+            self.training_start, self.training_end = row[2], row[3]
+            self.calibration_source = f"stored {row[4]} calibration"
 
     def predict(self, date: str = None) -> RecessionProbabilityResult:
         """
@@ -304,15 +485,20 @@ class RecessionProbabilityModel:
             confidence=confidence
         )
 
-    def predict_history(self, start_date: str = "1990-01-01") -> pd.DataFrame:
+    def predict_history(self, start_date: Optional[str] = "1990-01-01") -> pd.DataFrame:
         """
         Generate historical recession probabilities using vectorized operations.
 
+        Args:
+            start_date: First date (None = all available history)
+
         Returns DataFrame with columns:
             date, prob_12m, prob_6m, prob_3m, regime, actual_recession
         """
         df = self.load_indicators()
-        df = df.loc[df.index >= start_date].copy()
+        if start_date is not None:
+            df = df.loc[df.index >= start_date]
+        df = df.copy()
 
         if len(df) == 0:
             return pd.DataFrame()
@@ -433,14 +619,18 @@ class RecessionProbabilityModel:
         }
 
 
-def compute_recession_probability(conn: sqlite3.Connection = None) -> pd.Series:
+def compute_recession_probability(conn: sqlite3.Connection = None,
+                                  use_stored_calibration: bool = True) -> pd.Series:
     """
     Compute recession probability for the full history.
 
+    Args:
+        use_stored_calibration: False pins BASELINE_COEFFICIENTS
+
     Returns:
         pd.Series with recession probability indexed by date
     """
-    model = RecessionProbabilityModel(conn)
+    model = RecessionProbabilityModel(conn, use_stored_calibration)
     history = model.predict_history(start_date="1990-01-01")
 
     if history.empty:
@@ -458,13 +648,22 @@ if __name__ == "__main__":
     import sys
 
     conn = sqlite3.connect(DB_PATH)
-    model = RecessionProbabilityModel(conn)
+    # --baseline: ignore any stored calibration
+    model = RecessionProbabilityModel(conn, use_stored_calibration="--baseline" not in sys.argv)
 
     if len(sys.argv) > 1 and sys.argv[1] == "--calibrate":
-        print("Calibrating model...")
-        result = model.calibrate()
-        print(f"Best F1: {result.get('best_f1', 'N/A'):.3f}")
-        print(f"Coefficients: {result.get('coefficients', {})}")
+        # --calibrate [--method grid|logloss|auc] [--save]
+        method = sys.argv[sys.argv.index("--method") + 1] if "--method" in sys.argv else "grid"
+        print(f"Calibrating model ({method})...")
+        result = model.calibrate(method=method)
+        if result:
+            if "best_f1" in result:
+                print(f"Best F1: {result['best_f1']:.3f} ({result['grid_size']} grid points)")
+            print(f"F1 @ 0.5: {result['f1']:.3f}  Log-loss: {result['log_loss']:.4f}  AUC: {result.get('auc', float('nan')):.3f}")
+            print(f"Coefficients: {result['coefficients']}")
+            if "--save" in sys.argv:
+                model.save_calibration(result)
+                print(f"Saved to {CALIBRATION_TABLE}")
     elif len(sys.argv) > 1 and sys.argv[1] == "--evaluate":
         print("Evaluating model...")
         metrics = model.evaluate()
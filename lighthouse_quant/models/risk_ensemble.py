@@ -35,6 +35,7 @@ from enum import Enum
 import sys
 sys.path.insert(0, "/Users/bob/LHM")
 from lighthouse_quant.config import DB_PATH
+from lighthouse_quant.data.snapshot import DataSnapshot
 from lighthouse_quant.models.recession_probability import (
     RecessionProbabilityModel,
     RecessionProbabilityResult
@@ -43,7 +44,8 @@ from lighthouse_quant.models.warning_system import (
     WarningSystem,
     WarningLevel,
     SystemWarning,
-    ThresholdFlag
+    ThresholdFlag,
+    flag_names
 )
 
 
@@ -180,6 +182,40 @@ def determine_regime(
     return RiskRegime.EXPANSION, "Expansion regime. Buffers intact. Normal operations."
 
 
+def determine_regime_history(
+    base_prob: np.ndarray,
+    adjusted_prob: np.ndarray,
+    warning_level: np.ndarray,
+    flags: pd.DataFrame
+) -> np.ndarray:
+    """
+    determine_regime for every date at once.
+
+    Args:
+        warning_level: WarningLevel values (1-4)
+        flags: dates x flag name frame of triggered booleans
+
+    Returns:
+        Array of RiskRegime values
+    """
+    override_count = flags[flag_names("override")].sum(axis=1).to_numpy()
+    critical_count = flags[flag_names("critical")].sum(axis=1).to_numpy()
+    rrp_depleted = flags["RRP_DEPLETED"].to_numpy()
+    liquidity_stress = flags[flag_names("critical", "liquidity") + flag_names("override", "liquidity")].any(axis=1).to_numpy()
+
+    return np.select(
+        [
+            (adjusted_prob > 0.70) | (override_count >= 2),
+            (adjusted_prob > 0.50) | ((override_count >= 1) & (critical_count >= 2)),
+            (base_prob < 0.30) & (rrp_depleted | liquidity_stress),
+            (adjusted_prob > 0.25) | (warning_level >= WarningLevel.YELLOW.value),
+        ],
+        [RiskRegime.CRISIS.value, RiskRegime.PRE_CRISIS.value,
+         RiskRegime.HOLLOW_RALLY.value, RiskRegime.LATE_CYCLE.value],
+        default=RiskRegime.EXPANSION.value
+    )
+
+
 def determine_model_agreement(
     base_prob: float,
     warning_level: WarningLevel
@@ -203,21 +239,22 @@ def determine_model_agreement(
         return "DIVERGE"
 
 
+REGIME_ALLOCATION = {
+    RiskRegime.EXPANSION: 1.2,
+    RiskRegime.LATE_CYCLE: 0.8,
+    RiskRegime.HOLLOW_RALLY: 0.5,
+    RiskRegime.PRE_CRISIS: 0.3,
+    RiskRegime.CRISIS: 0.0,
+}
+
+
 def calculate_allocation_multiplier(regime: RiskRegime, adjusted_prob: float) -> float:
     """
     Calculate regime-based allocation multiplier.
 
     Returns value between 0.0 (max defensive) and 1.2 (max aggressive).
     """
-    regime_base = {
-        RiskRegime.EXPANSION: 1.2,
-        RiskRegime.LATE_CYCLE: 0.8,
-        RiskRegime.HOLLOW_RALLY: 0.5,
-        RiskRegime.PRE_CRISIS: 0.3,
-        RiskRegime.CRISIS: 0.0,
-    }
-
-    base = regime_base[regime]
+    base = REGIME_ALLOCATION[regime]
 
     # Further adjust based on probability
     if adjusted_prob > 0.50:
@@ -239,10 +276,10 @@ class RiskEnsemble:
     Synthesizes probability model and warning system into unified risk assessment.
     """
 
-    def __init__(self, conn: sqlite3.Connection = None):
+    def __init__(self, conn: sqlite3.Connection = None, snapshot: DataSnapshot = None):
         self.conn = conn or sqlite3.connect(DB_PATH)
         self.prob_model = RecessionProbabilityModel(self.conn)
-        self.warning_system = WarningSystem(self.conn)
+        self.warning_system = WarningSystem(self.conn, snapshot)
 
     def evaluate(self, date: str = None) -> EnsembleResult:
         """
@@ -338,6 +375,61 @@ class RiskEnsemble:
             invalidation_conditions=invalidations,
         )
 
+    def replay(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        Ensemble risk on every horizon date in one pass.
+
+        Builds on WarningSystem.replay. The base probability is the
+        predict_history row that predict(date) would use. Premiums, regimes
+        and allocation multipliers are applied column-wise. The result for a
+        date matches evaluate(date).
+
+        Returns:
+            DataFrame indexed by date: warning_level, base_probability,
+            discontinuity_premium, adjusted_probability, regime (RiskRegime
+            name), allocation_multiplier
+        """
+        warning = self.warning_system.replay(end_date=end_date)
+        flags = warning.flags
+        level = warning.levels.to_numpy()
+
+        history = self.prob_model.predict_history(start_date=None)
+        prob = pd.Series(history["prob_12m"].round(4).to_numpy(), index=pd.to_datetime(history["date"]))
+        base_prob = prob.reindex(prob.index.union(flags.index)).ffill().reindex(flags.index).to_numpy()
+
+        # Discontinuity premium, summed in the same order as evaluate()
+        base_premium = np.select([level == lvl.value for lvl in DISCONTINUITY_PREMIUM],
+                                 list(DISCONTINUITY_PREMIUM.values()))
+        flag_premium = np.zeros(len(flags))
+        for flag_name, premium in FLAG_PREMIUMS.items():
+            flag_premium = flag_premium + np.where(flags[flag_name].to_numpy(), premium, 0.0)
+        combo_premium = np.zeros(len(flags))
+        for combo in COMBINATION_PREMIUMS:
+            combo_premium = combo_premium + np.where(flags[combo["flags"]].all(axis=1).to_numpy(), combo["premium"], 0.0)
+        rmp_modifier = warning.rmp_risk_modifier.to_numpy()
+
+        total_premium = np.maximum(0.0, np.minimum(0.50, base_premium + flag_premium + combo_premium + rmp_modifier))
+        adjusted_prob = np.minimum(0.95, base_prob + total_premium)
+
+        regime = determine_regime_history(base_prob, adjusted_prob, level, flags)
+        alloc = np.array([REGIME_ALLOCATION[RiskRegime(r)] for r in range(1, 6)])[regime - 1]
+        alloc = np.where(adjusted_prob > 0.50, alloc * 0.5, np.where(adjusted_prob > 0.30, alloc * 0.8, alloc))
+
+        result = pd.DataFrame({
+            "warning_level": level,
+            "base_probability": base_prob,
+            "discontinuity_premium": total_premium,
+            "adjusted_probability": adjusted_prob,
+            "regime": np.array([r.name for r in RiskRegime], dtype=object)[regime - 1],
+            "allocation_multiplier": np.round(np.clip(alloc, 0.0, 1.2), 2),
+        }, index=flags.index)
+
+        # No probability before the first indicator date (predict() raises there)
+        result = result[~np.isnan(base_prob)]
+        if start_date:
+            result = result[result.index >= pd.Timestamp(start_date)]
+        return result
+
     def _generate_actions(
         self,
         regime: RiskRegime,
@@ -502,5 +594,10 @@ def compute_ensemble_risk(conn: sqlite3.Connection = None) -> pd.DataFrame:
 if __name__ == "__main__":
     conn = sqlite3.connect(DB_PATH)
     ensemble = RiskEnsemble(conn)
-    ensemble.print_report()
+    if len(sys.argv) > 1 and sys.argv[1] == "--replay":
+        history = ensemble.replay()
+        print(f"Replayed {len(history)} dates ({history.index.min().date()} to {history.index.max().date()})")
+        print(history["regime"].value_counts().to_string())
+    else:
+        ensemble.print_report()
     conn.close()
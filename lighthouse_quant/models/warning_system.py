@@ -14,6 +14,7 @@ Architecture:
     - Category aggregation (Liquidity, Labor, Credit, Structure)
     - Overall warning level (GREEN/YELLOW/AMBER/RED)
     - Override logic (certain conditions force escalation)
+    - Historical replay: all of the above for every date at once (replay())
 
 Key Insight from Horizon Jan 2026:
     "Liquidity still exists. But it no longer absorbs risk. It transmits it."
@@ -30,6 +31,10 @@ from enum import Enum
 import sys
 sys.path.insert(0, "/Users/bob/LHM")
 from lighthouse_quant.config import DB_PATH
+from lighthouse_quant.data.loaders import (
+    database_path, get_available_columns, load_horizon_dataset
+)
+from lighthouse_quant.data.snapshot import DataSnapshot, snapshot_for
 
 
 class WarningLevel(Enum):
@@ -99,6 +104,25 @@ class SystemWarning:
     rmp_assessment: Optional[ReserveManagementAssessment] = None
 
 
+@dataclass
+class WarningHistory:
+    """Warning system replayed over history (see WarningSystem.replay)."""
+    flags: pd.DataFrame             # dates x flag name: triggered (bool)
+    levels: pd.Series               # Overall WarningLevel value (1-4)
+    override_reason: pd.Series      # Override rule that set the level ("" if none)
+    rmp_risk_modifier: pd.Series    # ReserveManagementAssessment.risk_modifier
+
+    def between(self, start_date: str = None, end_date: str = None) -> "WarningHistory":
+        """Dates within [start_date, end_date]."""
+        keep = np.ones(len(self.levels), dtype=bool)
+        if start_date:
+            keep &= self.levels.index >= pd.Timestamp(start_date)
+        if end_date:
+            keep &= self.levels.index <= pd.Timestamp(end_date)
+        return WarningHistory(self.flags[keep], self.levels[keep],
+                              self.override_reason[keep], self.rmp_risk_modifier[keep])
+
+
 # ==========================================
 # THRESHOLD DEFINITIONS
 # ==========================================
@@ -432,6 +456,7 @@ OVERRIDE_RULES = [
     {
         "name": "Single Override",
         "condition": lambda flags: any(f.severity == "override" and f.triggered for f in flags),
+        "replay": lambda flags: flags[flag_names("override")].any(axis=1),
         "min_level": WarningLevel.AMBER,
         "description": "Critical threshold breached"
     },
@@ -440,6 +465,7 @@ OVERRIDE_RULES = [
     {
         "name": "Category Critical Mass",
         "condition": lambda flags: max_critical_per_category(flags) >= 2,
+        "replay": lambda flags: critical_counts_by_category(flags).max(axis=1) >= 2,
         "min_level": WarningLevel.AMBER,
         "description": "Multiple critical warnings in same category"
     },
@@ -448,6 +474,7 @@ OVERRIDE_RULES = [
     {
         "name": "Broad Critical Spread",
         "condition": lambda flags: count_categories_with_critical(flags) >= 3,
+        "replay": lambda flags: (critical_counts_by_category(flags) > 0).sum(axis=1) >= 3,
         "min_level": WarningLevel.AMBER,
         "description": "Critical warnings across multiple categories"
     },
@@ -459,6 +486,10 @@ OVERRIDE_RULES = [
             has_critical_in_category(flags, "liquidity") and
             has_critical_in_category(flags, "labor")
         ),
+        "replay": lambda flags: (
+            flags[flag_names("critical", "liquidity")].any(axis=1) &
+            flags[flag_names("critical", "labor")].any(axis=1)
+        ),
         "min_level": WarningLevel.RED,
         "description": "Both liquidity and labor showing critical stress"
     },
@@ -470,12 +501,20 @@ OVERRIDE_RULES = [
             any(f.name == "RRP_DEPLETED" and f.triggered for f in flags) and
             sum(1 for f in flags if f.severity == "override" and f.triggered) >= 2
         ),
+        "replay": lambda flags: (
+            flags["RRP_DEPLETED"] &
+            (flags[flag_names("override")].sum(axis=1) >= 2)
+        ),
         "min_level": WarningLevel.RED,
         "description": "RRP exhausted with additional override conditions"
     },
 ]
 
 
+# Horizon series behind the reserve management assessment
+RESERVE_SERIES = ("Bank_Reserves", "Fed_Balance_Sheet", "Fed_Balance_Sheet_wow_diff")
+
+
 def max_critical_per_category(flags: List[ThresholdFlag]) -> int:
     """Get max critical count in any single category."""
     from collections import Counter
@@ -494,6 +533,35 @@ def has_critical_in_category(flags: List[ThresholdFlag], category: str) -> bool:
     return any(f.category == category and f.severity == "critical" and f.triggered for f in flags)
 
 
+# Replay ("replay" in OVERRIDE_RULES) works on a dates x flag-name frame of
+# triggered booleans instead of a list of ThresholdFlag objects.
+
+def flag_names(severity: str = None, category: str = None) -> List[str]:
+    """THRESHOLDS flag names, optionally filtered by severity and/or category."""
+    return [
+        name
+        for cat, flags in THRESHOLDS.items() if category in (None, cat)
+        for name, config in flags.items() if severity in (None, config["severity"])
+    ]
+
+
+def critical_counts_by_category(flags: pd.DataFrame) -> pd.DataFrame:
+    """Triggered critical flags per category for each date (dates x categories)."""
+    return pd.DataFrame(
+        {cat: flags[flag_names("critical", cat)].sum(axis=1) for cat in THRESHOLDS},
+        index=flags.index
+    )
+
+
+def _trailing_window_start(dates: np.ndarray, rows: int, days: int) -> np.ndarray:
+    """
+    Start position of each row's trailing window: at most `rows` rows, none
+    older than `days` days (the _get_series_history window, for every row).
+    """
+    by_days = np.searchsorted(dates, dates - np.timedelta64(days, "D"), side="left")
+    return np.maximum(np.arange(len(dates)) - rows + 1, by_days)
+
+
 # ==========================================
 # WARNING SYSTEM CLASS
 # ==========================================
@@ -506,45 +574,84 @@ class WarningSystem:
     macro, structure, and sentiment to identify discontinuity risk.
     """
 
-    def __init__(self, conn: sqlite3.Connection = None):
+    def __init__(self, conn: sqlite3.Connection = None, snapshot: DataSnapshot = None):
         self.conn = conn or sqlite3.connect(DB_PATH)
+        self.db_path = database_path(self.conn)
+        self._snapshot = snapshot
         self._data_cache = {}
 
+    @property
+    def snapshot(self) -> DataSnapshot:
+        """Latest-value snapshot, set up on first use (see snapshot_for)."""
+        if self._snapshot is None:
+            self._snapshot = snapshot_for(self.conn)
+        return self._snapshot
+
+    def _prefetch_latest(self):
+        """Read every latest value evaluate() needs in one batch per source."""
+        configs = [c for flags in THRESHOLDS.values() for c in flags.values()]
+        self.snapshot.series_latest([c["series"] for c in configs if "series" in c] + list(RESERVE_SERIES))
+        self.snapshot.index_latest([c["index"] for c in configs if "index" in c])
+
     def _get_series_value(self, series_name: str, date: str = None) -> Optional[float]:
-        """Get latest value for a series from horizon_dataset."""
+        """Get latest value for a series (as of `date`, if given) from the horizon dataset."""
         cache_key = f"series_{series_name}"
 
         if cache_key not in self._data_cache:
             try:
-                query = f"SELECT date, {series_name} FROM horizon_dataset WHERE {series_name} IS NOT NULL ORDER BY date DESC LIMIT 1"
-                result = pd.read_sql(query, self.conn)
-                if not result.empty:
-                    self._data_cache[cache_key] = float(result.iloc[0][series_name])
+                if date is None:
+                    self._data_cache[cache_key] = self.snapshot.series_value(series_name)
                 else:
-                    self._data_cache[cache_key] = None
+                    values = load_horizon_dataset(end_date=date, columns=[series_name],
+                                                  db_path=self.db_path)[series_name].dropna()
+                    self._data_cache[cache_key] = float(values.iloc[-1]) if len(values) else None
             except Exception as e:
                 self._data_cache[cache_key] = None
 
         return self._data_cache.get(cache_key)
 
+    def _get_series_history(self, columns: List[str], rows: int, days: int = 120, date: str = None) -> pd.DataFrame:
+        """
+        Last `rows` rows where columns[0] is non-null (as of `date`, if given),
+        newest first (date as a column), read from the trailing `days` of the
+        horizon dataset only.
+        """
+        if date is None:
+            latest = self.snapshot.series_latest(columns[:1])
+            anchor = latest[columns[0]][0] if latest else None
+        else:
+            values = load_horizon_dataset(end_date=date, columns=columns[:1], db_path=self.db_path)[columns[0]]
+            values = values.dropna()
+            anchor = values.index[-1] if len(values) else None
+        if anchor is None:
+            return pd.DataFrame(columns=["date"] + columns)
+        start = (anchor - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+        df = load_horizon_dataset(start_date=start, end_date=anchor.strftime("%Y-%m-%d"),
+                                  columns=columns, db_path=self.db_path)
+        df = df.dropna(subset=columns[:1]).tail(rows).iloc[::-1]
+        return df.reset_index()
+
     def _get_index_value(self, index_name: str, date: str = None) -> Optional[float]:
-        """Get latest value for an index from lighthouse_indices."""
+        """Get latest value for an index (as of `date`, if given) from lighthouse_indices."""
         cache_key = f"index_{index_name}"
 
         if cache_key not in self._data_cache:
             try:
-                query = f"SELECT date, value FROM lighthouse_indices WHERE index_id = '{index_name}' ORDER BY date DESC LIMIT 1"
-                result = pd.read_sql(query, self.conn)
-                if not result.empty:
-                    self._data_cache[cache_key] = float(result.iloc[0]['value'])
+                if date is None:
+                    self._data_cache[cache_key] = self.snapshot.index_value(index_name)
                 else:
-                    self._data_cache[cache_key] = None
+                    query = "SELECT date, value FROM lighthouse_indices WHERE index_id = ? AND date <= ? ORDER BY date DESC LIMIT 1"
+                    result = pd.read_sql(query, self.conn, params=[index_name, date])
+                    if not result.empty:
+                        self._data_cache[cache_key] = float(result.iloc[0]['value'])
+                    else:
+                        self._data_cache[cache_key] = None
             except Exception as e:
                 self._data_cache[cache_key] = None
 
         return self._data_cache.get(cache_key)
 
-    def _assess_reserve_management(self) -> ReserveManagementAssessment:
+    def _assess_reserve_management(self, date: str = None) -> ReserveManagementAssessment:
         """
         Assess Fed reserve management operations (RMP).
 
@@ -557,7 +664,7 @@ class WarningSystem:
         LCLOR = 2800  # $2.8T estimate in billions
 
         # Get current reserves
-        reserves_current = self._get_series_value("Bank_Reserves")
+        reserves_current = self._get_series_value("Bank_Reserves", date)
         if reserves_current is None:
             reserves_current = 2879  # Fallback to recent known value
 
@@ -565,12 +672,7 @@ class WarningSystem:
 
         # Get reserve history to calculate drain rate (last 30 days)
         try:
-            reserve_history = pd.read_sql("""
-                SELECT date, Bank_Reserves
-                FROM horizon_dataset
-                WHERE Bank_Reserves IS NOT NULL
-                ORDER BY date DESC LIMIT 30
-            """, self.conn)
+            reserve_history = self._get_series_history(["Bank_Reserves"], rows=30, date=date)
 
             if len(reserve_history) >= 2:
                 # Calculate monthly drain rate from recent data
@@ -590,12 +692,7 @@ class WarningSystem:
 
         # Get Fed balance sheet changes (proxy for RMP activity)
         try:
-            fed_bs = pd.read_sql("""
-                SELECT date, Fed_Balance_Sheet, Fed_Balance_Sheet_wow_diff
-                FROM horizon_dataset
-                WHERE Fed_Balance_Sheet IS NOT NULL
-                ORDER BY date DESC LIMIT 8
-            """, self.conn)
+            fed_bs = self._get_series_history(["Fed_Balance_Sheet", "Fed_Balance_Sheet_wow_diff"], rows=8, date=date)
 
             if not fed_bs.empty:
                 # Average weekly change
@@ -671,13 +768,13 @@ class WarningSystem:
             risk_modifier=risk_modifier
         )
 
-    def _evaluate_threshold(self, flag_name: str, config: dict, category: str) -> ThresholdFlag:
+    def _evaluate_threshold(self, flag_name: str, config: dict, category: str, date: str = None) -> ThresholdFlag:
         """Evaluate a single threshold flag."""
         # Get current value
         if "series" in config:
-            current_value = self._get_series_value(config["series"])
+            current_value = self._get_series_value(config["series"], date)
         elif "index" in config:
-            current_value = self._get_index_value(config["index"])
+            current_value = self._get_index_value(config["index"], date)
         else:
             current_value = None
 
@@ -715,12 +812,14 @@ class WarningSystem:
         Evaluate all thresholds and generate system warning.
 
         Args:
-            date: Date to evaluate (default: latest available)
+            date: Date to evaluate, using values as of that date (default: latest available)
 
         Returns:
             SystemWarning with complete assessment
         """
         self._data_cache = {}  # Clear cache for fresh evaluation
+        if date is None:
+            self._prefetch_latest()
 
         # Evaluate all flags
         all_flags = []
@@ -729,7 +828,7 @@ class WarningSystem:
         for category, flags in THRESHOLDS.items():
             category_flags[category] = []
             for flag_name, config in flags.items():
-                flag = self._evaluate_threshold(flag_name, config, category)
+                flag = self._evaluate_threshold(flag_name, config, category, date)
                 all_flags.append(flag)
                 category_flags[category].append(flag)
 
@@ -782,7 +881,7 @@ class WarningSystem:
                     override_reason = rule["description"]
 
         # Assess Reserve Management Operations
-        rmp_assessment = self._assess_reserve_management()
+        rmp_assessment = self._assess_reserve_management(date)
 
         # Generate narrative and action items
         narrative = self._generate_narrative(overall_level, categories, triggered_flags)
@@ -804,6 +903,154 @@ class WarningSystem:
             rmp_assessment=rmp_assessment
         )
 
+    # ==========================================
+    # HISTORICAL REPLAY
+    # ==========================================
+
+    def _load_replay_inputs(self, end_date: str = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Load every THRESHOLDS input once.
+
+        Returns:
+            (panel, values): the horizon series as stored, and every input
+            (series and lighthouse_indices) as of each horizon date, i.e. the
+            latest value available on that date, as evaluate(date) reads it
+        """
+        series = sorted({c["series"] for f in THRESHOLDS.values() for c in f.values() if "series" in c} |
+                        set(RESERVE_SERIES))
+        available = set(get_available_columns(self.db_path))
+        panel = load_horizon_dataset(end_date=end_date, columns=[c for c in series if c in available],
+                                     db_path=self.db_path)
+        panel = panel.reindex(columns=series)
+
+        indices = sorted({c["index"] for f in THRESHOLDS.values() for c in f.values() if "index" in c})
+        try:
+            query = f"SELECT date, index_id, value FROM lighthouse_indices WHERE index_id IN ({','.join('?' * len(indices))})"
+            params = list(indices)
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date)
+            stored = pd.read_sql(query, self.conn, params=params, parse_dates=["date"])
+            stored = stored.pivot(index="date", columns="index_id", values="value")
+        except Exception:
+            stored = pd.DataFrame()
+        stored = stored.reindex(columns=indices)
+        stored = stored.reindex(stored.index.union(panel.index)).ffill().reindex(panel.index)
+
+        return panel, pd.concat([panel.ffill(), stored], axis=1)
+
+    def _replay_reserve_management(self, values: pd.DataFrame, panel: pd.DataFrame) -> pd.Series:
+        """ReserveManagementAssessment.risk_modifier for every date (see _assess_reserve_management)."""
+        LCLOR = 2800
+
+        reserves_current = values["Bank_Reserves"].fillna(2879).to_numpy()
+        reserves_buffer = reserves_current - LCLOR
+
+        # Drain rate: oldest vs newest of the last 30 reserve prints within 120 days
+        reserves = panel["Bank_Reserves"].dropna()
+        drain = pd.Series(65.0, index=reserves.index)
+        if len(reserves):
+            dates = reserves.index.to_numpy()
+            start = _trailing_window_start(dates, rows=30, days=120)
+            span_days = (dates - dates[start]) / np.timedelta64(1, "D")
+            level = reserves.to_numpy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                monthly = np.where(span_days > 0, (level[start] - level) / span_days * 30, 0.0)
+            drain[:] = np.where(np.arange(len(level)) - start + 1 >= 2, monthly, 65.0)
+        drain_rate_monthly = drain.reindex(drain.index.union(values.index)).ffill().reindex(values.index)
+        drain_rate_monthly = drain_rate_monthly.fillna(65.0).to_numpy()
+
+        # Fed balance sheet: mean weekly change over the last 8 prints within 120 days
+        fed_bs_monthly = np.zeros(len(values))
+        if panel["Fed_Balance_Sheet_wow_diff"].notna().any():
+            fed = panel.loc[panel["Fed_Balance_Sheet"].notna(), "Fed_Balance_Sheet_wow_diff"]
+            dates = fed.index.to_numpy()
+            start = _trailing_window_start(dates, rows=8, days=120)
+            diff = fed.to_numpy()
+            sums = np.concatenate([[0.0], np.cumsum(np.nan_to_num(diff))])
+            counts = np.concatenate([[0], np.cumsum(~np.isnan(diff))])
+            end = np.arange(1, len(diff) + 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                weekly = (sums[end] - sums[start]) / (counts[end] - counts[start])
+            monthly = np.where(np.abs(weekly) > 100, weekly * 4 / 1000, weekly * 4)
+            # NaN before the first print (no rows -> 0); NaN means inside the history are kept
+            seen = pd.Series(True, index=fed.index).reindex(values.index.union(fed.index)).ffill()
+            monthly = pd.Series(monthly, index=fed.index)
+            monthly = monthly.reindex(monthly.index.union(values.index)).ffill().reindex(values.index)
+            fed_bs_monthly = np.where(seen.reindex(values.index).fillna(False).to_numpy(dtype=bool),
+                                      monthly.to_numpy(), 0.0)
+
+        expected_qt_pace = 60
+        with np.errstate(invalid="ignore"):
+            rmp_estimated = np.where(fed_bs_monthly < 0,
+                                     np.maximum(0, expected_qt_pace - np.abs(fed_bs_monthly)),
+                                     expected_qt_pace + fed_bs_monthly)
+            net_drain = drain_rate_monthly - rmp_estimated
+            net_drain_rate = np.where(net_drain > 0, net_drain, 0.0)
+            months_to_lclor = np.divide(reserves_buffer, net_drain_rate,
+                                        out=np.full(len(values), np.inf), where=net_drain_rate > 0)
+            active = rmp_estimated > 20
+
+        risk_modifier = np.select(
+            [reserves_buffer <= 0, months_to_lclor < 2,
+             (months_to_lclor < 6) & active, months_to_lclor < 6,
+             (months_to_lclor < 12) & active, months_to_lclor < 12],
+            [0.10, 0.05, 0.0, 0.05, -0.05, 0.0],
+            default=-0.10
+        )
+        return pd.Series(risk_modifier, index=values.index, name="rmp_risk_modifier")
+
+    def replay(self, start_date: str = None, end_date: str = None) -> WarningHistory:
+        """
+        Evaluate the warning system on every horizon date in one pass.
+
+        Inputs are loaded once; each THRESHOLDS flag becomes a boolean column,
+        and category levels and OVERRIDE_RULES ("replay" conditions) are
+        applied column-wise. The result for a date matches evaluate(date).
+
+        Args:
+            start_date: First date to return (earlier history still feeds as-of values)
+            end_date: Last date to load and return
+        """
+        panel, values = self._load_replay_inputs(end_date)
+
+        flags = pd.DataFrame(index=values.index)
+        for category, category_flags in THRESHOLDS.items():
+            for name, config in category_flags.items():
+                current = values[config.get("series") or config.get("index")]
+                if config["direction"] == "above":
+                    flags[name] = current > config["threshold"]
+                else:
+                    flags[name] = current < config["threshold"]
+
+        # Category levels, then the highest across categories
+        level = np.full(len(flags), WarningLevel.GREEN.value)
+        for category in THRESHOLDS:
+            warning = flags[flag_names("warning", category)].sum(axis=1).to_numpy()
+            critical = flags[flag_names("critical", category)].sum(axis=1).to_numpy()
+            override = flags[flag_names("override", category)].sum(axis=1).to_numpy()
+            category_level = np.select(
+                [override > 0, critical >= 2, critical >= 1, warning >= 2],
+                [WarningLevel.RED.value, WarningLevel.AMBER.value, WarningLevel.YELLOW.value, WarningLevel.YELLOW.value],
+                default=WarningLevel.GREEN.value
+            )
+            level = np.maximum(level, category_level)
+
+        # Override rules, in order
+        reason = np.full(len(flags), "", dtype=object)
+        for rule in OVERRIDE_RULES:
+            raised = rule["replay"](flags).to_numpy() & (rule["min_level"].value > level)
+            level = np.where(raised, rule["min_level"].value, level)
+            reason = np.where(raised, rule["description"], reason)
+
+        history = WarningHistory(
+            flags=flags,
+            levels=pd.Series(level, index=flags.index, name="WARNING_LEVEL"),
+            override_reason=pd.Series(reason, index=flags.index, name="override_reason"),
+            rmp_risk_modifier=self._replay_reserve_management(values, panel),
+        )
+        return history.between(start_date, end_date)
+
     def _category_summary(self, category: str, flags: List[ThresholdFlag]) -> str:
         """Generate summary for a category."""
         triggered = [f for f in flags if f.triggered]
@@ -944,22 +1191,13 @@ class WarningSystem:
         return warning
 
 
-def compute_warning_level(conn: sqlite3.Connection = None) -> pd.Series:
+def compute_warning_level(conn: sqlite3.Connection = None, start_date: str = None) -> pd.Series:
     """
     Compute warning level for historical dates.
 
     Returns Series with warning level (1-4) indexed by date.
     """
-    system = WarningSystem(conn)
-    warning = system.evaluate()
-
-    # For now, just return latest value
-    # Full historical computation would require iterating through dates
-    return pd.Series(
-        [warning.overall_level.value],
-        index=[pd.Timestamp(warning.date)],
-        name="WARNING_LEVEL"
-    )
+    return WarningSystem(conn).replay(start_date=start_date).levels
 
 
 # CLI interface
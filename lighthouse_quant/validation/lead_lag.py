@@ -2,16 +2,32 @@
 Lead-Lag Analysis and Granger Causality Testing
 ================================================
 Validates whether leading indicators actually lead their target variables.
+
+Cross-correlations for all lags come from one FFT plus prefix sums per pair.
+Relationship validation and pair scans run on a process pool. Given a
+cache_path (run_validation passes LEAD_LAG_CACHE_PATH), results are cached
+keyed on a hash of the pair's data and parameters, so unchanged pairs are
+never recomputed; library calls do not touch the disk by default.
 """
 
+import hashlib
+import json
+import os
+import sqlite3
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from scipy import stats
 import warnings
 
 
+CACHE_VERSION = 1  # Bump when result definitions change
+
+
 @dataclass
 class LeadLagResult:
     """Results from lead-lag analysis."""
@@ -54,24 +70,47 @@ def compute_cross_correlation(
     if len(df) < max_lag + 10:
         raise ValueError(f"Insufficient data: {len(df)} observations for {max_lag} lags")
 
-    lead = df["lead"].values
-    lag = df["lag"].values
+    return lagged_correlations(df["lead"].to_numpy(dtype=float), df["lag"].to_numpy(dtype=float), max_lag)
 
-    correlations = []
-    lags = list(range(-max_lag, max_lag + 1))
 
-    for l in lags:
-        if l < 0:
-            # Negative lag: leading is shifted backward (lagging leads)
-            corr = np.corrcoef(lead[-l:], lag[:l])[0, 1]
-        elif l > 0:
-            # Positive lag: leading is shifted forward (leading leads)
-            corr = np.corrcoef(lead[:-l], lag[l:])[0, 1]
-        else:
-            corr = np.corrcoef(lead, lag)[0, 1]
-        correlations.append(corr)
+def lagged_correlations(lead: np.ndarray, lag: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of lead[i] with lag[i + l] for every l in
+    [-max_lag, max_lag], each over its own overlap (as np.corrcoef on the
+    sliced arrays).
+
+    The cross products of all lags come from one zero-padded FFT and the
+    per-overlap sums from prefix sums, so the cost does not grow with max_lag.
+    """
+    n = len(lead)
+    lags = np.arange(-max_lag, max_lag + 1)
+    a = lead - lead.mean()
+    b = lag - lag.mean()
+
+    size = 1 << int(np.ceil(np.log2(max(2 * n, 2))))  # No circular wrap-around
+    cross = np.fft.irfft(np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size), size)
+    sum_ab = cross[lags % size]  # sum_i a[i] * b[i + l]
+
+    def window_sums(x, start, end):
+        csum = np.concatenate([[0.0], np.cumsum(x)])
+        csq = np.concatenate([[0.0], np.cumsum(x * x)])
+        return csum[end] - csum[start], csq[end] - csq[start]
 
-    return np.array(lags), np.array(correlations)
+    a_start, a_end = np.maximum(0, -lags), n - np.maximum(0, lags)
+    b_start, b_end = np.maximum(0, lags), n + np.minimum(0, lags)
+    count = a_end - a_start
+    sum_a, sum_aa = window_sums(a, a_start, a_end)
+    sum_b, sum_bb = window_sums(b, b_start, b_end)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sum_ab - sum_a * sum_b / count
+        var_a = sum_aa - sum_a * sum_a / count
+        var_b = sum_bb - sum_b * sum_b / count
+        # Constant overlaps (variance lost in rounding) have no correlation
+        flat = (var_a <= 1e-12 * max(np.dot(a, a), 1e-300)) | (var_b <= 1e-12 * max(np.dot(b, b), 1e-300))
+        corr = np.where(flat | (count < 2), np.nan, cov / np.sqrt(var_a * var_b))
+
+    return lags, np.clip(corr, -1.0, 1.0)
 
 
 def granger_causality_test(
@@ -241,10 +280,122 @@ def validate_indicator_relationship(
     )
 
 
+# ==========================================
+# RESULT CACHE
+# ==========================================
+
+def _cache_key(data: pd.DataFrame, **params) -> str:
+    """Hash of the input data (values and dates) and the parameters."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    digest.update(",".join(map(str, data.columns)).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    digest.update(str(CACHE_VERSION).encode())
+    return digest.hexdigest()
+
+
+class _ResultCache:
+    """Key -> JSON result store in one SQLite file (None path = disabled)."""
+
+    def __init__(self, path: Optional[Path]):
+        self.conn = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT)")
+
+    def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        if self.conn is None or not keys:
+            return {}
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, result FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            found.update((k, json.loads(v)) for k, v in rows)
+        return found
+
+    def put_many(self, results: Dict[str, dict]):
+        if self.conn is None or not results:
+            return
+        self.conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?)",
+                              [(k, json.dumps(v, default=_json_default)) for k, v in results.items()])
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value)}")
+
+
+def _run_pool(func, tasks: List[tuple], workers: Optional[int]) -> list:
+    """func(*task) for every task, on a process pool when it pays off."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) < 2:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        return list(pool.map(func, *zip(*tasks), chunksize=chunksize))
+
+
+# ==========================================
+# BATCH VALIDATION
+# ==========================================
+
+def _relationship_row(df: pd.DataFrame, leading: str, lagging: str, exp_lag: int,
+                      exp_rel: str, max_lag: int) -> dict:
+    """One validate_all_relationships row (pool task)."""
+    try:
+        result = validate_indicator_relationship(
+            df, leading, lagging,
+            expected_lag=exp_lag,
+            expected_relationship=exp_rel,
+            max_lag=max_lag
+        )
+        return {
+            "leading": result.leading_indicator,
+            "lagging": result.lagging_indicator,
+            "expected_lag": result.expected_lag,
+            "optimal_lag": result.optimal_lag,
+            "lag_diff": abs(result.optimal_lag - result.expected_lag),
+            "expected_relationship": result.expected_relationship,
+            "correlation": result.correlation_at_optimal_lag,
+            "corr_at_zero": result.correlation_at_zero_lag,
+            "granger_pvalue": result.granger_pvalue,
+            "relationship_ok": result.relationship_confirmed,
+            "lead_ok": result.lead_confirmed,
+            "n_obs": result.n_observations,
+            "valid": result.relationship_confirmed and result.lead_confirmed
+        }
+    except Exception as e:
+        return {
+            "leading": leading,
+            "lagging": lagging,
+            "expected_lag": exp_lag,
+            "optimal_lag": np.nan,
+            "lag_diff": np.nan,
+            "expected_relationship": exp_rel,
+            "correlation": np.nan,
+            "corr_at_zero": np.nan,
+            "granger_pvalue": np.nan,
+            "relationship_ok": False,
+            "lead_ok": False,
+            "n_obs": 0,
+            "valid": False,
+            "error": str(e)
+        }
+
+
 def validate_all_relationships(
     df: pd.DataFrame,
     relationships: List[Tuple[str, str, int, str]],
-    max_lag: int = 24
+    max_lag: int = 24,
+    workers: Optional[int] = None,
+    cache_path: Optional[Path] = None
 ) -> pd.DataFrame:
     """
     Validate multiple indicator relationships.
@@ -253,54 +404,108 @@ def validate_all_relationships(
         df: DataFrame containing all series
         relationships: List of (leading, lagging, expected_lag, relationship) tuples
         max_lag: Maximum lag to search
+        workers: Processes for uncached pairs (default: CPU count; 1 = in-process)
+        cache_path: Result cache, e.g. LEAD_LAG_CACHE_PATH (default None = no caching)
 
     Returns:
         DataFrame with validation results for each relationship
     """
-    results = []
-
+    cache = _ResultCache(cache_path)
+    tasks, keys = [], []
     for leading, lagging, exp_lag, exp_rel in relationships:
-        try:
-            result = validate_indicator_relationship(
-                df, leading, lagging,
-                expected_lag=exp_lag,
-                expected_relationship=exp_rel,
-                max_lag=max_lag
-            )
-            results.append({
-                "leading": result.leading_indicator,
-                "lagging": result.lagging_indicator,
-                "expected_lag": result.expected_lag,
-                "optimal_lag": result.optimal_lag,
-                "lag_diff": abs(result.optimal_lag - result.expected_lag),
-                "expected_relationship": result.expected_relationship,
-                "correlation": result.correlation_at_optimal_lag,
-                "corr_at_zero": result.correlation_at_zero_lag,
-                "granger_pvalue": result.granger_pvalue,
-                "relationship_ok": result.relationship_confirmed,
-                "lead_ok": result.lead_confirmed,
-                "n_obs": result.n_observations,
-                "valid": result.relationship_confirmed and result.lead_confirmed
-            })
-        except Exception as e:
-            results.append({
-                "leading": leading,
-                "lagging": lagging,
-                "expected_lag": exp_lag,
-                "optimal_lag": np.nan,
-                "lag_diff": np.nan,
-                "expected_relationship": exp_rel,
-                "correlation": np.nan,
-                "corr_at_zero": np.nan,
-                "granger_pvalue": np.nan,
-                "relationship_ok": False,
-                "lead_ok": False,
-                "n_obs": 0,
-                "valid": False,
-                "error": str(e)
-            })
-
-    return pd.DataFrame(results)
+        pair = df[[c for c in dict.fromkeys([leading, lagging]) if c in df.columns]]
+        tasks.append((pair, leading, lagging, exp_lag, exp_rel, max_lag))
+        keys.append(_cache_key(pair, leading=leading, lagging=lagging, expected_lag=exp_lag,
+                               relationship=exp_rel, max_lag=max_lag))
+
+    cached = cache.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    computed = dict(zip([keys[i] for i in missing], _run_pool(_relationship_row, [tasks[i] for i in missing], workers)))
+    cache.put_many(computed)
+    cache.close()
+
+    return pd.DataFrame([cached.get(key) or computed[key] for key in keys])
+
+
+def _scan_rows(df: pd.DataFrame, pairs: List[Tuple[str, str]], max_lag: int,
+               min_obs: int, granger: bool) -> List[dict]:
+    """Best lag and correlation for a batch of column pairs (pool task)."""
+    values = df.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    position = {col: i for i, col in enumerate(df.columns)}
+    rows = []
+    for a, b in pairs:
+        ia, ib = position[a], position[b]
+        both = valid[:, ia] & valid[:, ib]
+        n_obs = int(both.sum())
+        if n_obs < max(min_obs, max_lag + 10):
+            continue
+        lags, corr = lagged_correlations(values[both, ia], values[both, ib], max_lag)
+        if np.isnan(corr).all():
+            continue
+        best = int(np.nanargmax(np.abs(corr)))
+        # Positive best lag: a leads b
+        leading, lagging = (a, b) if lags[best] >= 0 else (b, a)
+        row = {
+            "leading": leading,
+            "lagging": lagging,
+            "lead": abs(int(lags[best])),
+            "correlation": float(corr[best]),
+            "corr_at_zero": float(corr[max_lag]),
+            "n_obs": n_obs,
+        }
+        if granger:
+            pvalues = granger_causality_test(df[leading], df[lagging], max_lag=min(12, max_lag))
+            row["granger_pvalue"] = pvalues.get(row["lead"], min(pvalues.values())) if pvalues else np.nan
+        rows.append(row)
+    return rows
+
+
+def scan_lead_lag(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    max_lag: int = 24,
+    min_obs: int = 60,
+    granger: bool = False,
+    workers: Optional[int] = None,
+    cache_path: Optional[Path] = None
+) -> pd.DataFrame:
+    """
+    Scan every pair of `columns` (default: all) for its strongest lead-lag
+    correlation within +/- max_lag periods.
+
+    Each unordered pair is scanned once; the sign of the best lag decides
+    which series leads. Pairs are split into one batch per worker process
+    and, given a cache_path, the whole scan is cached on the hash of the
+    data and parameters.
+
+    Returns:
+        DataFrame (leading, lagging, lead, correlation, corr_at_zero, n_obs
+        [, granger_pvalue]) sorted by absolute correlation
+    """
+    data = df[columns] if columns is not None else df
+    data = data.loc[:, data.notna().sum() >= min_obs]
+    schema = ["leading", "lagging", "lead", "correlation", "corr_at_zero", "n_obs"] + (["granger_pvalue"] if granger else [])
+
+    cache = _ResultCache(cache_path)
+    key = _cache_key(data, scan=True, max_lag=max_lag, min_obs=min_obs, granger=granger)
+    cached = cache.get_many([key])
+    if key in cached:
+        cache.close()
+        return pd.DataFrame(cached[key], columns=schema)
+
+    pairs = list(combinations(data.columns, 2))
+    n_batches = max(1, min(len(pairs), (workers or os.cpu_count() or 1) * 4))
+    batches = [pairs[i::n_batches] for i in range(n_batches)]
+    rows = [row for batch in _run_pool(_scan_rows, [(data, b, max_lag, min_obs, granger) for b in batches], workers)
+            for row in batch]
+
+    result = pd.DataFrame(rows, columns=schema)  # full schema even when no pair qualifies
+    if not result.empty:
+        result = result.sort_values("correlation", key=np.abs, ascending=False).reset_index(drop=True)
+    cache.put_many({key: result.to_dict(orient="records")})
+    cache.close()
+    return result
 
 
 def compute_information_coefficient(
@@ -25,15 +25,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from lighthouse_quant.config import (
     DB_PATH, OUTPUT_DIR, INDICATOR_RELATIONSHIPS,
-    NBER_RECESSIONS, ZSCORE_WINDOW_MONTHLY
+    NBER_RECESSIONS, ZSCORE_WINDOW_MONTHLY, LEAD_LAG_CACHE_PATH
 )
 from lighthouse_quant.data.loaders import (
     load_horizon_dataset, load_lighthouse_indices, create_nber_recession_series,
     resample_to_monthly
 )
+from lighthouse_quant.data.pipeline import rolling_zscore
 from lighthouse_quant.validation.lead_lag import (
     validate_all_relationships, validate_indicator_relationship,
-    compute_cross_correlation
+    compute_cross_correlation, scan_lead_lag
 )
 from lighthouse_quant.validation.weight_optimization import (
     analyze_component_importance, validate_composite_weights,
@@ -57,7 +58,7 @@ def print_subheader(title: str):
     print(f"\n--- {title} ---")
 
 
-def run_lead_lag_validation(df: pd.DataFrame) -> pd.DataFrame:
+def run_lead_lag_validation(df: pd.DataFrame, workers: int = None, cache_path: Path = LEAD_LAG_CACHE_PATH) -> pd.DataFrame:
     """Run lead-lag validation for all configured relationships."""
     print_header("LEAD-LAG VALIDATION")
 
@@ -70,7 +71,9 @@ def run_lead_lag_validation(df: pd.DataFrame) -> pd.DataFrame:
     results = validate_all_relationships(
         df_monthly,
         INDICATOR_RELATIONSHIPS,
-        max_lag=24
+        max_lag=24,
+        workers=workers,
+        cache_path=cache_path
     )
 
     # Print results
@@ -119,6 +122,29 @@ def run_lead_lag_validation(df: pd.DataFrame) -> pd.DataFrame:
     return results
 
 
+def run_lead_lag_scan(df: pd.DataFrame, workers: int = None, cache_path: Path = LEAD_LAG_CACHE_PATH,
+                      top: int = 25) -> pd.DataFrame:
+    """Scan every pair of horizon columns for its strongest lead-lag relationship."""
+    print_header("LEAD-LAG SCAN (ALL PAIRS)")
+
+    df_monthly = resample_to_monthly(df)
+    n = len(df_monthly.columns)
+    print(f"Scanning up to {n * (n - 1) // 2} pairs over {len(df_monthly)} months...")
+
+    results = scan_lead_lag(df_monthly, max_lag=24, workers=workers, cache_path=cache_path)
+    print(f"Pairs scanned: {len(results)}")
+
+    leads = results[results["lead"] > 0].head(top)
+    print_subheader(f"Strongest leading relationships (top {len(leads)})")
+    print(f"{'Leading':<30} {'Lagging':<30} {'Lead':>5} {'Corr':>8} {'Corr@0':>8}")
+    print("-" * 85)
+    for _, row in leads.iterrows():
+        print(f"{row['leading']:<30} {row['lagging']:<30} {row['lead']:>5} "
+              f"{row['correlation']:>8.3f} {row['corr_at_zero']:>8.3f}")
+
+    return results
+
+
 def run_weight_validation(df: pd.DataFrame, indices: pd.DataFrame) -> dict:
     """Validate composite weights for key indices."""
     print_header("COMPOSITE WEIGHT VALIDATION")
@@ -138,26 +164,22 @@ def run_weight_validation(df: pd.DataFrame, indices: pd.DataFrame) -> dict:
         lfi_components["z_longterm"] = df_monthly["Unemployed_27wks_Plus_z"]
     elif "Unemployed_27wks_Plus" in df_monthly.columns:
         lfi_components["z_longterm"] = (
-            df_monthly["Unemployed_27wks_Plus"]
-            .rolling(ZSCORE_WINDOW_MONTHLY).apply(lambda x: (x.iloc[-1] - x.mean()) / x.std())
+            rolling_zscore(df_monthly["Unemployed_27wks_Plus"], ZSCORE_WINDOW_MONTHLY,
+                           min_periods=ZSCORE_WINDOW_MONTHLY)
         )
 
     # Inverted quits rate z-score
     if "JOLTS_Quits_Rate_z" in df_monthly.columns:
         lfi_components["z_quits_inv"] = -df_monthly["JOLTS_Quits_Rate_z"]
     elif "JOLTS_Quits_Rate" in df_monthly.columns:
-        quits_z = (
-            df_monthly["JOLTS_Quits_Rate"]
-            .rolling(ZSCORE_WINDOW_MONTHLY).apply(lambda x: (x.iloc[-1] - x.mean()) / x.std())
-        )
+        quits_z = rolling_zscore(df_monthly["JOLTS_Quits_Rate"], ZSCORE_WINDOW_MONTHLY,
+                                 min_periods=ZSCORE_WINDOW_MONTHLY)
         lfi_components["z_quits_inv"] = -quits_z
 
     # Hires/Quits ratio (inverted)
     if "JOLTS_Hires_Rate" in df_monthly.columns and "JOLTS_Quits_Rate" in df_monthly.columns:
         ratio = df_monthly["JOLTS_Hires_Rate"] / df_monthly["JOLTS_Quits_Rate"].replace(0, np.nan)
-        ratio_z = ratio.rolling(ZSCORE_WINDOW_MONTHLY).apply(
-            lambda x: (x.iloc[-1] - x.mean()) / x.std() if x.std() > 0 else 0
-        )
+        ratio_z = rolling_zscore(ratio, ZSCORE_WINDOW_MONTHLY, min_periods=ZSCORE_WINDOW_MONTHLY)
         lfi_components["z_hires_quits_inv"] = -ratio_z
 
     # Target: Forward 12-month change in unemployment rate
@@ -463,6 +485,9 @@ def main():
     parser.add_argument("--quick", action="store_true", help="Run quick validation only")
     parser.add_argument("--output", type=str, help="Output report path")
     parser.add_argument("--start-date", type=str, default="1970-01-01", help="Start date for analysis")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for lead-lag work (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute lead-lag results instead of using the cache")
+    parser.add_argument("--scan", action="store_true", help="Also scan every pair of horizon columns for lead-lag")
 
     args = parser.parse_args()
 
@@ -480,7 +505,14 @@ def main():
     print(f"Lighthouse indices: {len(indices)} rows, {len(indices.columns)} columns")
 
     # Run validations
-    lead_lag_results = run_lead_lag_validation(df)
+    cache_path = None if args.no_cache else LEAD_LAG_CACHE_PATH
+    lead_lag_results = run_lead_lag_validation(df, args.workers, cache_path)
+
+    if args.scan:
+        scan_results = run_lead_lag_scan(df, args.workers, cache_path)
+        scan_path = OUTPUT_DIR / "lead_lag_scan.csv"
+        scan_results.to_csv(scan_path, index=False)
+        print(f"Scan results saved to: {scan_path}")
 
     if not args.quick:
         weight_results = run_weight_validation(df, indices)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtest
+=====================
+Point-in-time histories of the proprietary indices (LFI, LCI, MRI and their
+pillars, plus REC_PROB), with every horizon series held back by its
+publication lag, and their hit rates against NBER recessions.
+
+For a rebalance date T the vintage is the as-of panel (each column shifted
+by its PUBLICATION_LAGS entry, see data.loaders.as_of_panel) up to T. Every
+index formula looks back over row windows only, and the z-score kernel is
+start-independent, so the indices of one vintage at T equal those of one
+pass over the as-of panel at T. The backtest therefore recomputes each block
+of consecutive rebalance dates in a single pass (consecutive vintages share
+the rolling z-score state instead of rebuilding it), with INDEX_WARMUP_ROWS
+rows of warm-up, and runs the blocks on a process pool.
+check_vintages() rebuilds sampled vintages from the source panel to confirm
+this.
+
+REC_PROB uses the fixed BASELINE_COEFFICIENTS: a stored calibration is fitted
+on the full sample and would leak later recessions into earlier vintages.
+
+Usage:
+    python -m lighthouse_quant.validation.walk_forward
+    python -m lighthouse_quant.validation.walk_forward --freq QE --workers 4
+    python -m lighthouse_quant.validation.walk_forward --check 24
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lighthouse_quant.config import DB_PATH, OUTPUT_DIR
+from lighthouse_quant.data.loaders import as_of_panel, load_horizon_dataset, publication_lags
+from lighthouse_quant.models.recession_probability import (
+    BASELINE_COEFFICIENTS, MODEL_TERMS, design_matrix, sigmoid
+)
+from lighthouse_quant.validation.regime_validation import validate_against_nber
+from lighthouse_quant.data.pipeline import pipeline_module
+
+# Index formulas live in the data pipeline
+compute_indices = pipeline_module("compute_indices")
+
+
+# ==========================================
+# CONFIGURATION
+# ==========================================
+
+# Signal thresholds scored against NBER recessions: (threshold, direction)
+SIGNAL_THRESHOLDS = {
+    "MRI": (0.25, "above"),       # Pre-Recession
+    "LFI": (1.0, "above"),        # High fragility
+    "LCI": (-0.5, "below"),       # Scarce liquidity
+    "REC_PROB": (0.5, "above"),
+}
+
+# Horizon columns behind REC_PROB (see RecessionProbabilityModel.load_indicators)
+REC_PROB_INPUTS = {"yield_curve": "Curve_10Y_3M", "credit_spread": "HY_OAS_z"}
+QUITS_Z = "JOLTS_Quits_Rate_z"
+
+
+@dataclass
+class WalkForwardResult:
+    """Point-in-time index history and its NBER hit rates."""
+    history: pd.DataFrame      # Rebalance date x index value, as known on that date
+    hit_rates: pd.DataFrame    # One row per SIGNAL_THRESHOLDS index
+    lagged: bool               # False = revised data (no publication lags)
+
+
+# ==========================================
+# VINTAGE COMPUTATION
+# ==========================================
+
+def rebalance_dates(index: pd.DatetimeIndex, freq: str = "ME", start_date: str = None) -> pd.DatetimeIndex:
+    """Last panel date of each `freq` period (from start_date)."""
+    dates = pd.Series(index, index=index)
+    if start_date:
+        dates = dates[dates.index >= start_date]
+    return pd.DatetimeIndex(dates.resample(freq).last().dropna())
+
+
+def compute_vintage_indices(panel: pd.DataFrame, coefficients: Dict[str, float]) -> pd.DataFrame:
+    """Panel indices and REC_PROB for every row of an (as-of) panel slice."""
+    indices = pd.DataFrame(compute_indices.compute_panel_indices(panel, verbose=False))
+
+    inputs = pd.DataFrame({"MRI": indices["MRI"]}, index=panel.index)
+    for term, col in REC_PROB_INPUTS.items():
+        inputs[term] = panel[col] if col in panel else np.nan
+    inputs["quits_inv"] = -panel[QUITS_Z] if QUITS_Z in panel else np.nan
+    beta = np.array([coefficients[t] for t in MODEL_TERMS])
+    indices["REC_PROB"] = np.where(indices["MRI"].notna(), sigmoid(design_matrix(inputs) @ beta), np.nan)
+    return indices
+
+
+def _compute_block(panel: pd.DataFrame, dates: pd.DatetimeIndex, coefficients: Dict[str, float]) -> pd.DataFrame:
+    """Pool task: one pass over a block's slice, kept at its rebalance dates."""
+    return compute_vintage_indices(panel, coefficients).reindex(dates)
+
+
+def walk_forward(
+    panel: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    coefficients: Dict[str, float],
+    lags: np.ndarray = None,
+    workers: int = None,
+) -> pd.DataFrame:
+    """
+    Point-in-time index values on each rebalance date.
+
+    Args:
+        panel: Horizon panel as stored (revised data, sorted DatetimeIndex)
+        dates: Rebalance dates (panel dates)
+        coefficients: REC_PROB model coefficients
+        lags: Publication lag per column in days (default: PUBLICATION_LAGS;
+              zeros = revised data)
+        workers: Processes (default: one per CPU; 1 = in-process)
+
+    Returns:
+        DataFrame indexed by rebalance date, one column per index
+    """
+    as_of = as_of_panel(panel, lags)
+    positions = np.searchsorted(as_of.index, dates)
+    workers = workers or os.cpu_count() or 1
+    blocks = [b for b in np.array_split(positions, min(workers, len(positions))) if len(b)]
+
+    tasks = []
+    for block in blocks:
+        start = max(0, block[0] - compute_indices.INDEX_WARMUP_ROWS)
+        tasks.append((as_of.iloc[start:block[-1] + 1], as_of.index[block], coefficients))
+
+    if len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compute_block, *zip(*tasks)))
+    else:
+        results = [_compute_block(*task) for task in tasks]
+    return pd.concat(results)
+
+
+def source_vintage(panel: pd.DataFrame, date: pd.Timestamp, lags: np.ndarray) -> pd.DataFrame:
+    """
+    Vintage known on `date`, built forward from the source rows rather than
+    through as_of_panel: each observation up to `date` is placed on the first
+    panel date at least its lag after it (the later one wins a shared date),
+    and observations not yet published by `date` are left out.
+    """
+    source = panel.loc[:date]
+    dates = source.index
+    vintage = pd.DataFrame(np.nan, index=dates, columns=source.columns)
+    for lag in np.unique(lags):
+        cols = source.columns[lags == lag]
+        target = dates.searchsorted(dates + pd.Timedelta(days=int(lag)), side="left")
+        published = target < len(dates)
+        block = source.loc[published, cols].set_axis(dates[target[published]])
+        block = block[~block.index.duplicated(keep="last")]
+        vintage.loc[block.index, cols] = block.to_numpy()
+    return vintage
+
+
+def _compute_vintage(panel: pd.DataFrame, date: pd.Timestamp, lags: np.ndarray,
+                     coefficients: Dict[str, float]) -> pd.Series:
+    """Pool task: one vintage rebuilt from the source panel up to `date`."""
+    return compute_vintage_indices(source_vintage(panel, date, lags), coefficients).iloc[-1]
+
+
+def check_vintages(
+    panel: pd.DataFrame,
+    history: pd.DataFrame,
+    coefficients: Dict[str, float],
+    lags: np.ndarray = None,
+    sample: int = 24,
+    workers: int = None,
+) -> bool:
+    """
+    Recompute `sample` rebalance dates as independent full-history vintages
+    (source_vintage, not as_of_panel) and compare them with the walk-forward
+    history.
+    """
+    lags = publication_lags(list(panel.columns)) if lags is None else lags
+    rng = np.random.default_rng(0)
+    picks = history.index[np.sort(rng.choice(len(history), min(sample, len(history)), replace=False))]
+
+    args = ([panel] * len(picks), picks, [lags] * len(picks), [coefficients] * len(picks))
+    if (workers or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            vintages = list(pool.map(_compute_vintage, *args))
+    else:
+        vintages = [_compute_vintage(*a) for a in zip(*args)]
+
+    expected = pd.DataFrame(vintages, index=picks)[history.columns]
+    actual = history.loc[picks]
+    close = np.isclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12, equal_nan=True)
+    if close.all():
+        print(f"Vintage check OK: {len(picks)} dates x {close.shape[1]} indices")
+        return True
+    bad = actual.columns[~close.all(axis=0)]
+    print(f"Vintage check FAILED for {', '.join(bad)}")
+    return False
+
+
+# ==========================================
+# HIT RATES
+# ==========================================
+
+def hit_rates(history: pd.DataFrame, start_date: str = "1970-01-01",
+              max_lead_months: int = 18, min_signal_months: int = 2) -> pd.DataFrame:
+    """validate_against_nber for each SIGNAL_THRESHOLDS index in the history."""
+    rows = []
+    for index_id, (threshold, direction) in SIGNAL_THRESHOLDS.items():
+        if index_id not in history or history[index_id].dropna().empty:
+            continue
+        result = validate_against_nber(
+            history[index_id].dropna().rename(index_id),
+            threshold=threshold,
+            threshold_direction=direction,
+            min_signal_months=min_signal_months,
+            max_lead_months=max_lead_months,
+            start_date=start_date,
+        )
+        rows.append({
+            "index": index_id,
+            "signal": f"{'>' if direction == 'above' else '<'} {threshold}",
+            "detected": result.n_recessions_detected,
+            "recessions": result.n_recessions_tested,
+            "hit_rate": result.true_positive_rate,
+            "avg_lead_months": result.average_lead_time,
+            "false_alarms": result.n_false_alarms,
+            "false_positive_rate": result.false_positive_rate,
+            "precision": result.precision,
+            "recall": result.recall,
+            "f1": result.f1_score,
+        })
+    return pd.DataFrame(rows).set_index("index") if rows else pd.DataFrame()
+
+
+def model_coefficients() -> Dict[str, float]:
+    """REC_PROB coefficients for the backtest: the fixed baseline, never a full-sample calibration."""
+    return dict(BASELINE_COEFFICIENTS)
+
+
+def run_walk_forward(
+    start_date: str = "1990-01-01",
+    freq: str = "ME",
+    lagged: bool = True,
+    workers: int = None,
+    db_path: Path = DB_PATH,
+    panel: pd.DataFrame = None,
+) -> WalkForwardResult:
+    """Load the panel, walk forward over rebalance dates and score the signals."""
+    if panel is None:
+        panel = load_horizon_dataset(db_path=db_path)
+    coefficients = model_coefficients()
+
+    lags = None if lagged else np.zeros(len(panel.columns), dtype=np.int64)
+    dates = rebalance_dates(panel.index, freq, start_date)
+    history = walk_forward(panel, dates, coefficients, lags=lags, workers=workers)
+    return WalkForwardResult(history=history, hit_rates=hit_rates(history, start_date), lagged=lagged)
+
+
+# ==========================================
+# CLI
+# ==========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the Lighthouse indices")
+    parser.add_argument("--start", default="1990-01-01", help="First rebalance date")
+    parser.add_argument("--freq", default="ME", help="Rebalance frequency (pandas offset, default month-end)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--check", type=int, default=0, metavar="N",
+                        help="Also rebuild N sampled vintages from scratch and compare")
+    parser.add_argument("--output", type=str, default=None, help="CSV for the point-in-time history")
+    args = parser.parse_args()
+
+    print("Loading horizon panel...")
+    panel = load_horizon_dataset()
+    print(f"   {len(panel)} rows, {len(panel.columns)} columns; "
+          f"{int((publication_lags(list(panel.columns)) > 0).sum())} columns lagged")
+
+    results = {}
+    for lagged in (True, False):
+        label = "Point-in-time (publication lags)" if lagged else "Revised data (no lags)"
+        print(f"\n--- {label} ---")
+        result = run_walk_forward(args.start, args.freq, lagged, args.workers, panel=panel)
+        results[lagged] = result
+        print(f"   {len(result.history)} rebalance dates "
+              f"({result.history.index.min().date()} to {result.history.index.max().date()})")
+        print(result.hit_rates.round(2).to_string())
+
+    if args.check:
+        check_vintages(panel, results[True].history, model_coefficients(), sample=args.check, workers=args.workers)
+
+    output = Path(args.output) if args.output else OUTPUT_DIR / "walk_forward_history.csv"
+    results[True].history.to_csv(output, index_label="date")
+    print(f"\nSaved point-in-time history to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import warnings
 
+from lighthouse_quant.data.pipeline import rolling_zscore
+
 
 @dataclass
 class WeightOptimizationResult:
@@ -27,10 +29,8 @@ class WeightOptimizationResult:
 
 
 def compute_zscore(series: pd.Series, window: int = 24) -> pd.Series:
-    """Compute rolling z-score."""
-    rolling_mean = series.rolling(window, min_periods=window//2).mean()
-    rolling_std = series.rolling(window, min_periods=window//2).std()
-    return (series - rolling_mean) / rolling_std
+    """Compute rolling z-score (lighthouse.rolling kernel)."""
+    return rolling_zscore(series, window)
 
 
 def optimize_weights_elastic_net(